@@ -44,6 +44,50 @@ options:
         required: true
         choices: ['present', 'absent']
         default: 'present'
+    retention_policy:
+        description: A retention policy to apply on the Database Backups of the compartments I(compartment_ids), or of
+                     the Database I(database_id). The Database Backups of the compartments are listed in parallel, and
+                     the policy is evaluated separately on the Database Backups of each Database, sorted by
+                     C(time_started). The Database Backups that no rule of the policy keeps are deleted in parallel.
+                     Only the Database Backups that are ACTIVE are evaluated. When I(retention_policy) is specified, no
+                     Database Backup is created.
+        required: false
+        type: dict
+        suboptions:
+            keep_last:
+                description: The number of most recent Database Backups to keep.
+                required: false
+                type: int
+            keep_daily:
+                description: The number of most recent days for which the most recent Database Backup of the day is
+                             kept.
+                required: false
+                type: int
+            keep_weekly:
+                description: The number of most recent weeks for which the most recent Database Backup of the week is
+                             kept.
+                required: false
+                type: int
+            keep_monthly:
+                description: The number of most recent months for which the most recent Database Backup of the month is
+                             kept.
+                required: false
+                type: int
+    compartment_ids:
+        description: The OCIDs of the compartments to apply the I(retention_policy) on. Either I(compartment_ids) or
+                     I(database_id) is required with I(retention_policy).
+        required: false
+        type: list
+    enable_parallel_requests:
+        description: Whether to list and delete the Database Backups with I(retention_policy) in parallel.
+        required: false
+        default: True
+        type: bool
+    max_thread_count:
+        description: When I(enable_parallel_requests=True), indicates the number of maximum parallel operations. The
+                     default number of threads used is the number of cores in your machine.
+        required: false
+        type: int
 author:
     - "Debayan Gupta(@debayan_gupta)"
 extends_documentation_fragment: [ oracle, oracle_creatable_resource, oracle_wait_options ]
@@ -63,6 +107,14 @@ EXAMPLES = """
   oci_backup:
       backup_id: 'ocid1.backup.aaaa'
       state: 'absent'
+# Apply a retention policy on the Database Backups of a compartment
+- name: Keep one Database Backup per week for 4 weeks and one per month for a year
+  oci_backup:
+      compartment_ids: ['ocid1.compartment.aaaa']
+      retention_policy:
+          keep_weekly: 4
+          keep_monthly: 12
+      wait: False
 """
 
 RETURN = """
@@ -138,6 +190,32 @@ RETURN = """
                     "time_started":"2018-02-23T06:37:58.669000+00:00",
                     "type":"FULL"
                 }
+    kept_backups:
+        description: The Database Backups kept by I(retention_policy), newest first for each Database.
+        returned: When I(retention_policy) is specified
+        type: list
+        sample: [{
+                    "compartment_id":"ocid1.compartment.aaaa",
+                    "database_id":"ocid1.database.aaaa",
+                    "display_name":"ansible-backup-weekly",
+                    "id":"ocid1.backup.aaaa",
+                    "lifecycle_state":"ACTIVE",
+                    "time_started":"2018-02-23T06:37:58.669000+00:00",
+                    "type":"FULL"
+                }]
+    removed_backups:
+        description: The Database Backups deleted by I(retention_policy), newest first for each Database.
+        returned: When I(retention_policy) is specified
+        type: list
+        sample: [{
+                    "compartment_id":"ocid1.compartment.aaaa",
+                    "database_id":"ocid1.database.aaaa",
+                    "display_name":"ansible-backup-daily",
+                    "id":"ocid1.backup.bbbb",
+                    "lifecycle_state":"DELETING",
+                    "time_started":"2018-02-20T06:37:58.669000+00:00",
+                    "type":"INCREMENTAL"
+                }]
 """
 
 from ansible.module_utils.basic import AnsibleModule
@@ -187,6 +265,34 @@ def delete_backup(db_client, module):
     return result
 
 
+def apply_backup_retention_policy(db_client, module):
+    database_id = module.params["database_id"]
+    if module.params["compartment_ids"]:
+        kwargs_lists = []
+        for compartment_id in module.params["compartment_ids"]:
+            kwargs_list = dict(compartment_id=compartment_id)
+            if database_id:
+                kwargs_list["database_id"] = database_id
+            kwargs_lists.append(kwargs_list)
+    elif database_id:
+        kwargs_lists = [dict(database_id=database_id)]
+    else:
+        module.fail_json(
+            msg="compartment_ids or database_id is required with retention_policy."
+        )
+    return oci_utils.apply_retention_policy(
+        module,
+        "backup",
+        db_client.list_backups,
+        kwargs_lists,
+        db_client.delete_backup,
+        "backup_id",
+        "database_id",
+        ["ACTIVE"],
+        time_attribute="time_started",
+    )
+
+
 def set_logger(input_logger):
     global logger
     logger = input_logger
@@ -213,17 +319,25 @@ def main():
                 default="present",
                 choices=["present", "absent"],
             ),
+            enable_parallel_requests=dict(type="bool", required=False, default=True),
+            max_thread_count=dict(type="int", required=False),
         )
     )
+    module_args.update(oci_utils.get_retention_policy_arg_spec())
 
-    module = AnsibleModule(argument_spec=module_args)
+    module = AnsibleModule(
+        argument_spec=module_args,
+        mutually_exclusive=[["backup_id", "retention_policy"]],
+    )
 
     if not HAS_OCI_PY_SDK:
         module.fail_json(msg="oci python sdk required for this module")
 
     db_client = oci_utils.create_service_client(module, DatabaseClient)
     state = module.params["state"]
-    if state == "present":
+    if module.params["retention_policy"]:
+        result = apply_backup_retention_policy(db_client, module)
+    elif state == "present":
         result = oci_utils.check_and_create_resource(
             resource_type="backup",
             create_fn=create_backup,
@@ -489,7 +489,6 @@ from ansible.module_utils.oracle import oci_utils, oci_db_utils
 import os
 
 try:
-    import copy
     from oci.database.database_client import DatabaseClient
     from oci.exceptions import ServiceError, ClientError
     from oci.util import to_dict
@@ -515,15 +514,13 @@ def launch_or_update_db_system(db_client, module):
         if db_system_id is not None:
             result = update_db_system(db_client, module, db_system_id)
         else:
-            module_copy = copy.deepcopy(module)
-            module_copy.params.update(
+            module_view = oci_utils.get_module_with_params_overlay(
+                module,
                 {
                     "ssh_public_keys": to_dict(
-                        create_ssh_public_keys(
-                            module_copy.params.get("ssh_public_keys")
-                        )
+                        create_ssh_public_keys(module.params.get("ssh_public_keys"))
                     )
-                }
+                },
             )
             result = oci_utils.check_and_create_resource(
                 resource_type="db_system",
@@ -531,7 +528,7 @@ def launch_or_update_db_system(db_client, module):
                 kwargs_create={"db_client": db_client, "module": module},
                 list_fn=db_client.list_db_systems,
                 kwargs_list={"compartment_id": module.params.get("compartment_id")},
-                module=module_copy,
+                module=module_view,
                 exclude_attributes=exclude_attributes,
                 model=LaunchDbSystemDetails(),
             )
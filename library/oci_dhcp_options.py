@@ -27,6 +27,8 @@ description:
     - Update OCI Dhcp Options, if present, by purging existing options and replacing them with
       specified ones
     - Delete OCI Dhcp Options, if present.
+    - Create or update Dhcp Options with the same name in every VCN of a compartment, with
+      I(apply_to_all_vcns=yes).
 version_added: "2.5"
 options:
     compartment_id:
@@ -91,6 +93,25 @@ options:
         required: false
         default: 'no'
         type: bool
+    apply_to_all_vcns:
+        description: Create or update Dhcp Options named I(display_name) with the options I(options) in every VCN of
+                     the compartment I(compartment_id). The VCNs and the Dhcp Options of the compartment are listed
+                     once, and the Dhcp Options of the VCNs are created or updated in parallel. Only applicable with
+                     I(state=present). Mutually exclusive with I(vcn_id) and I(dhcp_id).
+        required: false
+        default: 'no'
+        type: bool
+    enable_parallel_requests:
+        description: Whether to create or update the Dhcp Options of the VCNs in parallel, when
+                     I(apply_to_all_vcns=yes).
+        required: false
+        default: True
+        type: bool
+    max_thread_count:
+        description: When I(enable_parallel_requests=True), indicates the number of maximum parallel operations. The
+                     default number of threads used is the number of cores in your machine.
+        required: false
+        type: int
     state:
         description: Create,update or delete Dhcp Options. For I(state=present), if it
                      does not exist, it gets created. If it exists, it gets updated.
@@ -160,6 +181,18 @@ EXAMPLES = """
     delete_dhcp_options: 'yes'
     state: 'present'
 
+# Create or update Dhcp Options in every VCN of a compartment
+- name: Create or update Dhcp Options in every VCN of a compartment
+  oci_dhcp_options:
+    compartment_id: 'ocid1.compartment..xdsc'
+    name: 'corporate_dns'
+    apply_to_all_vcns: 'yes'
+    options:
+          - type: 'DomainNameServer'
+            server_type: 'CustomDnsServer'
+            custom_dns_servers: ['10.0.0.8', '10.0.0.10']
+    state: 'present'
+
 #Delete Dhcp Options
 - name: Delete Dhcp Options
   oci_dhcp_options:
@@ -239,11 +272,31 @@ RETURN = """
                     "time_created":"2017-11-26T16:41:06.996000+00:00",
                     "vcn_id":"ocid1.vcn.oc1.phx.xxxxxEXAMPLExxxxx"
                 }
+    dhcp_options_list:
+        description: Attributes of the Dhcp Options of each VCN of the compartment, with
+                     I(apply_to_all_vcns=yes). See I(dhcp_options) for the attributes of Dhcp Options.
+        returned: When I(apply_to_all_vcns=yes)
+        type: list
+        sample: [{
+                    "compartment_id":"ocid1.compartment.oc1..xxxxxEXAMPLExxxxx",
+                    "display_name":"corporate_dns",
+                    "id":"ocid1.dhcpoptions.oc1.phx.xxxxxEXAMPLExxxxx",
+                    "lifecycle_state":"AVAILABLE",
+                    "options":[
+                                {
+                                    "custom_dns_servers":["10.0.0.8", "10.0.0.10"],
+                                    "server_type":"CustomDnsServer",
+                                    "type":"DomainNameServer"
+                                }
+                            ],
+                    "time_created":"2017-11-26T16:41:06.996000+00:00",
+                    "vcn_id":"ocid1.vcn.oc1.phx.xxxxxEXAMPLExxxxx"
+                }]
 
 """
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.oracle import oci_utils
+from ansible.module_utils.oracle import oci_utils, oci_network_utils
 
 try:
     from oci.core import VirtualNetworkClient
@@ -301,7 +354,7 @@ def create_or_update_dhcp_options(virtual_network_client, module):
 
 
 def create_dhcp_options(virtual_network_client, module):
-    options = get_options_objects(module.params["options"])
+    options = get_option_models(get_input_option_keys(module.params["options"]))
     create_dhcp_details = CreateDhcpDetails()
     for attribute in create_dhcp_details.attribute_map:
         create_dhcp_details.__setattr__(attribute, module.params.get(attribute))
@@ -342,16 +395,15 @@ def update_dhcp_options(virtual_network_client, existing_dhcp_options, module):
             getattr(existing_dhcp_options, attribute),
             name_tag_changed,
         )
-    if input_options is not None:
-        if input_options:
-            options, options_changed = oci_utils.get_component_list_difference(
-                get_options_objects(input_options),
-                get_hashed_options(existing_options),
-                module.params.get("purge_dhcp_options"),
-                module.params.get("delete_dhcp_options"),
-            )
+    if input_options:
+        option_keys, options_changed = get_option_keys_difference(
+            get_input_option_keys(input_options),
+            get_existing_option_keys(existing_options),
+            module.params.get("purge_dhcp_options"),
+            module.params.get("delete_dhcp_options"),
+        )
     if options_changed:
-        update_dhcp_details.options = options
+        update_dhcp_details.options = get_option_models(option_keys)
     else:
         update_dhcp_details.options = existing_options
 
@@ -372,53 +424,245 @@ def update_dhcp_options(virtual_network_client, existing_dhcp_options, module):
     return result
 
 
-def get_hashed_options(options):
-    hashed_options = []
-    if options is None:
-        return hashed_options
-    for option in options:
-        dhcp_option = None
-        if option.type == "DomainNameServer":
-            dhcp_option = oci_utils.create_hashed_instance(DhcpDnsOption)
-            dhcp_option.type = "DomainNameServer"
-            server_type = option.server_type
-            dhcp_option.server_type = server_type
-            if server_type == "CustomDnsServer":
-                dhcp_option.custom_dns_servers = option.custom_dns_servers
-            else:
-                dhcp_option.custom_dns_servers = []
-        elif option.type == "SearchDomain":
-            dhcp_option = oci_utils.create_hashed_instance(DhcpSearchDomainOption)
-            dhcp_option.type = "SearchDomain"
-            dhcp_option.search_domain_names = option.search_domain_names
-        hashed_options.append(dhcp_option)
+# Memoized conversions of canonical DHCP option encodings to SDK models, shared by all the Dhcp Options of a run
+_option_models = dict()
+
 
-    return hashed_options
+def get_option_key(
+    option_type, server_type=None, custom_dns_servers=None, search_domain_names=None
+):
+    """
+    Get the canonical encoding of a DHCP option as a tuple. Two DHCP options are equivalent if and only if their
+    encodings are equal, so that DHCP options can be compared with set operations.
+    """
+    if option_type == "DomainNameServer":
+        if server_type == "CustomDnsServer":
+            return option_type, server_type, tuple(custom_dns_servers or [])
+        return option_type, server_type, ()
+    return option_type, tuple(search_domain_names or [])
+
+
+def get_existing_option_keys(options):
+    if options is None:
+        return []
+    return [
+        get_option_key(
+            option.type,
+            getattr(option, "server_type", None),
+            getattr(option, "custom_dns_servers", None),
+            getattr(option, "search_domain_names", None),
+        )
+        for option in options
+        if option.type in ["DomainNameServer", "SearchDomain"]
+    ]
 
 
-def get_options_objects(options):
-    dhcp_options = []
+def get_input_option_keys(options):
+    option_keys = []
     for option in options:
-        dhcp_option = None
         if option["type"] == "DomainNameServer":
-            dhcp_option = oci_utils.create_hashed_instance(DhcpDnsOption)
-            dhcp_option.type = "DomainNameServer"
-            server_type = option["server_type"]
-            dhcp_option.server_type = server_type
-            if server_type == "CustomDnsServer":
-                dhcp_option.custom_dns_servers = option.get("custom_dns_servers", None)
-            else:
-                dhcp_option.custom_dns_servers = []
+            option_keys.append(
+                get_option_key(
+                    "DomainNameServer",
+                    server_type=option["server_type"],
+                    custom_dns_servers=option.get("custom_dns_servers", None),
+                )
+            )
         elif option["type"] == "SearchDomain":
-            dhcp_option = oci_utils.create_hashed_instance(DhcpSearchDomainOption)
-            dhcp_option.type = "SearchDomain"
-            search_domain_names = option["search_domain_names"]
-            if search_domain_names:
-                dhcp_option.search_domain_names = option["search_domain_names"]
-            else:
+            if not option["search_domain_names"]:
                 raise ClientError("search_domain_names field should not be empty")
-        dhcp_options.append(dhcp_option)
-    return dhcp_options
+            option_keys.append(
+                get_option_key(
+                    "SearchDomain", search_domain_names=option["search_domain_names"]
+                )
+            )
+    return option_keys
+
+
+def get_option_models(option_keys):
+    options = []
+    for option_key in option_keys:
+        if option_key not in _option_models:
+            if option_key[0] == "DomainNameServer":
+                _option_models[option_key] = DhcpDnsOption(
+                    type=option_key[0],
+                    server_type=option_key[1],
+                    custom_dns_servers=list(option_key[2]),
+                )
+            else:
+                _option_models[option_key] = DhcpSearchDomainOption(
+                    type=option_key[0], search_domain_names=list(option_key[1])
+                )
+        options.append(_option_models[option_key])
+    return options
+
+
+def get_option_keys_difference(
+    option_keys, existing_option_keys, purge_options, delete_options=False
+):
+    """
+    Compute the DHCP options to set from the canonical encodings of the input and of the existing DHCP options.
+    :return: A tuple of the encodings of the DHCP options to set and whether they differ from the existing ones
+    """
+    if delete_options:
+        return oci_utils.apply_component_list_delta(
+            existing_option_keys, [], set(option_keys)
+        )
+    option_keys_to_add, option_keys_to_remove = oci_utils.get_component_list_delta(
+        option_keys, existing_option_keys
+    )
+    if not purge_options:
+        option_keys_to_remove = set()
+    return oci_utils.apply_component_list_delta(
+        existing_option_keys, option_keys_to_add, option_keys_to_remove
+    )
+
+
+def reconcile_vcn_dhcp_options(
+    virtual_network_client, vcn_id, existing_dhcp_options, option_keys, module
+):
+    # Runs in a worker thread, so errors are returned to the caller instead of failing the module here
+    try:
+        if existing_dhcp_options is None:
+            create_dhcp_details = CreateDhcpDetails(
+                compartment_id=module.params["compartment_id"],
+                vcn_id=vcn_id,
+                display_name=module.params["display_name"],
+                options=get_option_models(option_keys),
+                freeform_tags=module.params["freeform_tags"],
+                defined_tags=module.params["defined_tags"],
+            )
+            dhcp_options = oci_utils.call_with_backoff(
+                virtual_network_client.create_dhcp_options,
+                create_dhcp_details=create_dhcp_details,
+            ).data
+            return dict(dhcp_options=dhcp_options, changed=True, error=None)
+
+        update_dhcp_details = UpdateDhcpDetails()
+        tags_changed = False
+        for attribute in ["freeform_tags", "defined_tags"]:
+            tags_changed = oci_utils.check_and_update_attributes(
+                update_dhcp_details,
+                attribute,
+                module.params.get(attribute),
+                getattr(existing_dhcp_options, attribute),
+                tags_changed,
+            )
+        updated_option_keys, options_changed = get_option_keys_difference(
+            option_keys,
+            get_existing_option_keys(existing_dhcp_options.options),
+            module.params.get("purge_dhcp_options"),
+            module.params.get("delete_dhcp_options"),
+        )
+        if not tags_changed and not options_changed:
+            return dict(dhcp_options=existing_dhcp_options, changed=False, error=None)
+        if options_changed:
+            update_dhcp_details.options = get_option_models(updated_option_keys)
+        else:
+            update_dhcp_details.options = existing_dhcp_options.options
+        dhcp_options = oci_utils.call_with_backoff(
+            virtual_network_client.update_dhcp_options,
+            dhcp_id=existing_dhcp_options.id,
+            update_dhcp_details=update_dhcp_details,
+        ).data
+        return dict(dhcp_options=dhcp_options, changed=True, error=None)
+    except ServiceError as ex:
+        return dict(
+            dhcp_options=existing_dhcp_options,
+            changed=False,
+            error="{0}: {1}".format(vcn_id, ex.message),
+        )
+
+
+def reconcile_compartment_dhcp_options(virtual_network_client, module):
+    """
+    Create or update the Dhcp Options named `display_name` in every VCN of a compartment. The VCNs and the Dhcp Options
+    of the compartment are listed once, the input options are encoded once for all the VCNs, and the Dhcp Options of
+    the VCNs are created or updated in parallel and waited on together.
+    """
+    compartment_id = module.params["compartment_id"]
+    try:
+        option_keys = get_input_option_keys(module.params["options"])
+        vcns = [
+            vcn
+            for vcn in oci_utils.list_all_resources(
+                virtual_network_client.list_vcns, compartment_id=compartment_id
+            )
+            if vcn.lifecycle_state
+            not in oci_network_utils.VCN_RESOURCE_TERMINATED_STATES
+        ]
+        existing_dhcp_options_by_vcn = dict()
+        for dhcp_options in oci_utils.list_all_resources(
+            virtual_network_client.list_dhcp_options,
+            compartment_id=compartment_id,
+            display_name=module.params["display_name"],
+        ):
+            if (
+                dhcp_options.lifecycle_state
+                not in oci_network_utils.VCN_RESOURCE_TERMINATED_STATES
+            ):
+                existing_dhcp_options_by_vcn.setdefault(
+                    dhcp_options.vcn_id, dhcp_options
+                )
+    except ServiceError as ex:
+        module.fail_json(msg=ex.message)
+    except ClientError as ex:
+        module.fail_json(msg=ex.args[0])
+
+    outcomes = oci_utils.execute_tasks(
+        lambda vcn: reconcile_vcn_dhcp_options(
+            virtual_network_client,
+            vcn.id,
+            existing_dhcp_options_by_vcn.get(vcn.id),
+            option_keys,
+            module,
+        ),
+        vcns,
+        module,
+    )
+    dhcp_options_list = [
+        to_dict(outcome["dhcp_options"])
+        for outcome in outcomes
+        if outcome["dhcp_options"] is not None
+    ]
+    changed_ids = [
+        outcome["dhcp_options"].id for outcome in outcomes if outcome["changed"]
+    ]
+    result = dict(changed=bool(changed_ids), dhcp_options_list=dhcp_options_list)
+    errors = [outcome["error"] for outcome in outcomes if outcome["error"]]
+    if errors:
+        module.fail_json(
+            msg="Failed to create or update the Dhcp Options of {0} VCNs: {1}".format(
+                len(errors), "; ".join(errors)
+            ),
+            **result
+        )
+
+    if changed_ids and module.params.get("wait", None):
+        try:
+            waited_dhcp_options, timed_out_ids = (
+                oci_utils.wait_for_resources_lifecycle_state(
+                    module,
+                    virtual_network_client.list_dhcp_options,
+                    [dict(compartment_id=compartment_id)],
+                    changed_ids,
+                    module.params.get("wait_until") or ["AVAILABLE"],
+                )
+            )
+        except ServiceError as ex:
+            module.fail_json(msg=ex.message, **result)
+        result["dhcp_options_list"] = [
+            waited_dhcp_options.get(dhcp_options["id"], dhcp_options)
+            for dhcp_options in dhcp_options_list
+        ]
+        if timed_out_ids:
+            module.fail_json(
+                msg="Timed out waiting for Dhcp Options {0}.".format(
+                    ", ".join(sorted(timed_out_ids))
+                ),
+                **result
+            )
+    return result
 
 
 def delete_dhcp_options(virtual_network_client, module):
@@ -452,11 +696,18 @@ def main():
             options=dict(type=list, required=False),
             purge_dhcp_options=dict(type="bool", required=False, default=True),
             delete_dhcp_options=dict(type="bool", required=False, default=False),
+            apply_to_all_vcns=dict(type="bool", required=False, default=False),
+            enable_parallel_requests=dict(type="bool", required=False, default=True),
+            max_thread_count=dict(type="int", required=False),
         )
     )
     module = AnsibleModule(
         argument_spec=module_args,
-        mutually_exclusive=[["purge_dhcp_options", "delete_dhcp_options"]],
+        mutually_exclusive=[
+            ["purge_dhcp_options", "delete_dhcp_options"],
+            ["apply_to_all_vcns", "vcn_id"],
+            ["apply_to_all_vcns", "dhcp_id"],
+        ],
     )
 
     if not HAS_OCI_PY_SDK:
@@ -468,7 +719,18 @@ def main():
 
     state = module.params["state"]
 
-    if state == "present":
+    if module.params["apply_to_all_vcns"]:
+        if state != "present":
+            module.fail_json(
+                msg="apply_to_all_vcns is only applicable to state=present."
+            )
+        for param in ["compartment_id", "display_name", "options"]:
+            if not module.params[param]:
+                module.fail_json(
+                    msg="{0} is required with apply_to_all_vcns.".format(param)
+                )
+        result = reconcile_compartment_dhcp_options(virtual_network_client, module)
+    elif state == "present":
         result = create_or_update_dhcp_options(virtual_network_client, module)
     elif state == "absent":
         result = delete_dhcp_options(virtual_network_client, module)
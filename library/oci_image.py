@@ -22,6 +22,8 @@ short_description: Create, import, update and delete OCI Compute images
 description:
     - This module allows the user to create an image, import an exported image, update an image and delete OCI Compute
       Images.
+    - This module also allows the user to export an image to Object Storage, and to copy an image to other regions
+      through Object Storage.
 version_added: "2.5"
 options:
     compartment_id:
@@ -78,15 +80,85 @@ options:
                              I(state=present) and the I(source_type=objectStorageTuple) under C(image_source_details).
                 required: false
                 aliases: [ 'object' ]
+            src:
+                description: The path of a local image file to upload to the Object Storage object specified by
+                             C(namespace), C(bucket) and C(object) before importing the image. The file is uploaded
+                             using multipart upload with the parts uploaded in parallel. The file is not uploaded again
+                             if the object already exists. Only supported with I(source_type=objectStorageTuple).
+                required: false
+    image_export_details:
+        description: Details of the Object Storage destination to export the image I(image_id) to with
+                     I(state=exported).
+        required: false
+        suboptions:
+            destination_type:
+                description: The destination type for the exported image. Use 'objectStorageTuple' to export the
+                             image to an object in Object Storage specified by C(namespace), C(bucket), and C(object).
+                             Use 'objectStorageUri' to export the image to an Object Storage URL specified by
+                             C(destination_uri).
+                required: true
+                choices: ['objectStorageTuple', 'objectStorageUri']
+            destination_uri:
+                description: The Object Storage URL to export the image to. Required with
+                             I(destination_type=objectStorageUri).
+                required: false
+            bucket_name:
+                description: The Object Storage bucket to export the image to. Required with
+                             I(destination_type=objectStorageTuple).
+                required: false
+                aliases: [ 'bucket' ]
+            namespace_name:
+                description: The Object Storage namespace to export the image to. Required with
+                             I(destination_type=objectStorageTuple).
+                required: false
+                aliases: [ 'namespace' ]
+            object_name:
+                description: The Object Storage object name for the exported image. Required with
+                             I(destination_type=objectStorageTuple). The image is not exported again if the object
+                             already exists.
+                required: false
+                aliases: [ 'object' ]
+    destination_regions:
+        description: A list of regions to copy the image I(image_id) to with I(state=present). The image is exported
+                     once to I(staging_bucket) in the current region, and the exported image is then copied to
+                     I(staging_bucket) in each of the destination regions and imported there. The destination regions
+                     are processed in parallel as per I(enable_parallel_requests) and I(max_thread_count). The copies
+                     are tagged with the freeform tag C(source_image_id) holding the OCID of I(image_id), and a region
+                     which already has an image with the same display name and C(source_image_id) in
+                     I(destination_compartment_id) is skipped.
+        required: false
+        type: list
+    staging_bucket:
+        description: The name of the Object Storage bucket used to stage the exported image when copying an image with
+                     I(destination_regions). A bucket with this name must exist in the current region and in each of
+                     the I(destination_regions). Required with I(destination_regions).
+        required: false
+    destination_compartment_id:
+        description: The OCID of the compartment to import the copies of the image in, in the
+                     I(destination_regions). By default, the copies are imported in the compartment of the image.
+        required: false
+    enable_parallel_requests:
+        description: Whether to copy the image to the I(destination_regions) in parallel.
+        required: false
+        default: True
+        type: bool
+    max_thread_count:
+        description: When I(enable_parallel_requests=True), indicates the number of maximum parallel operations that are
+                     used to copy the image to the I(destination_regions), and to upload the parts of the local image
+                     file specified by C(src) under I(image_source_details). The default number of threads used is
+                     the number of cores in your machine.
+        required: false
+        type: int
     state:
         description: The state of the image that must be asserted to. When I(state=present), and the
                      image doesn't exist, the image is created with the specified details. When I(state=absent),
-                     the image is deleted.
+                     the image is deleted. When I(state=exported), the image I(image_id) is exported to Object Storage
+                     as specified by I(image_export_details).
                      Creation of an image may take longer than the default value of I(wait_timeout). So if I(wait=true),
                      during creation of an image, it is recommended to set a longer timeout value of I(wait_timeout).
         required: false
         default: "present"
-        choices: ['present', 'absent']
+        choices: ['present', 'absent', 'exported']
 
 author: "Sivakumar Thyagarajan (@sivakumart)"
 extends_documentation_fragment: [ oracle, oracle_creatable_resource, oracle_wait_options, oracle_tags ]
@@ -120,6 +192,36 @@ EXAMPLES = """
             source_uri: "https://objectstorage.us-phoenix-1.oraclecloud.com/n/my_namespace/b/my_bucket/o/image-to-impor
                         t.qcow2"
 
+- name: Create a new image by uploading a local image file to a bucket in Object Storage Service and importing it
+  oci_image:
+        name: my_custom_image_4
+        compartment_id: "ocid1.compartment.oc1..xxxxxEXAMPLExxxxx...vm62xq"
+        image_source_details:
+            source_type: "objectStorageTuple"
+            bucket: "my_bucket"
+            namespace: "my_namespace"
+            object: "image-to-import.qcow2"
+            src: "/tmp/images/image-to-import.qcow2"
+
+- name: Export an image to a bucket in Object Storage Service
+  oci_image:
+        id: "ocid1.image.oc1.phx.xxxxxEXAMPLExxxxx...lxiggdq"
+        image_export_details:
+            destination_type: "objectStorageTuple"
+            bucket: "my_bucket"
+            namespace: "my_namespace"
+            object: "exported-image.oci"
+        state: "exported"
+
+- name: Copy an image to two other regions, staging the exported image in the bucket "image-staging" of each region
+  oci_image:
+        id: "ocid1.image.oc1.phx.xxxxxEXAMPLExxxxx...lxiggdq"
+        destination_regions:
+            - us-ashburn-1
+            - eu-frankfurt-1
+        staging_bucket: "image-staging"
+        wait_timeout: 7200
+
 - name: Update an image's display name
   oci_image:
         id: "ocid1.image.oc1.phx.xxxxxEXAMPLExxxxx...lxiggdq"
@@ -146,6 +248,15 @@ oci_image:
               "operating_system_version": "16.04",
               "time_created": "2017-11-24T13:18:31.579000+00:00"
            }
+image_copies:
+    description: The copies of the image in each of the I(destination_regions). Each copy contains the C(region), the
+                 copied C(image), whether the copy was C(changed), and an C(error) message if the image could not be
+                 copied to the region.
+    returned: When the image is copied with I(destination_regions)
+    type: list
+    sample: [{"region": "us-ashburn-1", "changed": true,
+              "image": {"id": "ocid1.image.oc1.iad.xxxxxEXAMPLExxxxx...dgb3pmci2q", "display_name": "my-image-1",
+                        "lifecycle_state": "AVAILABLE"}}]
 """
 
 from ansible.module_utils.basic import AnsibleModule
@@ -158,9 +269,13 @@ try:
         ImageSourceViaObjectStorageTupleDetails,
         ImageSourceViaObjectStorageUriDetails,
         CreateImageDetails,
+        ExportImageViaObjectStorageTupleDetails,
+        ExportImageViaObjectStorageUriDetails,
     )
+    from oci.object_storage import ObjectStorageClient, UploadManager
+    from oci.object_storage.models import CopyObjectDetails
     from oci.util import to_dict
-    from oci.exceptions import ServiceError
+    from oci.exceptions import ServiceError, MaximumWaitTimeExceeded
 
     HAS_OCI_PY_SDK = True
 except ImportError:
@@ -168,6 +283,9 @@ except ImportError:
 
 RESOURCE_NAME = "image"
 
+# The freeform tag of the copies of an image in other regions, holding the OCID of the image they were copied from
+SOURCE_IMAGE_ID_TAG = "source_image_id"
+
 
 def _get_image_from_id(compute_client, id, module):
     try:
@@ -210,6 +328,17 @@ def update_image(compute_client, id, display_name, module):
 
 def create_image(compute_client, module):
     cid = _get_create_image_details(module)
+    image_source_details = module.params["image_source_details"]
+    if image_source_details and image_source_details.get("src"):
+        object_storage_client = oci_utils.create_service_client(
+            module, ObjectStorageClient
+        )
+        upload_image_file(
+            object_storage_client,
+            module,
+            image_source_details["src"],
+            cid.image_source_details,
+        )
     return oci_utils.create_and_wait(
         resource_type=RESOURCE_NAME,
         client=compute_client,
@@ -242,9 +371,11 @@ def _get_create_image_details(module):
         if source_type == "objectStorageTuple":
             isd = ImageSourceViaObjectStorageTupleDetails()
             isd.source_type = source_type
-            isd.namespace_name = image_source_details["namespace"]
-            isd.bucket_name = image_source_details["bucket"]
-            isd.object_name = image_source_details["object"]
+            (
+                isd.namespace_name,
+                isd.bucket_name,
+                isd.object_name,
+            ) = _get_object_storage_tuple(image_source_details)
         elif source_type == "objectStorageUri":
             isd = ImageSourceViaObjectStorageUriDetails()
             isd.source_type = source_type
@@ -258,6 +389,303 @@ def _get_create_image_details(module):
     return cid
 
 
+def upload_image_file(object_storage_client, module, src, image_source_details):
+    """
+    Stage a local image file in the Object Storage object from which the image is imported, using a parallel
+    multipart upload. The file is not uploaded if the object already exists.
+    """
+    if _object_exists(
+        object_storage_client,
+        image_source_details.namespace_name,
+        image_source_details.bucket_name,
+        image_source_details.object_name,
+    ):
+        debug(
+            "Object {0} already exists, skipping the upload of {1}".format(
+                image_source_details.object_name, src
+            )
+        )
+        return
+
+    upload_manager_kwargs = dict(allow_parallel_uploads=True)
+    if module.params.get("max_thread_count"):
+        upload_manager_kwargs["parallel_process_count"] = module.params[
+            "max_thread_count"
+        ]
+    upload_manager = UploadManager(object_storage_client, **upload_manager_kwargs)
+    try:
+        oci_utils.call_with_backoff(
+            upload_manager.upload_file,
+            namespace_name=image_source_details.namespace_name,
+            bucket_name=image_source_details.bucket_name,
+            object_name=image_source_details.object_name,
+            file_path=src,
+        )
+    except ServiceError as ex:
+        module.fail_json(msg=ex.message)
+
+
+def _object_exists(object_storage_client, namespace_name, bucket_name, object_name):
+    try:
+        oci_utils.call_with_backoff(
+            object_storage_client.head_object,
+            namespace_name=namespace_name,
+            bucket_name=bucket_name,
+            object_name=object_name,
+        )
+        return True
+    except ServiceError as ex:
+        if ex.status == 404:
+            return False
+        raise
+
+
+def _get_object_storage_tuple(details):
+    # The documented suboptions are namespace_name, bucket_name and object_name, but their aliases namespace, bucket
+    # and object have always been accepted too
+    return tuple(
+        details.get(name + "_name", details.get(name))
+        for name in ["namespace", "bucket", "object"]
+    )
+
+
+def _get_export_image_details(image_export_details):
+    # The image can be exported to a tuple(namespace,bucket,object) or a URI
+    if image_export_details["destination_type"] == "objectStorageUri":
+        eid = ExportImageViaObjectStorageUriDetails()
+        eid.destination_uri = image_export_details["destination_uri"]
+    else:
+        eid = ExportImageViaObjectStorageTupleDetails()
+        (
+            eid.namespace_name,
+            eid.bucket_name,
+            eid.object_name,
+        ) = _get_object_storage_tuple(image_export_details)
+    eid.destination_type = image_export_details["destination_type"]
+    return eid
+
+
+def _wait_for_images(compute_client, module, compartment_id, image_ids):
+    """
+    Wait for a set of images in a compartment to be AVAILABLE, listing the images of the compartment once in each poll
+    round. Fail the module if an image does not become AVAILABLE within I(wait_timeout) seconds.
+    :return: A dictionary of image OCID to the last seen state of the image (as a dict)
+    """
+    images, timed_out_ids = oci_utils.wait_for_resources_lifecycle_state(
+        module,
+        compute_client.list_images,
+        [dict(compartment_id=compartment_id)],
+        image_ids,
+        ["AVAILABLE"],
+    )
+    if timed_out_ids:
+        module.fail_json(
+            msg="Timed out waiting for images {0} to be AVAILABLE.".format(
+                ", ".join(timed_out_ids)
+            )
+        )
+    return images
+
+
+def export_image(compute_client, object_storage_client, module):
+    result = dict(changed=False)
+    image_id = module.params["image_id"]
+    image_export_details = module.params["image_export_details"]
+    if not image_export_details:
+        module.fail_json(msg="image_export_details is required with state=exported.")
+
+    eid = _get_export_image_details(image_export_details)
+    try:
+        if eid.destination_type == "objectStorageTuple" and _object_exists(
+            object_storage_client, eid.namespace_name, eid.bucket_name, eid.object_name
+        ):
+            debug("Image " + image_id + " is already exported to " + eid.object_name)
+            result["image"] = to_dict(
+                _get_image_from_id(compute_client, image_id, module).data
+            )
+            return result
+
+        image = oci_utils.call_with_backoff(
+            compute_client.export_image, image_id=image_id, export_image_details=eid
+        ).data
+        result["changed"] = True
+        result["image"] = to_dict(image)
+        if module.params.get("wait", True):
+            result["image"] = _wait_for_images(
+                compute_client, module, image.compartment_id, [image_id]
+            )[image_id]
+    except ServiceError as ex:
+        module.fail_json(msg=ex.message)
+
+    return result
+
+
+def copy_image_to_regions(compute_client, module):
+    """
+    Copy the image I(image_id) to each of the I(destination_regions). The image is exported once to
+    I(staging_bucket), and the copy of the exported image to each destination region and its import there are
+    pipelined, with the destination regions processed in parallel.
+    """
+    result = dict(changed=False)
+    image_id = module.params["image_id"]
+    staging_bucket = module.params["staging_bucket"]
+    if not staging_bucket:
+        module.fail_json(msg="staging_bucket is required with destination_regions.")
+
+    object_storage_client = oci_utils.create_service_client(module, ObjectStorageClient)
+    try:
+        image = _get_image_from_id(compute_client, image_id, module).data
+        namespace = oci_utils.call_with_backoff(
+            object_storage_client.get_namespace
+        ).data
+        compartment_id = (
+            module.params["destination_compartment_id"] or image.compartment_id
+        )
+        object_name = image_id + ".oci"
+
+        # Stage the exported image in the current region once, for all the destination regions
+        if not _object_exists(
+            object_storage_client, namespace, staging_bucket, object_name
+        ):
+            eid = ExportImageViaObjectStorageTupleDetails()
+            eid.destination_type = "objectStorageTuple"
+            eid.namespace_name = namespace
+            eid.bucket_name = staging_bucket
+            eid.object_name = object_name
+            oci_utils.call_with_backoff(
+                compute_client.export_image, image_id=image_id, export_image_details=eid
+            )
+            _wait_for_images(compute_client, module, image.compartment_id, [image_id])
+    except ServiceError as ex:
+        module.fail_json(msg=ex.message)
+
+    def copy_image_to_region(region):
+        try:
+            return _copy_image_to_region(
+                module,
+                object_storage_client,
+                image,
+                region,
+                compartment_id,
+                namespace,
+                staging_bucket,
+                object_name,
+            )
+        except ServiceError as ex:
+            return dict(region=region, changed=False, error=ex.message)
+        except MaximumWaitTimeExceeded as ex:
+            return dict(region=region, changed=True, error=str(ex))
+
+    image_copies = oci_utils.execute_tasks(
+        copy_image_to_region, module.params["destination_regions"], module
+    )
+
+    result["changed"] = any(image_copy["changed"] for image_copy in image_copies)
+    result["image"] = to_dict(image)
+    result["image_copies"] = image_copies
+    failed_copies = [image_copy for image_copy in image_copies if "error" in image_copy]
+    if failed_copies:
+        module.fail_json(
+            msg="Failed to copy image {0} to {1} of {2} regions".format(
+                image_id, len(failed_copies), len(image_copies)
+            ),
+            **result
+        )
+    return result
+
+
+def _copy_image_to_region(
+    module,
+    object_storage_client,
+    image,
+    region,
+    compartment_id,
+    namespace,
+    staging_bucket,
+    object_name,
+):
+    region_compute_client = oci_utils.create_service_client(
+        module, ComputeClient, region=region
+    )
+    existing_images = [
+        existing_image
+        for existing_image in oci_utils.list_all_resources(
+            region_compute_client.list_images,
+            compartment_id=compartment_id,
+            display_name=image.display_name,
+        )
+        if existing_image.lifecycle_state in ["PROVISIONING", "IMPORTING", "AVAILABLE"]
+        and (existing_image.freeform_tags or {}).get(SOURCE_IMAGE_ID_TAG) == image.id
+    ]
+    if existing_images:
+        debug("Image {0} is already copied to {1}".format(image.id, region))
+        return dict(region=region, image=to_dict(existing_images[0]), changed=False)
+
+    # Copy the staged image to the staging bucket of the destination region
+    cod = CopyObjectDetails()
+    cod.source_object_name = object_name
+    cod.destination_region = region
+    cod.destination_namespace = namespace
+    cod.destination_bucket = staging_bucket
+    cod.destination_object_name = object_name
+    response = oci_utils.call_with_backoff(
+        object_storage_client.copy_object,
+        namespace_name=namespace,
+        bucket_name=staging_bucket,
+        copy_object_details=cod,
+    )
+    work_request_id = response.headers["opc-work-request-id"]
+    work_requests, timed_out_ids = oci_utils.wait_for_work_requests(
+        object_storage_client, module, [work_request_id], adapter="ObjectStorageClient"
+    )
+    if timed_out_ids:
+        raise MaximumWaitTimeExceeded(
+            "Timed out waiting for the copy of the exported image to {0}".format(region)
+        )
+    work_request = work_requests[work_request_id]
+    if work_request["status"] != "COMPLETED":
+        return dict(
+            region=region,
+            changed=False,
+            error="Copy of the exported image to {0} {1}: {2}".format(
+                region,
+                work_request["status"],
+                oci_utils.get_work_request_error_message(work_request),
+            ),
+        )
+
+    # Import the copied image in the destination region
+    isd = ImageSourceViaObjectStorageTupleDetails()
+    isd.source_type = "objectStorageTuple"
+    isd.namespace_name = namespace
+    isd.bucket_name = staging_bucket
+    isd.object_name = object_name
+    cid = CreateImageDetails()
+    cid.compartment_id = compartment_id
+    cid.display_name = image.display_name
+    cid.image_source_details = isd
+    oci_utils.add_tags_to_model_from_module(cid, module)
+    cid.freeform_tags = dict(cid.freeform_tags or {})
+    cid.freeform_tags[SOURCE_IMAGE_ID_TAG] = image.id
+    region_image = oci_utils.call_with_backoff(
+        region_compute_client.create_image, create_image_details=cid
+    ).data
+
+    result = dict(region=region, image=to_dict(region_image), changed=True)
+    if module.params.get("wait", True):
+        images, timed_out_ids = oci_utils.wait_for_resources_lifecycle_state(
+            module,
+            region_compute_client.list_images,
+            [dict(compartment_id=compartment_id)],
+            [region_image.id],
+            ["AVAILABLE"],
+        )
+        result["image"] = images.get(region_image.id, result["image"])
+        if timed_out_ids:
+            result["error"] = "Timed out waiting for the image to be AVAILABLE"
+    return result
+
+
 def debug(s):
     get_logger().debug(s)
 
@@ -285,11 +713,33 @@ def main():
             image_id=dict(type="str", required=False, aliases=["id"]),
             instance_id=dict(type="str", required=False),
             image_source_details=dict(type="dict", required=False),
+            image_export_details=dict(
+                type="dict",
+                required=False,
+                options=dict(
+                    destination_type=dict(
+                        type="str",
+                        required=True,
+                        choices=["objectStorageTuple", "objectStorageUri"],
+                    ),
+                    destination_uri=dict(type="str", required=False),
+                    bucket_name=dict(type="str", required=False, aliases=["bucket"]),
+                    namespace_name=dict(
+                        type="str", required=False, aliases=["namespace"]
+                    ),
+                    object_name=dict(type="str", required=False, aliases=["object"]),
+                ),
+            ),
+            destination_regions=dict(type="list", required=False),
+            staging_bucket=dict(type="str", required=False),
+            destination_compartment_id=dict(type="str", required=False),
+            enable_parallel_requests=dict(type="bool", required=False, default=True),
+            max_thread_count=dict(type="int", required=False),
             state=dict(
                 type="str",
                 required=False,
                 default="present",
-                choices=["present", "absent"],
+                choices=["present", "absent", "exported"],
             ),
         )
     )
@@ -298,7 +748,10 @@ def main():
         argument_spec=module_args,
         supports_check_mode=False,
         mutually_exclusive=["instance_id", "image_source_details"],
-        required_if=[("state", "absent", ["image_id"])],
+        required_if=[
+            ("state", "absent", ["image_id"]),
+            ("state", "exported", ["image_id"]),
+        ],
     )
 
     if not HAS_OCI_PY_SDK:
@@ -322,6 +775,13 @@ def main():
                 result = delete_image(compute_client, id, module)
             else:
                 debug("Image " + id + " already deleted.")
+        elif state == "exported":
+            object_storage_client = oci_utils.create_service_client(
+                module, ObjectStorageClient
+            )
+            result = export_image(compute_client, object_storage_client, module)
+        elif module.params["destination_regions"]:
+            result = copy_image_to_regions(compute_client, module)
         elif state == "present":
             display_name = module.params["name"]
             current_image = image_resp.data
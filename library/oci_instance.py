@@ -32,6 +32,26 @@ options:
         description: The Availability Domain of the instance. Required when creating a compute instance with
                      I(state=present).
         required: false
+    batch_size:
+        description: When performing a power action on the instances specified by I(instance_ids) or I(instance_tag),
+                     the number of instances to perform the power action on in each rolling batch. The power actions
+                     on the instances of a batch are issued in parallel as per I(enable_parallel_requests) and
+                     I(max_thread_count). With I(wait=yes), the next batch is released only after all the instances
+                     of the current batch reach the desired lifecycle state. If a power action fails on an instance of a
+                     batch, the remaining batches are not released. By default, all the instances are processed in a
+                     single batch.
+        required: false
+        type: int
+    cache_dir:
+        description: The directory in which the catalog of shapes and images used by I(validate_launch) is cached.
+        required: false
+        default: The system temporary directory
+    cache_max_age:
+        description: The number of seconds for which the cached catalog of shapes and images used by
+                     I(validate_launch) is considered valid.
+        required: false
+        default: 3600
+        type: int
     boot_volume_details:
         description: Details for attaching/detaching a boot volume to/from an instance. I(boot_volume_details) is
                      mutually exclusive with I(image_id). This option is only supported in experimental mode. To use
@@ -111,6 +131,20 @@ options:
                      or reset) on an instance, and for terminating an instance I(state=absent).
         required: false
         aliases: [ 'id' ]
+    instance_ids:
+        description: A list of OCIDs of compute instances to perform a power action on, as specified by I(state). Only
+                     supported with I(state=running), I(state=stopped), I(state=reset) and I(state=softreset).
+                     I(instance_ids) is mutually exclusive with I(instance_id) and I(instance_tag).
+        required: false
+        type: list
+    instance_tag:
+        description: Select all the instances in the compartment I(compartment_id) (and in the availability domain
+                     I(availability_domain), if specified) that have all the specified defined tags, and perform a
+                     power action on them, as specified by I(state). Specified in the same format as I(count_tag).
+                     Only supported with I(state=running), I(state=stopped), I(state=reset) and I(state=softreset).
+                     I(instance_tag) is mutually exclusive with I(instance_id) and I(instance_ids).
+        required: false
+        type: dict
     ipxe_script:
         description: custom iPXE script that will run when the instance boots.
         required: false
@@ -120,14 +154,16 @@ options:
         default: False
         type: bool
     enable_parallel_requests:
-        description: Whether to scale up and down I(exact_count) instances in parallel. By default, I(exact_count)
-                     instances are launched or terminated in parallel.
+        description: Whether to scale up and down I(exact_count) instances in parallel, and whether to perform power
+                     actions on the instances of a batch specified through I(instance_ids) or I(instance_tag) in
+                     parallel. By default, I(exact_count) instances are launched or terminated in parallel.
         required: False
         default: True
         type: bool
     max_thread_count:
         description: When I(enable_parallel_requests=True), indicates the number of maximum parallel operations that are
-                     used to launch or terminate I(exact_count) instances. The default number of threads used is the
+                     used to launch or terminate I(exact_count) instances, or to perform power actions on the instances
+                     specified through I(instance_ids) or I(instance_tag). The default number of threads used is the
                      number of cores in your machine.
         required: False
         type: int
@@ -165,6 +201,18 @@ options:
         required: false
         default: "present"
         choices: ['present', 'absent', 'running', 'reset', 'softreset', 'stopped']
+    validate_launch:
+        description: Whether to validate the I(shape) and the image of a new instance before launching it. When
+                     I(validate_launch=yes), the launch fails early without submitting the launch request if the
+                     I(shape) is not available in the I(availability_domain), if the image is not in AVAILABLE state,
+                     or if the I(shape) is not compatible with the image. The shapes and images are looked up from a
+                     catalog of the shapes of the I(availability_domain) and the images of the I(compartment_id),
+                     which is cached in I(cache_dir) for I(cache_max_age) seconds and is shared by all the instances
+                     launched with I(exact_count). Note that capacity that is exhausted at the time of the launch is
+                     still only reported by the launch request.
+        required: false
+        default: false
+        type: bool
     volume_details:
         description: Details for attaching or detaching a volume to an instance with I(state=present) or
                      I(state=RUNNING). This option is only supported in experimental mode. To use an experimental
@@ -189,6 +237,40 @@ options:
             volume_id:
                 description: The OCID of the volume to be attached to or detached from the instance I(instance_id).
                 required: false
+    volumes:
+        description: The complete list of volumes to attach to or detach from an instance with I(state=present) or
+                     I(state=RUNNING). The volume attachments of the instance are listed once and all the required
+                     attach and detach requests are issued in parallel as per I(enable_parallel_requests) and
+                     I(max_thread_count). With I(wait=yes), all the volume attachments are waited on together.
+                     Mutually exclusive with I(volume_details). This option is only supported in experimental mode.
+                     To use an experimental feature, set the environment variable OCI_ANSIBLE_EXPERIMENTAL to True.
+        required: false
+        type: list
+        suboptions:
+            attachment_state:
+                description: Attach the volume to the instance with I(attachment_state=present). Detach the volume
+                             from the instance with I(attachment_state=absent).
+                required: false
+                default: present
+                choices: ['present', 'absent']
+            attachment_name:
+                description: A user-friendly name for the volume attachment. Does not have to be unique, and it
+                             cannot be changed. Avoid entering confidential information.
+                required: false
+            type:
+                description: The type of volume attachment. The only supported value is "iscsi".
+                required: false
+                default: iscsi
+                choices: ['iscsi']
+            volume_id:
+                description: The OCID of the volume.
+                required: true
+    purge_volume_attachments:
+        description: Whether to detach the volumes that are attached to the instance but are not specified in
+                     I(volumes). Only applicable with I(volumes).
+        required: false
+        default: false
+        type: bool
     vnic:
         description: Details for the primary VNIC that is automatically created and attached when the instance is
                      launched. Required when creating a compute instance with I(state=present).
@@ -252,6 +334,28 @@ EXAMPLES = """
         private_ip: "10.0.0.5"
         subnet_id: "ocid1.subnet.oc1.phx.xxxxxEXAMPLExxxxx...5iddusmpqpaoa"
 
+- name: Launch/create an instance after validating the shape and image against a cached catalog of shapes and images
+  oci_instance:
+     name: myinstance3
+     availability_domain: "BnQb:PHX-AD-1"
+     compartment_id: "ocid1.compartment.oc1..xxxxxEXAMPLExxxxx...vm62xq"
+     image_id: "ocid1.image.oc1.phx.xxxxxEXAMPLExxxxx...sa7klnoa"
+     shape: "VM.Standard2.1"
+     validate_launch: yes
+     cache_max_age: 7200
+     vnic:
+        subnet_id: "ocid1.subnet.oc1.phx.xxxxxEXAMPLExxxxx...5iddusmpqpaoa"
+
+- name: Ensure that an instance has exactly these two volumes attached, attaching and detaching volumes in parallel
+  oci_instance:
+     id: "ocid1.instance.oc1.phx.xxxxxEXAMPLExxxxx...lxiggdq"
+     volumes:
+        - volume_id: "ocid1.volume.oc1.phx.xxxxxEXAMPLExxxxx...kdqm5s24"
+          attachment_name: data-volume-1
+        - volume_id: "ocid1.volume.oc1.phx.xxxxxEXAMPLExxxxx...u4enkwa"
+          attachment_name: data-volume-2
+     purge_volume_attachments: yes
+
 - name: Launch/create an instance using a boot volume, a private IP assignment and attach a volume, and a specific
         fault domain
   oci_instance:
@@ -303,6 +407,22 @@ EXAMPLES = """
      boot_volume_details:
         boot_volume_id: ocid1.bootvolume.oc1.iad.xxxxxEXAMPLExxxxx
 
+- name: Perform a rolling soft-reset of a set of instances, 10 instances at a time
+  oci_instance:
+     instance_ids:
+        - "ocid1.instance.oc1.phx.xxxxxEXAMPLExxxxx...lxiggdq"
+        - "ocid1.instance.oc1.phx.xxxxxEXAMPLExxxxx...kdsoeiw"
+     state: "softreset"
+     batch_size: 10
+
+- name: Stop all the instances with the defined tag namespace "TagNamespace1", tag key "Application" and value "App1"
+  oci_instance:
+     compartment_id: "ocid1.compartment.oc1..xxxxxEXAMPLExxxxx...vm62xq"
+     instance_tag:
+        TagNamespace1: { Application: App1 }
+     state: "stopped"
+     max_thread_count: 20
+
 - name: Reset an instance
   oci_instance:
      id: "ocid1.instance.oc1.phx.xxxxxEXAMPLExxxxx...lxiggdq"
@@ -1166,6 +1286,80 @@ terminated_instances:
                     returned: always
                     type: string
                     sample: ocid1.volume.oc1.phx.xxxxxEXAMPLExxxxx
+power_action_results:
+    description: Outcome of the power action on each of the instances specified through I(instance_ids) or selected
+                 through I(instance_tag), in the same order as the returned I(instances).
+    returned: When a power action is performed using I(instance_ids) or I(instance_tag)
+    type: complex
+    contains:
+        id:
+            description: The OCID of the instance.
+            returned: always
+            type: string
+            sample: ocid1.instance.oc1.phx.xxxxxEXAMPLExxxxx
+        display_name:
+            description: The user-friendly name of the instance.
+            returned: always
+            type: string
+            sample: my-web-server-0
+        action:
+            description: The power action performed on the instance. Not set if no power action was required.
+            returned: always
+            type: string
+            sample: STOP
+        changed:
+            description: Whether the power action was performed on the instance.
+            returned: always
+            type: bool
+            sample: true
+        lifecycle_state:
+            description: The last known lifecycle state of the instance.
+            returned: always
+            type: string
+            sample: STOPPED
+        error:
+            description: The error message, if the power action failed or the instance did not reach the desired
+                         lifecycle state within I(wait_timeout) seconds.
+            returned: On failure of the power action on the instance
+            type: string
+            sample: Timed out waiting for lifecycle_state to reach STOPPED
+    sample: [{"id": "ocid1.instance.oc1.phx.xxxxxEXAMPLExxxxx", "display_name": "my-web-server-0",
+              "action": "STOP", "changed": true, "lifecycle_state": "STOPPED"}]
+volume_attachment_results:
+    description: Outcome of each volume attach and detach performed to reconcile the volume attachments of the
+                 instance with I(volumes).
+    returned: When volumes are attached or detached using I(volumes)
+    type: complex
+    contains:
+        action:
+            description: Whether the volume was attached or detached.
+            returned: always
+            type: string
+            sample: ATTACH
+        volume_id:
+            description: The OCID of the volume.
+            returned: always
+            type: string
+            sample: ocid1.volume.oc1.phx.xxxxxEXAMPLExxxxx
+        volume_attachment:
+            description: The last known state of the volume attachment. Not set if the attach request failed.
+            returned: always
+            type: dict
+            sample: {"id": "ocid1.volumeattachment.oc1.phx.xxxxxEXAMPLExxxxx", "lifecycle_state": "ATTACHED"}
+        changed:
+            description: Whether the attach or detach request was issued.
+            returned: always
+            type: bool
+            sample: true
+        error:
+            description: The error message, if the attach or detach request failed or the volume attachment did not
+                         reach the desired lifecycle state within I(wait_timeout) seconds.
+            returned: On failure of the attach or detach of the volume
+            type: string
+            sample: Timed out waiting for ATTACHED state
+    sample: [{"action": "ATTACH", "volume_id": "ocid1.volume.oc1.phx.xxxxxEXAMPLExxxxx", "changed": true,
+              "volume_attachment": {"id": "ocid1.volumeattachment.oc1.phx.xxxxxEXAMPLExxxxx",
+                                    "lifecycle_state": "ATTACHED"}}]
 """
 
 from ansible.module_utils.basic import AnsibleModule
@@ -1173,7 +1367,6 @@ from ansible.module_utils.oracle import oci_utils, oci_compute_utils
 from ansible.module_utils.oracle.oci_utils import check_mode
 
 from ansible.module_utils import six
-from multiprocessing.dummy import Pool as ThreadPool
 
 try:
     import oci
@@ -1313,34 +1506,20 @@ def power_action_on_instance(compute_client, id, desired_state, module):
     result = {}
     changed = False
     # The power action to execute on a compute instance to reach the desired 'state'
-    state_action_map = {
-        "stopped": "STOP",
-        "running": "START",
-        "reset": "RESET",
-        "softreset": "SOFTRESET",
-    }
+    state_action_map = oci_compute_utils.POWER_ACTIONS
     # The desired lifecycle state for the compute instance to reach the user specified 'state'
-    desired_lifecycle_states = {
-        "stopped": "STOPPED",
-        "running": "RUNNING",
-        "reset": "RUNNING",
-        "softreset": "RUNNING",
-    }
+    desired_lifecycle_states = oci_compute_utils.POWER_ACTION_LIFECYCLE_STATES
     try:
         response = oci_utils.call_with_backoff(
             compute_client.get_instance, instance_id=id
         )
         curr_state = response.data.lifecycle_state
 
-        change_required = False
-
-        # We need to perform a power action if the current state doesn't match the desired state
-        if curr_state != desired_lifecycle_states[desired_state]:
-            change_required = True
-
-        # Resets also require a change
-        if desired_state in ["softreset", "reset"]:
-            change_required = True
+        # We need to perform a power action if the current state doesn't match the desired state. Resets always
+        # require a change.
+        change_required = oci_compute_utils.is_power_action_required(
+            curr_state, desired_state
+        )
 
         if change_required:
             changed = True
@@ -1389,11 +1568,85 @@ def power_action_on_instance(compute_client, id, desired_state, module):
     return result
 
 
+def power_action_on_instances(compute_client, desired_state, module):
+    """
+    Perform a power action on all the instances specified through I(instance_ids) or selected through
+    I(instance_tag), in rolling batches of I(batch_size) instances.
+    """
+    result = dict(changed=False)
+    try:
+        instances = _get_instances_for_power_action(compute_client, module)
+        debug(
+            "Performing power action {0} on {1} instances".format(
+                desired_state, len(instances)
+            )
+        )
+        instances, outcomes = oci_compute_utils.perform_power_action_in_batches(
+            module,
+            instances,
+            desired_state,
+            power_action_fn=lambda instance_id, action: oci_utils.call_with_backoff(
+                compute_client.instance_action, instance_id=instance_id, action=action
+            ),
+            list_fn=compute_client.list_instances,
+        )
+    except ServiceError as ex:
+        module.fail_json(msg=ex.message)
+
+    result["changed"] = any(outcome["changed"] for outcome in outcomes)
+    result["instances"] = instances
+    result["power_action_results"] = outcomes
+    failed_outcomes = [outcome for outcome in outcomes if "error" in outcome]
+    if failed_outcomes:
+        module.fail_json(
+            msg="Power action failed on {0} of {1} instances".format(
+                len(failed_outcomes), len(outcomes)
+            ),
+            **result
+        )
+    return result
+
+
+def _get_instances_for_power_action(compute_client, module):
+    instance_ids = module.params["instance_ids"]
+    if instance_ids:
+        # Get all the instances in parallel, preserving the order specified by the user
+        return oci_utils.execute_tasks(
+            lambda instance_id: oci_utils.call_with_backoff(
+                compute_client.get_instance, instance_id=instance_id
+            ).data,
+            instance_ids,
+            module,
+        )
+
+    param_map = {
+        "compartment_id": module.params["compartment_id"],
+        "sort_by": "TIMECREATED",
+        "sort_order": "ASC",
+    }
+    if module.params["availability_domain"] is not None:
+        param_map["availability_domain"] = module.params["availability_domain"]
+    curr_instances = oci_utils.list_all_resources(
+        compute_client.list_instances, **param_map
+    )
+    return [
+        inst
+        for inst in curr_instances
+        if inst.lifecycle_state not in oci_utils.DEAD_STATES
+        and oci_utils.is_resource_tagged_with(inst, module.params["instance_tag"])
+    ]
+
+
 def launch_instance(compute_client, module, display_name_override=None):
     lid = get_launch_instance_details(module, display_name_override)
     cvd = get_vnic_details(module)
     lid.create_vnic_details = cvd
 
+    if module.params.get("validate_launch"):
+        # Fail early if the shape or the image can't be used to launch the instance, instead of waiting for the
+        # launch request to fail
+        oci_compute_utils.validate_launch_instance_details(compute_client, module, lid)
+
     debug("Provisioning " + str(lid))
     result = oci_utils.create_and_wait(
         resource_type=RESOURCE_NAME,
@@ -1593,12 +1846,75 @@ def combine_result(result, attachment_result, boot_volume_attachment_result):
             boot_volume_attachment_result.get("changed", False),
         ]
     )
+    if "volume_attachment_results" in attachment_result:
+        combined_result["volume_attachment_results"] = attachment_result[
+            "volume_attachment_results"
+        ]
     return combined_result
 
 
+def handle_volumes(compute_client, module, instance_id=None):
+    result = dict(changed=False)
+    if instance_id is None:
+        instance_id = module.params["instance_id"]
+
+    try:
+        instance = to_dict(
+            oci_utils.call_with_backoff(
+                compute_client.get_instance, instance_id=instance_id
+            ).data
+        )
+        # Compute all the attachment changes from a single listing of the volume attachments of the instance
+        volume_attachments = oci_compute_utils.get_volume_attachments(
+            compute_client, instance
+        )
+    except ServiceError as ex:
+        module.fail_json(msg=ex.message)
+
+    volumes_to_attach, attachments_to_detach = oci_compute_utils.get_volume_attachment_changes(
+        volume_attachments,
+        module.params["volumes"],
+        module.params["purge_volume_attachments"],
+    )
+    if not volumes_to_attach and not attachments_to_detach:
+        return result
+
+    attach_volume_details_list = [
+        get_attach_volume_details(
+            instance_id=instance_id,
+            volume_id=volume["volume_id"],
+            type=volume.get("type") or "iscsi",
+            attachment_name=volume.get("attachment_name"),
+        )
+        for volume in volumes_to_attach
+    ]
+    outcomes = oci_compute_utils.reconcile_volume_attachments(
+        compute_client,
+        module,
+        instance,
+        attach_volume_details_list,
+        attachments_to_detach,
+    )
+    result["changed"] = any(outcome["changed"] for outcome in outcomes)
+    result["volume_attachment_results"] = outcomes
+
+    failed_outcomes = [outcome for outcome in outcomes if "error" in outcome]
+    if failed_outcomes:
+        module.fail_json(
+            msg="Failed to attach or detach {0} of {1} volumes".format(
+                len(failed_outcomes), len(outcomes)
+            ),
+            **result
+        )
+    return result
+
+
 @check_mode
 def handle_volume_details(compute_client, module, instance_id=None):
     attachment_result = dict(changed=False)
+    if module.params.get("volumes") is not None:
+        return handle_volumes(compute_client, module, instance_id)
+
     volume_details = module.params["volume_details"]
     if volume_details:
         if "attachment_state" in volume_details:
@@ -1827,9 +2143,11 @@ def _get_default_source_details(module):
     return None
 
 
-def _get_default_image_id(module):
+def _get_default_image_id(compute_client, module):
     """
-    Return the image_id if the image_id was specified through "source_details", or None
+    Return the image_id if the image_id was specified through "source_details", or None. With I(validate_launch=yes),
+    the image is looked up from the in-memory index of the compute catalog, so that an unknown image fails before
+    the existing instances are matched, and the launch validation reuses the same lookup.
     """
     if (
         "source_details" in module.params
@@ -1838,7 +2156,21 @@ def _get_default_image_id(module):
         source_details = module.params["source_details"]
         source_type = source_details["source_type"]
         if source_type == "image":
-            return source_details["image_id"]
+            image_id = source_details["image_id"]
+            if image_id and module.params.get("validate_launch"):
+                try:
+                    catalog = oci_compute_utils.get_compute_catalog(
+                        compute_client,
+                        module,
+                        module.params["compartment_id"],
+                        module.params["availability_domain"],
+                    )
+                    oci_compute_utils.get_catalog_image(
+                        compute_client, catalog, image_id
+                    )
+                except ServiceError as ex:
+                    module.fail_json(msg=ex.message)
+            return image_id
     return None
 
 
@@ -1889,7 +2221,7 @@ def create_one_instance(compute_client, module, display_name_override=None):
             # current user request, consider it as
             # a match.
             "source_details": _get_default_source_details(module),
-            "image_id": _get_default_image_id(module),
+            "image_id": _get_default_image_id(compute_client, module),
         },
     )
     # Handle volume details when an instance is launched
@@ -2015,26 +2347,7 @@ def ensure_exact_count(compute_client, exact_count, count_tag, fault_domain, mod
 
 # Execute a set of launch/terminate tasks either in a parallel or sequential fashion as requested by the user
 def _execute_tasks(task_method, list_of_params, module):
-    if module.params["enable_parallel_requests"]:
-
-        # construct a ThreadPool
-        pool = ThreadPool(module.params["max_thread_count"])
-        # run task_method in parallel, collecting results
-        results = pool.map(task_method, list_of_params)
-        pool.close()
-
-        # wait for all instance creation requests to complete
-        pool.join()
-
-        # terminate the pool
-        pool.terminate()
-    else:
-        # perform task_method in a sequential manner
-        results = []
-        for inst_idx in range(len(list_of_params)):
-            results.append(task_method(list_of_params[inst_idx]))
-
-    return results
+    return oci_utils.execute_tasks(task_method, list_of_params, module)
 
 
 # Pool.starmap accepts a sequence of argument tuples but only since 3.3, and therefore can't be employed by us. So,
@@ -2090,16 +2403,7 @@ def _get_matching_instances(
 
 
 def _does_instance_match_tag(instance, count_tag):
-    for namespace in count_tag:
-        if namespace in instance.defined_tags:
-            tnspace = instance.defined_tags[namespace]
-            if not all(tnspace[k] == v for k, v in count_tag[namespace].items()):
-                return False
-        else:
-            # A namespace specified in "count_tag" is not in instance's defined_tags
-            return False
-    # all count_tag tags present in instance's defined_tags
-    return True
+    return oci_utils.is_resource_tagged_with(instance, count_tag)
 
 
 def _does_instance_match_fault_domain(inst, fault_domain):
@@ -2138,6 +2442,7 @@ def main():
     module_args.update(
         dict(
             availability_domain=dict(type="str", required=False),
+            batch_size=dict(type="int", required=False),
             boot_volume_details=dict(type="dict", required=False),
             compartment_id=dict(type="str", required=False),
             count_tag=dict(type="dict", required=False),
@@ -2145,6 +2450,8 @@ def main():
             extended_metadata=dict(type="dict", required=False),
             fault_domain=dict(type="str", required=False),
             instance_id=dict(type="str", required=False, aliases=["id"]),
+            instance_ids=dict(type="list", required=False),
+            instance_tag=dict(type="dict", required=False),
             image_id=dict(type="str", required=False),
             ipxe_script=dict(type="str", required=False),
             max_thread_count=dict(type="int", required=False),
@@ -2167,10 +2474,31 @@ def main():
                 ],
             ),
             volume_details=dict(type="dict", required=False),
+            volumes=dict(
+                type="list",
+                required=False,
+                elements="dict",
+                options=dict(
+                    attachment_state=dict(
+                        type="str",
+                        required=False,
+                        default="present",
+                        choices=["present", "absent"],
+                    ),
+                    attachment_name=dict(type="str", required=False),
+                    type=dict(
+                        type="str", required=False, default="iscsi", choices=["iscsi"]
+                    ),
+                    volume_id=dict(type="str", required=True),
+                ),
+            ),
+            purge_volume_attachments=dict(type="bool", required=False, default=False),
             source_details=dict(type="dict", required=False),
+            validate_launch=dict(type="bool", required=False, default=False),
             vnic=dict(type="dict", aliases=["create_vnic_details"]),
         )
     )
+    module_args.update(oci_utils.get_cache_arg_spec())
 
     module = AnsibleModule(
         argument_spec=module_args,
@@ -2182,6 +2510,9 @@ def main():
             ["source_details", "image_id"],
             ["exact_count", "volume_details"],
             ["exact_count", "boot_volume_details"],
+            ["exact_count", "volumes"],
+            ["volume_details", "volumes"],
+            ["instance_id", "instance_ids", "instance_tag"],
         ],
         required_together=[["exact_count", "count_tag"]],
     )
@@ -2198,7 +2529,21 @@ def main():
 
     id = module.params["instance_id"]
     try:
-        if id is not None:
+        if module.params["instance_ids"] or module.params["instance_tag"]:
+            if state not in oci_compute_utils.POWER_ACTIONS:
+                module.fail_json(
+                    msg="instance_ids and instance_tag are only supported with power actions. state must be "
+                    "one of: {0}".format(
+                        ", ".join(sorted(oci_compute_utils.POWER_ACTIONS))
+                    )
+                )
+            if module.params["instance_tag"] and not module.params["compartment_id"]:
+                module.fail_json(
+                    msg="compartment_id is required to select instances using instance_tag."
+                )
+            result = power_action_on_instances(compute_client, state, module)
+            module.exit_json(**result)
+        elif id is not None:
             inst = None
 
             # Attempt to get the instance
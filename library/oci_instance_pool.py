@@ -61,10 +61,57 @@ options:
     size:
         description: The number of instances that should be in the instance pool. Required to create an instance pool.
         required: false
+    size_increment:
+        description: When changing the I(size) of an existing instance pool, the maximum number of instances to add to
+                     or remove from the instance pool in each scaling step. Each step waits for the instance pool to
+                     finish scaling and for all of its instances to be RUNNING before the next step, and the time
+                     taken by each step is returned in I(scaling_steps). With I(wait=no), the last step only waits
+                     for the instance pool to finish scaling. All the steps must complete within I(wait_timeout)
+                     seconds. By default, the size is changed in a single step.
+        required: false
+        type: int
+    count_of_instances_to_wait:
+        description: With I(wait=yes), the number of instances of the instance pool to wait for to be RUNNING after the
+                     instance pool is created or its I(size) is changed. By default, only the lifecycle state of the
+                     instance pool is waited on, except with I(size_increment) where all the instances are waited on.
+        required: false
+        type: int
     instance_pool_id:
         description: The OCID of the instance pool. Required for updating and terminating the instance pool
         required: false
         aliases: ['id']
+    instance_pool_ids:
+        description: A list of OCIDs of instance pools to perform a power action on, as specified by I(state). Only
+                     supported with I(state=running), I(state=stopped), I(state=reset) and I(state=softreset).
+        required: false
+        type: list
+    instance_pool_tag:
+        description: Select all the instance pools in the compartment I(compartment_id) that have all the specified
+                     defined tags, and perform a power action on them, as specified by I(state). The defined tags
+                     are specified as a dictionary of tag namespaces to key/value pairs. Only supported with I(state=running),
+                     I(state=stopped), I(state=reset) and I(state=softreset).
+        required: false
+        type: dict
+    batch_size:
+        description: When performing a power action on the instance pools specified by I(instance_pool_ids) or
+                     I(instance_pool_tag), the number of instance pools to perform the power action on in each rolling
+                     batch. With I(wait=yes), the next batch is released only after all the instance pools of the
+                     current batch reach the desired lifecycle state. If a power action fails on an instance pool of a
+                     batch, the remaining batches are not released. By default, all the instance pools are processed
+                     in a single batch.
+        required: false
+        type: int
+    enable_parallel_requests:
+        description: Whether to perform the power actions on the instance pools of a batch in parallel.
+        required: false
+        default: True
+        type: bool
+    max_thread_count:
+        description: When I(enable_parallel_requests=True), indicates the number of maximum parallel operations that are
+                     used to perform power actions on instance pools. The default number of threads used is the number
+                     of cores in your machine.
+        required: false
+        type: int
     state:
         description: Create or update an instance pool with I(state=present). Use I(state=absent) to delete an
                      instance pool. When I(state=stopped), stop (power off) action is performed on the specified
@@ -105,6 +152,23 @@ EXAMPLES = """
     id: ocid1.instancepool.oc1.phx.xxxxxEXAMPLExxxxx...rz3fhq
     state: running
 
+- name: Perform a rolling reset of a set of instance pools, two instance pools at a time
+  oci_instance_pool:
+    instance_pool_ids:
+        - ocid1.instancepool.oc1.phx.xxxxxEXAMPLExxxxx...rz3fhq
+        - ocid1.instancepool.oc1.phx.xxxxxEXAMPLExxxxx...kd8d3q
+        - ocid1.instancepool.oc1.phx.xxxxxEXAMPLExxxxx...qpw9ea
+    state: reset
+    batch_size: 2
+
+- name: Stop all the instance pools with the defined tag namespace "TagNamespace1", tag key "Environment" and
+        value "staging"
+  oci_instance_pool:
+    compartment_id: "ocid1.compartment.oc1..xxxxxEXAMPLExxxxx...vm62xq"
+    instance_pool_tag:
+        TagNamespace1: { Environment: staging }
+    state: stopped
+
 - name: Reset an instance pool
   oci_instance_pool:
     id: ocid1.instancepool.oc1.phx.xxxxxEXAMPLExxxxx...rz3fhq
@@ -115,6 +179,13 @@ EXAMPLES = """
     id: ocid1.instancepool.oc1.phx.xxxxxEXAMPLExxxxx...rz3fhq
     state: softreset
 
+- name: Scale an instance pool to 50 instances, 10 instances at a time, and wait for 45 of the instances to be RUNNING
+  oci_instance_pool:
+    id: ocid1.instancepool.oc1.phx.xxxxxEXAMPLExxxxx...rz3fhq
+    size: 50
+    size_increment: 10
+    count_of_instances_to_wait: 45
+
 - name: Update an instance pool's display name
   oci_instance_pool:
     id: ocid1.instancepool.oc1.phx.xxxxxEXAMPLExxxxx...rz3fhq
@@ -222,10 +293,41 @@ instance_pool:
                 "size": 1,
                 "time-created": "2018-11-09T16:58:35.270000+00:00"
         }
+instance_pools:
+    description: Information about the Instance Pools specified through I(instance_pool_ids) or selected through
+                 I(instance_pool_tag)
+    returned: When a power action is performed using I(instance_pool_ids) or I(instance_pool_tag)
+    type: list
+    sample: Same as the instance_pool sample
+power_action_results:
+    description: Outcome of the power action on each of the instance pools specified through I(instance_pool_ids) or
+                 selected through I(instance_pool_tag), in the same order as the returned I(instance_pools). Each
+                 outcome contains the C(id), C(display_name), the C(action) performed (if any), whether the instance
+                 pool was C(changed), its last known C(lifecycle_state) and an C(error) message if the power action
+                 failed or timed out.
+    returned: When a power action is performed using I(instance_pool_ids) or I(instance_pool_tag)
+    type: list
+    sample: [{"id": "ocid1.instancepool.oc1.phx.xxxxxEXAMPLExxxxx...rz3fhq", "display_name": "backend-servers-pool",
+              "action": "RESET", "changed": true, "lifecycle_state": "RUNNING"}]
+scaling_steps:
+    description: The steps taken to change the size of the instance pool with I(size_increment). Each step contains the
+                 C(size) of the instance pool after the step, the number of C(running_instances) at the end of the step
+                 and the C(elapsed_seconds) taken by the step.
+    returned: When the size of the instance pool is changed with I(size_increment)
+    type: list
+    sample: [{"size": 15, "running_instances": 15, "elapsed_seconds": 142.3},
+             {"size": 20, "running_instances": 20, "elapsed_seconds": 131.8}]
+running_instances:
+    description: The number of RUNNING instances in the instance pool.
+    returned: When the instances of the instance pool are waited on with I(count_of_instances_to_wait)
+    type: int
+    sample: 5
 """
 
+import time
+
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.oracle import oci_utils
+from ansible.module_utils.oracle import oci_utils, oci_compute_utils
 
 try:
     from oci.core.compute_management_client import ComputeManagementClient
@@ -307,6 +409,112 @@ def update_instance_pool(compute_management_client, module):
     )
 
 
+def scale_instance_pool(compute_management_client, module):
+    """
+    Change the size of the instance pool I(instance_pool_id) to I(size) in steps of at most I(size_increment)
+    instances. Each step waits for the instance pool to be done scaling and for all of its instances to be RUNNING,
+    except the last step, which waits for I(count_of_instances_to_wait) RUNNING instances if I(wait=yes). Even with
+    I(wait=no), the last step waits for the instance pool to be done scaling, as the instance pool can't be updated
+    while it is SCALING. All the steps share a single timeout of I(wait_timeout) seconds.
+    :return: The list of the scaling steps taken, with the size, RUNNING instances and elapsed time of each step
+    """
+    instance_pool_id = module.params["instance_pool_id"]
+    target_size = module.params["size"]
+    size_increment = module.params["size_increment"]
+    deadline = time.time() + module.params.get(
+        "wait_timeout", oci_utils.MAX_WAIT_TIMEOUT_IN_SECONDS
+    )
+    scaling_steps = []
+    try:
+        current_size = oci_utils.call_with_backoff(
+            compute_management_client.get_instance_pool,
+            instance_pool_id=instance_pool_id,
+        ).data.size
+        while current_size != target_size:
+            step = min(size_increment, abs(target_size - current_size))
+            if target_size < current_size:
+                step = -step
+            next_size = current_size + step
+            start_time = time.time()
+            oci_utils.call_with_backoff(
+                compute_management_client.update_instance_pool,
+                instance_pool_id=instance_pool_id,
+                update_instance_pool_details=UpdateInstancePoolDetails(size=next_size),
+            )
+            count_of_instances_to_wait = next_size
+            if next_size == target_size:
+                count_of_instances_to_wait = 0
+                if module.params.get("wait", True):
+                    count_of_instances_to_wait = _get_count_of_instances_to_wait(
+                        module, next_size
+                    )
+            instance_pool, running_count, timed_out = oci_compute_utils.wait_for_instance_pool_instances(
+                compute_management_client,
+                module,
+                instance_pool_id,
+                next_size,
+                count_of_instances_to_wait,
+                deadline=deadline,
+            )
+            scaling_step = dict(size=next_size, running_instances=running_count)
+            if timed_out:
+                scaling_steps.append(scaling_step)
+                module.fail_json(
+                    msg="Timed out waiting for instance pool {0} to scale to {1} instances.".format(
+                        instance_pool_id, next_size
+                    ),
+                    changed=True,
+                    instance_pool=instance_pool,
+                    scaling_steps=scaling_steps,
+                )
+            scaling_step["elapsed_seconds"] = round(time.time() - start_time, 1)
+            debug(
+                "Scaled instance pool {0} to {size} instances ({running_instances} RUNNING) in "
+                "{elapsed_seconds} seconds".format(instance_pool_id, **scaling_step)
+            )
+            scaling_steps.append(scaling_step)
+            current_size = next_size
+    except ServiceError as ex:
+        module.fail_json(msg=ex.message)
+
+    return scaling_steps
+
+
+def _get_count_of_instances_to_wait(module, size):
+    # An instance pool can't have more RUNNING instances than its size
+    if module.params["count_of_instances_to_wait"] is not None:
+        return min(module.params["count_of_instances_to_wait"], size)
+    return size
+
+
+def wait_for_running_instances(compute_management_client, module, result):
+    """
+    Wait for I(count_of_instances_to_wait) instances of a created or updated instance pool to be RUNNING.
+    """
+    instance_pool = result["instance_pool"]
+    try:
+        instance_pool, running_count, timed_out = oci_compute_utils.wait_for_instance_pool_instances(
+            compute_management_client,
+            module,
+            instance_pool["id"],
+            instance_pool["size"],
+            _get_count_of_instances_to_wait(module, instance_pool["size"]),
+        )
+    except ServiceError as ex:
+        module.fail_json(msg=ex.message)
+
+    result["instance_pool"] = instance_pool
+    result["running_instances"] = running_count
+    if timed_out:
+        module.fail_json(
+            msg="Timed out waiting for {0} instances of instance pool {1} to be RUNNING.".format(
+                module.params["count_of_instances_to_wait"], instance_pool["id"]
+            ),
+            **result
+        )
+    return result
+
+
 def set_logger(my_logger):
     global logger
     logger = my_logger
@@ -324,19 +532,9 @@ def power_action_on_instance_pool(compute_management_client, module):
     result = {}
     changed = False
     # The power action to execute on a compute instance pool to reach the desired 'state'
-    state_action_map = {
-        "stopped": "STOP",
-        "running": "START",
-        "reset": "RESET",
-        "softreset": "SOFTRESET",
-    }
+    state_action_map = oci_compute_utils.POWER_ACTIONS
     # The desired lifecycle state for the compute instance pool to reach the user specified 'state'
-    desired_lifecycle_states = {
-        "stopped": "STOPPED",
-        "running": "RUNNING",
-        "reset": "RUNNING",
-        "softreset": "RUNNING",
-    }
+    desired_lifecycle_states = oci_compute_utils.POWER_ACTION_LIFECYCLE_STATES
 
     desired_state = module.params["state"]
     instance_pool_id = module.params["id"]
@@ -347,15 +545,11 @@ def power_action_on_instance_pool(compute_management_client, module):
         )
         curr_state = response.data.lifecycle_state
 
-        change_required = False
-
-        # We need to perform a power action if the current state doesn't match the desired state
-        if curr_state != desired_lifecycle_states[desired_state]:
-            change_required = True
-
-        # Resets also require a change
-        if desired_state in ["softreset", "reset"]:
-            change_required = True
+        # We need to perform a power action if the current state doesn't match the desired state. Resets always
+        # require a change.
+        change_required = oci_compute_utils.is_power_action_required(
+            curr_state, desired_state
+        )
 
         if change_required:
             changed = True
@@ -409,6 +603,81 @@ def power_action_on_instance_pool(compute_management_client, module):
     return result
 
 
+def _perform_instance_pool_power_action(
+    compute_management_client, instance_pool_id, action
+):
+    instance_action_method = getattr(
+        compute_management_client, action.lower() + "_instance_pool"
+    )
+    return oci_utils.call_with_backoff(
+        instance_action_method, instance_pool_id=instance_pool_id
+    )
+
+
+def power_action_on_instance_pools(compute_management_client, module):
+    """
+    Perform a power action on all the instance pools specified through I(instance_pool_ids) or selected through
+    I(instance_pool_tag), in rolling batches of I(batch_size) instance pools.
+    """
+    result = dict(changed=False)
+    desired_state = module.params["state"]
+    try:
+        instance_pools = _get_instance_pools_for_power_action(
+            compute_management_client, module
+        )
+        instance_pools, outcomes = oci_compute_utils.perform_power_action_in_batches(
+            module,
+            instance_pools,
+            desired_state,
+            power_action_fn=lambda pool_id, action: _perform_instance_pool_power_action(
+                compute_management_client, pool_id, action
+            ),
+            list_fn=compute_management_client.list_instance_pools,
+        )
+    except ServiceError as ex:
+        module.fail_json(msg=ex.message)
+
+    result["changed"] = any(outcome["changed"] for outcome in outcomes)
+    result["instance_pools"] = instance_pools
+    result["power_action_results"] = outcomes
+    failed_outcomes = [outcome for outcome in outcomes if "error" in outcome]
+    if failed_outcomes:
+        module.fail_json(
+            msg="Power action failed on {0} of {1} instance pools".format(
+                len(failed_outcomes), len(outcomes)
+            ),
+            **result
+        )
+    return result
+
+
+def _get_instance_pools_for_power_action(compute_management_client, module):
+    instance_pool_ids = module.params["instance_pool_ids"]
+    if instance_pool_ids:
+        # Get all the instance pools in parallel, preserving the order specified by the user
+        return oci_utils.execute_tasks(
+            lambda instance_pool_id: oci_utils.call_with_backoff(
+                compute_management_client.get_instance_pool,
+                instance_pool_id=instance_pool_id,
+            ).data,
+            instance_pool_ids,
+            module,
+        )
+
+    instance_pools = oci_utils.list_all_resources(
+        compute_management_client.list_instance_pools,
+        compartment_id=module.params["compartment_id"],
+    )
+    return [
+        instance_pool
+        for instance_pool in instance_pools
+        if instance_pool.lifecycle_state not in oci_utils.DEAD_STATES
+        and oci_utils.is_resource_tagged_with(
+            instance_pool, module.params["instance_pool_tag"]
+        )
+    ]
+
+
 def main():
     my_logger = oci_utils.get_logger(RESOURCE_NAME)
     set_logger(my_logger)
@@ -423,7 +692,14 @@ def main():
             instance_configuration_id=dict(type="str", required=False),
             placement_configurations=dict(type="list", required=False),
             instance_pool_id=dict(type="str", required=False, aliases=["id"]),
+            instance_pool_ids=dict(type="list", required=False),
+            instance_pool_tag=dict(type="dict", required=False),
+            batch_size=dict(type="int", required=False),
+            enable_parallel_requests=dict(type="bool", required=False, default=True),
+            max_thread_count=dict(type="int", required=False),
             size=dict(type="int", required=False),
+            size_increment=dict(type="int", required=False),
+            count_of_instances_to_wait=dict(type="int", required=False),
             state=dict(
                 type="str",
                 required=False,
@@ -443,7 +719,10 @@ def main():
     module = AnsibleModule(
         argument_spec=module_args,
         supports_check_mode=False,
-        mutually_exclusive=["instance_pool_id", "compartment_id"],
+        mutually_exclusive=[
+            ["instance_pool_id", "compartment_id"],
+            ["instance_pool_id", "instance_pool_ids", "instance_pool_tag"],
+        ],
         required_if=[("state", "absent", ["instance_pool_id"])],
     )
 
@@ -456,6 +735,18 @@ def main():
 
     state = module.params["state"]
 
+    size_increment = module.params["size_increment"]
+    if size_increment is not None and size_increment < 1:
+        module.fail_json(msg="size_increment must be greater than 0.")
+
+    if (
+        module.params["instance_pool_ids"] or module.params["instance_pool_tag"]
+    ) and state not in oci_compute_utils.POWER_ACTIONS:
+        module.fail_json(
+            msg="instance_pool_ids and instance_pool_tag are only supported with power actions. state must be one "
+            "of: {0}".format(", ".join(sorted(oci_compute_utils.POWER_ACTIONS)))
+        )
+
     if state == "absent":
         result = delete_instance_pool(compute_management_client, module)
 
@@ -479,7 +770,30 @@ def main():
                 supports_sort_by_time_created=False,
             )
         else:
+            scaling_steps = []
+            if module.params["size_increment"] and module.params["size"] is not None:
+                scaling_steps = scale_instance_pool(compute_management_client, module)
             result = update_instance_pool(compute_management_client, module)
+            if scaling_steps:
+                result["changed"] = True
+                result["scaling_steps"] = scaling_steps
+
+        if (
+            result["changed"]
+            and module.params.get("wait", True)
+            and module.params["count_of_instances_to_wait"] is not None
+            and "scaling_steps" not in result
+        ):
+            result = wait_for_running_instances(
+                compute_management_client, module, result
+            )
+    elif module.params["instance_pool_ids"] or module.params["instance_pool_tag"]:
+        if module.params["instance_pool_tag"] and not module.params["compartment_id"]:
+            module.fail_json(
+                msg="compartment_id is required to select instance pools using instance_pool_tag."
+            )
+        # one of the power actions, on a set of instance pools
+        result = power_action_on_instance_pools(compute_management_client, module)
     else:
         # one of the power actions
         result = power_action_on_instance_pool(compute_management_client, module)
@@ -21,12 +21,48 @@ module: oci_ip_sec_connection_device_status_facts
 short_description: Retrieve status of the specified IPSec connection
 description:
     - This module retrieves status of the specified IPSec connection (whether it's up or down).
+    - With I(monitoring_duration), the status of the tunnels of one or more IPSec connections is sampled every
+      I(monitoring_interval) seconds for I(monitoring_duration) seconds, the IPSec connections being sampled in
+      parallel with one request per IPSec connection and interval. The up/down transitions of each tunnel and the time
+      spent in each state are reported.
 version_added: "2.5"
 options:
     ipsc_id:
-        description: The OCID of the IPSec connection.
-        required: true
+        description: The OCID of the IPSec connection. Required if I(ipsc_ids) is not specified.
+        required: false
         aliases: [ 'id' ]
+    ipsc_ids:
+        description: The OCIDs of IPSec connections to retrieve the status of. Mutually exclusive with I(ipsc_id).
+        required: false
+        type: list
+    monitoring_duration:
+        description: The number of seconds to monitor the tunnels of the IPSec connections for. If not specified, the
+                     status of the IPSec connections is retrieved once.
+        required: false
+        type: int
+    monitoring_interval:
+        description: The number of seconds between two samples of the status of the IPSec connections, when
+                     I(monitoring_duration) is specified.
+        required: false
+        default: 30
+        type: int
+    max_samples:
+        description: The number of the most recent samples kept and returned for each tunnel, when
+                     I(monitoring_duration) is specified. The transitions and the time spent in each state account for
+                     all the samples.
+        required: false
+        default: 20
+        type: int
+    enable_parallel_requests:
+        description: Whether to retrieve the status of the IPSec connections in parallel.
+        required: false
+        default: True
+        type: bool
+    max_thread_count:
+        description: When I(enable_parallel_requests=True), indicates the number of maximum parallel operations. The
+                     default number of threads used is the number of cores in your machine.
+        required: false
+        type: int
 author: "Rohit Chaware (@rohitChaware)"
 extends_documentation_fragment: [ oracle ]
 """
@@ -35,6 +71,14 @@ EXAMPLES = """
 - name: Get status of IPSec connection
   oci_ip_sec_connection_device_status_facts:
     ipsc_id: ocid1.ipsecconnection.oc1.phx.xxxxxEXAMPLExxxxx
+
+- name: Monitor the tunnels of IPSec connections for 10 minutes, sampling every minute
+  oci_ip_sec_connection_device_status_facts:
+    ipsc_ids:
+      - ocid1.ipsecconnection.oc1.phx.xxxxxEXAMPLExxxxx
+      - ocid1.ipsecconnection.oc1.phx.yyyyyEXAMPLEyyyyy
+    monitoring_duration: 600
+    monitoring_interval: 60
 """
 
 RETURN = """
@@ -76,8 +120,76 @@ ip_sec_connection_device_status:
                          "time_state_modified": "2018-09-13T20:22:40.626000+00:00"}
                        ]
             }
+ip_sec_connection_device_statuses:
+    description: The last retrieved status of each IPSec connection of I(ipsc_ids), in the same order. See
+                 I(ip_sec_connection_device_status) for the attributes of a status.
+    returned: When I(ipsc_ids) is specified
+    type: list
+ip_sec_tunnels_monitoring:
+    description: The monitoring results of each tunnel of the IPSec connections
+    returned: When I(monitoring_duration) is specified
+    type: complex
+    contains:
+        ipsc_id:
+            description: The OCID of the IPSec connection of the tunnel.
+            returned: always
+            type: string
+            sample: ocid1.ipsecconnection.oc1.phx.xxxxxEXAMPLExxxxx
+        ip_address:
+            description: The IP address of Oracle's VPN headend of the tunnel.
+            returned: always
+            type: string
+            sample: 129.213.7.49
+        lifecycle_state:
+            description: The state of the tunnel in the last sample.
+            returned: always
+            type: string
+            sample: UP
+        sample_count:
+            description: The number of samples of the tunnel.
+            returned: always
+            type: int
+            sample: 11
+        samples:
+            description: The I(max_samples) most recent samples of the tunnel, with the time of the sample and the
+                         state of the tunnel.
+            returned: always
+            type: list
+            sample: [{"time": "2019-02-11T10:00:00.000000", "lifecycle_state": "UP"}]
+        transitions:
+            description: The changes of state of the tunnel, with the time of the sample the new state was first seen
+                         in.
+            returned: always
+            type: list
+            sample: [{"time": "2019-02-11T10:04:00.000000", "from_state": "UP", "to_state": "DOWN"}]
+        time_in_state:
+            description: The number of seconds the tunnel spent in each state, each interval between two samples being
+                         accounted to the state of the first sample.
+            returned: always
+            type: dict
+            sample: {"UP": 480.0, "DOWN": 120.0}
+    sample: [{
+            "ipsc_id": "ocid1.ipsecconnection.oc1.phx.xxxxxEXAMPLExxxxx",
+            "ip_address": "129.213.7.49",
+            "lifecycle_state": "UP",
+            "sample_count": 11,
+            "samples": [{"time": "2019-02-11T10:10:00.000000", "lifecycle_state": "UP"}],
+            "transitions": [{"time": "2019-02-11T10:04:00.000000", "from_state": "UP", "to_state": "DOWN"},
+                            {"time": "2019-02-11T10:06:00.000000", "from_state": "DOWN", "to_state": "UP"}],
+            "time_in_state": {"UP": 480.0, "DOWN": 120.0}
+        }]
+ip_sec_connection_monitoring_errors:
+    description: The errors raised while sampling the status of the IPSec connections, by IPSec connection OCID.
+                 Failed samples are skipped.
+    returned: When I(monitoring_duration) is specified
+    type: dict
+    sample: {"ocid1.ipsecconnection.oc1.phx.xxxxxEXAMPLExxxxx": ["Service unavailable"]}
 """
 
+import time
+from collections import deque
+from datetime import datetime
+
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.oracle import oci_utils
 
@@ -92,11 +204,149 @@ except ImportError:
     HAS_OCI_PY_SDK = False
 
 
+def get_device_statuses(virtual_network_client, module, ipsc_ids):
+    """
+    Get the status of IPSec connections, in parallel.
+    :return: A list of (status, error message) tuples, in the same order as `ipsc_ids`
+    """
+
+    def get_device_status(ipsc_id):
+        # Runs in a worker thread, so errors are returned to the caller instead of failing the module here
+        try:
+            return (
+                oci_utils.call_with_backoff(
+                    virtual_network_client.get_ip_sec_connection_device_status,
+                    ipsc_id=ipsc_id,
+                ).data,
+                None,
+            )
+        except ServiceError as ex:
+            return None, ex.message
+
+    return oci_utils.execute_tasks(get_device_status, ipsc_ids, module)
+
+
+def record_tunnel_samples(tunnels, device_status, sample_time, max_samples):
+    """
+    Record a sample of the tunnels of an IPSec connection in `tunnels`, a dictionary of (IPSec connection OCID, tunnel
+    IP address) to the history of the tunnel. Only the `max_samples` most recent samples of a tunnel are kept, in a
+    ring buffer, while its transitions and the time spent in each state account for all the samples.
+    """
+    for tunnel_status in device_status.tunnels or []:
+        key = (device_status.id, tunnel_status.ip_address)
+        if key not in tunnels:
+            tunnels[key] = dict(
+                samples=deque(maxlen=max_samples),
+                sample_count=0,
+                transitions=[],
+                time_in_state=dict(),
+            )
+        tunnel = tunnels[key]
+        state = tunnel_status.lifecycle_state
+        if tunnel["samples"]:
+            last_time, last_state = tunnel["samples"][-1]
+            tunnel["time_in_state"][last_state] = tunnel["time_in_state"].get(
+                last_state, 0
+            ) + (sample_time - last_time)
+            if state != last_state:
+                tunnel["transitions"].append((sample_time, last_state, state))
+        tunnel["samples"].append((sample_time, state))
+        tunnel["sample_count"] += 1
+
+
+def format_sample_time(sample_time):
+    return datetime.utcfromtimestamp(sample_time).isoformat()
+
+
+def get_tunnels_monitoring(tunnels):
+    tunnels_monitoring = []
+    for (ipsc_id, ip_address), tunnel in sorted(tunnels.items()):
+        tunnels_monitoring.append(
+            dict(
+                ipsc_id=ipsc_id,
+                ip_address=ip_address,
+                lifecycle_state=tunnel["samples"][-1][1],
+                sample_count=tunnel["sample_count"],
+                samples=[
+                    dict(time=format_sample_time(sample_time), lifecycle_state=state)
+                    for sample_time, state in tunnel["samples"]
+                ],
+                transitions=[
+                    dict(
+                        time=format_sample_time(sample_time),
+                        from_state=from_state,
+                        to_state=to_state,
+                    )
+                    for sample_time, from_state, to_state in tunnel["transitions"]
+                ],
+                time_in_state=dict(
+                    (state, round(seconds, 3))
+                    for state, seconds in tunnel["time_in_state"].items()
+                ),
+            )
+        )
+    return tunnels_monitoring
+
+
+def monitor_device_statuses(virtual_network_client, module, ipsc_ids):
+    """
+    Sample the status of the tunnels of IPSec connections every `monitoring_interval` seconds for
+    `monitoring_duration` seconds, with one request per IPSec connection and sample.
+    """
+    interval = module.params["monitoring_interval"]
+    end_time = time.time() + module.params["monitoring_duration"]
+    tunnels = dict()
+    errors = dict()
+    device_statuses = dict()
+    while True:
+        sample_time = time.time()
+        for ipsc_id, (device_status, error) in zip(
+            ipsc_ids, get_device_statuses(virtual_network_client, module, ipsc_ids)
+        ):
+            if error:
+                errors.setdefault(
+                    ipsc_id, deque(maxlen=module.params["max_samples"])
+                ).append(error)
+                continue
+            device_statuses[ipsc_id] = to_dict(device_status)
+            record_tunnel_samples(
+                tunnels, device_status, sample_time, module.params["max_samples"]
+            )
+        if sample_time + interval > end_time:
+            break
+        time.sleep(max(0, sample_time + interval - time.time()))
+
+    return dict(
+        ip_sec_connection_device_statuses=[
+            device_statuses.get(ipsc_id) for ipsc_id in ipsc_ids
+        ],
+        ip_sec_tunnels_monitoring=get_tunnels_monitoring(tunnels),
+        ip_sec_connection_monitoring_errors=dict(
+            (ipsc_id, list(ipsc_errors)) for ipsc_id, ipsc_errors in errors.items()
+        ),
+    )
+
+
 def main():
     module_args = oci_utils.get_common_arg_spec()
-    module_args.update(dict(ipsc_id=dict(type="str", required=True, aliases=["id"])))
+    module_args.update(
+        dict(
+            ipsc_id=dict(type="str", required=False, aliases=["id"]),
+            ipsc_ids=dict(type="list", required=False),
+            monitoring_duration=dict(type="int", required=False),
+            monitoring_interval=dict(type="int", required=False, default=30),
+            max_samples=dict(type="int", required=False, default=20),
+            enable_parallel_requests=dict(type="bool", required=False, default=True),
+            max_thread_count=dict(type="int", required=False),
+        )
+    )
 
-    module = AnsibleModule(argument_spec=module_args, supports_check_mode=False)
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=False,
+        required_one_of=[["ipsc_id", "ipsc_ids"]],
+        mutually_exclusive=[["ipsc_id", "ipsc_ids"]],
+    )
 
     if not HAS_OCI_PY_SDK:
         module.fail_json(msg="oci python sdk required for this module.")
@@ -105,6 +355,38 @@ def main():
         module, VirtualNetworkClient
     )
 
+    if module.params["monitoring_duration"] is not None:
+        if (
+            module.params["monitoring_interval"] <= 0
+            or module.params["max_samples"] <= 0
+        ):
+            module.fail_json(
+                msg="monitoring_interval and max_samples must be positive numbers."
+            )
+        result = monitor_device_statuses(
+            virtual_network_client,
+            module,
+            module.params["ipsc_ids"] or [module.params["ipsc_id"]],
+        )
+        if module.params["ipsc_id"] is not None:
+            result["ip_sec_connection_device_status"] = result.pop(
+                "ip_sec_connection_device_statuses"
+            )[0]
+        module.exit_json(**result)
+
+    if module.params["ipsc_ids"] is not None:
+        device_statuses = []
+        for ipsc_id, (device_status, error) in zip(
+            module.params["ipsc_ids"],
+            get_device_statuses(
+                virtual_network_client, module, module.params["ipsc_ids"]
+            ),
+        ):
+            if error:
+                module.fail_json(msg="{0}: {1}".format(ipsc_id, error))
+            device_statuses.append(to_dict(device_status))
+        module.exit_json(ip_sec_connection_device_statuses=device_statuses)
+
     ip_sec_connection_id = module.params["ipsc_id"]
     try:
         result = to_dict(
@@ -22,6 +22,8 @@ short_description: Create, update and delete load balancers in OCI Load Balancin
 description:
     - Creates OCI Load Balancers
     - Update OCI Load Balancers, if present, with a new display name
+    - Reconcile all the certificates, hostnames, backend sets, path route sets and listeners of OCI Load Balancers,
+      if present, with I(reconcile_sub_resources=yes)
     - Delete OCI Load Balancers, if present.
 version_added: "2.5"
 options:
@@ -195,6 +197,25 @@ options:
     subnet_ids:
         description: An array of subnet OCIDs.
         required: true
+    reconcile_sub_resources:
+        description: When updating the load balancer I(load_balancer_id), also reconcile its certificates, hostnames,
+                     backend sets, path route sets and listeners with I(certificates), I(hostnames), I(backend_sets),
+                     I(path_route_sets) and I(listeners). The load balancer is fetched once and all its sub-resources
+                     are compared with the specified ones, so that a run without changes makes a single request. The
+                     changes are applied in the order of the dependencies between the sub-resources (certificates and
+                     hostnames, then backend sets, then path route sets, then listeners, and the deletions in the
+                     reverse order), and the work requests of the independent changes are waited on together.
+                     Sub-resources of a type whose option is not specified are left as they are, and so are the
+                     attributes of a sub-resource that are not specified. Certificates can not be updated.
+        required: false
+        default: 'no'
+        type: bool
+    purge_sub_resources:
+        description: With I(reconcile_sub_resources=yes), delete the sub-resources of the types whose option is
+                     specified that are not in that option.
+        required: false
+        default: 'no'
+        type: bool
 author:
     - "Debayan Gupta(@debayan_gupta)"
 extends_documentation_fragment: [ oracle, oracle_creatable_resource, oracle_wait_options ]
@@ -253,6 +274,30 @@ EXAMPLES = """
     load_balancer_id: "ocid1.loadbalancer.oc1.iad.xxxxxEXAMPLExxxxx"
     name: "ansible_lb_updated"
     state: 'present'
+# Reconcile all the backend sets and listeners of a Load Balancer
+- name: Reconcile the backend sets and listeners of a Load Balancer
+  oci_load_balancer:
+    load_balancer_id: "ocid1.loadbalancer.oc1.iad.xxxxxEXAMPLExxxxx"
+    name: "ansible_lb"
+    reconcile_sub_resources: yes
+    purge_sub_resources: yes
+    backend_sets:
+     backend1:
+      backends:
+          - ip_address: "10.159.34.21"
+            port: "8080"
+          - ip_address: "10.159.34.22"
+            port: "8080"
+      health_checker:
+          protocol: "HTTP"
+          url_path: "/healthcheck"
+      policy: "LEAST_CONNECTIONS"
+    listeners:
+      listerner1:
+        default_backend_set_name: "backend1"
+        port: "80"
+        protocol: "HTTP"
+    state: 'present'
 # Deleted Load Balancer
 - name: Update Load Balancer
   oci_load_balancer:
@@ -447,6 +492,13 @@ RETURN = """
    ],
    "time_created":"2018-01-06T18:22:17.198000+00:00"
 }
+    sub_resource_changes:
+        description: The changes made to the sub-resources of the Load Balancer, in the order they were applied, with
+                     I(reconcile_sub_resources=yes)
+        returned: When I(reconcile_sub_resources=yes)
+        type: list
+        sample: [{"resource_type": "backend_set", "name": "backend1", "action": "update", "level": 1},
+                 {"resource_type": "listener", "name": "listener2", "action": "delete", "level": 3}]
 """
 
 from ansible.module_utils.basic import AnsibleModule
@@ -454,9 +506,9 @@ from ansible.module_utils.oracle import oci_utils, oci_lb_utils
 from ansible.module_utils import six
 
 try:
-    import copy
     from oci.load_balancer.load_balancer_client import LoadBalancerClient
-    from oci.exceptions import ServiceError, ClientError
+    from oci.exceptions import ServiceError, ClientError, MaximumWaitTimeExceeded
+    from oci.load_balancer import models as oci_lb_models
     from oci.util import to_dict
     from oci.load_balancer.models import (
         CreateLoadBalancerDetails,
@@ -469,6 +521,17 @@ except ImportError:
 
 logger = None
 
+# The sub-resources of a load balancer reconciled with reconcile_sub_resources, as tuples of the module option, the
+# level of the sub-resources in the dependencies between sub-resources, the name of the sub-resource in the SDK and the
+# name of the parameter of the update and delete functions of the SDK identifying a sub-resource
+LB_SUB_RESOURCES = [
+    ("certificates", 0, "certificate", "certificate_name"),
+    ("hostnames", 0, "hostname", "name"),
+    ("backend_sets", 1, "backend_set", "backend_set_name"),
+    ("path_route_sets", 2, "path_route_set", "path_route_set_name"),
+    ("listeners", 3, "listener", "listener_name"),
+]
+
 
 def create_or_update_lb(lb_client, module):
     result = dict(changed=False, load_balancer="")
@@ -503,16 +566,20 @@ def create_or_update_lb(lb_client, module):
                 lb_client.get_load_balancer, module, load_balancer_id=load_balancer_id
             )
             result = update_load_balancer(lb_client, module, existing_load_balancer)
+            if module.params.get("reconcile_sub_resources"):
+                result = reconcile_lb_sub_resources(
+                    lb_client, module, existing_load_balancer, result
+                )
         else:
-            module1 = copy.deepcopy(module)
-            module1.params.update(
+            module_view = oci_utils.get_module_with_params_overlay(
+                module,
                 {
                     "certificates": to_dict(
                         oci_lb_utils.create_certificates(
-                            module1.params.get("certificates")
+                            module.params.get("certificates")
                         )
                     )
-                }
+                },
             )
             result = oci_utils.check_and_create_resource(
                 resource_type="load_balancer",
@@ -520,7 +587,7 @@ def create_or_update_lb(lb_client, module):
                 kwargs_create={"lb_client": lb_client, "module": module},
                 list_fn=lb_client.list_load_balancers,
                 kwargs_list={"compartment_id": module.params.get("compartment_id")},
-                module=module1,
+                module=module_view,
                 exclude_attributes=exclude_attributes,
                 default_attribute_values=default_attribute_values,
                 model=CreateLoadBalancerDetails(),
@@ -533,6 +600,9 @@ def create_or_update_lb(lb_client, module):
     except ClientError as ex:
         get_logger().error("Unable to create/update backend due to: %s", str(ex))
         module.fail_json(msg=str(ex))
+    except MaximumWaitTimeExceeded as ex:
+        get_logger().error("Unable to create/update load balancer due to: %s", str(ex))
+        module.fail_json(msg=str(ex))
 
     return result
 
@@ -629,6 +699,219 @@ def update_load_balancer(lb_client, module, load_balancer):
     return result
 
 
+def get_desired_lb_sub_resources(module):
+    """
+    Get the desired sub-resources of the load balancer, as a dictionary of option to a dictionary of sub-resource name
+    to the details of the sub-resource. Options that are not specified are not in the dictionary.
+    """
+    desired_sub_resources = dict()
+    certificates = oci_lb_utils.create_certificates(module.params["certificates"])
+    if certificates is not None:
+        desired_sub_resources["certificates"] = dict(
+            (certificate.certificate_name, certificate)
+            for certificate in certificates.values()
+        )
+    hostnames = oci_lb_utils.create_hostnames(module.params["hostnames"])
+    if hostnames is not None:
+        desired_sub_resources["hostnames"] = dict(
+            (hostname.name, hostname) for hostname in hostnames.values()
+        )
+    for option, create_fn in [
+        ("backend_sets", oci_lb_utils.create_backend_sets),
+        ("path_route_sets", oci_lb_utils.create_path_route_sets),
+        ("listeners", oci_lb_utils.create_listeners),
+    ]:
+        sub_resources = create_fn(module.params[option])
+        if sub_resources is not None:
+            desired_sub_resources[option] = sub_resources
+    return desired_sub_resources
+
+
+def get_lb_sub_resource_changes(load_balancer, desired_sub_resources, purge):
+    """
+    Compare the sub-resources of a load balancer with the desired ones.
+    :return: A list of changes, each a dictionary with the resource_type, name, action (create, update or delete) and
+     level of a sub-resource
+    """
+    changes = []
+    for option, level, resource_type, name_param in LB_SUB_RESOURCES:
+        if option not in desired_sub_resources:
+            continue
+        existing_sub_resources = getattr(load_balancer, option) or dict()
+        for name, details in sorted(desired_sub_resources[option].items()):
+            if name not in existing_sub_resources:
+                action = "create"
+            elif resource_type == "certificate":
+                # The private key and passphrase of a certificate are not returned by the service
+                if oci_lb_utils.is_same_certificate(
+                    details, existing_sub_resources[name]
+                ):
+                    continue
+                action = "update"
+            elif oci_utils.is_value_matching(
+                to_dict(details), to_dict(existing_sub_resources[name])
+            ):
+                continue
+            else:
+                action = "update"
+            changes.append(
+                dict(resource_type=resource_type, name=name, action=action, level=level)
+            )
+        if purge:
+            for name in sorted(
+                set(existing_sub_resources) - set(desired_sub_resources[option])
+            ):
+                changes.append(
+                    dict(
+                        resource_type=resource_type,
+                        name=name,
+                        action="delete",
+                        level=level,
+                    )
+                )
+    return changes
+
+
+def get_lb_sub_resource_change_phases(changes):
+    """
+    Group the changes of the sub-resources of a load balancer in phases of independent changes. The sub-resources are
+    created and updated by increasing level, and deleted by decreasing level once nothing refers to them anymore.
+    """
+    levels = sorted(set(level for option, level, resource, param in LB_SUB_RESOURCES))
+    phases = []
+    for level in levels:
+        phases.append(
+            [
+                change
+                for change in changes
+                if change["level"] == level and change["action"] != "delete"
+            ]
+        )
+    for level in reversed(levels):
+        phases.append(
+            [
+                change
+                for change in changes
+                if change["level"] == level and change["action"] == "delete"
+            ]
+        )
+    return [phase for phase in phases if phase]
+
+
+def submit_lb_sub_resource_change(
+    lb_client, load_balancer, desired_sub_resources, change
+):
+    """
+    Submit the create, update or delete operation of a change to a sub-resource of a load balancer.
+    :return: The OCID of the work request of the operation
+    """
+    option, level, resource_type, name_param = next(
+        sub_resource
+        for sub_resource in LB_SUB_RESOURCES
+        if sub_resource[2] == change["resource_type"]
+    )
+    class_name = "".join(word.capitalize() for word in resource_type.split("_"))
+    name = change["name"]
+    kwargs_function = dict(load_balancer_id=load_balancer.id)
+    if change["action"] == "delete":
+        kwargs_function[name_param] = name
+    else:
+        desired_details = desired_sub_resources[option][name]
+        details_class = getattr(
+            oci_lb_models, change["action"].capitalize() + class_name + "Details"
+        )
+        details = details_class()
+        existing_details = None
+        if change["action"] == "update":
+            kwargs_function[name_param] = name
+            existing_details = oci_lb_utils.get_details_from_resource(
+                details_class.__name__, getattr(load_balancer, option)[name]
+            )
+        for attribute in details.attribute_map:
+            if attribute == "name":
+                value = name
+            else:
+                value = getattr(desired_details, attribute, None)
+            # The attributes that are not specified keep their current value
+            if value is None and existing_details is not None:
+                value = getattr(existing_details, attribute)
+            details.__setattr__(attribute, value)
+        kwargs_function["{0}_{1}_details".format(change["action"], resource_type)] = (
+            details
+        )
+    response = oci_utils.call_with_backoff(
+        getattr(lb_client, "{0}_{1}".format(change["action"], resource_type)),
+        **kwargs_function
+    )
+    return response.headers.get("opc-work-request-id")
+
+
+def reconcile_lb_sub_resources(lb_client, module, load_balancer, result):
+    """
+    Reconcile the certificates, hostnames, backend sets, path route sets and listeners of a load balancer with the
+    specified ones. The sub-resources are compared with the existing load balancer, so that nothing else is requested
+    when they are all up to date, and the changes of each phase are submitted together and waited on with a single
+    work request poller.
+    """
+    desired_sub_resources = get_desired_lb_sub_resources(module)
+    changes = get_lb_sub_resource_changes(
+        load_balancer, desired_sub_resources, module.params.get("purge_sub_resources")
+    )
+    result["sub_resource_changes"] = []
+    for change in changes:
+        if change["resource_type"] == "certificate" and change["action"] == "update":
+            module.fail_json(
+                msg="Certificate {0} of the load balancer differs from the specified certificate. Certificates can "
+                "not be updated.".format(change["name"]),
+                **result
+            )
+    if not changes:
+        return result
+
+    for phase in get_lb_sub_resource_change_phases(changes):
+        work_request_ids = []
+        for change in phase:
+            get_logger().info(
+                "Submitting the %s of %s %s in load balancer %s",
+                change["action"],
+                change["resource_type"],
+                change["name"],
+                load_balancer.id,
+            )
+            work_request_ids.append(
+                submit_lb_sub_resource_change(
+                    lb_client, load_balancer, desired_sub_resources, change
+                )
+            )
+            result["changed"] = True
+            result["sub_resource_changes"].append(change)
+        work_requests = oci_lb_utils.wait_for_work_requests(
+            lb_client, module, load_balancer.id, work_request_ids
+        )
+        failed_work_requests = [
+            work_request
+            for work_request in work_requests.values()
+            if work_request["lifecycle_state"] == "FAILED"
+        ]
+        if failed_work_requests:
+            module.fail_json(
+                msg="Failed to reconcile the sub-resources of the load balancer: {0}".format(
+                    "; ".join(
+                        str(work_request["error_details"])
+                        for work_request in failed_work_requests
+                    )
+                ),
+                **result
+            )
+
+    result["load_balancer"] = to_dict(
+        oci_utils.call_with_backoff(
+            lb_client.get_load_balancer, load_balancer_id=load_balancer.id
+        ).data
+    )
+    return result
+
+
 def delete_load_balancer(lb_client, module):
     lb_id = module.params.get("load_balancer_id")
     get_logger().info("Deleting load balancer %s", lb_id)
@@ -683,6 +966,8 @@ def main():
                 choices=["present", "absent"],
             ),
             is_private=dict(type="bool", required=False, default=False),
+            reconcile_sub_resources=dict(type="bool", required=False, default=False),
+            purge_sub_resources=dict(type="bool", required=False, default=False),
         )
     )
 
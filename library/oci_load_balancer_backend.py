@@ -24,6 +24,8 @@ description:
     - Add a Backend server to OCI Load Balancer
     - Update a Backend server in a Load Balancer, if present, with any changed attribute
     - Delete a Backend server from OCI Load Balancer Backends, if present.
+    - Drain, undrain, take offline or bring online a list of Backend servers of a backend set in rolling batches,
+      with I(backends).
 version_added: "2.5"
 options:
     load_balancer_id:
@@ -34,11 +36,11 @@ options:
         description: The name of the backend set to add the backend server to.
         required: true
     ip_address:
-        description: The IP address of the backend server.
-        required: true
+        description: The IP address of the backend server. Required if I(backends) is not specified.
+        required: false
     port:
-        description: The communication port for the backend server.
-        required: true
+        description: The communication port for the backend server. Required if I(backends) is not specified.
+        required: false
     backup:
         description: Whether the load balancer should treat this server as a backup unit. If true, the load balancer
                      forwards no ingress traffic to this backend server unless all other backend servers not marked as
@@ -70,6 +72,27 @@ options:
                      traffic. For example, a server weighted 3 receives 3 times the number
                      of new connections as a server weighted 1.
         required: false
+    backends:
+        description: A list of backend servers of the backend set, each a dict with the I(ip_address) and I(port) of a
+                     backend server, whose I(drain) and I(offline) states are changed in rolling batches of
+                     I(batch_size) backend servers. The backend servers of a batch are updated together with one update
+                     of the backend set. Before the next batch is released, the backend servers that still receive
+                     traffic after the update must all be healthy, and when backend servers are drained or taken
+                     offline, I(drain_wait_seconds) seconds are given to their connections to complete. Only
+                     applicable with I(state=present). Mutually exclusive with I(ip_address) and I(port).
+        required: false
+        type: list
+    batch_size:
+        description: The number of backend servers of I(backends) to update in each batch.
+        required: false
+        default: 1
+        type: int
+    drain_wait_seconds:
+        description: The number of seconds to wait after draining or taking offline a batch of backend servers of
+                     I(backends), for the connections to these backend servers to complete.
+        required: false
+        default: 30
+        type: int
 author:
     - "Debayan Gupta(@debayan_gupta)"
 extends_documentation_fragment: [oracle, oracle_wait_options]
@@ -125,6 +148,24 @@ EXAMPLES = """
     port: 8080
     backup: True
     state: 'present'
+# Drain backend servers two at a time
+- name: Drain backend servers in rolling batches
+  oci_load_balancer_backend:
+    load_balancer_id: "ocid1.loadbalancer.oc1.iad.xxxxxEXAMPLExxxxx"
+    backend_set_name: "backend1"
+    backends:
+      - ip_address: "10.50.121.69"
+        port: 8080
+      - ip_address: "10.50.121.70"
+        port: 8080
+      - ip_address: "10.50.121.71"
+        port: 8080
+      - ip_address: "10.50.121.72"
+        port: 8080
+    batch_size: 2
+    drain: True
+    drain_wait_seconds: 60
+    state: 'present'
 # Delete Load Balancer Backend
 - name: Update Load Balancer Backend
   oci_load_balancer_backend:
@@ -186,14 +227,33 @@ RETURN = """
                     "port":8181,
                     "weight":3
                 }
+    backend_set:
+        description: Attributes of the backend set, after the backend servers of I(backends) were updated.
+        returned: When I(backends) is specified
+        type: dict
+        sample: {
+                    "name": "backend1",
+                    "policy": "ROUND_ROBIN",
+                    "backends": [{"name": "10.159.34.21:8181", "ip_address": "10.159.34.21", "port": 8181,
+                                  "backup": false, "drain": true, "offline": false, "weight": 1}]
+                }
+    rolling_batches:
+        description: The batches of backend servers of I(backends) that were updated, with the number of seconds taken
+                     by the update of the backend set and by the wait for the backend servers to settle.
+        returned: When I(backends) is specified
+        type: list
+        sample: [{"backends": ["10.159.34.21:8181", "10.159.34.22:8181"], "update_seconds": 21.3,
+                  "settle_seconds": 64.2}]
 """
+import time
+
 from ansible.module_utils.basic import AnsibleModule
 
 from ansible.module_utils.oracle import oci_utils, oci_lb_utils
 
 try:
     from oci.load_balancer.load_balancer_client import LoadBalancerClient
-    from oci.exceptions import ServiceError, ClientError
+    from oci.exceptions import ServiceError, ClientError, MaximumWaitTimeExceeded
     from oci.util import to_dict
     from oci.load_balancer.models import UpdateBackendDetails, CreateBackendDetails
 
@@ -387,6 +447,147 @@ def delete_backend(lb_client, module):
     return result
 
 
+def wait_for_serving_backends_health(
+    lb_client, module, lb_id, backend_set_name, details
+):
+    """
+    Wait until all the backend servers of a backend set that receive traffic, i.e. that are neither drained nor
+    offline, are healthy.
+    """
+    serving_backend_names = set(
+        "{0}:{1}".format(backend.ip_address, backend.port)
+        for backend in details.backends or []
+        if not backend.drain and not backend.offline
+    )
+    max_wait_seconds = module.params.get(
+        "wait_timeout", oci_utils.MAX_WAIT_TIMEOUT_IN_SECONDS
+    )
+    start_time = time.time()
+    poll_interval = 1
+    while True:
+        backend_set_health = oci_utils.call_with_backoff(
+            lb_client.get_backend_set_health,
+            load_balancer_id=lb_id,
+            backend_set_name=backend_set_name,
+        ).data
+        unhealthy_backend_names = serving_backend_names.intersection(
+            (backend_set_health.warning_state_backend_names or [])
+            + (backend_set_health.critical_state_backend_names or [])
+            + (backend_set_health.unknown_state_backend_names or [])
+        )
+        if not unhealthy_backend_names:
+            return
+        elapsed_seconds = time.time() - start_time
+        if elapsed_seconds >= max_wait_seconds:
+            raise MaximumWaitTimeExceeded(
+                "Timed out waiting for backends {0} to be healthy".format(
+                    ", ".join(sorted(unhealthy_backend_names))
+                )
+            )
+        time.sleep(min(poll_interval, max_wait_seconds - elapsed_seconds))
+        poll_interval = min(poll_interval * 2, oci_utils.MAX_POLL_INTERVAL_IN_SECONDS)
+
+
+def roll_backends(lb_client, module):
+    """
+    Change the drain and offline states of a list of backend servers of a backend set in rolling batches. The backend
+    set is fetched once, each batch is applied with a single update of the backend set, and the next batch is only
+    released once the backend servers still receiving traffic are healthy.
+    """
+    lb_id = module.params.get("load_balancer_id")
+    backend_set_name = module.params.get("backend_set_name")
+    attributes = dict(
+        (attribute, module.params.get(attribute))
+        for attribute in ["drain", "offline"]
+        if module.params.get(attribute) is not None
+    )
+    result = dict(changed=False, rolling_batches=[])
+    try:
+        backend_set = oci_utils.call_with_backoff(
+            lb_client.get_backend_set,
+            load_balancer_id=lb_id,
+            backend_set_name=backend_set_name,
+        ).data
+        details = oci_lb_utils.get_details_from_resource(
+            "UpdateBackendSetDetails", backend_set
+        )
+        backends_by_name = dict(
+            ("{0}:{1}".format(backend.ip_address, backend.port), backend)
+            for backend in details.backends or []
+        )
+        backend_names = []
+        for backend in module.params["backends"]:
+            backend_name = "{0}:{1}".format(backend["ip_address"], backend["port"])
+            if backend_name not in backends_by_name:
+                module.fail_json(
+                    msg="Backend {0} is not in backend set {1}".format(
+                        backend_name, backend_set_name
+                    )
+                )
+            if backend_name not in backend_names and any(
+                getattr(backends_by_name[backend_name], attribute) != value
+                for attribute, value in attributes.items()
+            ):
+                backend_names.append(backend_name)
+        result["backend_set"] = to_dict(backend_set)
+
+        for batch in oci_utils.get_batches(backend_names, module.params["batch_size"]):
+            get_logger().info(
+                "Updating backends %s of backendset %s in load balancer %s with %s",
+                batch,
+                backend_set_name,
+                lb_id,
+                attributes,
+            )
+            start_time = time.time()
+            for backend_name in batch:
+                for attribute, value in attributes.items():
+                    backends_by_name[backend_name].__setattr__(attribute, value)
+            response = oci_utils.call_with_backoff(
+                lb_client.update_backend_set,
+                update_backend_set_details=details,
+                load_balancer_id=lb_id,
+                backend_set_name=backend_set_name,
+            )
+            result["changed"] = True
+            work_request_id = response.headers.get("opc-work-request-id")
+            work_request = oci_lb_utils.wait_for_work_requests(
+                lb_client, module, lb_id, [work_request_id]
+            )[work_request_id]
+            if work_request["lifecycle_state"] == "FAILED":
+                module.fail_json(msg=str(work_request["error_details"]), **result)
+            update_time = time.time()
+            if attributes.get("drain") or attributes.get("offline"):
+                time.sleep(module.params["drain_wait_seconds"])
+            wait_for_serving_backends_health(
+                lb_client, module, lb_id, backend_set_name, details
+            )
+            result["rolling_batches"].append(
+                dict(
+                    backends=batch,
+                    update_seconds=round(update_time - start_time, 3),
+                    settle_seconds=round(time.time() - update_time, 3),
+                )
+            )
+
+        if result["changed"]:
+            result["backend_set"] = to_dict(
+                oci_utils.call_with_backoff(
+                    lb_client.get_backend_set,
+                    load_balancer_id=lb_id,
+                    backend_set_name=backend_set_name,
+                ).data
+            )
+    except ServiceError as ex:
+        get_logger().error("Unable to update backends due to: %s", ex.message)
+        module.fail_json(msg=ex.message, **result)
+    except MaximumWaitTimeExceeded as ex:
+        get_logger().error("Unable to update backends due to: %s", str(ex))
+        module.fail_json(msg=str(ex), **result)
+
+    return result
+
+
 def set_logger(input_logger):
     global logger
     logger = input_logger
@@ -405,7 +606,7 @@ def main():
             load_balancer_id=dict(type="str", required=True, aliases=["id"]),
             backend_set_name=dict(type="str", required=True),
             backup=dict(type="bool", required=False),
-            ip_address=dict(type="str", required=True),
+            ip_address=dict(type="str", required=False),
             drain=dict(type="bool", required=False),
             state=dict(
                 type="str",
@@ -414,12 +615,18 @@ def main():
                 choices=["present", "absent"],
             ),
             offline=dict(type="bool", required=False),
-            port=dict(type="int", required=True),
+            port=dict(type="int", required=False),
             weight=dict(type="int", required=False),
+            backends=dict(type="list", required=False),
+            batch_size=dict(type="int", required=False, default=1),
+            drain_wait_seconds=dict(type="int", required=False, default=30),
         )
     )
 
-    module = AnsibleModule(argument_spec=module_args)
+    module = AnsibleModule(
+        argument_spec=module_args,
+        mutually_exclusive=[["backends", "ip_address"], ["backends", "port"]],
+    )
 
     if not HAS_OCI_PY_SDK:
         module.fail_json(msg="oci python sdk required for this module")
@@ -427,7 +634,17 @@ def main():
     lb_client = oci_utils.create_service_client(module, LoadBalancerClient)
     state = module.params["state"]
 
-    if state == "present":
+    if module.params["backends"] is not None:
+        if state != "present":
+            module.fail_json(msg="backends is only applicable to state=present.")
+        if module.params["drain"] is None and module.params["offline"] is None:
+            module.fail_json(msg="drain or offline is required with backends.")
+        if module.params["batch_size"] <= 0:
+            module.fail_json(msg="batch_size must be a positive number.")
+        result = roll_backends(lb_client, module)
+    elif module.params["ip_address"] is None or module.params["port"] is None:
+        module.fail_json(msg="ip_address and port are required.")
+    elif state == "present":
         result = create_or_update_backend(lb_client, module)
     elif state == "absent":
         result = delete_backend(lb_client, module)
@@ -23,6 +23,7 @@ short_description: Add or remove a SSL certificate from a load balancer in
 description:
     - Add a SSL certificate to OCI Load Balancer
     - Delete a SSL certificate, if present.
+    - Add a list of SSL certificates to OCI Load Balancer in a single run, for example to rotate many certificates.
 version_added: "2.5"
 options:
     load_balancer_id:
@@ -30,8 +31,9 @@ options:
         required: true
         aliases: ['id']
     name:
-        description: The name of the certificate  to add to the load balancer.
-        required: true
+        description: The name of the certificate  to add to the load balancer. Required if I(certificates) is not
+                     specified.
+        required: false
     ca_certificate:
         description: The Certificate Authority certificate, or any interim certificate,
                      that you received from your SSL certificate provider. The absolute
@@ -56,6 +58,15 @@ options:
         required: false
         default: 'present'
         choices: ['present','absent']
+    certificates:
+        description: A list of certificates to add to the load balancer, each a dict with the I(name),
+                     I(ca_certificate), I(passphrase), I(private_key) and I(public_certificate) of a certificate.
+                     The certificates are compared with the existing certificates of the load balancer by name and
+                     by the SHA-256 fingerprints of their public and CA certificates, from a single listing of the
+                     existing certificates. The missing certificates are added together, and their work requests
+                     are waited on together. Only applicable with I(state=present). Mutually exclusive with I(name).
+        required: false
+        type: list
 author:
     - "Debayan Gupta(@debayan_gupta)"
 extends_documentation_fragment: [ oracle, oracle_wait_options ]
@@ -82,6 +93,20 @@ EXAMPLES = """
     private_key: "certificate_src/private_key_with_passphrase.pem"
     public_certificate: "certificate_src/cert_with_passphrase.pem"
     state: 'present'
+# Add a list of certificate bundles to a load balancer
+- name: Add rotated certificate bundles
+  oci_load_balancer_certificate:
+    load_balancer_id: "ocid1.loadbalancer.oc1.iad.xxxxxEXAMPLExxxxx"
+    certificates:
+      - name: "www_example_com_2019"
+        ca_certificate: "certificate_src/www/ca_cert.pem"
+        private_key: "certificate_src/www/private_key.pem"
+        public_certificate: "certificate_src/www/cert.pem"
+      - name: "api_example_com_2019"
+        ca_certificate: "certificate_src/api/ca_cert.pem"
+        private_key: "certificate_src/api/private_key.pem"
+        public_certificate: "certificate_src/api/cert.pem"
+    state: 'present'
 # Delete a SSL Certificate from a load balancer
 - name: Delete a SSL certificate
   oci_load_balancer_certificate:
@@ -124,6 +149,14 @@ RETURN = """
                     "certificate_name":"ansible_cert",
                     "public_certificate":"-----BEGIN CERTIFICATE-----\\nMIIDPjCCAiYCCQC5OEUUNtrC\\n-----END CERTIFICATE-----"
                 }
+    certificates:
+        description: Attributes of the certificates of I(certificates), with whether each certificate was added
+                     (changed).
+        returned: When I(certificates) is specified
+        type: list
+        sample: [{"certificate_name": "www_example_com_2019", "changed": true,
+                  "ca_certificate": "-----BEGIN CERTIFICATE-----\\nMIIDlTCCAn2gAw\\n-----END CERTIFICATE-----",
+                  "public_certificate": "-----BEGIN CERTIFICATE-----\\nMIIDPjCCAiYCCQC5OEUUNtrC\\n-----END CERTIFICATE-----"}]
 """
 
 from ansible.module_utils.basic import AnsibleModule
@@ -133,7 +166,7 @@ from ansible.module_utils.oracle import oci_utils, oci_lb_utils
 try:
     from oci.load_balancer.load_balancer_client import LoadBalancerClient
     from oci.util import to_dict
-    from oci.load_balancer.models import CreateCertificateDetails
+    from oci.exceptions import ServiceError, MaximumWaitTimeExceeded
 
     HAS_OCI_PY_SDK = True
 except ImportError:
@@ -202,6 +235,97 @@ def create_certificate(lb_client, module):
     return result
 
 
+def create_certificates(lb_client, module):
+    """
+    Add the missing certificates of a list of certificates to a load balancer. The certificates are looked up in an
+    index of the existing certificates by name, built from a single listing of the certificates, and compared by
+    fingerprint. The work requests of the added certificates are waited on together.
+    """
+    lb_id = module.params.get("load_balancer_id")
+    result = dict(changed=False, certificates=[])
+    certificates_index = oci_lb_utils.get_certificates_index(lb_client, module, lb_id)
+    certificates = []
+    different_certificate_names = []
+    for certificate_params in module.params["certificates"]:
+        name = certificate_params.get("name")
+        if not name:
+            module.fail_json(msg="name is required for each certificate.")
+        create_certificate_details = oci_lb_utils.get_create_certificate_details(
+            module, name, certificate_params
+        )
+        certificate = certificates_index.get(name)
+        if certificate is not None and not oci_lb_utils.is_same_certificate(
+            create_certificate_details, certificate
+        ):
+            different_certificate_names.append(name)
+        certificates.append((create_certificate_details, certificate))
+    if different_certificate_names:
+        module.fail_json(
+            msg="Certificates "
+            + ", ".join(different_certificate_names)
+            + " with different attribute value already available in "
+            "load balancer " + lb_id
+        )
+
+    work_request_ids = []
+    try:
+        for create_certificate_details, certificate in certificates:
+            if certificate is not None:
+                continue
+            get_logger().info(
+                "Creating certificate %s in the load balancer %s",
+                create_certificate_details.certificate_name,
+                lb_id,
+            )
+            response = oci_utils.call_with_backoff(
+                lb_client.create_certificate,
+                create_certificate_details=create_certificate_details,
+                load_balancer_id=lb_id,
+            )
+            result["changed"] = True
+            work_request_ids.append(response.headers.get("opc-work-request-id"))
+        if work_request_ids and module.params.get("wait", True):
+            work_requests = oci_lb_utils.wait_for_work_requests(
+                lb_client, module, lb_id, work_request_ids
+            )
+            failed_work_requests = [
+                work_request
+                for work_request in work_requests.values()
+                if work_request["lifecycle_state"] == "FAILED"
+            ]
+            if failed_work_requests:
+                module.fail_json(
+                    msg="Failed to create certificates: "
+                    + "; ".join(
+                        str(work_request["error_details"])
+                        for work_request in failed_work_requests
+                    ),
+                    **result
+                )
+    except ServiceError as ex:
+        get_logger().error("Unable to create certificates due to: %s", ex.message)
+        module.fail_json(msg=ex.message, **result)
+    except MaximumWaitTimeExceeded as ex:
+        get_logger().error("Unable to create certificates due to: %s", str(ex))
+        module.fail_json(msg=str(ex), **result)
+
+    if result["changed"]:
+        certificates_index = oci_lb_utils.get_certificates_index(
+            lb_client, module, lb_id
+        )
+    for create_certificate_details, certificate in certificates:
+        name = create_certificate_details.certificate_name
+        certificate_result = to_dict(
+            certificates_index.get(name)
+            or oci_lb_utils.get_details_from_resource(
+                "Certificate", create_certificate_details
+            )
+        )
+        certificate_result["changed"] = certificate is None
+        result["certificates"].append(certificate_result)
+    return result
+
+
 def delete_certificate(lb_client, module):
     lb_id = module.params.get("load_balancer_id")
     name = module.params.get("name")
@@ -242,7 +366,7 @@ def main():
     module_args = oci_utils.get_common_arg_spec(supports_wait=True)
     module_args.update(
         dict(
-            name=dict(type="str", required=True),
+            name=dict(type="str", required=False),
             load_balancer_id=dict(type="str", required=True, aliases=["id"]),
             ca_certificate=dict(type="str", required=False),
             passphrase=dict(type="str", required=False, no_log=True),
@@ -254,10 +378,13 @@ def main():
                 default="present",
                 choices=["present", "absent"],
             ),
+            certificates=dict(type="list", required=False),
         )
     )
 
-    module = AnsibleModule(argument_spec=module_args)
+    module = AnsibleModule(
+        argument_spec=module_args, mutually_exclusive=[["certificates", "name"]]
+    )
 
     if not HAS_OCI_PY_SDK:
         module.fail_json(msg="oci python sdk required for this module")
@@ -265,16 +392,15 @@ def main():
     lb_client = oci_utils.create_service_client(module, LoadBalancerClient)
     state = module.params["state"]
 
-    if state == "present":
-        result = oci_utils.check_and_create_resource(
-            resource_type="certificate",
-            create_fn=create_certificate,
-            kwargs_create={"lb_client": lb_client, "module": module},
-            list_fn=lb_client.list_certificates,
-            kwargs_list={"load_balancer_id": module.params.get("load_balancer_id")},
-            module=module,
-            model=CreateCertificateDetails(),
-        )
+    if module.params["certificates"] is not None:
+        if state != "present":
+            module.fail_json(msg="certificates is only applicable to state=present.")
+        result = create_certificates(lb_client, module)
+    elif module.params["name"] is None:
+        module.fail_json(msg="name is required.")
+    elif state == "present":
+        # create_certificate matches the existing certificate by name and fingerprint
+        result = create_certificate(lb_client, module)
     elif state == "absent":
         result = delete_certificate(lb_client, module)
 
@@ -21,12 +21,33 @@ module: oci_load_balancer_health_summary_facts
 short_description: Fetches the summary health statuses for all load balancers in a given compartment.
 description:
     - Fetches the summary health statuses for all load balancers in a given compartment.
+    - With I(aggregate_backend_health=yes), also fetches the health status of every backend set and backend of all
+      the load balancers in the compartment, as a health matrix with rollups of the statuses.
 version_added: "2.5"
 options:
     compartment_id:
         description: Identifier of the Compartment containing all Load Balancer
         required: true
         aliases: ['id']
+    aggregate_backend_health:
+        description: Fetch the health status of every backend set and backend of the load balancers in the
+                     compartment. The load balancers and their health summaries are listed once. A load balancer with
+                     an OK status only has healthy backend sets and backends, so only the load balancers with another
+                     status, and only their backend sets with another status, are fetched, in parallel.
+        required: false
+        default: 'no'
+        type: bool
+    enable_parallel_requests:
+        description: Whether to fetch the health of the load balancers in parallel, when
+                     I(aggregate_backend_health=yes).
+        required: false
+        default: True
+        type: bool
+    max_thread_count:
+        description: When I(enable_parallel_requests=True), indicates the number of maximum parallel operations. The
+                     default number of threads used is the number of cores in your machine.
+        required: false
+        type: int
 author:
     - "Debayan Gupta(@debayan_gupta)"
 extends_documentation_fragment: oracle
@@ -37,6 +58,13 @@ EXAMPLES = """
 - name: List all Load Balancer Health Summary in a Compartment
   oci_load_balancer_health_summary_facts:
       compartment_id: 'ocid1.compartment..xcds'
+
+#Fetch the health of every backend set and backend of all load balancers
+- name: Get the health matrix of all Load Balancers in a Compartment
+  oci_load_balancer_health_summary_facts:
+      compartment_id: 'ocid1.compartment..xcds'
+      aggregate_backend_health: yes
+      max_thread_count: 10
 """
 
 RETURN = """
@@ -65,11 +93,38 @@ RETURN = """
                     "load_balancer_id":"ocid1.loadbalancer.oc1.iad.xxxxxEXAMPLExxxxx",
                     "status":"WARNING"
                 }]
+    load_balancer_health_matrix:
+        description: The health status of every load balancer of the compartment, of its backend sets and of their
+                     backends, indexed by load balancer OCID, backend set name and backend name.
+        returned: When I(aggregate_backend_health=yes)
+        type: dict
+        sample: {
+                    "ocid1.loadbalancer.oc1.iad.xxxxxEXAMPLExxxxx": {
+                        "display_name": "ansible_lb",
+                        "status": "WARNING",
+                        "backend_sets": {
+                            "backend1": {
+                                "status": "WARNING",
+                                "backends": {"10.0.0.2:8080": "OK", "10.0.0.3:8080": "CRITICAL"}
+                            }
+                        }
+                    }
+                }
+    load_balancer_health_rollup:
+        description: The number of load balancers, backend sets and backends in each health status.
+        returned: When I(aggregate_backend_health=yes)
+        type: dict
+        sample: {
+                    "load_balancers": {"OK": 59, "WARNING": 1},
+                    "backend_sets": {"OK": 119, "WARNING": 1},
+                    "backends": {"OK": 2399, "CRITICAL": 1}
+                }
 
 """
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.oracle import oci_utils
+from ansible.module_utils import six
 
 try:
     from oci.load_balancer.load_balancer_client import LoadBalancerClient
@@ -104,6 +159,146 @@ def list_load_balancer_healths(lb_client, module):
     return result
 
 
+def get_load_balancer_health_matrix_entry(lb_client, load_balancer, status):
+    """
+    Get the health status of a load balancer, of its backend sets and of their backends. The health of the backend
+    sets is only fetched when the load balancer is not OK, and the health of the backends is derived from the health
+    of their backend set.
+    """
+    # Runs in a worker thread, so errors are returned to the caller instead of failing the module here
+    backend_set_healths = dict()
+    try:
+        if status != "OK":
+            load_balancer_health = oci_utils.call_with_backoff(
+                lb_client.get_load_balancer_health, load_balancer_id=load_balancer.id
+            ).data
+            status = load_balancer_health.status
+            for backend_set_name in (
+                (load_balancer_health.warning_state_backend_set_names or [])
+                + (load_balancer_health.critical_state_backend_set_names or [])
+                + (load_balancer_health.unknown_state_backend_set_names or [])
+            ):
+                backend_set_healths[backend_set_name] = oci_utils.call_with_backoff(
+                    lb_client.get_backend_set_health,
+                    load_balancer_id=load_balancer.id,
+                    backend_set_name=backend_set_name,
+                ).data
+    except ServiceError as ex:
+        return dict(entry=None, error="{0}: {1}".format(load_balancer.id, ex.message))
+
+    backend_sets = dict()
+    for backend_set_name, backend_set in six.iteritems(
+        load_balancer.backend_sets or {}
+    ):
+        backend_set_health = backend_set_healths.get(backend_set_name)
+        backend_statuses = dict()
+        if backend_set_health is not None:
+            for backend_status in ["WARNING", "CRITICAL", "UNKNOWN"]:
+                for backend_name in (
+                    getattr(
+                        backend_set_health,
+                        "{0}_state_backend_names".format(backend_status.lower()),
+                    )
+                    or []
+                ):
+                    backend_statuses[backend_name] = backend_status
+        backend_sets[backend_set_name] = dict(
+            status=backend_set_health.status if backend_set_health else "OK",
+            backends=dict(
+                (backend.name, backend_statuses.get(backend.name, "OK"))
+                for backend in backend_set.backends or []
+            ),
+        )
+    return dict(
+        entry=dict(
+            display_name=load_balancer.display_name,
+            status=status,
+            backend_sets=backend_sets,
+        ),
+        error=None,
+    )
+
+
+def get_load_balancer_health_rollup(health_matrix):
+    rollup = dict(load_balancers=dict(), backend_sets=dict(), backends=dict())
+    for load_balancer_health in health_matrix.values():
+        statuses = rollup["load_balancers"]
+        statuses[load_balancer_health["status"]] = (
+            statuses.get(load_balancer_health["status"], 0) + 1
+        )
+        for backend_set_health in load_balancer_health["backend_sets"].values():
+            statuses = rollup["backend_sets"]
+            statuses[backend_set_health["status"]] = (
+                statuses.get(backend_set_health["status"], 0) + 1
+            )
+            for backend_status in backend_set_health["backends"].values():
+                statuses = rollup["backends"]
+                statuses[backend_status] = statuses.get(backend_status, 0) + 1
+    return rollup
+
+
+def get_load_balancer_health_matrix(lb_client, module):
+    """
+    Get the health status of every load balancer of a compartment, of their backend sets and of their backends, with
+    one listing of the load balancers and of their health summaries, and the health of the load balancers that are not
+    OK fetched in parallel.
+    """
+    compartment_id = module.params.get("compartment_id")
+    get_logger().info(
+        "Retrieving the health matrix of all Load Balancers in Compartment %s",
+        compartment_id,
+    )
+    try:
+        statuses = dict(
+            (health_summary.load_balancer_id, health_summary.status)
+            for health_summary in oci_utils.list_all_resources(
+                lb_client.list_load_balancer_healths, compartment_id=compartment_id
+            )
+        )
+        load_balancers = [
+            load_balancer
+            for load_balancer in oci_utils.list_all_resources(
+                lb_client.list_load_balancers, compartment_id=compartment_id
+            )
+            if load_balancer.lifecycle_state == "ACTIVE"
+        ]
+    except ServiceError as ex:
+        get_logger().error(
+            "Unable to list all load balancer healths due to: %s", ex.message
+        )
+        module.fail_json(msg=ex.message)
+
+    outcomes = oci_utils.execute_tasks(
+        lambda load_balancer: get_load_balancer_health_matrix_entry(
+            lb_client, load_balancer, statuses.get(load_balancer.id, "UNKNOWN")
+        ),
+        load_balancers,
+        module,
+    )
+    health_matrix = dict(
+        (load_balancer.id, outcome["entry"])
+        for load_balancer, outcome in zip(load_balancers, outcomes)
+        if outcome["entry"] is not None
+    )
+    result = dict(
+        load_balancer_health_summary=[
+            dict(load_balancer_id=load_balancer_id, status=status)
+            for load_balancer_id, status in sorted(statuses.items())
+        ],
+        load_balancer_health_matrix=health_matrix,
+        load_balancer_health_rollup=get_load_balancer_health_rollup(health_matrix),
+    )
+    errors = [outcome["error"] for outcome in outcomes if outcome["error"]]
+    if errors:
+        module.fail_json(
+            msg="Failed to retrieve the health of {0} load balancers: {1}".format(
+                len(errors), "; ".join(errors)
+            ),
+            **result
+        )
+    return result
+
+
 def set_logger(input_logger):
     global logger
     logger = input_logger
@@ -118,7 +313,12 @@ def main():
     set_logger(logger)
     module_args = oci_utils.get_common_arg_spec()
     module_args.update(
-        dict(compartment_id=dict(type="str", required=True, aliases=["id"]))
+        dict(
+            compartment_id=dict(type="str", required=True, aliases=["id"]),
+            aggregate_backend_health=dict(type="bool", required=False, default=False),
+            enable_parallel_requests=dict(type="bool", required=False, default=True),
+            max_thread_count=dict(type="int", required=False),
+        )
     )
     module = AnsibleModule(argument_spec=module_args)
 
@@ -126,7 +326,10 @@ def main():
         module.fail_json(msg="oci python sdk required for this module")
     lb_client = oci_utils.create_service_client(module, LoadBalancerClient)
 
-    result = list_load_balancer_healths(lb_client, module)
+    if module.params["aggregate_backend_health"]:
+        result = get_load_balancer_health_matrix(lb_client, module)
+    else:
+        result = list_load_balancer_healths(lb_client, module)
 
     module.exit_json(**result)
 
@@ -23,6 +23,9 @@ description:
     - Create an OCI Load Balancer Path Route Set
     - Update OCI Load Balancers Path Route Set, if present.
     - Delete OCI Load Balancers Path Route Set, if present.
+    - The path routes are checked before the path route set is created or updated. Path routes with the same path
+      and match type that route to different backend sets are rejected, and path routes that can never be matched
+      because an earlier path route matches all their paths are reported.
 version_added: "2.5"
 options:
     load_balancer_id:
@@ -62,7 +65,10 @@ options:
         description: Purge any Path Route in the  Path Route Set named I(name) that is not specified in I(path_routes).
                      This is only applicable in case of updating path route set.If I(purge_path_routes=no), provided
                      path_routes would be appended to existing path_routes.  I(purge_path_routes) and I(delete_path_routes)
-                     are mutually exclusive.
+                     are mutually exclusive. The path routes are compared with the existing path routes by match type,
+                     case-insensitive path and backend set name. If I(purge_path_routes=yes), the path routes are
+                     kept in the order of I(path_routes), as the first matching path route wins, and a different
+                     order updates the path route set.
         required: false
         default: 'yes'
         type: bool
@@ -178,6 +184,14 @@ RETURN = """
                                   }
                                 ]
                 }
+    unreachable_path_routes:
+        description: The PREFIX_MATCH and SUFFIX_MATCH path routes of the path route set that can never be matched,
+                     because an earlier PREFIX_MATCH or SUFFIX_MATCH path route (shadowed_by) matches all their paths.
+        returned: When I(state=present)
+        type: list
+        sample: [{"match_type": "PREFIX_MATCH", "path": "/admin/users", "backend_set_name": "users_backend_set",
+                  "shadowed_by": {"match_type": "PREFIX_MATCH", "path": "/admin",
+                                  "backend_set_name": "admin_backend_set"}}]
 """
 from ansible.module_utils.basic import AnsibleModule
 
@@ -191,8 +205,6 @@ try:
     from oci.load_balancer.models import (
         CreatePathRouteSetDetails,
         UpdatePathRouteSetDetails,
-        PathRoute,
-        PathMatchType,
     )
 
     HAS_OCI_PY_SDK = True
@@ -240,6 +252,30 @@ def create_or_update_path_route_set(lb_client, module):
     return result
 
 
+def get_unreachable_path_routes(module, path_routes):
+    """
+    Get the path routes of a path route set that can never be matched, warning about them.
+    """
+    unreachable_path_routes = []
+    for unreachable in oci_lb_utils.compile_path_routes(path_routes)["unreachable"]:
+        unreachable_path_route = dict(
+            zip(["match_type", "path", "backend_set_name"], unreachable["path_route"])
+        )
+        unreachable_path_route["shadowed_by"] = dict(
+            zip(["match_type", "path", "backend_set_name"], unreachable["shadowed_by"])
+        )
+        unreachable_path_routes.append(unreachable_path_route)
+        module.warn(
+            "Path route {0} {1} is unreachable, all its paths are matched by the earlier path route {2} {3}".format(
+                unreachable["path_route"][0],
+                unreachable["path_route"][1],
+                unreachable["shadowed_by"][0],
+                unreachable["shadowed_by"][1],
+            )
+        )
+    return unreachable_path_routes
+
+
 def create_path_route_set(lb_client, module):
     path_route_set_input_details = dict(
         {"path_routes": module.params.get("path_routes", None)}
@@ -253,6 +289,9 @@ def create_path_route_set(lb_client, module):
     create_path_route_set_details = CreatePathRouteSetDetails()
     create_path_route_set_details.name = name
     create_path_route_set_details.path_routes = path_route_set_details.path_routes
+    unreachable_path_routes = get_unreachable_path_routes(
+        module, path_route_set_details.path_routes
+    )
     result = oci_lb_utils.create_or_update_lb_resources_and_wait(
         resource_type="path_route_set",
         function=lb_client.create_path_route_set,
@@ -265,6 +304,7 @@ def create_path_route_set(lb_client, module):
         kwargs_get={"load_balancer_id": lb_id, "path_route_set_name": name},
         module=module,
     )
+    result["unreachable_path_routes"] = unreachable_path_routes
     get_logger().info(
         "Successfullt created path route set %s in the load balancer %s", name, lb_id
     )
@@ -280,22 +320,45 @@ def update_path_route_set(lb_client, module, lb_id, path_route_set, name):
     input_path_routes = oci_lb_utils.create_path_routes(
         module.params.get("path_routes", None)
     )
-    existing_path_routes = oci_utils.get_hashed_object_list(
-        PathRoute, path_route_set.path_routes, attributes_class_type=[PathMatchType]
-    )
+    existing_path_routes = path_route_set.path_routes or []
     get_logger().info("Updating path route set %s in the load balancer %s", name, lb_id)
-    changed = False
-    if input_path_routes is not None:
-        path_routes, changed = oci_utils.check_and_return_component_list_difference(
-            input_path_routes,
-            existing_path_routes,
-            purge_path_routes,
-            delete_path_routes,
-        )
-    if changed:
-        update_path_route_set_details.path_routes = path_routes
+    # The path routes are compared through their canonical tuples
+    path_routes_by_key = dict(
+        (oci_lb_utils.get_path_route_key(path_route), path_route)
+        for path_route in existing_path_routes + input_path_routes
+    )
+    input_keys = [
+        oci_lb_utils.get_path_route_key(path_route) for path_route in input_path_routes
+    ]
+    existing_keys = [
+        oci_lb_utils.get_path_route_key(path_route)
+        for path_route in existing_path_routes
+    ]
+    if purge_path_routes and not delete_path_routes:
+        # The path routes are evaluated in order and the first match wins, so the input order is kept as is and a
+        # reorder is a change
+        keys = []
+        for key in input_keys:
+            if key not in keys:
+                keys.append(key)
+        changed = keys != existing_keys
     else:
-        update_path_route_set_details.path_routes = existing_path_routes
+        if delete_path_routes:
+            keys_to_add, keys_to_remove = [], set(input_keys)
+        else:
+            keys_to_add, keys_to_remove = oci_utils.get_component_list_delta(
+                input_keys, existing_keys
+            )
+            keys_to_remove = set()
+        keys, changed = oci_utils.apply_component_list_delta(
+            existing_keys, keys_to_add, keys_to_remove
+        )
+    update_path_route_set_details.path_routes = [
+        path_routes_by_key[key] for key in keys
+    ]
+    unreachable_path_routes = get_unreachable_path_routes(
+        module, update_path_route_set_details.path_routes
+    )
 
     if changed:
         result = oci_lb_utils.create_or_update_lb_resources_and_wait(
@@ -323,6 +386,7 @@ def update_path_route_set(lb_client, module, lb_id, path_route_set, name):
             lb_id,
         )
 
+    result["unreachable_path_routes"] = unreachable_path_routes
     return result
 
 
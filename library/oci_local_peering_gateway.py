@@ -47,6 +47,26 @@ options:
         description: The OCID of the LPG you want to peer with. Required to connect I(local_peering_gateway_id) to
                      another LPG in the same region.
         required: false
+    peerings:
+        description: A list of LPG peerings to establish, for example between the hub and the spokes of a
+                     hub-and-spoke topology. Each peering is a dict with the C(local_peering_gateway_id) of a LPG and
+                     the C(peer_id) of the LPG to connect it to. The LPGs and their VCNs are fetched once, in parallel,
+                     the LPGs that are not connected yet are connected in parallel and, with I(wait=yes), all the
+                     peerings are waited on together. The exhaustive search for similar LPG peerings lists the VCNs and
+                     LPGs of the tenancy once for all the peerings. Mutually exclusive with I(local_peering_gateway_id)
+                     and I(peer_id).
+        required: false
+        type: list
+    enable_parallel_requests:
+        description: Whether to fetch and connect the LPGs of I(peerings) in parallel.
+        required: false
+        default: True
+        type: bool
+    max_thread_count:
+        description: When I(enable_parallel_requests=True), indicates the number of maximum parallel operations. The
+                     default number of threads used is the number of cores in your machine.
+        required: false
+        type: int
     skip_exhaustive_search_for_lpg_peerings:
         description: While connecting a LPG to another peer LPG with I(state=present), an exhaustive search (by default)
                      looks for all available LPG peerings within the tenancy and tries to detect if the desired LPG
@@ -81,6 +101,14 @@ EXAMPLES = """
     local_peering_gateway_id: ocid1.localpeeringgateway.oc1.phx.xxxxxEXAMPLExxxxx
     peer_id: ocid1.localpeeringgateway.oc1.phx.xxxxxEXAMPLExxxxx
 
+- name: Connect the LPGs of a hub VCN to the LPGs of its spoke VCNs
+  oci_local_peering_gateway:
+    peerings:
+      - local_peering_gateway_id: ocid1.localpeeringgateway.oc1.phx.xxxxxEXAMPLExxxxx
+        peer_id: ocid1.localpeeringgateway.oc1.phx.yyyyyEXAMPLEyyyyy
+      - local_peering_gateway_id: ocid1.localpeeringgateway.oc1.phx.zzzzzEXAMPLEzzzzz
+        peer_id: ocid1.localpeeringgateway.oc1.phx.wwwwwEXAMPLEwwwww
+
 - name: Delete the specified LPG
   oci_local_peering_gateway:
     id: ocid1.localpeeringgateway.oc1.phx.xxxxxEXAMPLExxxxx
@@ -106,6 +134,26 @@ local_peering_gateway:
             "time_created": "2018-09-24T06:51:59.491000+00:00",
             "vcn_id": "ocid1.vcn.oc1.phx.xxxxxEXAMPLExxxxx"
         }
+peerings:
+    description: The LPGs of each peering of I(peerings), in the same order, and whether the peering was established
+                 by this task
+    returned: When I(peerings) is specified
+    type: list
+    sample: [{
+            "changed": true,
+            "local_peering_gateway": {
+                "id": "ocid1.localpeeringgateway.oc1.phx.xxxxxEXAMPLExxxxx",
+                "peer_advertised_cidr": "172.16.1.0/30",
+                "peering_status": "PEERED",
+                "vcn_id": "ocid1.vcn.oc1.phx.xxxxxEXAMPLExxxxx"
+            },
+            "peer_local_peering_gateway": {
+                "id": "ocid1.localpeeringgateway.oc1.phx.yyyyyEXAMPLEyyyyy",
+                "peer_advertised_cidr": "10.0.0.0/16",
+                "peering_status": "PEERED",
+                "vcn_id": "ocid1.vcn.oc1.phx.yyyyyEXAMPLEyyyyy"
+            }
+        }]
 """
 
 from ansible.module_utils.basic import AnsibleModule
@@ -369,6 +417,220 @@ def connect_lpg(virtual_network_client, module):
         module.fail_json(msg=ex.message)
 
 
+def list_accessible_resources(list_fn, kwargs_lists, module):
+    """
+    List resources once for each entry of `kwargs_lists`, in parallel. Listings that are not authorized return no
+    resources, like in the exhaustive search of `get_similar_lpg`.
+    :return: A list of the lists of resources, in the same order as `kwargs_lists`
+    """
+
+    def list_resources(kwargs_list):
+        # Runs in a worker thread, so errors are returned to the caller instead of failing the module here
+        try:
+            return oci_utils.list_all_resources(list_fn, **kwargs_list), None
+        except ServiceError as ex:
+            if ex.status == 403:
+                return [], None
+            return None, ex.message
+
+    outcomes = oci_utils.execute_tasks(list_resources, kwargs_lists, module)
+    errors = [error for _, error in outcomes if error]
+    if errors:
+        module.fail_json(msg="; ".join(errors))
+    return [resources for resources, _ in outcomes]
+
+
+def get_peered_lpgs_by_vcn_cidr(virtual_network_client, module, vcn_cidr_blocks):
+    """
+    Index the PEERED LPGs of the tenancy by the CIDR block of their VCN, for the VCNs having one of `vcn_cidr_blocks`.
+    The compartments are listed once, and the VCNs of every compartment and the LPGs of the matching VCNs in parallel.
+    """
+    tenancy = oci_utils.get_oci_config(module)["tenancy"]
+    identity_client = oci_utils.create_service_client(module, IdentityClient)
+    compartment_ids = [
+        compartment.id
+        for compartment in list_accessible_resources(
+            identity_client.list_compartments,
+            [dict(compartment_id=tenancy, compartment_id_in_subtree=True)],
+            module,
+        )[0]
+    ]
+    vcns = [
+        vcn
+        for compartment_vcns in list_accessible_resources(
+            virtual_network_client.list_vcns,
+            [dict(compartment_id=compartment_id) for compartment_id in compartment_ids],
+            module,
+        )
+        for vcn in compartment_vcns
+        if vcn.cidr_block in vcn_cidr_blocks
+    ]
+    # The LPGs of a VCN can be in any compartment
+    kwargs_lists = [
+        dict(compartment_id=compartment_id, vcn_id=vcn.id)
+        for vcn in vcns
+        for compartment_id in compartment_ids
+    ]
+    vcn_cidr_blocks_by_id = dict((vcn.id, vcn.cidr_block) for vcn in vcns)
+    peered_lpgs = dict()
+    for kwargs_list, lpgs in zip(
+        kwargs_lists,
+        list_accessible_resources(
+            virtual_network_client.list_local_peering_gateways, kwargs_lists, module
+        ),
+    ):
+        for lpg in lpgs:
+            if lpg.peering_status == "PEERED":
+                peered_lpgs.setdefault(
+                    vcn_cidr_blocks_by_id[kwargs_list["vcn_id"]], []
+                ).append(lpg)
+    return peered_lpgs
+
+
+def connect_lpg_pair(virtual_network_client, lpg_id, peer_id):
+    # Runs in a worker thread, so errors are returned to the caller instead of failing the module here
+    connect_details = ConnectLocalPeeringGatewaysDetails()
+    connect_details.peer_id = peer_id
+    try:
+        oci_utils.call_with_backoff(
+            virtual_network_client.connect_local_peering_gateways,
+            local_peering_gateway_id=lpg_id,
+            connect_local_peering_gateways_details=connect_details,
+        )
+        return None
+    except ServiceError as ex:
+        return "Failed to connect {0} to {1}: {2}".format(lpg_id, peer_id, ex.message)
+
+
+def connect_lpg_peerings(virtual_network_client, module):
+    """
+    Establish all the LPG peerings of `peerings`. The LPGs and their VCNs are fetched once, the LPGs that are not
+    connected yet are connected in parallel, and both sides of the new peerings are waited on with one listing of the
+    LPGs per VCN in each poll round.
+    """
+    pairs = []
+    for peering in module.params["peerings"]:
+        if not peering.get("local_peering_gateway_id") or not peering.get("peer_id"):
+            module.fail_json(
+                msg="local_peering_gateway_id and peer_id are required for every entry of peerings."
+            )
+        pairs.append((peering["local_peering_gateway_id"], peering["peer_id"]))
+    lpg_ids = [lpg_id for pair in pairs for lpg_id in pair]
+    for lpg_id in set(lpg_ids):
+        if lpg_ids.count(lpg_id) > 1:
+            module.fail_json(
+                msg="Local peering gateway {0} is part of more than one peering.".format(
+                    lpg_id
+                )
+            )
+
+    lpgs = oci_utils.get_resources_by_id(
+        virtual_network_client.get_local_peering_gateway,
+        "local_peering_gateway_id",
+        lpg_ids,
+        module,
+    )
+    vcns = oci_utils.get_resources_by_id(
+        virtual_network_client.get_vcn,
+        "vcn_id",
+        [lpg.vcn_id for lpg in lpgs.values()],
+        module,
+    )
+
+    def get_vcn_cidr_block(lpg_id):
+        return vcns[lpgs[lpg_id].vcn_id].cidr_block
+
+    # Same heuristic as `are_lpgs_connected`, with the exhaustive search done once for all the peerings
+    peered_pairs = [
+        (lpg_id, peer_id)
+        for lpg_id, peer_id in pairs
+        if lpgs[lpg_id].peering_status == "PEERED"
+        and lpgs[lpg_id].peer_advertised_cidr == get_vcn_cidr_block(peer_id)
+        and lpgs[peer_id].peering_status == "PEERED"
+        and lpgs[peer_id].peer_advertised_cidr == get_vcn_cidr_block(lpg_id)
+    ]
+    if peered_pairs and not module.params["skip_exhaustive_search_for_lpg_peerings"]:
+        try:
+            peered_lpgs = get_peered_lpgs_by_vcn_cidr(
+                virtual_network_client,
+                module,
+                set(get_vcn_cidr_block(peer_id) for _, peer_id in peered_pairs),
+            )
+        except ServiceError as ex:
+            module.fail_json(msg=ex.message)
+        for lpg_id, peer_id in peered_pairs:
+            for similar_lpg in peered_lpgs.get(get_vcn_cidr_block(peer_id), []):
+                if (
+                    similar_lpg.id != peer_id
+                    and similar_lpg.peer_advertised_cidr == get_vcn_cidr_block(lpg_id)
+                ):
+                    module.fail_json(
+                        msg="Local peering gateway {0} may be connected to local peering gateway {1}.".format(
+                            similar_lpg.id, lpg_id
+                        )
+                    )
+
+    pairs_to_connect = [pair for pair in pairs if pair not in peered_pairs]
+    errors = oci_utils.execute_tasks(
+        lambda pair: connect_lpg_pair(virtual_network_client, pair[0], pair[1]),
+        pairs_to_connect,
+        module,
+    )
+    connected_pairs = [
+        pair for pair, error in zip(pairs_to_connect, errors) if error is None
+    ]
+    lpg_dicts = dict((lpg_id, to_dict(lpg)) for lpg_id, lpg in lpgs.items())
+    result = dict(changed=bool(connected_pairs))
+
+    def get_peerings():
+        return [
+            dict(
+                changed=(lpg_id, peer_id) in connected_pairs,
+                local_peering_gateway=lpg_dicts[lpg_id],
+                peer_local_peering_gateway=lpg_dicts[peer_id],
+            )
+            for lpg_id, peer_id in pairs
+        ]
+
+    result["peerings"] = get_peerings()
+    errors = [error for error in errors if error]
+    if errors:
+        module.fail_json(msg=" ".join(errors), **result)
+
+    if connected_pairs and module.params["wait"]:
+        connected_lpg_ids = [lpg_id for pair in connected_pairs for lpg_id in pair]
+        kwargs_lists = [
+            dict(compartment_id=compartment_id, vcn_id=vcn_id)
+            for compartment_id, vcn_id in sorted(
+                set(
+                    (lpgs[lpg_id].compartment_id, lpgs[lpg_id].vcn_id)
+                    for lpg_id in connected_lpg_ids
+                )
+            )
+        ]
+        try:
+            waited_lpgs, timed_out_ids = oci_utils.wait_for_resources_lifecycle_state(
+                module,
+                virtual_network_client.list_local_peering_gateways,
+                kwargs_lists,
+                connected_lpg_ids,
+                module.params["wait_until"] or ["PEERED"],
+                state_attribute="peering_status",
+            )
+        except ServiceError as ex:
+            module.fail_json(msg=ex.message, **result)
+        lpg_dicts.update(waited_lpgs)
+        result["peerings"] = get_peerings()
+        if timed_out_ids:
+            module.fail_json(
+                msg="Timed out waiting for local peering gateways {0} to be peered.".format(
+                    ", ".join(sorted(timed_out_ids))
+                ),
+                **result
+            )
+    return result
+
+
 def set_logger(my_logger):
     global logger
     logger = my_logger
@@ -400,6 +662,9 @@ def main():
             ),
             local_peering_gateway_id=dict(type="str", required=False, aliases=["id"]),
             peer_id=dict(type="str", required=False),
+            peerings=dict(type="list", required=False),
+            enable_parallel_requests=dict(type="bool", required=False, default=True),
+            max_thread_count=dict(type="int", required=False),
             vcn_id=dict(type="str", required=False),
             skip_exhaustive_search_for_lpg_peerings=dict(
                 type=bool, required=False, default=False
@@ -414,6 +679,10 @@ def main():
             ("state", "absent", ["local_peering_gateway_id"]),
             ("peer_id", not None, ["local_peering_gateway_id"]),
         ],
+        mutually_exclusive=[
+            ["peerings", "local_peering_gateway_id"],
+            ["peerings", "peer_id"],
+        ],
     )
 
     if not HAS_OCI_PY_SDK:
@@ -429,6 +698,9 @@ def main():
     if state == "absent":
         result = delete_local_peering_gateway(virtual_network_client, module)
 
+    elif module.params["peerings"] is not None:
+        result = connect_lpg_peerings(virtual_network_client, module)
+
     else:
         local_peering_gateway_id = module.params["local_peering_gateway_id"]
         if local_peering_gateway_id is not None:
@@ -42,7 +42,7 @@ options:
         required: false
         choices: ["PROVISIONING", "AVAILABLE", "TERMINATING", "TERMINATED"]
 author: "Rohit Chaware (@rohitChaware)"
-extends_documentation_fragment: [ oracle, oracle_display_name_option ]
+extends_documentation_fragment: [ oracle, oracle_display_name_option, oracle_vcn_snapshot_options ]
 """
 
 EXAMPLES = """
@@ -127,7 +127,7 @@ nat_gateways:
 """
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.oracle import oci_utils
+from ansible.module_utils.oracle import oci_utils, oci_network_utils
 
 try:
     from oci.core.virtual_network_client import VirtualNetworkClient
@@ -142,6 +142,7 @@ except ImportError:
 
 def main():
     module_args = oci_utils.get_facts_module_arg_spec()
+    module_args.update(oci_network_utils.get_vcn_snapshot_arg_spec())
     module_args.update(
         dict(
             compartment_id=dict(type="str", required=False),
@@ -183,19 +184,29 @@ def main():
                 )
             ]
         else:
-            optional_list_method_params = ["display_name", "lifecycle_state", "vcn_id"]
+            optional_list_method_params = ["display_name", "lifecycle_state"]
             optional_kwargs = {
                 param: module.params[param]
                 for param in optional_list_method_params
                 if module.params.get(param) is not None
             }
-            result = to_dict(
-                oci_utils.list_all_resources(
-                    virtual_network_client.list_nat_gateways,
-                    compartment_id=compartment_id,
+            if module.params.get("vcn_id") is not None:
+                result = oci_network_utils.list_vcn_resources(
+                    virtual_network_client,
+                    module,
+                    "nat_gateway",
+                    compartment_id,
+                    module.params["vcn_id"],
                     **optional_kwargs
                 )
-            )
+            else:
+                result = to_dict(
+                    oci_utils.list_all_resources(
+                        virtual_network_client.list_nat_gateways,
+                        compartment_id=compartment_id,
+                        **optional_kwargs
+                    )
+                )
     except ServiceError as ex:
         module.fail_json(msg=ex.message)
 
@@ -23,6 +23,13 @@ description:
     - This module allows the user to create, delete and update private IPs in OCI.
 version_added: "2.5"
 options:
+    count:
+        description: The number of secondary private IPs the VNIC specified by I(vnic_id) must have. The missing private
+                     IPs are created in parallel, using the lowest free addresses of the VNIC's subnet. The free
+                     addresses are computed from a single listing of the private IPs of the subnet. Mutually exclusive
+                     with I(ip_addresses).
+        required: false
+        type: int
     display_name:
         description: A user-friendly name. Does not have to be unique, and it's changeable. Avoid entering confidential
                      information.
@@ -38,6 +45,23 @@ options:
         description: A private IP address of your choice. Must be an available IP address within the subnet's CIDR. If
                      you don't specify a value, Oracle automatically assigns a private IP address from the subnet.
         required: false
+    ip_addresses:
+        description: A list of private IP addresses that must be assigned to the VNIC specified by I(vnic_id). The
+                     addresses that are not assigned to the VNIC yet are created in parallel. The module fails without
+                     creating any private IP if one of the addresses is outside the VNIC's subnet, is reserved or is
+                     assigned to another VNIC. Mutually exclusive with I(count).
+        required: false
+        type: list
+    enable_parallel_requests:
+        description: Whether to create the private IPs in parallel, when I(count) or I(ip_addresses) is specified.
+        required: false
+        default: True
+        type: bool
+    max_thread_count:
+        description: When I(enable_parallel_requests=True), indicates the number of maximum parallel operations. The
+                     default number of threads used is the number of cores in your machine.
+        required: false
+        type: int
     private_ip_id:
         description: The OCID of the private IP. Required to update a private IP using I(state=present) or delete a
                      private IP using I(state=absent).
@@ -64,6 +88,17 @@ EXAMPLES = """
     ip_address: '10.0.0.114'
     vnic_id: 'ocid1.vnic.oc1.iad.xxxxxEXAMPLExxxxx'
 
+- name: Ensure that a VNIC has 32 secondary private IPs
+  oci_private_ip:
+    display_name: 'mesh_ip'
+    count: 32
+    vnic_id: 'ocid1.vnic.oc1.iad.xxxxxEXAMPLExxxxx'
+
+- name: Assign a list of private IPs to a VNIC
+  oci_private_ip:
+    ip_addresses: ['10.0.0.120', '10.0.0.121', '10.0.0.122']
+    vnic_id: 'ocid1.vnic.oc1.iad.xxxxxEXAMPLExxxxx'
+
 - name: Update a private IP
   oci_private_ip:
     private_ip_id: 'ocid1.privateip.oc1.iad.xxxxxEXAMPLExxxxx'
@@ -94,15 +129,35 @@ private_ip:
             "time_created": "2018-03-28T18:37:56.190000+00:00",
             "vnic_id": "ocid1.vnic.oc1.iad.xxxxxEXAMPLExxxxx"
         }
+private_ips:
+    description: Information about all the secondary private IPs of the VNIC, ordered by IP address
+    returned: When I(count) or I(ip_addresses) is specified
+    type: list
+    sample: [{
+            "availability_domain": "IwGV:US-ASHBURN-AD-1",
+            "compartment_id": "ocid1.compartment.oc1..xxxxxEXAMPLExxxxx",
+            "defined_tags": {},
+            "display_name": "mesh_ip",
+            "freeform_tags": {},
+            "hostname_label": null,
+            "id": "ocid1.privateip.oc1.iad.xxxxxEXAMPLExxxxx",
+            "ip_address": "10.0.0.2",
+            "is_primary": false,
+            "subnet_id": "ocid1.subnet.oc1.iad.xxxxxEXAMPLExxxxx",
+            "time_created": "2018-03-28T18:37:56.190000+00:00",
+            "vnic_id": "ocid1.vnic.oc1.iad.xxxxxEXAMPLExxxxx"
+        }]
 """
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.oracle import oci_utils
+from ansible.module_utils.oracle import oci_utils, oci_network_utils
 
 try:
     from oci.core.virtual_network_client import VirtualNetworkClient
     from oci.core.models import CreatePrivateIpDetails
     from oci.core.models import UpdatePrivateIpDetails
+    from oci.exceptions import ServiceError
+    from oci.util import to_dict
 
     HAS_OCI_PY_SDK = True
 
@@ -161,11 +216,141 @@ def create_private_ip(virtual_network_client, module):
     return result
 
 
+def get_ip_addresses_to_create(subnet, vnic_private_ips, used_ip_addresses, module):
+    if module.params["ip_addresses"] is not None:
+        vnic_ip_addresses = set(
+            private_ip.ip_address for private_ip in vnic_private_ips
+        )
+        ip_addresses_to_create = []
+        for ip_address in module.params["ip_addresses"]:
+            if ip_address in vnic_ip_addresses or ip_address in ip_addresses_to_create:
+                continue
+            if ip_address in used_ip_addresses:
+                module.fail_json(
+                    msg="IP address {0} is already assigned to another VNIC.".format(
+                        ip_address
+                    )
+                )
+            try:
+                is_assignable = oci_network_utils.is_assignable_ip_address(
+                    subnet.cidr_block, ip_address
+                )
+            except ValueError as ex:
+                module.fail_json(msg=str(ex))
+            if not is_assignable:
+                module.fail_json(
+                    msg="IP address {0} is not an assignable address of the subnet {1}.".format(
+                        ip_address, subnet.cidr_block
+                    )
+                )
+            ip_addresses_to_create.append(ip_address)
+        return ip_addresses_to_create
+
+    missing_count = module.params["count"] - len(
+        [private_ip for private_ip in vnic_private_ips if not private_ip.is_primary]
+    )
+    if missing_count <= 0:
+        return []
+    ip_addresses_to_create = oci_network_utils.get_free_ip_addresses(
+        subnet.cidr_block, used_ip_addresses, missing_count
+    )
+    if len(ip_addresses_to_create) < missing_count:
+        module.fail_json(
+            msg="Subnet {0} has only {1} free IP addresses, {2} are required.".format(
+                subnet.cidr_block, len(ip_addresses_to_create), missing_count
+            )
+        )
+    return ip_addresses_to_create
+
+
+def create_private_ips(virtual_network_client, module):
+    """
+    Create the private IPs missing on a VNIC, as a number of secondary private IPs (`count`) or as a list of IP
+    addresses (`ip_addresses`). The private IPs of the VNIC's subnet are listed once, and the addresses to create are
+    computed from that listing before all the private IPs are created in parallel.
+    """
+    vnic_id = module.params["vnic_id"]
+    try:
+        vnic = oci_utils.call_with_backoff(
+            virtual_network_client.get_vnic, vnic_id=vnic_id
+        ).data
+        subnet = oci_utils.call_with_backoff(
+            virtual_network_client.get_subnet, subnet_id=vnic.subnet_id
+        ).data
+        subnet_private_ips = oci_utils.list_all_resources(
+            virtual_network_client.list_private_ips, subnet_id=subnet.id
+        )
+    except ServiceError as ex:
+        module.fail_json(msg=ex.message)
+
+    vnic_private_ips = [
+        private_ip for private_ip in subnet_private_ips if private_ip.vnic_id == vnic_id
+    ]
+    used_ip_addresses = set(private_ip.ip_address for private_ip in subnet_private_ips)
+    ip_addresses_to_create = get_ip_addresses_to_create(
+        subnet, vnic_private_ips, used_ip_addresses, module
+    )
+
+    def create_private_ip_with_address(ip_address):
+        # Runs in a worker thread, so errors are returned to the caller instead of failing the module here
+        create_private_ip_details = CreatePrivateIpDetails(
+            vnic_id=vnic_id,
+            ip_address=ip_address,
+            display_name=module.params["display_name"],
+            freeform_tags=module.params["freeform_tags"],
+            defined_tags=module.params["defined_tags"],
+        )
+        try:
+            return dict(
+                private_ip=oci_utils.call_with_backoff(
+                    virtual_network_client.create_private_ip,
+                    create_private_ip_details=create_private_ip_details,
+                ).data,
+                error=None,
+            )
+        except ServiceError as ex:
+            return dict(
+                private_ip=None, error="{0}: {1}".format(ip_address, ex.message)
+            )
+
+    outcomes = oci_utils.execute_tasks(
+        create_private_ip_with_address, ip_addresses_to_create, module
+    )
+    private_ips = [
+        private_ip for private_ip in vnic_private_ips if not private_ip.is_primary
+    ]
+    private_ips.extend(
+        outcome["private_ip"] for outcome in outcomes if outcome["error"] is None
+    )
+    private_ips.sort(
+        key=lambda private_ip: oci_network_utils.parse_cidr_block(
+            private_ip.ip_address
+        )[1]
+    )
+    result = dict(
+        changed=any(outcome["error"] is None for outcome in outcomes),
+        private_ips=to_dict(private_ips),
+    )
+    errors = [outcome["error"] for outcome in outcomes if outcome["error"]]
+    if errors:
+        module.fail_json(
+            msg="Failed to create {0} private IPs: {1}".format(
+                len(errors), "; ".join(errors)
+            ),
+            **result
+        )
+    return result
+
+
 def main():
     module_args = oci_utils.get_taggable_arg_spec()
     module_args.update(
         dict(
+            count=dict(type="int", required=False),
             hostname_label=dict(type="str", required=False),
+            ip_addresses=dict(type="list", required=False),
+            enable_parallel_requests=dict(type="bool", required=False, default=True),
+            max_thread_count=dict(type="int", required=False),
             ip_address=dict(type="str", required=False),
             display_name=dict(type="str", required=False, aliases=["name"]),
             vnic_id=dict(type="str", required=False),
@@ -183,6 +368,10 @@ def main():
         argument_spec=module_args,
         supports_check_mode=False,
         required_if=[("state", "absent", ["private_ip_id"])],
+        mutually_exclusive=[
+            ["count", "ip_addresses", "ip_address", "private_ip_id"],
+            ["count", "ip_addresses", "hostname_label"],
+        ],
     )
 
     if not HAS_OCI_PY_SDK:
@@ -201,6 +390,13 @@ def main():
     else:
         if private_ip_id is not None:
             result = update_private_ip(virtual_network_client, module)
+        elif (
+            module.params["count"] is not None
+            or module.params["ip_addresses"] is not None
+        ):
+            if module.params["vnic_id"] is None:
+                module.fail_json(msg="vnic_id is required with count or ip_addresses.")
+            result = create_private_ips(virtual_network_client, module)
         else:
             # Exclude ip_address & display_name when matching private_ips if they are not explicitly specified by user.
             exclude_attributes = {"display_name": True, "ip_address": True}
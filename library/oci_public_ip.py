@@ -38,6 +38,23 @@ options:
                      reserved public IP. If you don't provide it, the public IP is created but not assigned to a private
                      IP.
         required: false
+    private_ip_ids:
+        description: A list of OCIDs of private IPs to assign a public IP of lifetime I(lifetime) to. The private IPs
+                     are looked up and their missing public IPs are created in parallel, and all the created public IPs
+                     are waited on together. I(compartment_id) and I(lifetime) are required with this option. Mutually
+                     exclusive with I(private_ip_id) and I(public_ip_id).
+        required: false
+        type: list
+    enable_parallel_requests:
+        description: Whether to create the public IPs in parallel, when I(private_ip_ids) is specified.
+        required: false
+        default: True
+        type: bool
+    max_thread_count:
+        description: When I(enable_parallel_requests=True), indicates the number of maximum parallel operations. The
+                     default number of threads used is the number of cores in your machine.
+        required: false
+        type: int
     public_ip_id:
         description: The OCID of the public IP. Required to delete or update a public IP.
         required: false
@@ -70,6 +87,14 @@ EXAMPLES = """
     lifetime: EPHEMERAL
     private_ip_id: ocid1.privateip.oc1.iad.xxxxxEXAMPLExxxxx
 
+- name: Create an ephemeral public IP for each of a list of private IPs
+  oci_public_ip:
+    compartment_id: ocid1.compartment.oc1..xxxxxEXAMPLExxxxx
+    lifetime: EPHEMERAL
+    private_ip_ids:
+      - ocid1.privateip.oc1.iad.xxxxxEXAMPLExxxxx
+      - ocid1.privateip.oc1.iad.yyyyyEXAMPLEyyyyy
+
 - name: Assign a reserved public IP to a private IP
   oci_public_ip:
     id: ocid1.publicip.oc1.iad.xxxxxEXAMPLExxxxx
@@ -103,6 +128,22 @@ public_ip:
             "scope": "REGION",
             "time_created": "2018-06-22T15:25:25.569000+00:00"
         }
+public_ips:
+    description: Information about the public IPs of the private IPs, in the order of I(private_ip_ids)
+    returned: When I(private_ip_ids) is specified
+    type: list
+    sample: [{
+            "availability_domain": "IwGV:US-ASHBURN-AD-1",
+            "compartment_id": "ocid1.compartment.oc1..xxxxxEXAMPLExxxxx",
+            "display_name": "ansible_public_ip",
+            "id": "ocid1.publicip.oc1.iad.xxxxxEXAMPLExxxxx",
+            "ip_address": "129.213.14.149",
+            "lifecycle_state": "ASSIGNED",
+            "lifetime": "EPHEMERAL",
+            "private_ip_id": "ocid1.privateip.oc1.iad.xxxxxEXAMPLExxxxx",
+            "scope": "AVAILABILITY_DOMAIN",
+            "time_created": "2018-06-22T15:25:25.569000+00:00"
+        }]
 """
 
 from ansible.module_utils.basic import AnsibleModule
@@ -113,6 +154,8 @@ try:
     from oci.core.virtual_network_client import VirtualNetworkClient
     from oci.core.models import CreatePublicIpDetails
     from oci.core.models import UpdatePublicIpDetails
+    from oci.core.models import GetPublicIpByPrivateIpIdDetails
+    from oci.exceptions import ServiceError
     from oci.util import to_dict
 
     HAS_OCI_PY_SDK = True
@@ -185,6 +228,116 @@ def create_public_ip(virtual_network_client, module):
     return result
 
 
+def get_or_create_public_ip(virtual_network_client, private_ip_id, module):
+    # Runs in a worker thread, so errors are returned to the caller instead of failing the module here
+    try:
+        try:
+            public_ip = oci_utils.call_with_backoff(
+                virtual_network_client.get_public_ip_by_private_ip_id,
+                get_public_ip_by_private_ip_id_details=GetPublicIpByPrivateIpIdDetails(
+                    private_ip_id=private_ip_id
+                ),
+            ).data
+            return dict(public_ip=public_ip, created=False, error=None)
+        except ServiceError as ex:
+            if ex.status != 404:
+                raise
+        create_public_ip_details = CreatePublicIpDetails(
+            compartment_id=module.params["compartment_id"],
+            display_name=module.params["display_name"],
+            lifetime=module.params["lifetime"],
+            private_ip_id=private_ip_id,
+            freeform_tags=module.params["freeform_tags"],
+            defined_tags=module.params["defined_tags"],
+        )
+        public_ip = oci_utils.call_with_backoff(
+            virtual_network_client.create_public_ip,
+            create_public_ip_details=create_public_ip_details,
+        ).data
+        return dict(public_ip=public_ip, created=True, error=None)
+    except ServiceError as ex:
+        return dict(
+            public_ip=None,
+            created=False,
+            error="{0}: {1}".format(private_ip_id, ex.message),
+        )
+
+
+def create_public_ips(virtual_network_client, module):
+    """
+    Assign a public IP to each of the private IPs of `private_ip_ids` that does not have one yet. The private IPs are
+    processed in parallel, and the created public IPs are waited on together, with one listing of the public IPs per
+    scope and availability domain in each poll round.
+    """
+    private_ip_ids = list(module.params["private_ip_ids"])
+    outcomes = oci_utils.execute_tasks(
+        lambda private_ip_id: get_or_create_public_ip(
+            virtual_network_client, private_ip_id, module
+        ),
+        private_ip_ids,
+        module,
+    )
+    public_ips = [
+        to_dict(outcome["public_ip"])
+        for outcome in outcomes
+        if outcome["public_ip"] is not None
+    ]
+    created_public_ips = [
+        outcome["public_ip"] for outcome in outcomes if outcome["created"]
+    ]
+    result = dict(changed=bool(created_public_ips), public_ips=public_ips)
+    errors = [outcome["error"] for outcome in outcomes if outcome["error"]]
+    if errors:
+        module.fail_json(
+            msg="Failed to create {0} public IPs: {1}".format(
+                len(errors), "; ".join(errors)
+            ),
+            **result
+        )
+
+    if created_public_ips and module.params.get("wait", None):
+        if module.params["lifetime"] == "RESERVED":
+            kwargs_lists = [
+                dict(scope="REGION", compartment_id=module.params["compartment_id"])
+            ]
+        else:
+            kwargs_lists = [
+                dict(
+                    scope="AVAILABILITY_DOMAIN",
+                    compartment_id=module.params["compartment_id"],
+                    availability_domain=availability_domain,
+                )
+                for availability_domain in sorted(
+                    set(
+                        public_ip.availability_domain
+                        for public_ip in created_public_ips
+                    )
+                )
+            ]
+        try:
+            waited_public_ips, timed_out_ids = oci_utils.wait_for_resources_lifecycle_state(
+                module,
+                virtual_network_client.list_public_ips,
+                kwargs_lists,
+                [public_ip.id for public_ip in created_public_ips],
+                module.params.get("wait_until") or ["ASSIGNED", "AVAILABLE"],
+            )
+        except ServiceError as ex:
+            module.fail_json(msg=ex.message, **result)
+        result["public_ips"] = [
+            waited_public_ips.get(public_ip["id"], public_ip)
+            for public_ip in public_ips
+        ]
+        if timed_out_ids:
+            module.fail_json(
+                msg="Timed out waiting for public IPs {0}.".format(
+                    ", ".join(sorted(timed_out_ids))
+                ),
+                **result
+            )
+    return result
+
+
 def main():
     module_args = oci_utils.get_taggable_arg_spec(
         supports_create=True, supports_wait=True
@@ -203,6 +356,9 @@ def main():
                 choices=["absent", "present"],
             ),
             private_ip_id=dict(type="str", required=False),
+            private_ip_ids=dict(type="list", required=False),
+            enable_parallel_requests=dict(type="bool", required=False, default=True),
+            max_thread_count=dict(type="int", required=False),
             public_ip_id=dict(type="str", required=False, aliases=["id"]),
         )
     )
@@ -212,8 +368,9 @@ def main():
         supports_check_mode=False,
         required_if=[
             ("state", "absent", ["public_ip_id"]),
-            ("lifetime", "EPHEMERAL", ["private_ip_id"]),
+            ("lifetime", "EPHEMERAL", ["private_ip_id", "private_ip_ids"], True),
         ],
+        mutually_exclusive=[["private_ip_ids", "private_ip_id", "public_ip_id"]],
     )
 
     if not HAS_OCI_PY_SDK:
@@ -232,6 +389,15 @@ def main():
     else:
         if public_ip_id is not None:
             result = update_public_ip(virtual_network_client, module)
+        elif module.params["private_ip_ids"] is not None:
+            if (
+                module.params["compartment_id"] is None
+                or module.params["lifetime"] is None
+            ):
+                module.fail_json(
+                    msg="compartment_id and lifetime are required with private_ip_ids."
+                )
+            result = create_public_ips(virtual_network_client, module)
         else:
             exclude_attributes = {"display_name": True}
             # If the user desired lifetime of the public IP to be created is RESERVED, then use SCOPE as REGION for
@@ -50,6 +50,25 @@ options:
         description: The name of the region that contains the RPC you want to peer with. Required to connect
                      I(remote_peering_connection_id) to another RPC in different region.
         required: false
+    peerings:
+        description: A list of RPC peerings to establish, for example between the DRG of a hub region and the DRGs of
+                     its spoke regions. Each peering is a dict with the C(remote_peering_connection_id) of a RPC, the
+                     C(peer_id) of the RPC to connect it to and the C(peer_region_name) of the region of the peer RPC.
+                     The RPCs are fetched once, in parallel, the RPCs that are not connected to their peer yet are
+                     connected in parallel and, with I(wait=yes), all the peerings are waited on together. Mutually
+                     exclusive with I(remote_peering_connection_id), I(peer_id) and I(peer_region_name).
+        required: false
+        type: list
+    enable_parallel_requests:
+        description: Whether to fetch and connect the RPCs of I(peerings) in parallel.
+        required: false
+        default: True
+        type: bool
+    max_thread_count:
+        description: When I(enable_parallel_requests=True), indicates the number of maximum parallel operations. The
+                     default number of threads used is the number of cores in your machine.
+        required: false
+        type: int
     drg_id:
         description: The OCID of the DRG the RPC belongs to. Required when creating a RPC with I(state=present).
         required: false
@@ -75,6 +94,16 @@ EXAMPLES = """
     peer_id: ocid1.remotepeeringconnection.oc1.iad.xxxxxEXAMPLExxxxx
     peer_region_name: us-ashburn-1
 
+- name: Connect the RPCs of a hub region to RPCs in other regions
+  oci_remote_peering_connection:
+    peerings:
+      - remote_peering_connection_id: ocid1.remotepeeringconnection.oc1.phx.xxxxxEXAMPLExxxxx
+        peer_id: ocid1.remotepeeringconnection.oc1.iad.xxxxxEXAMPLExxxxx
+        peer_region_name: us-ashburn-1
+      - remote_peering_connection_id: ocid1.remotepeeringconnection.oc1.phx.yyyyyEXAMPLEyyyyy
+        peer_id: ocid1.remotepeeringconnection.oc1.eu-frankfurt-1.xxxxxEXAMPLExxxxx
+        peer_region_name: eu-frankfurt-1
+
 - name: Delete the specified RPC
   oci_remote_peering_connection:
     id: ocid1.remotepeeringconnection.oc1.phx.xxxxxEXAMPLExxxxx
@@ -99,6 +128,23 @@ remote_peering_connection:
             "peering_status": "PEERED",
             "time_created": "2018-09-24T06:51:59.491000+00:00"
         }
+remote_peering_connections:
+    description: Information about the RPCs of I(peerings), in the same order
+    returned: When I(peerings) is specified
+    type: list
+    sample: [{
+            "compartment_id": "ocid1.compartment.oc1..xxxxxEXAMPLExxxxx",
+            "display_name": "ansible_remote_peering_connection",
+            "drg_id": "ocid1.drg.oc1.phx.xxxxxEXAMPLExxxxx",
+            "id": "ocid1.remotepeeringconnection.oc1.phx.xxxxxEXAMPLExxxxx",
+            "is_cross_tenancy_peering": false,
+            "lifecycle_state": "AVAILABLE",
+            "peer_id":  "ocid1.remotepeeringconnection.oc1.iad.xxxxxEXAMPLExxxxx",
+            "peer_region_name": "us-ashburn-1",
+            "peer_tenancy_id": "ocid1.tenancy.oc1..xxxxxEXAMPLExxxxx",
+            "peering_status": "PEERED",
+            "time_created": "2018-09-24T06:51:59.491000+00:00"
+        }]
 """
 
 from ansible.module_utils.basic import AnsibleModule
@@ -230,6 +276,111 @@ def connect_rpc(virtual_network_client, module):
         module.fail_json(msg=ex.message)
 
 
+def connect_rpc_pair(virtual_network_client, peering):
+    # Runs in a worker thread, so errors are returned to the caller instead of failing the module here
+    connect_details = ConnectRemotePeeringConnectionsDetails(
+        peer_id=peering["peer_id"], peer_region_name=peering["peer_region_name"]
+    )
+    try:
+        oci_utils.call_with_backoff(
+            virtual_network_client.connect_remote_peering_connections,
+            remote_peering_connection_id=peering["remote_peering_connection_id"],
+            connect_remote_peering_connections_details=connect_details,
+        )
+        return None
+    except ServiceError as ex:
+        return "Failed to connect {0} to {1}: {2}".format(
+            peering["remote_peering_connection_id"], peering["peer_id"], ex.message
+        )
+
+
+def connect_rpc_peerings(virtual_network_client, module):
+    """
+    Establish all the RPC peerings of `peerings`. The RPCs are fetched once, the RPCs that are not connected to their
+    peer yet are connected in parallel, and the new peerings are waited on with one listing of the RPCs per DRG in each
+    poll round.
+    """
+    peerings = module.params["peerings"]
+    for peering in peerings:
+        if not all(
+            peering.get(key)
+            for key in ["remote_peering_connection_id", "peer_id", "peer_region_name"]
+        ):
+            module.fail_json(
+                msg="remote_peering_connection_id, peer_id and peer_region_name are required for every entry of "
+                "peerings."
+            )
+    rpc_ids = [peering["remote_peering_connection_id"] for peering in peerings]
+    if len(set(rpc_ids)) != len(rpc_ids):
+        module.fail_json(msg="A RPC can only be part of one peering.")
+
+    rpcs = oci_utils.get_resources_by_id(
+        virtual_network_client.get_remote_peering_connection,
+        "remote_peering_connection_id",
+        rpc_ids,
+        module,
+    )
+    peerings_to_connect = [
+        peering
+        for peering in peerings
+        if not are_rpcs_connected(
+            virtual_network_client,
+            rpcs[peering["remote_peering_connection_id"]],
+            peering["peer_id"],
+        )
+    ]
+    errors = oci_utils.execute_tasks(
+        lambda peering: connect_rpc_pair(virtual_network_client, peering),
+        peerings_to_connect,
+        module,
+    )
+    connected_rpc_ids = [
+        peering["remote_peering_connection_id"]
+        for peering, error in zip(peerings_to_connect, errors)
+        if error is None
+    ]
+    rpc_dicts = dict((rpc_id, to_dict(rpc)) for rpc_id, rpc in rpcs.items())
+    result = dict(
+        changed=bool(connected_rpc_ids),
+        remote_peering_connections=[rpc_dicts[rpc_id] for rpc_id in rpc_ids],
+    )
+    errors = [error for error in errors if error]
+    if errors:
+        module.fail_json(msg=" ".join(errors), **result)
+
+    if connected_rpc_ids and module.params["wait"]:
+        kwargs_lists = [
+            dict(compartment_id=compartment_id, drg_id=drg_id)
+            for compartment_id, drg_id in sorted(
+                set(
+                    (rpcs[rpc_id].compartment_id, rpcs[rpc_id].drg_id)
+                    for rpc_id in connected_rpc_ids
+                )
+            )
+        ]
+        try:
+            waited_rpcs, timed_out_ids = oci_utils.wait_for_resources_lifecycle_state(
+                module,
+                virtual_network_client.list_remote_peering_connections,
+                kwargs_lists,
+                connected_rpc_ids,
+                module.params["wait_until"] or ["PEERED"],
+                state_attribute="peering_status",
+            )
+        except ServiceError as ex:
+            module.fail_json(msg=ex.message, **result)
+        rpc_dicts.update(waited_rpcs)
+        result["remote_peering_connections"] = [rpc_dicts[rpc_id] for rpc_id in rpc_ids]
+        if timed_out_ids:
+            module.fail_json(
+                msg="Timed out waiting for remote peering connections {0} to be peered.".format(
+                    ", ".join(sorted(timed_out_ids))
+                ),
+                **result
+            )
+    return result
+
+
 def main():
     module_args = oci_utils.get_common_arg_spec(
         supports_create=True, supports_wait=True
@@ -250,6 +401,9 @@ def main():
             peer_region_name=dict(type="str", required=False),
             peer_id=dict(type="str", required=False),
             drg_id=dict(type="str", required=False),
+            peerings=dict(type="list", required=False),
+            enable_parallel_requests=dict(type="bool", required=False, default=True),
+            max_thread_count=dict(type="int", required=False),
         )
     )
 
@@ -258,6 +412,10 @@ def main():
         supports_check_mode=False,
         required_if=[("state", "absent", ["remote_peering_connection_id"])],
         required_together=[["peer_id", "peer_region_name"]],
+        mutually_exclusive=[
+            ["peerings", "remote_peering_connection_id"],
+            ["peerings", "peer_id"],
+        ],
     )
 
     if not HAS_OCI_PY_SDK:
@@ -273,6 +431,9 @@ def main():
     if state == "absent":
         result = delete_remote_peering_connection(virtual_network_client, module)
 
+    elif module.params["peerings"] is not None:
+        result = connect_rpc_peerings(virtual_network_client, module)
+
     else:
         remote_peering_connection_id = module.params["remote_peering_connection_id"]
         if remote_peering_connection_id is not None:
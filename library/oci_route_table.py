@@ -100,6 +100,15 @@ options:
         required: false
         default: 'no'
         type: bool
+    incremental_update:
+        description: Update the route rules of an existing Route Table incrementally. Only the route rules to be
+                     added and removed are computed from the existing Route Table, and they are applied to the
+                     latest version of the Route Table with an ETag guarded (if-match) update. If the Route Table
+                     is modified concurrently, for example by another play, the change is applied again to its
+                     latest version instead of overwriting the concurrent modification.
+        required: false
+        default: 'no'
+        type: bool
     state:
         description: Create,update or delete Route Table. For I(state=present), if it
                      does not exist, it gets created. If it exists, it gets updated.
@@ -161,6 +170,16 @@ EXAMPLES = """
           network_entity_id: 'ocid1.internetgateway..abcd'
     state: 'present'
 
+- name: Add a route rule to a Route Table shared by concurrent plays
+  oci_route_table:
+    rt_id: 'ocid1.routetable..xxxxxEXAMPLExxxxx'
+    purge_route_rules: 'no'
+    incremental_update: 'yes'
+    route_rules:
+        - cidr_block: '10.1.0.0/16'
+          network_entity_id: 'ocid1.localpeeringgateway..xxxxxEXAMPLExxxxx'
+    state: 'present'
+
 # Delete Route Table
 - name: Delete Route Table
   oci_route_table:
@@ -386,6 +405,18 @@ def update_route_table(virtual_network_client, existing_route_table, module):
         else:
             route_rules = []
             route_rules_changed = True
+    if module.params.get("incremental_update") and (
+        name_tag_changed or route_rules_changed
+    ):
+        return update_route_table_incrementally(
+            virtual_network_client,
+            existing_route_table,
+            update_route_table_details,
+            route_rules if route_rules_changed else None,
+            name_tag_changed,
+            module,
+        )
+
     if route_rules_changed:
         update_route_table_details.route_rules = route_rules
     else:
@@ -408,6 +439,47 @@ def update_route_table(virtual_network_client, existing_route_table, module):
     return result
 
 
+def update_route_table_incrementally(
+    virtual_network_client,
+    existing_route_table,
+    update_route_table_details,
+    route_rules,
+    name_tag_changed,
+    module,
+):
+    route_rules_to_add, route_rules_to_remove = [], set()
+    if route_rules is not None:
+        route_rules_to_add, route_rules_to_remove = oci_utils.get_component_list_delta(
+            route_rules, get_hashed_route_rules(existing_route_table.route_rules)
+        )
+
+    def get_kwargs_update(route_table):
+        # Apply the delta to the latest route rules of the route table
+        route_rules, route_rules_changed = oci_utils.apply_component_list_delta(
+            get_hashed_route_rules(route_table.route_rules),
+            route_rules_to_add,
+            route_rules_to_remove,
+        )
+        if not (name_tag_changed or route_rules_changed):
+            return None
+        update_route_table_details.route_rules = route_rules
+        return {
+            "rt_id": route_table.id,
+            "update_route_table_details": update_route_table_details,
+        }
+
+    return oci_utils.update_with_if_match(
+        resource_type="route_table",
+        client=virtual_network_client,
+        update_fn=virtual_network_client.update_route_table,
+        get_kwargs_update_fn=get_kwargs_update,
+        get_fn=virtual_network_client.get_route_table,
+        get_param="rt_id",
+        resource_id=existing_route_table.id,
+        module=module,
+    )
+
+
 def get_hashed_route_rules(route_rules):
     route_rules_reprs = []
     supported_route_rule_attributes = [
@@ -451,6 +523,7 @@ def main():
         route_rules=dict(type=list, required=False),
         purge_route_rules=dict(type="bool", required=False, default=True),
         delete_route_rules=dict(type="bool", required=False, default=False),
+        incremental_update=dict(type="bool", required=False, default=False),
     )
     module = AnsibleModule(
         argument_spec=module_args,
@@ -42,7 +42,7 @@ options:
         aliases: ['id']
 author:
     - "Debayan Gupta(@debayan_gupta)"
-extends_documentation_fragment: [ oracle, oracle_display_name_option ]
+extends_documentation_fragment: [ oracle, oracle_display_name_option, oracle_vcn_snapshot_options ]
 """
 
 EXAMPLES = """
@@ -146,7 +146,7 @@ RETURN = """
 """
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.oracle import oci_utils
+from ansible.module_utils.oracle import oci_utils, oci_network_utils
 
 try:
     from oci.core import VirtualNetworkClient
@@ -165,10 +165,12 @@ def list_route_tables(virtual_network_client, module):
     rt_id = module.params.get("rt_id")
     try:
         if compartment_id and vcn_id:
-            existing_route_tables = oci_utils.list_all_resources(
-                virtual_network_client.list_route_tables,
-                compartment_id=compartment_id,
-                vcn_id=vcn_id,
+            existing_route_tables = oci_network_utils.list_vcn_resources(
+                virtual_network_client,
+                module,
+                "route_table",
+                compartment_id,
+                vcn_id,
                 display_name=module.params["display_name"],
             )
         elif rt_id:
@@ -184,6 +186,7 @@ def list_route_tables(virtual_network_client, module):
 
 def main():
     module_args = oci_utils.get_facts_module_arg_spec()
+    module_args.update(oci_network_utils.get_vcn_snapshot_arg_spec())
     module_args.update(
         dict(
             compartment_id=dict(type="str", required=False),
@@ -164,6 +164,26 @@ options:
         required: false
         default: 'yes'
         type: bool
+    minimize_rules:
+        description: Minimize the security rules before creating or updating the security list, without changing the
+                     traffic they allow. Duplicate rules are removed, the overlapping or adjacent port ranges and the
+                     sibling CIDR blocks of otherwise equal rules are merged, and the rules covered by a wider rule
+                     (a rule with an enclosing CIDR block, protocol, port ranges and ICMP type/code, and the same
+                     statefulness) are removed. With I(purge_security_rules=no), the provided rules that are covered
+                     by an existing rule are not appended, and the resulting security rules are minimized as a whole.
+                     Not applicable with I(delete_security_rules=yes).
+        required: false
+        default: 'no'
+        type: bool
+    incremental_update:
+        description: Update the security rules of an existing security list incrementally. Only the security rules
+                     to be added and removed are computed from the existing security list, and they are applied to
+                     the latest version of the security list with an ETag guarded (if-match) update. If the security
+                     list is modified concurrently, for example by another play, the change is applied again to its
+                     latest version instead of overwriting the concurrent modification.
+        required: false
+        default: 'no'
+        type: bool
     delete_security_rules:
         description: Delete security rules from existing security list which are present in the
                      security rules provided by I(ingress_security_rules) and/or I(egress_security_rules).
@@ -244,6 +264,41 @@ EXAMPLES = """
     delete_security_rules: 'yes'
     state: 'present'
 
+- name: Update a security list by appending ingress rules, skipping the rules covered by existing rules and
+        merging the rules which can be merged
+  oci_security_list:
+    security_list_id: 'ocid1.securitylist.xxxxxEXAMPLExxxxx'
+    ingress_security_rules:
+        - source: '10.0.0.0/25'
+          protocol: '6'
+          tcp_options:
+              destination_port_range:
+                 min: '8080'
+                 max: '8080'
+        - source: '10.0.0.128/25'
+          protocol: '6'
+          tcp_options:
+              destination_port_range:
+                 min: '8080'
+                 max: '8080'
+    purge_security_rules: 'no'
+    minimize_rules: 'yes'
+    state: 'present'
+
+- name: Add an ingress rule to a security list shared by concurrent plays
+  oci_security_list:
+    id: 'ocid1.securitylist.xxxxxEXAMPLExxxxx'
+    ingress_security_rules:
+        - source: '10.2.0.0/16'
+          protocol: '6'
+          tcp_options:
+              destination_port_range:
+                 min: '443'
+                 max: '443'
+    purge_security_rules: 'no'
+    incremental_update: 'yes'
+    state: 'present'
+
 # Delete a security list
 - name: Delete a security list
   oci_security_list:
@@ -370,7 +425,7 @@ RETURN = """
 """
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.oracle import oci_utils
+from ansible.module_utils.oracle import oci_utils, oci_network_utils
 
 
 try:
@@ -450,6 +505,13 @@ def create_security_list(virtual_network_client, module):
         egress_security_rules = get_security_rules(
             "egress_security_rules", input_egress_security_rules
         )
+    if module.params.get("minimize_rules"):
+        ingress_security_rules = get_minimized_security_rules(
+            ingress_security_rules, None, True, module
+        )
+        egress_security_rules = get_minimized_security_rules(
+            egress_security_rules, None, True, module
+        )
     create_security_list_details = CreateSecurityListDetails()
     for attribute in create_security_list_details.attribute_map:
         create_security_list_details.__setattr__(
@@ -483,6 +545,7 @@ def update_security_list(virtual_network_client, existing_security_list, module)
     input_egress_security_rules = module.params.get("egress_security_rules")
     purge_security_rules = module.params.get("purge_security_rules")
     delete_security_rules = module.params.get("delete_security_rules")
+    minimize_rules = module.params.get("minimize_rules") and not delete_security_rules
     name_tag_changed = False
     egress_security_rules_changed = False
     ingress_security_rules_changed = False
@@ -503,12 +566,21 @@ def update_security_list(virtual_network_client, existing_security_list, module)
         input_egress_security_rules = get_security_rules(
             "egress_security_rules", input_egress_security_rules
         )
+        hashed_egress_security_rules = get_hashed_security_rules(
+            "egress_security_rules", existing_egress_security_rule
+        )
+        if minimize_rules:
+            # The minimized rules are the complete list of egress rules of the security list
+            input_egress_security_rules = get_minimized_security_rules(
+                input_egress_security_rules,
+                hashed_egress_security_rules,
+                purge_security_rules,
+                module,
+            )
         egress_security_rules, egress_security_rules_changed = oci_utils.check_and_return_component_list_difference(
             input_egress_security_rules,
-            get_hashed_security_rules(
-                "egress_security_rules", existing_egress_security_rule
-            ),
-            purge_security_rules,
+            hashed_egress_security_rules,
+            purge_security_rules or minimize_rules,
             delete_security_rules,
         )
 
@@ -516,15 +588,39 @@ def update_security_list(virtual_network_client, existing_security_list, module)
         input_ingress_security_rules = get_security_rules(
             "ingress_security_rules", input_ingress_security_rules
         )
+        hashed_ingress_security_rules = get_hashed_security_rules(
+            "ingress_security_rules", existing_ingress_security_rule
+        )
+        if minimize_rules:
+            # The minimized rules are the complete list of ingress rules of the security list
+            input_ingress_security_rules = get_minimized_security_rules(
+                input_ingress_security_rules,
+                hashed_ingress_security_rules,
+                purge_security_rules,
+                module,
+            )
         ingress_security_rules, ingress_security_rules_changed = oci_utils.check_and_return_component_list_difference(
             input_ingress_security_rules,
-            get_hashed_security_rules(
-                "ingress_security_rules", existing_ingress_security_rule
-            ),
-            purge_security_rules,
+            hashed_ingress_security_rules,
+            purge_security_rules or minimize_rules,
             delete_security_rules,
         )
 
+    if module.params.get("incremental_update") and (
+        name_tag_changed
+        or egress_security_rules_changed
+        or ingress_security_rules_changed
+    ):
+        return update_security_list_incrementally(
+            virtual_network_client,
+            existing_security_list,
+            update_security_list_details,
+            egress_security_rules if egress_security_rules_changed else None,
+            ingress_security_rules if ingress_security_rules_changed else None,
+            name_tag_changed,
+            module,
+        )
+
     if egress_security_rules_changed:
         update_security_list_details.egress_security_rules = egress_security_rules
     else:
@@ -557,6 +653,100 @@ def update_security_list(virtual_network_client, existing_security_list, module)
     return result
 
 
+def update_security_list_incrementally(
+    virtual_network_client,
+    existing_security_list,
+    update_security_list_details,
+    egress_security_rules,
+    ingress_security_rules,
+    name_tag_changed,
+    module,
+):
+    deltas = dict()
+    try:
+        for security_rules_type, security_rules in [
+            ("egress_security_rules", egress_security_rules),
+            ("ingress_security_rules", ingress_security_rules),
+        ]:
+            if security_rules is None:
+                deltas[security_rules_type] = ([], set())
+            else:
+                deltas[security_rules_type] = oci_network_utils.get_security_rule_delta(
+                    security_rules,
+                    get_hashed_security_rules(
+                        security_rules_type,
+                        getattr(existing_security_list, security_rules_type),
+                    ),
+                )
+    except ValueError as ex:
+        module.fail_json(msg=str(ex))
+
+    def get_kwargs_update(security_list):
+        # Apply the deltas to the latest security rules of the security list
+        changed = name_tag_changed
+        for security_rules_type, delta in deltas.items():
+            security_rules_to_add, compiled_rules_to_remove = delta
+            security_rules, security_rules_changed = oci_network_utils.apply_security_rule_delta(
+                get_hashed_security_rules(
+                    security_rules_type, getattr(security_list, security_rules_type)
+                ),
+                security_rules_to_add,
+                compiled_rules_to_remove,
+            )
+            setattr(update_security_list_details, security_rules_type, security_rules)
+            changed = changed or security_rules_changed
+        if not changed:
+            return None
+        return {
+            "security_list_id": security_list.id,
+            "update_security_list_details": update_security_list_details,
+        }
+
+    return oci_utils.update_with_if_match(
+        resource_type="security_list",
+        client=virtual_network_client,
+        update_fn=virtual_network_client.update_security_list,
+        get_kwargs_update_fn=get_kwargs_update,
+        get_fn=virtual_network_client.get_security_list,
+        get_param="security_list_id",
+        resource_id=existing_security_list.id,
+        module=module,
+    )
+
+
+def get_minimized_security_rules(
+    input_security_rules, existing_security_rules, purge_security_rules, module
+):
+    """
+    Minimize the security rules of a security list with oci_network_utils.minimize_security_rules. When the input
+    security rules are appended to the existing security rules, the input rules that are covered by an existing rule
+    are dropped, and the existing rules along with the remaining input rules are minimized as a whole.
+    :return: The complete list of security rules for the security list
+    """
+    try:
+        if purge_security_rules or not existing_security_rules:
+            return oci_network_utils.minimize_security_rules(input_security_rules)
+
+        index = oci_network_utils.build_security_rule_index(
+            oci_network_utils.compile_security_rule(security_rule)
+            for security_rule in existing_security_rules
+        )
+        new_security_rules = [
+            security_rule
+            for security_rule in input_security_rules
+            if not oci_network_utils.is_security_rule_covered(
+                index, oci_network_utils.compile_security_rule(security_rule)
+            )
+        ]
+        if not new_security_rules:
+            return existing_security_rules
+        return oci_network_utils.minimize_security_rules(
+            existing_security_rules + new_security_rules
+        )
+    except ValueError as ex:
+        module.fail_json(msg=str(ex))
+
+
 def get_hashed_security_rules(security_rules_type, security_rules):
     supported_security_rule_simple_attributes = [
         "source",
@@ -621,64 +811,9 @@ def get_hashed_port_range(port_range):
 
 
 def get_security_rules(security_rule_type, input_security_rules):
-    security_rule = None
-    security_rules = []
-    for input_security_rule in input_security_rules:
-        if security_rule_type == "ingress_security_rules":
-            security_rule = oci_utils.create_hashed_instance(IngressSecurityRule)
-            security_rule.source = input_security_rule["source"]
-            security_rule.source_type = input_security_rule.get(
-                "source_type", "CIDR_BLOCK"
-            )
-        elif security_rule_type == "egress_security_rules":
-            security_rule = oci_utils.create_hashed_instance(EgressSecurityRule)
-            security_rule.destination = input_security_rule["destination"]
-            security_rule.destination_type = input_security_rule.get(
-                "destination_type", "CIDR_BLOCK"
-            )
-        input_icmp_options = input_security_rule.get("icmp_options", None)
-        if input_icmp_options:
-            icmp_options = oci_utils.create_hashed_instance(IcmpOptions)
-            icmp_options.type = input_icmp_options.get("type")
-            icmp_options.code = input_icmp_options.get("code", None)
-            security_rule.icmp_options = icmp_options
-
-        input_tcp_options = input_security_rule.get("tcp_options", None)
-        if input_tcp_options:
-            tcp_options = oci_utils.create_hashed_instance(TcpOptions)
-            get_protocol_option(input_tcp_options, tcp_options)
-            security_rule.tcp_options = tcp_options
-        input_udp_options = input_security_rule.get("udp_options", None)
-        if input_udp_options:
-            udp_options = oci_utils.create_hashed_instance(UdpOptions)
-            get_protocol_option(input_udp_options, udp_options)
-            security_rule.udp_options = udp_options
-
-        security_rule.is_stateless = input_security_rule.get("is_stateless", False)
-        if security_rule.is_stateless is None:
-            security_rule.is_stateless = False
-        security_rule.protocol = input_security_rule.get("protocol").lower()
-        security_rules.append(security_rule)
-
-    return security_rules
-
-
-def get_protocol_option(input_protocol_options, protocol_options):
-    port_range = None
-    input_destination_port_range = input_protocol_options.get(
-        "destination_port_range", None
+    return oci_network_utils.get_security_rules(
+        security_rule_type, input_security_rules
     )
-    if input_destination_port_range:
-        port_range = oci_utils.create_hashed_instance(PortRange)
-        port_range.min = input_destination_port_range["min"]
-        port_range.max = input_destination_port_range["max"]
-        protocol_options.destination_port_range = port_range
-    input_source_port_range = input_protocol_options.get("source_port_range", None)
-    if input_source_port_range:
-        port_range = oci_utils.create_hashed_instance(PortRange)
-        port_range.min = input_source_port_range["min"]
-        port_range.max = input_source_port_range["max"]
-        protocol_options.source_port_range = port_range
 
 
 def delete_security_list(virtual_network_client, module):
@@ -714,6 +849,8 @@ def main():
             egress_security_rules=dict(type=list, required=False),
             purge_security_rules=dict(type="bool", required=False, default=True),
             delete_security_rules=dict(type="bool", required=False, default=False),
+            minimize_rules=dict(type="bool", required=False, default=False),
+            incremental_update=dict(type="bool", required=False, default=False),
         )
     )
 
@@ -42,7 +42,7 @@ options:
         aliases: ['id']
 author:
     - "Debayan Gupta(@debayan_gupta)"
-extends_documentation_fragment: [ oracle, oracle_display_name_option ]
+extends_documentation_fragment: [ oracle, oracle_display_name_option, oracle_vcn_snapshot_options ]
 """
 
 EXAMPLES = """
@@ -226,7 +226,7 @@ RETURN = """
 """
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.oracle import oci_utils
+from ansible.module_utils.oracle import oci_utils, oci_network_utils
 
 
 try:
@@ -246,10 +246,12 @@ def list_security_lists(virtual_network_client, module):
     security_list_id = module.params.get("security_list_id")
     try:
         if compartment_id and vcn_id:
-            existing_security_lists = oci_utils.list_all_resources(
-                virtual_network_client.list_security_lists,
-                compartment_id=compartment_id,
-                vcn_id=vcn_id,
+            existing_security_lists = oci_network_utils.list_vcn_resources(
+                virtual_network_client,
+                module,
+                "security_list",
+                compartment_id,
+                vcn_id,
                 display_name=module.params["display_name"],
             )
         elif security_list_id:
@@ -266,6 +268,7 @@ def list_security_lists(virtual_network_client, module):
 
 def main():
     module_args = oci_utils.get_facts_module_arg_spec()
+    module_args.update(oci_network_utils.get_vcn_snapshot_arg_spec())
     module_args.update(
         dict(
             compartment_id=dict(type="str", required=False),
@@ -28,8 +28,18 @@ options:
                      I(state=present).
         required: false
     cidr_block:
-        description: The CIDR IP address range of the subnet. Required when creating a subnet with I(state=present).
+        description: The CIDR IP address range of the subnet. Required when creating a subnet with I(state=present),
+                     unless I(cidr_prefix_length) is specified. Before a subnet is created, its CIDR block is validated
+                     against the CIDR blocks of the VCN and the CIDR blocks of the existing subnets of the VCN.
         required: false
+    cidr_prefix_length:
+        description: The prefix length of the CIDR block to allocate to the subnet, when I(cidr_block) is not
+                     specified. The free CIDR block of that size with the lowest address in the first CIDR block of
+                     the VCN that has one is allocated, as computed from a single listing of the subnets of the VCN. If a subnet of the VCN with the same
+                     I(display_name) and prefix length exists, its CIDR block is used. I(display_name) is required with
+                     this option.
+        required: false
+        type: int
     compartment_id:
         description: The OCID of the compartment to contain the subnet. Required when creating a subnet with
                      I(state=present).
@@ -96,6 +106,14 @@ EXAMPLES = """
     prohibit_public_ip_on_vnic: true
     vcn_id: ocid1.vcn.oc1.phx.xxxxxEXAMPLExxxxx
 
+- name: Create a subnet with the next free /24 CIDR block of the VCN
+  oci_subnet:
+    availability_domain: BnQb:PHX-AD-1
+    cidr_prefix_length: 24
+    compartment_id: ocid1.compartment.oc1..xxxxxEXAMPLExxxxx
+    display_name: ansible_subnet
+    vcn_id: ocid1.vcn.oc1.phx.xxxxxEXAMPLExxxxx
+
 - name: Update subnet's display name and associated route table
   oci_subnet:
     display_name: ansible_subnet
@@ -143,13 +161,14 @@ subnet:
 """
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.oracle import oci_utils
+from ansible.module_utils.oracle import oci_utils, oci_network_utils
 
 
 try:
     from oci.core.virtual_network_client import VirtualNetworkClient
     from oci.core.models import CreateSubnetDetails
     from oci.core.models import UpdateSubnetDetails
+    from oci.exceptions import ServiceError
 
     HAS_OCI_PY_SDK = True
 
@@ -200,6 +219,100 @@ def create_subnet(virtual_network_client, module):
     )
 
 
+def get_subnet_cidr_block(virtual_network_client, module, vcn):
+    """
+    Validate the CIDR block of the subnet to create against the CIDR blocks of the VCN and its existing subnets, or
+    allocate a free CIDR block of `cidr_prefix_length` to the subnet, before the subnet is created.
+    :return: The CIDR block of the subnet
+    """
+    try:
+        subnets = [
+            subnet
+            for subnet in oci_utils.list_all_resources(
+                virtual_network_client.list_subnets,
+                compartment_id=module.params["compartment_id"],
+                vcn_id=vcn.id,
+            )
+            if subnet.lifecycle_state
+            not in oci_network_utils.VCN_RESOURCE_TERMINATED_STATES
+        ]
+    except ServiceError as ex:
+        module.fail_json(msg=ex.message)
+    cidr_block = module.params["cidr_block"]
+    cidr_prefix_length = module.params["cidr_prefix_length"]
+    if cidr_prefix_length is not None:
+        if not module.params["display_name"]:
+            module.fail_json(msg="display_name is required with cidr_prefix_length.")
+        for subnet in subnets:
+            if (
+                subnet.display_name == module.params["display_name"]
+                and oci_network_utils.parse_cidr_block(subnet.cidr_block)[2]
+                == cidr_prefix_length
+            ):
+                return subnet.cidr_block
+    elif any(subnet.cidr_block == cidr_block for subnet in subnets):
+        # Either the subnet exists already, or the service reports the conflict
+        return cidr_block
+
+    try:
+        allocators = oci_network_utils.get_cidr_allocators(
+            oci_network_utils.get_vcn_cidr_blocks(vcn),
+            [subnet.cidr_block for subnet in subnets],
+        )
+        if cidr_prefix_length is not None:
+            return oci_network_utils.allocate_cidr_block_in(
+                allocators, cidr_prefix_length
+            )
+        oci_network_utils.reserve_cidr_block_in(allocators, cidr_block)
+    except ValueError as ex:
+        module.fail_json(msg=str(ex))
+    return cidr_block
+
+
+def check_and_create_subnet(virtual_network_client, module):
+    vcn = oci_utils.call_with_backoff(
+        virtual_network_client.get_vcn, vcn_id=module.params["vcn_id"]
+    ).data
+    if (
+        module.params["cidr_block"] is not None
+        or module.params["cidr_prefix_length"] is not None
+    ):
+        module = oci_utils.get_module_with_params_overlay(
+            module,
+            {"cidr_block": get_subnet_cidr_block(virtual_network_client, module, vcn)},
+        )
+
+    exclude_attributes = {
+        "display_name": True,
+        "dns_label": True,
+        "dhcp_options_id": True,
+    }
+    default_attribute_values = {
+        "dhcp_options_id": vcn.default_dhcp_options_id,
+        "prohibit_public_ip_on_vnic": False,
+        "route_table_id": vcn.default_route_table_id,
+        "security_list_ids": [vcn.default_security_list_id],
+    }
+
+    return oci_utils.check_and_create_resource(
+        resource_type="subnet",
+        create_fn=create_subnet,
+        kwargs_create={
+            "virtual_network_client": virtual_network_client,
+            "module": module,
+        },
+        list_fn=virtual_network_client.list_subnets,
+        kwargs_list={
+            "compartment_id": module.params["compartment_id"],
+            "vcn_id": module.params["vcn_id"],
+        },
+        module=module,
+        model=CreateSubnetDetails(),
+        exclude_attributes=exclude_attributes,
+        default_attribute_values=default_attribute_values,
+    )
+
+
 def main():
     module_args = oci_utils.get_taggable_arg_spec(
         supports_create=True, supports_wait=True
@@ -208,6 +321,7 @@ def main():
         dict(
             availability_domain=dict(type="str", required=False),
             cidr_block=dict(type="str", required=False),
+            cidr_prefix_length=dict(type="int", required=False),
             compartment_id=dict(type="str", required=False),
             dhcp_options_id=dict(type="str", required=False),
             display_name=dict(type="str", required=False, aliases=["name"]),
@@ -226,7 +340,11 @@ def main():
         )
     )
 
-    module = AnsibleModule(argument_spec=module_args, supports_check_mode=False)
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=False,
+        mutually_exclusive=[["cidr_block", "cidr_prefix_length"]],
+    )
 
     if not HAS_OCI_PY_SDK:
         module.fail_json(msg="oci python sdk required for this module.")
@@ -234,11 +352,6 @@ def main():
     virtual_network_client = oci_utils.create_service_client(
         module, VirtualNetworkClient
     )
-    exclude_attributes = {
-        "display_name": True,
-        "dns_label": True,
-        "dhcp_options_id": True,
-    }
     state = module.params["state"]
     subnet_id = module.params["subnet_id"]
 
@@ -254,34 +367,7 @@ def main():
         if subnet_id is not None:
             result = update_subnet(virtual_network_client, module)
         else:
-            vcn = oci_utils.call_with_backoff(
-                virtual_network_client.get_vcn, vcn_id=module.params["vcn_id"]
-            ).data
-
-            default_attribute_values = {
-                "dhcp_options_id": vcn.default_dhcp_options_id,
-                "prohibit_public_ip_on_vnic": False,
-                "route_table_id": vcn.default_route_table_id,
-                "security_list_ids": [vcn.default_security_list_id],
-            }
-
-            result = oci_utils.check_and_create_resource(
-                resource_type="subnet",
-                create_fn=create_subnet,
-                kwargs_create={
-                    "virtual_network_client": virtual_network_client,
-                    "module": module,
-                },
-                list_fn=virtual_network_client.list_subnets,
-                kwargs_list={
-                    "compartment_id": module.params["compartment_id"],
-                    "vcn_id": module.params["vcn_id"],
-                },
-                module=module,
-                model=CreateSubnetDetails(),
-                exclude_attributes=exclude_attributes,
-                default_attribute_values=default_attribute_values,
-            )
+            result = check_and_create_subnet(virtual_network_client, module)
 
     module.exit_json(**result)
 
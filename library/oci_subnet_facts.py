@@ -43,7 +43,7 @@ options:
         required: false
         choices: ["PROVISIONING", "AVAILABLE", "TERMINATING", "TERMINATED"]
 author: "Rohit Chaware (@rohitChaware)"
-extends_documentation_fragment: [ oracle, oracle_display_name_option ]
+extends_documentation_fragment: [ oracle, oracle_display_name_option, oracle_vcn_snapshot_options ]
 """
 
 EXAMPLES = """
@@ -52,6 +52,12 @@ EXAMPLES = """
     compartment_id: ocid1.compartment.oc1..xxxxxEXAMPLExxxxx
     vcn_id: ocid1.vcn.oc1.phx.xxxxxEXAMPLExxxxx
 
+- name: Get the subnets of a VCN from a snapshot of the VCN shared with other networking facts tasks
+  oci_subnet_facts:
+    compartment_id: ocid1.compartment.oc1..xxxxxEXAMPLExxxxx
+    vcn_id: ocid1.vcn.oc1.phx.xxxxxEXAMPLExxxxx
+    use_vcn_snapshot: yes
+
 - name: Get a specific subnet
   oci_subnet_facts:
     subnet_id: ocid1.subnet.oc1.phx.xxxxxEXAMPLExxxxx
@@ -174,7 +180,7 @@ subnets:
 """
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.oracle import oci_utils
+from ansible.module_utils.oracle import oci_utils, oci_network_utils
 
 try:
     from oci.core.virtual_network_client import VirtualNetworkClient
@@ -189,6 +195,7 @@ except ImportError:
 
 def main():
     module_args = oci_utils.get_facts_module_arg_spec()
+    module_args.update(oci_network_utils.get_vcn_snapshot_arg_spec())
     module_args.update(
         dict(
             compartment_id=dict(type="str", required=False),
@@ -235,13 +242,13 @@ def main():
                 for param in optional_list_method_params
                 if module.params.get(param) is not None
             }
-            result = to_dict(
-                oci_utils.list_all_resources(
-                    virtual_network_client.list_subnets,
-                    compartment_id=compartment_id,
-                    vcn_id=vcn_id,
-                    **optional_kwargs
-                )
+            result = oci_network_utils.list_vcn_resources(
+                virtual_network_client,
+                module,
+                "subnet",
+                compartment_id,
+                vcn_id,
+                **optional_kwargs
             )
         except ServiceError as ex:
             module.fail_json(msg=ex.message)
@@ -0,0 +1,849 @@
+#!/usr/bin/python
+# Copyright (c) 2019, Oracle and/or its affiliates.
+# This software is made available to you under the terms of the GPL 3.0 license or the Apache 2.0 license.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0
+# See LICENSE.TXT for details.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+ANSIBLE_METADATA = {
+    "metadata_version": "1.1",
+    "status": ["preview"],
+    "supported_by": "community",
+}
+
+DOCUMENTATION = """
+---
+module: oci_vcn_topology
+short_description: Reconcile a whole VCN topology in OCI
+description:
+    - This module reconciles a Virtual Cloud Network (VCN) and its gateways, DHCP options, security lists, route tables
+      and subnets with a declarative description of the topology, in a single task.
+    - The existing resources of the VCN are listed once per resource type, concurrently. The resources of the topology
+      are identified by their display name, which must be unique for a resource type within the VCN. Resources of the
+      VCN that are not part of the topology are left untouched.
+    - The resources are created or updated in dependency order, gateways, DHCP options and security lists first, then
+      route tables and finally subnets. The resources that do not depend on each other are created or updated in
+      parallel, and waited for together, before the resources depending on them are processed.
+version_added: "2.5"
+options:
+    compartment_id:
+        description: The OCID of the compartment containing the VCN and its resources.
+        required: true
+    vcn_id:
+        description: The OCID of an existing VCN. If not specified, the VCN is looked up by I(display_name) in the
+                     compartment, and created if it doesn't exist.
+        required: false
+        aliases: [ 'id' ]
+    display_name:
+        description: The display name of the VCN. Required if I(vcn_id) is not specified.
+        required: false
+        aliases: [ 'name' ]
+    cidr_block:
+        description: The CIDR IP address block of the VCN. Required to create the VCN.
+        required: false
+    dns_label:
+        description: A DNS label for the VCN, used in conjunction with the VNIC's hostname and subnet's DNS label to
+                     form a fully qualified domain name (FQDN) for each VNIC within this subnet. Only used to create the
+                     VCN.
+        required: false
+    internet_gateways:
+        description: The internet gateways of the VCN. Each internet gateway is a dict with the C(display_name) of the
+                     internet gateway and C(is_enabled), whether the gateway is enabled (default C(true)).
+        required: false
+        type: list
+    nat_gateways:
+        description: The NAT gateways of the VCN. Each NAT gateway is a dict with the C(display_name) of the NAT
+                     gateway and C(block_traffic), whether the NAT gateway blocks traffic through it.
+        required: false
+        type: list
+    service_gateways:
+        description: The service gateways of the VCN. Each service gateway is a dict with the C(display_name) of the
+                     service gateway and C(services), the list of the OCIDs of the services enabled on it.
+        required: false
+        type: list
+    dhcp_options:
+        description: The sets of DHCP options of the VCN. Each set of DHCP options is a dict with the C(display_name)
+                     of the set and its C(options), as described in M(oci_dhcp_options).
+        required: false
+        type: list
+    security_lists:
+        description: The security lists of the VCN. Each security list is a dict with the C(display_name) of the
+                     security list, its C(ingress_security_rules) and its C(egress_security_rules), as described in
+                     M(oci_security_list). The security rules of an existing security list are replaced by the
+                     specified ones.
+        required: false
+        type: list
+    route_tables:
+        description: The route tables of the VCN. Each route table is a dict with the C(display_name) of the route
+                     table and its C(route_rules). A route rule has a C(destination), a C(destination_type) (default
+                     C(CIDR_BLOCK)) and either C(network_entity), the display name of an internet, NAT or service
+                     gateway of the VCN, or C(network_entity_id), the OCID of the target of the route rule. The route
+                     rules of an existing route table are replaced by the specified ones.
+        required: false
+        type: list
+    subnets:
+        description: The subnets of the VCN. Each subnet is a dict with the C(display_name), C(cidr_block),
+                     C(availability_domain), C(dns_label) and C(prohibit_public_ip_on_vnic) of the subnet, and with
+                     C(route_table), C(security_lists) and C(dhcp_options), the display names of the route table, the
+                     security lists and the set of DHCP options of the VCN that the subnet uses. The display names can
+                     refer to resources of the topology or to existing resources of the VCN, like its default route
+                     table. The VCN defaults are used when they are not specified. Instead of a C(cidr_block), a new
+                     subnet can have a C(cidr_prefix_length), the prefix length of the free CIDR block of the VCN to
+                     allocate to it. The CIDR blocks of the new subnets are validated and allocated against the
+                     existing subnets of the VCN before any subnet is created, so that the subnets are created in
+                     parallel without overlapping.
+        required: false
+        type: list
+    enable_parallel_requests:
+        description: Whether to list, create and update the resources that do not depend on each other in parallel.
+        required: false
+        default: True
+        type: bool
+    max_thread_count:
+        description: When I(enable_parallel_requests=True), indicates the number of maximum parallel operations. The
+                     default number of threads used is the number of cores in your machine.
+        required: false
+        type: int
+    state:
+        description: The state of the VCN topology that must be asserted to. Only I(state=present) is supported.
+        required: false
+        default: 'present'
+        choices: ['present']
+author: "Rohit Chaware (@rohitChaware)"
+notes:
+    - The resources a resource depends on are always waited for before the resource is created or updated. I(wait)
+      only controls whether the resources of the last level, usually the subnets, are waited for.
+extends_documentation_fragment: [ oracle, oracle_wait_options ]
+"""
+
+EXAMPLES = """
+- name: Create or update a VCN with public and private subnets
+  oci_vcn_topology:
+    compartment_id: ocid1.compartment.oc1..xxxxxEXAMPLExxxxx
+    display_name: ansible_vcn
+    cidr_block: 10.0.0.0/16
+    dns_label: ansiblevcn
+    internet_gateways:
+      - display_name: ansible_igw
+    nat_gateways:
+      - display_name: ansible_natgw
+    security_lists:
+      - display_name: ansible_public_sl
+        ingress_security_rules:
+          - source: 0.0.0.0/0
+            protocol: "6"
+            tcp_options:
+              destination_port_range:
+                min: 443
+                max: 443
+        egress_security_rules:
+          - destination: 0.0.0.0/0
+            protocol: all
+    route_tables:
+      - display_name: ansible_public_rt
+        route_rules:
+          - destination: 0.0.0.0/0
+            network_entity: ansible_igw
+      - display_name: ansible_private_rt
+        route_rules:
+          - destination: 0.0.0.0/0
+            network_entity: ansible_natgw
+    subnets:
+      - display_name: ansible_public_subnet
+        cidr_block: 10.0.0.0/24
+        availability_domain: BnQb:PHX-AD-1
+        route_table: ansible_public_rt
+        security_lists: [ ansible_public_sl ]
+      - display_name: ansible_private_subnet
+        cidr_prefix_length: 24
+        availability_domain: BnQb:PHX-AD-1
+        prohibit_public_ip_on_vnic: true
+        route_table: ansible_private_rt
+"""
+
+RETURN = """
+vcn_topology:
+    description: The VCN and the resources of the topology, after reconciliation
+    returned: always
+    type: complex
+    contains:
+        vcn:
+            description: Information about the VCN
+            returned: always
+            type: dict
+            sample: {"id": "ocid1.vcn.oc1.phx.xxxxxEXAMPLExxxxx", "display_name": "ansible_vcn",
+                     "cidr_block": "10.0.0.0/16", "lifecycle_state": "AVAILABLE"}
+        internet_gateways:
+            description: Information about the internet gateways of the topology
+            returned: always
+            type: list
+            sample: [{"id": "ocid1.internetgateway.oc1.phx.xxxxxEXAMPLExxxxx", "display_name": "ansible_igw",
+                      "is_enabled": true, "lifecycle_state": "AVAILABLE"}]
+        nat_gateways:
+            description: Information about the NAT gateways of the topology
+            returned: always
+            type: list
+            sample: []
+        service_gateways:
+            description: Information about the service gateways of the topology
+            returned: always
+            type: list
+            sample: []
+        dhcp_options:
+            description: Information about the sets of DHCP options of the topology
+            returned: always
+            type: list
+            sample: []
+        security_lists:
+            description: Information about the security lists of the topology
+            returned: always
+            type: list
+            sample: []
+        route_tables:
+            description: Information about the route tables of the topology
+            returned: always
+            type: list
+            sample: []
+        subnets:
+            description: Information about the subnets of the topology
+            returned: always
+            type: list
+            sample: [{"id": "ocid1.subnet.oc1.phx.xxxxxEXAMPLExxxxx", "display_name": "ansible_public_subnet",
+                      "cidr_block": "10.0.0.0/24", "lifecycle_state": "AVAILABLE"}]
+topology_changes:
+    description: The resources created or updated, with the level at which they were processed. The resources of a
+                 level were created or updated in parallel.
+    returned: always
+    type: list
+    sample: [{"resource_type": "internet_gateway", "display_name": "ansible_igw", "action": "create", "level": 0},
+             {"resource_type": "route_table", "display_name": "ansible_public_rt", "action": "update", "level": 1}]
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.oracle import oci_utils, oci_network_utils
+
+try:
+    from oci.core import VirtualNetworkClient, models
+    from oci.exceptions import ServiceError, MaximumWaitTimeExceeded
+    from oci.util import to_dict
+    from oci.core.models import (
+        CreateVcnDetails,
+        ServiceIdRequestDetails,
+        DhcpDnsOption,
+        DhcpSearchDomainOption,
+        RouteRule,
+    )
+
+    HAS_OCI_PY_SDK = True
+except ImportError:
+    HAS_OCI_PY_SDK = False
+
+
+# The module option, and the SDK functions, models and argument names used to create and update each type of resource of
+# a VCN topology
+TOPOLOGY_RESOURCE_TYPES = {
+    "internet_gateway": dict(
+        option="internet_gateways",
+        create_fn="create_internet_gateway",
+        create_details="CreateInternetGatewayDetails",
+        create_details_param="create_internet_gateway_details",
+        update_fn="update_internet_gateway",
+        update_details="UpdateInternetGatewayDetails",
+        update_details_param="update_internet_gateway_details",
+        id_param="ig_id",
+    ),
+    "nat_gateway": dict(
+        option="nat_gateways",
+        create_fn="create_nat_gateway",
+        create_details="CreateNatGatewayDetails",
+        create_details_param="create_nat_gateway_details",
+        update_fn="update_nat_gateway",
+        update_details="UpdateNatGatewayDetails",
+        update_details_param="update_nat_gateway_details",
+        id_param="nat_gateway_id",
+    ),
+    "service_gateway": dict(
+        option="service_gateways",
+        create_fn="create_service_gateway",
+        create_details="CreateServiceGatewayDetails",
+        create_details_param="create_service_gateway_details",
+        update_fn="update_service_gateway",
+        update_details="UpdateServiceGatewayDetails",
+        update_details_param="update_service_gateway_details",
+        id_param="service_gateway_id",
+    ),
+    "dhcp_options": dict(
+        option="dhcp_options",
+        create_fn="create_dhcp_options",
+        create_details="CreateDhcpDetails",
+        create_details_param="create_dhcp_details",
+        update_fn="update_dhcp_options",
+        update_details="UpdateDhcpDetails",
+        update_details_param="update_dhcp_details",
+        id_param="dhcp_id",
+    ),
+    "security_list": dict(
+        option="security_lists",
+        create_fn="create_security_list",
+        create_details="CreateSecurityListDetails",
+        create_details_param="create_security_list_details",
+        update_fn="update_security_list",
+        update_details="UpdateSecurityListDetails",
+        update_details_param="update_security_list_details",
+        id_param="security_list_id",
+    ),
+    "route_table": dict(
+        option="route_tables",
+        create_fn="create_route_table",
+        create_details="CreateRouteTableDetails",
+        create_details_param="create_route_table_details",
+        update_fn="update_route_table",
+        update_details="UpdateRouteTableDetails",
+        update_details_param="update_route_table_details",
+        id_param="rt_id",
+    ),
+    "subnet": dict(
+        option="subnets",
+        create_fn="create_subnet",
+        create_details="CreateSubnetDetails",
+        create_details_param="create_subnet_details",
+        update_fn="update_subnet",
+        update_details="UpdateSubnetDetails",
+        update_details_param="update_subnet_details",
+        id_param="subnet_id",
+    ),
+}
+
+GATEWAY_RESOURCE_TYPES = ["internet_gateway", "nat_gateway", "service_gateway"]
+
+TOPOLOGY_READY_STATES = ["AVAILABLE"]
+
+
+def get_topology_nodes(module):
+    """
+    Return the resources of the topology specified in the module options, as a dictionary of (resource type, display
+    name) to the dict describing the resource.
+    """
+    nodes = dict()
+    for resource_type, resource_type_details in TOPOLOGY_RESOURCE_TYPES.items():
+        for resource in module.params.get(resource_type_details["option"]) or []:
+            display_name = resource.get("display_name")
+            if not display_name:
+                module.fail_json(
+                    msg="display_name is required for every entry of {0}.".format(
+                        resource_type_details["option"]
+                    )
+                )
+            if (resource_type, display_name) in nodes:
+                module.fail_json(
+                    msg="Duplicate {0} {1} in the topology.".format(
+                        resource_type, display_name
+                    )
+                )
+            nodes[(resource_type, display_name)] = resource
+    return nodes
+
+
+def get_node_references(node, resource):
+    """
+    Return the (resource type, display name) of the resources referred to by a resource of the topology. Route rules
+    refer to gateways by their display name only, so a reference to a gateway is returned with a None resource type.
+    """
+    resource_type, _ = node
+    references = []
+    if resource_type == "route_table":
+        for route_rule in resource.get("route_rules") or []:
+            if route_rule.get("network_entity"):
+                references.append((None, route_rule["network_entity"]))
+    elif resource_type == "subnet":
+        if resource.get("route_table"):
+            references.append(("route_table", resource["route_table"]))
+        for security_list in resource.get("security_lists") or []:
+            references.append(("security_list", security_list))
+        if resource.get("dhcp_options"):
+            references.append(("dhcp_options", resource["dhcp_options"]))
+    return references
+
+
+def resolve_reference(reference, nodes, resources_by_name):
+    """
+    Return the (resource type, display name) of the resource a reference refers to, looking for it in the topology and
+    in the existing resources of the VCN.
+    """
+    resource_type, display_name = reference
+    resource_types = [resource_type] if resource_type else GATEWAY_RESOURCE_TYPES
+    matches = [
+        (candidate_type, display_name)
+        for candidate_type in resource_types
+        if (candidate_type, display_name) in nodes
+        or display_name in resources_by_name.get(candidate_type, {})
+    ]
+    if not matches:
+        raise ValueError(
+            "No {0} named {1} in the topology or in the VCN".format(
+                resource_type or "gateway", display_name
+            )
+        )
+    if len(matches) > 1:
+        raise ValueError(
+            "More than one gateway named {0} in the topology or in the VCN".format(
+                display_name
+            )
+        )
+    return matches[0]
+
+
+def plan_subnet_cidr_blocks(nodes, existing_subnets, vcn):
+    """
+    Validate the CIDR blocks of the new subnets of the topology against the VCN and its existing subnets, and allocate
+    a CIDR block to the new subnets that only have a `cidr_prefix_length`, in display name order.
+    :raises ValueError: If a CIDR block is not within the VCN or overlaps with another subnet, or if there is no free
+                        CIDR block of a requested size left in the VCN
+    """
+    subnet_nodes = sorted(node for node in nodes if node[0] == "subnet")
+    if not subnet_nodes:
+        return
+    existing_subnets_by_name = dict(
+        (subnet.display_name, subnet) for subnet in existing_subnets
+    )
+    allocators = oci_network_utils.get_cidr_allocators(
+        oci_network_utils.get_vcn_cidr_blocks(vcn),
+        [subnet.cidr_block for subnet in existing_subnets],
+    )
+    for node in subnet_nodes:
+        resource = nodes[node]
+        existing_subnet = existing_subnets_by_name.get(node[1])
+        if existing_subnet is not None:
+            if (
+                resource.get("cidr_prefix_length") is not None
+                and oci_network_utils.parse_cidr_block(existing_subnet.cidr_block)[2]
+                != resource["cidr_prefix_length"]
+            ):
+                raise ValueError(
+                    "cidr_prefix_length of the existing subnet {0} cannot be changed".format(
+                        node[1]
+                    )
+                )
+        elif resource.get("cidr_block"):
+            oci_network_utils.reserve_cidr_block_in(allocators, resource["cidr_block"])
+    for node in subnet_nodes:
+        resource = nodes[node]
+        if (
+            node[1] not in existing_subnets_by_name
+            and not resource.get("cidr_block")
+            and resource.get("cidr_prefix_length") is not None
+        ):
+            nodes[node] = dict(
+                resource,
+                cidr_block=oci_network_utils.allocate_cidr_block_in(
+                    allocators, resource["cidr_prefix_length"]
+                ),
+            )
+
+
+def get_dhcp_options(options):
+    dhcp_options = []
+    for option in options or []:
+        if option["type"] == "DomainNameServer":
+            dhcp_option = DhcpDnsOption(
+                type="DomainNameServer",
+                server_type=option["server_type"],
+                custom_dns_servers=option.get("custom_dns_servers") or [],
+            )
+        else:
+            dhcp_option = DhcpSearchDomainOption(
+                type="SearchDomain",
+                search_domain_names=option.get("search_domain_names"),
+            )
+        dhcp_options.append(dhcp_option)
+    return dhcp_options
+
+
+def get_desired_attributes(node, resource, get_resource_id):
+    """
+    Return the attributes of a resource of the topology, as SDK models, with the references to other resources
+    resolved to OCIDs with `get_resource_id`.
+    """
+    resource_type, display_name = node
+    attributes = dict(display_name=display_name)
+    if resource_type == "internet_gateway":
+        attributes["is_enabled"] = resource.get("is_enabled", True)
+    elif resource_type == "nat_gateway":
+        attributes["block_traffic"] = resource.get("block_traffic")
+    elif resource_type == "service_gateway":
+        attributes["services"] = [
+            ServiceIdRequestDetails(service_id=service_id)
+            for service_id in resource.get("services") or []
+        ]
+    elif resource_type == "dhcp_options":
+        attributes["options"] = get_dhcp_options(resource.get("options"))
+    elif resource_type == "security_list":
+        for security_rules_type in ["ingress_security_rules", "egress_security_rules"]:
+            attributes[security_rules_type] = oci_network_utils.get_security_rules(
+                security_rules_type, resource.get(security_rules_type) or []
+            )
+    elif resource_type == "route_table":
+        attributes["route_rules"] = [
+            RouteRule(
+                destination=route_rule.get("destination"),
+                destination_type=route_rule.get("destination_type", "CIDR_BLOCK"),
+                network_entity_id=(
+                    get_resource_id((None, route_rule["network_entity"]))
+                    if route_rule.get("network_entity")
+                    else route_rule.get("network_entity_id")
+                ),
+            )
+            for route_rule in resource.get("route_rules") or []
+        ]
+    elif resource_type == "subnet":
+        for attribute in [
+            "cidr_block",
+            "availability_domain",
+            "dns_label",
+            "prohibit_public_ip_on_vnic",
+        ]:
+            attributes[attribute] = resource.get(attribute)
+        if resource.get("route_table"):
+            attributes["route_table_id"] = get_resource_id(
+                ("route_table", resource["route_table"])
+            )
+        if resource.get("security_lists"):
+            attributes["security_list_ids"] = [
+                get_resource_id(("security_list", security_list))
+                for security_list in resource["security_lists"]
+            ]
+        if resource.get("dhcp_options"):
+            attributes["dhcp_options_id"] = get_resource_id(
+                ("dhcp_options", resource["dhcp_options"])
+            )
+    return attributes
+
+
+def get_node_change(
+    node, desired_attributes, existing_resource, compartment_id, vcn_id
+):
+    """
+    Compute the change needed to reconcile a resource of the topology.
+    :return: None if the existing resource matches the desired attributes, otherwise a dict with the action, the SDK
+             function and its arguments
+    """
+    resource_type, display_name = node
+    resource_type_details = TOPOLOGY_RESOURCE_TYPES[resource_type]
+    if existing_resource is None:
+        details = getattr(models, resource_type_details["create_details"])()
+        details.compartment_id = compartment_id
+        details.vcn_id = vcn_id
+        for attribute, value in desired_attributes.items():
+            setattr(details, attribute, value)
+        return dict(
+            node=node,
+            action="create",
+            function=resource_type_details["create_fn"],
+            kwargs={resource_type_details["create_details_param"]: details},
+        )
+
+    existing_attributes = to_dict(existing_resource)
+    details = getattr(models, resource_type_details["update_details"])()
+    changed = False
+    for attribute, value in desired_attributes.items():
+        if oci_utils.is_value_matching(
+            to_dict(value), existing_attributes.get(attribute)
+        ):
+            continue
+        if attribute not in details.attribute_map:
+            raise ValueError(
+                "{0} of the existing {1} {2} cannot be changed".format(
+                    attribute, resource_type, display_name
+                )
+            )
+        setattr(details, attribute, value)
+        changed = True
+    if not changed:
+        return None
+    return dict(
+        node=node,
+        action="update",
+        function=resource_type_details["update_fn"],
+        kwargs={
+            resource_type_details["id_param"]: existing_resource.id,
+            resource_type_details["update_details_param"]: details,
+        },
+    )
+
+
+def apply_node_change(virtual_network_client, change):
+    # Runs in a worker thread, so errors are returned to the caller instead of failing the module here
+    try:
+        response = oci_utils.call_with_backoff(
+            getattr(virtual_network_client, change["function"]), **change["kwargs"]
+        )
+        return dict(resource=response.data, error=None)
+    except ServiceError as ex:
+        return dict(resource=None, error=ex.message)
+
+
+def wait_for_resources(
+    virtual_network_client, module, compartment_id, vcn_id, nodes_by_id
+):
+    """
+    Wait for the resources created or updated at a level of the topology to be AVAILABLE, with one listing per poll
+    round and resource type, the resource types being waited for concurrently.
+    :return: A dictionary of OCID to the last seen state of the resources
+    """
+    ids_by_resource_type = dict()
+    for resource_id, (resource_type, _) in nodes_by_id.items():
+        ids_by_resource_type.setdefault(resource_type, []).append(resource_id)
+
+    def wait_for_resource_type(resource_type):
+        list_fn = getattr(
+            virtual_network_client,
+            oci_network_utils.VCN_RESOURCE_LIST_FUNCTIONS[resource_type],
+        )
+        return oci_utils.wait_for_resources_lifecycle_state(
+            module,
+            list_fn,
+            [dict(compartment_id=compartment_id, vcn_id=vcn_id)],
+            ids_by_resource_type[resource_type],
+            TOPOLOGY_READY_STATES,
+        )
+
+    resource_types = sorted(ids_by_resource_type)
+    resources = dict()
+    timed_out_ids = []
+    for waited_resources, waited_timed_out_ids in oci_utils.execute_tasks(
+        wait_for_resource_type, resource_types, module
+    ):
+        resources.update(waited_resources)
+        timed_out_ids.extend(waited_timed_out_ids)
+    if timed_out_ids:
+        module.fail_json(
+            msg="Timed out waiting for {0} to be AVAILABLE.".format(
+                ", ".join(
+                    "{0} {1}".format(*nodes_by_id[resource_id])
+                    for resource_id in sorted(timed_out_ids)
+                )
+            )
+        )
+    return resources
+
+
+def get_or_create_vcn(virtual_network_client, module, wait_for_vcn):
+    compartment_id = module.params["compartment_id"]
+    vcn_id = module.params.get("vcn_id")
+    if vcn_id:
+        return (
+            to_dict(
+                oci_utils.call_with_backoff(
+                    virtual_network_client.get_vcn, vcn_id=vcn_id
+                ).data
+            ),
+            False,
+        )
+
+    display_name = module.params.get("display_name")
+    if not display_name:
+        module.fail_json(msg="Specify display_name or vcn_id to identify the VCN.")
+    for vcn in oci_utils.list_all_resources(
+        virtual_network_client.list_vcns,
+        compartment_id=compartment_id,
+        display_name=display_name,
+    ):
+        if vcn.lifecycle_state not in oci_network_utils.VCN_RESOURCE_TERMINATED_STATES:
+            return to_dict(vcn), False
+
+    if not module.params.get("cidr_block"):
+        module.fail_json(msg="cidr_block is required to create the VCN.")
+    create_vcn_details = CreateVcnDetails(
+        cidr_block=module.params["cidr_block"],
+        compartment_id=compartment_id,
+        display_name=display_name,
+        dns_label=module.params.get("dns_label"),
+    )
+    vcn = oci_utils.call_with_backoff(
+        virtual_network_client.create_vcn, create_vcn_details=create_vcn_details
+    ).data
+    if wait_for_vcn:
+        vcns, timed_out_ids = oci_utils.wait_for_resources_lifecycle_state(
+            module,
+            virtual_network_client.list_vcns,
+            [dict(compartment_id=compartment_id)],
+            [vcn.id],
+            TOPOLOGY_READY_STATES,
+        )
+        if timed_out_ids:
+            module.fail_json(
+                msg="Timed out waiting for VCN {0} to be AVAILABLE.".format(vcn.id)
+            )
+        return vcns[vcn.id], True
+    return to_dict(vcn), True
+
+
+def reconcile_vcn_topology(virtual_network_client, module):
+    result = dict(changed=False, topology_changes=[])
+    compartment_id = module.params["compartment_id"]
+    nodes = get_topology_nodes(module)
+
+    vcn, vcn_created = get_or_create_vcn(
+        virtual_network_client, module, bool(nodes) or module.params.get("wait")
+    )
+    result["changed"] = vcn_created
+    vcn_id = vcn["id"]
+
+    # The default route table, security list and DHCP options of a new VCN can be referred to as well
+    snapshot = oci_network_utils.get_vcn_snapshot(
+        virtual_network_client, module, compartment_id, vcn_id
+    )
+    resources_by_name = dict()
+    for resource_type, resources in snapshot.items():
+        resources_by_name[resource_type] = dict()
+        for resource in resources:
+            resources_by_name[resource_type].setdefault(resource.display_name, resource)
+
+    try:
+        plan_subnet_cidr_blocks(nodes, snapshot.get("subnet", []), vcn)
+        dependencies = dict()
+        for node, resource in nodes.items():
+            referenced_nodes = [
+                resolve_reference(reference, nodes, resources_by_name)
+                for reference in get_node_references(node, resource)
+            ]
+            dependencies[node] = [
+                referenced_node
+                for referenced_node in referenced_nodes
+                if referenced_node in nodes
+            ]
+        levels = oci_utils.get_dependency_levels(dependencies)
+    except ValueError as ex:
+        module.fail_json(msg=str(ex))
+
+    resource_ids = dict(
+        ((resource_type, display_name), resource.id)
+        for resource_type, resources in resources_by_name.items()
+        for display_name, resource in resources.items()
+    )
+    topology_resources = dict()
+
+    def get_resource_id(reference):
+        return resource_ids[resolve_reference(reference, nodes, resources_by_name)]
+
+    for level_index, level in enumerate(levels):
+        changes = []
+        try:
+            for node in level:
+                resource_type, display_name = node
+                existing_resource = resources_by_name.get(resource_type, {}).get(
+                    display_name
+                )
+                if existing_resource is not None:
+                    topology_resources[node] = to_dict(existing_resource)
+                change = get_node_change(
+                    node,
+                    get_desired_attributes(node, nodes[node], get_resource_id),
+                    existing_resource,
+                    compartment_id,
+                    vcn_id,
+                )
+                if change:
+                    changes.append(change)
+        except ValueError as ex:
+            module.fail_json(msg=str(ex))
+        if not changes:
+            continue
+
+        outcomes = oci_utils.execute_tasks(
+            lambda change: apply_node_change(virtual_network_client, change),
+            changes,
+            module,
+        )
+        errors = []
+        nodes_by_id = dict()
+        for change, outcome in zip(changes, outcomes):
+            node = change["node"]
+            if outcome["error"]:
+                errors.append(
+                    "Failed to {0} {1} {2}: {3}".format(
+                        change["action"], node[0], node[1], outcome["error"]
+                    )
+                )
+                continue
+            resource_ids[node] = outcome["resource"].id
+            topology_resources[node] = to_dict(outcome["resource"])
+            nodes_by_id[outcome["resource"].id] = node
+            result["topology_changes"].append(
+                dict(
+                    resource_type=node[0],
+                    display_name=node[1],
+                    action=change["action"],
+                    level=level_index,
+                )
+            )
+        result["changed"] = result["changed"] or bool(nodes_by_id)
+        if errors:
+            module.fail_json(msg=" ".join(errors), **result)
+
+        # The resources of the next levels can only be created once the resources they depend on are AVAILABLE
+        if level_index < len(levels) - 1 or module.params.get("wait"):
+            for resource_id, resource in wait_for_resources(
+                virtual_network_client, module, compartment_id, vcn_id, nodes_by_id
+            ).items():
+                topology_resources[nodes_by_id[resource_id]] = resource
+
+    result["vcn_topology"] = dict(vcn=vcn)
+    for resource_type, resource_type_details in TOPOLOGY_RESOURCE_TYPES.items():
+        result["vcn_topology"][resource_type_details["option"]] = [
+            topology_resources[node]
+            for node in sorted(nodes)
+            if node[0] == resource_type
+        ]
+    return result
+
+
+def main():
+    module_args = oci_utils.get_common_arg_spec(supports_wait=True)
+    module_args.update(
+        dict(
+            compartment_id=dict(type="str", required=True),
+            vcn_id=dict(type="str", required=False, aliases=["id"]),
+            display_name=dict(type="str", required=False, aliases=["name"]),
+            cidr_block=dict(type="str", required=False),
+            dns_label=dict(type="str", required=False),
+            internet_gateways=dict(type="list", required=False),
+            nat_gateways=dict(type="list", required=False),
+            service_gateways=dict(type="list", required=False),
+            dhcp_options=dict(type="list", required=False),
+            security_lists=dict(type="list", required=False),
+            route_tables=dict(type="list", required=False),
+            subnets=dict(type="list", required=False),
+            enable_parallel_requests=dict(type="bool", required=False, default=True),
+            max_thread_count=dict(type="int", required=False),
+            state=dict(
+                type="str", required=False, default="present", choices=["present"]
+            ),
+        )
+    )
+
+    module = AnsibleModule(argument_spec=module_args, supports_check_mode=False)
+
+    if not HAS_OCI_PY_SDK:
+        module.fail_json(msg="oci python sdk required for this module.")
+
+    virtual_network_client = oci_utils.create_service_client(
+        module, VirtualNetworkClient
+    )
+
+    try:
+        result = reconcile_vcn_topology(virtual_network_client, module)
+    except ServiceError as ex:
+        module.fail_json(msg=ex.message)
+    except MaximumWaitTimeExceeded as ex:
+        module.fail_json(msg=str(ex))
+
+    module.exit_json(**result)
+
+
+if __name__ == "__main__":
+    main()
@@ -96,6 +96,9 @@ options:
         required: false
     public_prefixes:
         description: For a public virtual circuit. The public IP prefixes (CIDRs) the customer wants to advertise across the connection.
+                     The prefixes are compared with the existing public prefixes of the virtual circuit once
+                     normalized, and only the prefixes to add or delete are submitted, in bulk requests of at most
+                     100 prefixes each, before waiting once for the virtual circuit.
         suboptions:
               cidr_block:
                     description: An individual public IP prefix (CIDR) to add to the public virtual circuit. Must be /31 or less specific.
@@ -131,6 +134,21 @@ options:
                      If I(delete_public_prefixes=false), then input publi prefixes gets added.
         required: false
         default: false
+    purge_public_prefixes:
+        description: Delete the public prefixes of the virtual circuit which are not present in I(public_prefixes). If
+                     I(purge_public_prefixes=false), the prefixes of I(public_prefixes) whose addresses are already
+                     advertised by existing public prefixes are not added. I(purge_public_prefixes) and
+                     I(delete_public_prefixes) are mutually exclusive.
+        required: false
+        default: false
+        type: bool
+    aggregate_public_prefixes:
+        description: Aggregate the prefixes of I(public_prefixes) into the smallest list of prefixes advertising
+                     exactly the same addresses, dropping the duplicate and contained prefixes and merging the
+                     adjacent prefixes into their covering supernets. Not applicable with I(delete_public_prefixes).
+        required: false
+        default: false
+        type: bool
     reference_comment:
         description: Provider-supplied reference information about this virtual circuit. Relevant only if the customer
                      is using FastConnect via a provider. To be updated only by the provider.
@@ -234,6 +252,18 @@ EXAMPLES = """
       delete_public_prefixes: true
       state: 'present'
 
+# Replace the Public Prefixes of an existing Virtual Circuit, aggregating the adjacent prefixes
+- name: Replace the Public Prefixes of an existing Virtual Circuit
+  oci_virtual_circuit:
+      virtual_circuit_id: 'ocid1.virtualcircuit..xxxxxEXAMPLExxxxx'
+      public_prefixes:
+            - '206.209.218.0/25'
+            - '206.209.218.128/25'
+            - '206.209.220.0/24'
+      purge_public_prefixes: true
+      aggregate_public_prefixes: true
+      state: 'present'
+
 # Delete Virtual Circuit
 - name: Delete Virtual Circuit
   oci_virtual_circuit:
@@ -411,7 +441,7 @@ RETURN = """
 """
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.oracle import oci_utils
+from ansible.module_utils.oracle import oci_utils, oci_network_utils
 
 
 try:
@@ -522,8 +552,29 @@ def get_cross_connect_mappings(module):
     return result_cross_connect_mappings
 
 
-def get_public_prefixes(module):
+# Maximum number of public prefixes sent in a single bulk add or bulk delete request
+MAX_PUBLIC_PREFIXES_PER_REQUEST = 100
+
+
+def get_input_public_prefixes(module):
     input_public_prefixes = module.params.get("public_prefixes")
+    if input_public_prefixes is None:
+        return None
+    try:
+        if module.params.get("aggregate_public_prefixes") and not module.params.get(
+            "delete_public_prefixes"
+        ):
+            return oci_network_utils.aggregate_cidr_blocks(input_public_prefixes)
+        return [
+            oci_network_utils.normalize_cidr_block(input_public_prefix)
+            for input_public_prefix in input_public_prefixes
+        ]
+    except ValueError as ex:
+        module.fail_json(msg=str(ex))
+
+
+def get_public_prefixes(module):
+    input_public_prefixes = get_input_public_prefixes(module)
     if input_public_prefixes is None:
         return None
     result_public_prefixes = []
@@ -595,50 +646,93 @@ def update_virtual_circuit(virtual_network_client, existing_virtual_circuit, mod
         )
 
     if module.params.get("public_prefixes") is not None:
-        result = bulk_add_or_delete_public_prefixes(
-            get_public_prefixes(module),
-            virtual_network_client,
-            existing_virtual_circuit.id,
-            module,
+        public_prefixes_result = update_public_prefixes(
+            virtual_network_client, existing_virtual_circuit.id, module
         )
+        result["public_prefix_changes"] = public_prefixes_result[
+            "public_prefix_changes"
+        ]
+        if public_prefixes_result["changed"]:
+            result["changed"] = True
+            result["virtual_circuit"] = public_prefixes_result["virtual_circuit"]
 
     return result
 
 
-def bulk_add_or_delete_public_prefixes(
-    input_public_prefixes, virtual_network_client, virtual_circuit_id, module
-):
-    update_fn = None
-    kwargs_update = None
-    virtual_circuit_public_prefixes_details = None
-    if module.params.get("delete_public_prefixes"):
-        virtual_circuit_public_prefixes_details = (
-            BulkDeleteVirtualCircuitPublicPrefixesDetails()
+def update_public_prefixes(virtual_network_client, virtual_circuit_id, module):
+    """
+    Add or delete the public prefixes of a virtual circuit. The existing public prefixes are listed once and compared
+    with the desired ones, and only the prefixes to delete and to add are submitted, in chunked bulk requests. The
+    virtual circuit is then waited for once.
+    """
+    existing_public_prefixes = [
+        public_prefix.cidr_block
+        for public_prefix in oci_utils.list_all_resources(
+            virtual_network_client.list_virtual_circuit_public_prefixes,
+            virtual_circuit_id=virtual_circuit_id,
         )
-        update_fn = virtual_network_client.bulk_delete_virtual_circuit_public_prefixes
-        kwargs_update = {
-            "bulk_delete_virtual_circuit_public_prefixes_details": virtual_circuit_public_prefixes_details,
-            "virtual_circuit_id": virtual_circuit_id,
-        }
+    ]
+    input_public_prefixes = get_input_public_prefixes(module)
+    if module.params.get("delete_public_prefixes"):
+        to_add = []
+        to_delete = [
+            existing_public_prefix
+            for existing_public_prefix in existing_public_prefixes
+            if oci_network_utils.normalize_cidr_block(existing_public_prefix)
+            in input_public_prefixes
+        ]
     else:
-        virtual_circuit_public_prefixes_details = (
-            BulkAddVirtualCircuitPublicPrefixesDetails()
+        to_add, to_delete = oci_network_utils.get_cidr_block_set_delta(
+            input_public_prefixes,
+            existing_public_prefixes,
+            purge=module.params.get("purge_public_prefixes"),
         )
-        update_fn = virtual_network_client.bulk_add_virtual_circuit_public_prefixes
-        kwargs_update = {
-            "bulk_add_virtual_circuit_public_prefixes_details": virtual_circuit_public_prefixes_details,
-            "virtual_circuit_id": virtual_circuit_id,
-        }
-    virtual_circuit_public_prefixes_details.public_prefixes = input_public_prefixes
-    result = oci_utils.update_and_wait(
-        resource_type="virtual_circuit",
-        update_fn=update_fn,
-        kwargs_update=kwargs_update,
+    result = dict(
+        changed=False, public_prefix_changes=dict(added=to_add, deleted=to_delete)
+    )
+    if not to_add and not to_delete:
+        return result
+
+    # Prefixes are deleted first, so that a prefix replaced by a wider or narrower one never overlaps with it
+    for batch in oci_utils.get_batches(to_delete, MAX_PUBLIC_PREFIXES_PER_REQUEST):
+        oci_utils.call_with_backoff(
+            virtual_network_client.bulk_delete_virtual_circuit_public_prefixes,
+            virtual_circuit_id=virtual_circuit_id,
+            bulk_delete_virtual_circuit_public_prefixes_details=BulkDeleteVirtualCircuitPublicPrefixesDetails(
+                public_prefixes=[
+                    DeleteVirtualCircuitPublicPrefixDetails(cidr_block=cidr_block)
+                    for cidr_block in batch
+                ]
+            ),
+        )
+    for batch in oci_utils.get_batches(to_add, MAX_PUBLIC_PREFIXES_PER_REQUEST):
+        oci_utils.call_with_backoff(
+            virtual_network_client.bulk_add_virtual_circuit_public_prefixes,
+            virtual_circuit_id=virtual_circuit_id,
+            bulk_add_virtual_circuit_public_prefixes_details=BulkAddVirtualCircuitPublicPrefixesDetails(
+                public_prefixes=[
+                    CreateVirtualCircuitPublicPrefixDetails(cidr_block=cidr_block)
+                    for cidr_block in batch
+                ]
+            ),
+        )
+    virtual_circuit = to_dict(
+        oci_utils.call_with_backoff(
+            virtual_network_client.get_virtual_circuit,
+            virtual_circuit_id=virtual_circuit_id,
+        ).data
+    )
+    result["changed"] = True
+    result["virtual_circuit"] = oci_utils.wait_for_resource_lifecycle_state(
         client=virtual_network_client,
-        get_fn=virtual_network_client.get_virtual_circuit,
-        kwargs_get={"virtual_circuit_id": virtual_circuit_id},
-        get_param=None,
         module=module,
+        wait_applicable=True,
+        kwargs_get=None,
+        get_fn=virtual_network_client.get_virtual_circuit,
+        get_param="virtual_circuit_id",
+        resource=virtual_circuit,
+        states=None,
+        resource_type="virtual_circuit",
     )
     return result
 
@@ -687,11 +781,14 @@ def main():
         purge_cross_connect_mappings=dict(type="bool", required=False, default=True),
         delete_cross_connect_mappings=dict(type="bool", required=False, default=False),
         delete_public_prefixes=dict(type=bool, required=False, default=False),
+        purge_public_prefixes=dict(type="bool", required=False, default=False),
+        aggregate_public_prefixes=dict(type="bool", required=False, default=False),
     )
     module = AnsibleModule(
         argument_spec=module_args,
         mutually_exclusive=[
-            ["purge_cross_connect_mappings", "delete_cross_connect_mappings"]
+            ["purge_cross_connect_mappings", "delete_cross_connect_mappings"],
+            ["purge_public_prefixes", "delete_public_prefixes"],
         ],
     )
 
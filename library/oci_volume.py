@@ -50,6 +50,34 @@ options:
         required: false
         default: no
         type: bool
+    count:
+        description: The number of volumes named I(display_name) suffixed with an index starting at 0 (for example,
+                     'data_volume_0', 'data_volume_1') that must exist in I(availability_domain). The volumes of the
+                     compartment are listed once, and the missing volumes are created in parallel. Mutually exclusive
+                     with I(volumes) and I(volume_id).
+        required: false
+        type: int
+    volumes:
+        description: A list of volumes that must exist in the compartment specified by I(compartment_id). Each entry
+                     is a dict with a C(display_name), and optionally an C(availability_domain), a C(size_in_gbs) and
+                     a C(backup_policy_id) overriding the module options of the same name. A volume exists if a volume
+                     with the same display name is in the same availability domain. The volumes of the compartment
+                     are listed once, and the missing volumes are created in parallel. The volumes are returned in the
+                     order of this list. I(source_details.wait_for_copy) is not supported with I(count) or I(volumes).
+                     Mutually exclusive with I(count) and I(volume_id).
+        required: false
+        type: list
+    enable_parallel_requests:
+        description: Whether to create the volumes in parallel, when I(count) or I(volumes) is specified.
+        required: false
+        default: True
+        type: bool
+    max_thread_count:
+        description: When I(enable_parallel_requests=True), indicates the number of maximum parallel operations, and
+                     so the maximum number of create requests in flight. The default number of threads used is the
+                     number of cores in your machine.
+        required: false
+        type: int
     display_name:
         description: A user-friendly name. Does not have to be unique, and it's changeable. Avoid entering confidential
                      information. If I(display_name) is not provided, it is auto-generated.
@@ -128,6 +156,27 @@ EXAMPLES = """
       id: ocid1.volumebackup.oc1.iad.xxxxxEXAMPLExxxxx
       type: volumeBackup
 
+- name: Ensure that 16 volumes named data_volume_0 to data_volume_15 exist
+  oci_volume:
+    availability_domain: IwGV:US-ASHBURN-AD-2
+    compartment_id: ocid1.compartment.oc1..xxxxxEXAMPLExxxxx
+    name: data_volume
+    size_in_gbs: 256
+    count: 16
+    max_thread_count: 8
+
+- name: Ensure that a list of volumes exist
+  oci_volume:
+    availability_domain: IwGV:US-ASHBURN-AD-2
+    compartment_id: ocid1.compartment.oc1..xxxxxEXAMPLExxxxx
+    volumes:
+      - display_name: db_data
+        size_in_gbs: 1024
+      - display_name: db_logs
+      - display_name: db_standby_data
+        availability_domain: IwGV:US-ASHBURN-AD-3
+        size_in_gbs: 1024
+
 - name: Update a volume
   oci_volume:
     name: ansible_test_volume
@@ -318,6 +367,22 @@ volume:
                         "volume_id": "ocid1.volume.oc1.iad.xxxxxEXAMPLExxxxx"
             }
         }
+volumes:
+    description: Information about the volumes specified by I(count) or I(volumes), in the order they are specified
+    returned: When I(count) or I(volumes) is specified
+    type: list
+    sample: [{
+            "availability_domain": "IwGV:US-ASHBURN-AD-2",
+            "compartment_id": "ocid1.compartment.oc1..xxxxxEXAMPLExxxxx",
+            "display_name": "data_volume_0",
+            "id": "ocid1.volume.oc1.iad.xxxxxEXAMPLExxxxx",
+            "is_hydrated": true,
+            "lifecycle_state": "AVAILABLE",
+            "size_in_gbs": 256,
+            "size_in_mbs": 262144,
+            "source_details": null,
+            "time_created": "2017-12-05T15:35:28.747000+00:00"
+        }]
 """
 
 from ansible.module_utils.basic import AnsibleModule
@@ -353,6 +418,27 @@ def handle_delete_volume(block_storage_client, module):
     )
 
 
+def get_volume_source_details(module):
+    source_details = module.params["source_details"]
+    volume_source = None
+    if "type" in source_details:
+        if source_details["type"] == "volume":
+            volume_source = VolumeSourceFromVolumeDetails()
+            volume_source.id = source_details.get("id")
+
+        elif source_details["type"] == "volumeBackup":
+            volume_source = VolumeSourceFromVolumeBackupDetails()
+            volume_source.id = source_details.get("id")
+
+        else:
+            module.fail_json(msg="value of state must be one of: volume, volumeBackup")
+
+    else:
+        module.fail_json(msg="missing required arguments: type")
+
+    return volume_source
+
+
 def handle_create_volume(block_storage_client, module):
     create_volume_details = CreateVolumeDetails()
 
@@ -362,25 +448,7 @@ def handle_create_volume(block_storage_client, module):
 
     if module.params["source_details"]:
         source_details = module.params["source_details"]
-        volume_source = None
-        if "type" in source_details:
-            if source_details["type"] == "volume":
-                volume_source = VolumeSourceFromVolumeDetails()
-                volume_source.id = source_details.get("id")
-
-            elif source_details["type"] == "volumeBackup":
-                volume_source = VolumeSourceFromVolumeBackupDetails()
-                volume_source.id = source_details.get("id")
-
-            else:
-                module.fail_json(
-                    msg="value of state must be one of: volume, volumeBackup"
-                )
-
-        else:
-            module.fail_json(msg="missing required arguments: type")
-
-        create_volume_details.source_details = volume_source
+        create_volume_details.source_details = get_volume_source_details(module)
 
     result = oci_utils.create_and_wait(
         resource_type="volume",
@@ -441,6 +509,162 @@ def handle_update_volume(block_storage_client, module):
     )
 
 
+def get_volume_specs(module):
+    if module.params["volumes"] is not None:
+        volume_specs = []
+        for volume in module.params["volumes"]:
+            if not volume.get("display_name"):
+                module.fail_json(msg="display_name is required for each of volumes.")
+            volume_specs.append(
+                dict(
+                    display_name=volume["display_name"],
+                    availability_domain=volume.get("availability_domain")
+                    or module.params["availability_domain"],
+                    size_in_gbs=volume.get("size_in_gbs")
+                    or module.params["size_in_gbs"],
+                    backup_policy_id=volume.get("backup_policy_id")
+                    or module.params["backup_policy_id"],
+                )
+            )
+    else:
+        if not module.params["display_name"]:
+            module.fail_json(msg="display_name is required with count.")
+        volume_specs = [
+            dict(
+                display_name="{0}_{1}".format(module.params["display_name"], index),
+                availability_domain=module.params["availability_domain"],
+                size_in_gbs=module.params["size_in_gbs"],
+                backup_policy_id=module.params["backup_policy_id"],
+            )
+            for index in range(module.params["count"])
+        ]
+
+    volume_keys = set()
+    for volume_spec in volume_specs:
+        if volume_spec["availability_domain"] is None:
+            module.fail_json(
+                msg="availability_domain is required for volume {0}.".format(
+                    volume_spec["display_name"]
+                )
+            )
+        volume_key = (volume_spec["display_name"], volume_spec["availability_domain"])
+        if volume_key in volume_keys:
+            module.fail_json(
+                msg="Volume {0} in {1} is specified more than once.".format(*volume_key)
+            )
+        volume_keys.add(volume_key)
+    return volume_specs
+
+
+def create_volumes(block_storage_client, module):
+    """
+    Create the volumes of a number of volumes (`count`) or of a list of volumes (`volumes`) that do not exist yet. A
+    volume exists if a volume with the same display_name is in the same availability domain. The volumes of the
+    compartment are listed once, the missing volumes are created in parallel and the created volumes are waited on
+    together, with one listing of the volumes of the compartment in each poll round.
+    """
+    compartment_id = module.params["compartment_id"]
+    volume_specs = get_volume_specs(module)
+    try:
+        existing_volumes = dict(
+            ((volume.display_name, volume.availability_domain), volume)
+            for volume in oci_utils.list_all_resources(
+                block_storage_client.list_volumes, compartment_id=compartment_id
+            )
+            if volume.lifecycle_state not in ["TERMINATING", "TERMINATED", "FAULTY"]
+        )
+    except ServiceError as ex:
+        module.fail_json(msg=ex.message)
+
+    volume_source = None
+    if module.params["source_details"]:
+        volume_source = get_volume_source_details(module)
+
+    def create_volume(volume_spec):
+        # Runs in a worker thread, so errors are returned to the caller instead of failing the module here
+        create_volume_details = CreateVolumeDetails(
+            compartment_id=compartment_id,
+            source_details=volume_source,
+            freeform_tags=module.params["freeform_tags"],
+            defined_tags=module.params["defined_tags"],
+            **volume_spec
+        )
+        try:
+            return dict(
+                volume=oci_utils.call_with_backoff(
+                    block_storage_client.create_volume,
+                    create_volume_details=create_volume_details,
+                ).data,
+                error=None,
+            )
+        except ServiceError as ex:
+            return dict(
+                volume=None,
+                error="{0}: {1}".format(volume_spec["display_name"], ex.message),
+            )
+
+    volume_specs_to_create = [
+        volume_spec
+        for volume_spec in volume_specs
+        if (volume_spec["display_name"], volume_spec["availability_domain"])
+        not in existing_volumes
+    ]
+    outcomes = oci_utils.execute_tasks(create_volume, volume_specs_to_create, module)
+    created_volumes = dict(
+        ((volume_spec["display_name"], volume_spec["availability_domain"]), outcome)
+        for volume_spec, outcome in zip(volume_specs_to_create, outcomes)
+    )
+
+    def get_volumes():
+        volumes = []
+        for volume_spec in volume_specs:
+            volume_key = (
+                volume_spec["display_name"],
+                volume_spec["availability_domain"],
+            )
+            if volume_key in existing_volumes:
+                volumes.append(to_dict(existing_volumes[volume_key]))
+            elif created_volumes[volume_key]["error"] is None:
+                volumes.append(to_dict(created_volumes[volume_key]["volume"]))
+        return volumes
+
+    created_volume_ids = [
+        outcome["volume"].id for outcome in outcomes if outcome["error"] is None
+    ]
+    result = dict(changed=bool(created_volume_ids), volumes=get_volumes())
+    errors = [outcome["error"] for outcome in outcomes if outcome["error"]]
+    if errors:
+        module.fail_json(
+            msg="Failed to create {0} volumes: {1}".format(
+                len(errors), "; ".join(errors)
+            ),
+            **result
+        )
+
+    if created_volume_ids and module.params.get("wait", None):
+        try:
+            waited_volumes, timed_out_ids = oci_utils.wait_for_resources_lifecycle_state(
+                module,
+                block_storage_client.list_volumes,
+                [dict(compartment_id=compartment_id)],
+                created_volume_ids,
+                module.params.get("wait_until") or ["AVAILABLE"],
+            )
+        except ServiceError as ex:
+            module.fail_json(msg=ex.message, **result)
+        result["volumes"] = [
+            waited_volumes.get(volume["id"], volume) for volume in result["volumes"]
+        ]
+        if timed_out_ids:
+            module.fail_json(
+                msg="Timed out waiting for volumes {0}.".format(
+                    ", ".join(sorted(timed_out_ids))
+                ),
+                **result
+            )
+    return result
+
+
 @check_mode
 def add_attached_instance_info(module, result, lookup_attached_instance):
     compute_client = oci_utils.create_service_client(module, ComputeClient)
@@ -484,6 +708,10 @@ def main():
             lookup_all_attached_instances=dict(
                 type="bool", required=False, default="no"
             ),
+            count=dict(type="int", required=False),
+            volumes=dict(type="list", required=False),
+            enable_parallel_requests=dict(type="bool", required=False, default=True),
+            max_thread_count=dict(type="int", required=False),
         )
     )
 
@@ -492,6 +720,7 @@ def main():
         supports_check_mode=False,
         required_together=[["availability_domain", "compartment_id"]],
         required_if=[["state", "absent", ["volume_id"]]],
+        mutually_exclusive=[["count", "volumes", "volume_id"]],
     )
 
     if not HAS_OCI_PY_SDK:
@@ -505,6 +734,12 @@ def main():
     if state == "absent":
         result = handle_delete_volume(block_storage_client, module)
 
+    elif module.params["count"] is not None or module.params["volumes"] is not None:
+        if module.params["compartment_id"] is None:
+            module.fail_json(msg="compartment_id is required with count or volumes.")
+        result = create_volumes(block_storage_client, module)
+        module.exit_json(**result)
+
     else:
         if volume_id is None:
             # Exclude size_in_mbs as it is deprecated but still in the CreateVolumeDetails.
@@ -49,6 +49,71 @@ options:
         description: The OCID of the volume that needs to be backed up. Required to create a volume backup with
                      I(state=present).
         required: false
+    volume_backup_ids:
+        description: A list of OCIDs of volume backups to copy to each of the I(destination_regions). Mutually exclusive
+                     with I(volume_backup_id).
+        required: false
+        type: list
+    destination_regions:
+        description: A list of regions to copy the volume backups I(volume_backup_ids) (or the volume backup
+                     I(volume_backup_id)) to with I(state=present). The destination regions are processed in parallel.
+                     The copies that already exist in a destination region are found through an index of the volume
+                     backups of the region by the OCID of the volume backup they were copied from, built from a single
+                     listing per compartment, and are not copied again.
+        required: false
+        type: list
+    max_copies_per_region:
+        description: The maximum number of copies in progress in each of the I(destination_regions). The copies to a
+                     region are started in batches of I(max_copies_per_region), and a batch is started only once the
+                     copies of the previous batch are AVAILABLE. The copies of the last batch are not waited on if
+                     I(wait=False).
+        required: false
+        default: 2
+        type: int
+    enable_parallel_requests:
+        description: Whether to copy the volume backups to the I(destination_regions), or to list and delete the volume
+                     backups with I(retention_policy), in parallel.
+        required: false
+        default: True
+        type: bool
+    max_thread_count:
+        description: When I(enable_parallel_requests=True), indicates the number of maximum parallel operations. The
+                     default number of threads used is the number of cores in your machine.
+        required: false
+        type: int
+    retention_policy:
+        description: A retention policy to apply on the volume backups of the compartments I(compartment_ids), or only
+                     on the backups of the volume I(volume_id) if it is specified. The volume backups of the
+                     compartments are listed in parallel, and the policy is evaluated separately on the volume backups
+                     of each volume, sorted by C(time_created). The volume backups that no rule of the policy keeps are
+                     deleted in parallel. Only the volume backups that are AVAILABLE are evaluated. When
+                     I(retention_policy) is specified, no volume backup is created.
+        required: false
+        type: dict
+        suboptions:
+            keep_last:
+                description: The number of most recent volume backups to keep.
+                required: false
+                type: int
+            keep_daily:
+                description: The number of most recent days for which the most recent volume backup of the day is kept.
+                required: false
+                type: int
+            keep_weekly:
+                description: The number of most recent weeks for which the most recent volume backup of the week is
+                             kept.
+                required: false
+                type: int
+            keep_monthly:
+                description: The number of most recent months for which the most recent volume backup of the month is
+                             kept.
+                required: false
+                type: int
+    compartment_ids:
+        description: The OCIDs of the compartments to apply the I(retention_policy) on. Required with
+                     I(retention_policy).
+        required: false
+        type: list
 author: "Rohit Chaware (@rohitChaware)"
 extends_documentation_fragment: [ oracle, oracle_creatable_resource, oracle_wait_options, oracle_tags ]
 """
@@ -66,6 +131,22 @@ EXAMPLES = """
     volume_id: ocid1.volume.oc1.iad.xxxxxEXAMPLExxxxx
     force_create: True
 
+- name: Copy volume backups to two other regions
+  oci_volume_backup:
+    volume_backup_ids:
+      - ocid1.volumebackup.oc1.iad.xxxxxEXAMPLExxxxx1
+      - ocid1.volumebackup.oc1.iad.xxxxxEXAMPLExxxxx2
+    destination_regions: ['us-phoenix-1', 'uk-london-1']
+    max_copies_per_region: 1
+
+- name: Keep the last 3 backups and one backup per day for a week of each volume of a compartment
+  oci_volume_backup:
+    compartment_ids: ['ocid1.compartment.oc1..xxxxxEXAMPLExxxxx']
+    retention_policy:
+      keep_last: 3
+      keep_daily: 7
+    wait: False
+
 - name: Update name of a volume backup
   oci_volume_backup:
     name: test_backup
@@ -162,10 +243,53 @@ volume_backup:
             "unique_size_in_mbs": 1,
             "volume_id": "ocid1.volume.oc1.iad.xxxxxEXAMPLExxxxx"
     }
+volume_backup_copies:
+    description: The copies of the volume backups in each of the I(destination_regions), one per volume backup and
+                 destination region. Each copy contains the C(region), the OCID of the source volume backup
+                 (C(source_volume_backup_id)), the copied volume backup (C(volume_backup)), whether it was copied by
+                 this task (C(changed)) and, if the copy failed, the C(error).
+    returned: When volume backups are copied with I(destination_regions)
+    type: list
+    sample: [{
+            "region": "us-phoenix-1",
+            "source_volume_backup_id": "ocid1.volumebackup.oc1.iad.xxxxxEXAMPLExxxxx",
+            "volume_backup": {
+                "compartment_id": "ocid1.compartment.oc1..xxxxxEXAMPLExxxxx",
+                "display_name": "ansible_backup",
+                "id": "ocid1.volumebackup.oc1.phx.xxxxxEXAMPLExxxxx",
+                "lifecycle_state": "AVAILABLE",
+                "source_volume_backup_id": "ocid1.volumebackup.oc1.iad.xxxxxEXAMPLExxxxx"
+            },
+            "changed": true
+        }]
+kept_volume_backups:
+    description: The volume backups kept by I(retention_policy), newest first for each volume
+    returned: When I(retention_policy) is specified
+    type: list
+    sample: [{
+            "compartment_id": "ocid1.compartment.oc1..xxxxxEXAMPLExxxxx",
+            "display_name": "ansible_backup",
+            "id": "ocid1.volumebackup.oc1.iad.xxxxxEXAMPLExxxxx",
+            "lifecycle_state": "AVAILABLE",
+            "time_created": "2017-12-22T15:40:53.219000+00:00",
+            "volume_id": "ocid1.volume.oc1.iad.xxxxxEXAMPLExxxxx"
+        }]
+removed_volume_backups:
+    description: The volume backups deleted by I(retention_policy), newest first for each volume
+    returned: When I(retention_policy) is specified
+    type: list
+    sample: [{
+            "compartment_id": "ocid1.compartment.oc1..xxxxxEXAMPLExxxxx",
+            "display_name": "ansible_backup",
+            "id": "ocid1.volumebackup.oc1.iad.xxxxxEXAMPLExxxxx",
+            "lifecycle_state": "TERMINATING",
+            "time_created": "2017-11-22T15:40:53.219000+00:00",
+            "volume_id": "ocid1.volume.oc1.iad.xxxxxEXAMPLExxxxx"
+        }]
 """
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.oracle import oci_utils
+from ansible.module_utils.oracle import oci_utils, oci_blockstorage_utils
 
 
 try:
@@ -241,6 +365,27 @@ def update_volume_backup(block_storage_client, module):
     )
 
 
+def apply_volume_backup_retention_policy(block_storage_client, module):
+    if not module.params["compartment_ids"]:
+        module.fail_json(msg="compartment_ids is required with retention_policy.")
+    kwargs_lists = []
+    for compartment_id in module.params["compartment_ids"]:
+        kwargs_list = dict(compartment_id=compartment_id)
+        if module.params["volume_id"]:
+            kwargs_list["volume_id"] = module.params["volume_id"]
+        kwargs_lists.append(kwargs_list)
+    return oci_utils.apply_retention_policy(
+        module,
+        "volume_backup",
+        block_storage_client.list_volume_backups,
+        kwargs_lists,
+        block_storage_client.delete_volume_backup,
+        "volume_backup_id",
+        "volume_id",
+        ["AVAILABLE"],
+    )
+
+
 def set_logger(input_logger):
     global logger
     logger = input_logger
@@ -272,14 +417,24 @@ def main():
                 choices=["FULL", "INCREMENTAL"],
             ),
             volume_backup_id=dict(type="str", required=False, aliases=["id"]),
+            volume_backup_ids=dict(type="list", required=False),
+            destination_regions=dict(type="list", required=False),
+            max_copies_per_region=dict(type="int", required=False, default=2),
+            enable_parallel_requests=dict(type="bool", required=False, default=True),
+            max_thread_count=dict(type="int", required=False),
             volume_id=dict(type="str", required=False),
         )
     )
+    module_args.update(oci_utils.get_retention_policy_arg_spec())
 
     module = AnsibleModule(
         argument_spec=module_args,
         supports_check_mode=False,
         required_if=[["state", "absent", ["volume_backup_id"]]],
+        mutually_exclusive=[
+            ["volume_backup_id", "volume_backup_ids", "retention_policy"],
+            ["destination_regions", "retention_policy"],
+        ],
     )
 
     if not HAS_OCI_PY_SDK:
@@ -293,6 +448,21 @@ def main():
     if state == "absent":
         result = delete_volume_backup(block_storage_client, module)
 
+    elif module.params["retention_policy"]:
+        result = apply_volume_backup_retention_policy(block_storage_client, module)
+
+    elif module.params["destination_regions"]:
+        volume_backup_ids = module.params["volume_backup_ids"] or (
+            [volume_backup_id] if volume_backup_id else []
+        )
+        if not volume_backup_ids:
+            module.fail_json(
+                msg="volume_backup_id or volume_backup_ids is required with destination_regions."
+            )
+        result = oci_blockstorage_utils.copy_backups_to_regions(
+            block_storage_client, module, "volume_backup", volume_backup_ids
+        )
+
     else:
         if volume_backup_id is None:
             # Get compartment_id of volume to list all the volume backups of the volume in that compartment.
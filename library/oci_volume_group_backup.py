@@ -53,6 +53,37 @@ options:
         description: The OCID of the volume group that needs to be backed up. Required to create a volume group backup
                      with I(state=present).
         required: false
+    volume_group_backup_ids:
+        description: A list of OCIDs of volume group backups to copy to each of the I(destination_regions). Mutually
+                     exclusive with I(volume_group_backup_id).
+        required: false
+        type: list
+    destination_regions:
+        description: A list of regions to copy the volume group backups I(volume_group_backup_ids) (or the volume group
+                     backup I(volume_group_backup_id)) to with I(state=present). The destination regions are processed
+                     in parallel. The copies that already exist in a destination region are found through an index of
+                     the volume group backups of the region by the OCID of the volume group backup they were copied
+                     from, built from a single listing per compartment, and are not copied again.
+        required: false
+        type: list
+    max_copies_per_region:
+        description: The maximum number of copies in progress in each of the I(destination_regions). The copies to a
+                     region are started in batches of I(max_copies_per_region), and a batch is started only once the
+                     copies of the previous batch are AVAILABLE. The copies of the last batch are not waited on if
+                     I(wait=False).
+        required: false
+        default: 2
+        type: int
+    enable_parallel_requests:
+        description: Whether to copy the volume group backups to the I(destination_regions) in parallel.
+        required: false
+        default: True
+        type: bool
+    max_thread_count:
+        description: When I(enable_parallel_requests=True), indicates the number of maximum parallel operations. The
+                     default number of threads used is the number of cores in your machine.
+        required: false
+        type: int
 author: "Rohit Chaware (@rohitChaware)"
 extends_documentation_fragment: [ oracle, oracle_creatable_resource, oracle_wait_options, oracle_tags ]
 """
@@ -70,6 +101,14 @@ EXAMPLES = """
     volume_group_id: ocid1.volumegroup.oc1.iad.xxxxxEXAMPLExxxxx
     force_create: True
 
+- name: Copy volume group backups to two other regions
+  oci_volume_group_backup:
+    volume_group_backup_ids:
+      - ocid1.volumegroupbackup.oc1.iad.xxxxxEXAMPLExxxxx1
+      - ocid1.volumegroupbackup.oc1.iad.xxxxxEXAMPLExxxxx2
+    destination_regions: ['us-phoenix-1', 'uk-london-1']
+    max_copies_per_region: 1
+
 - name: Update name of a volume group backup
   oci_volume_group_backup:
     name: test_backup
@@ -188,10 +227,29 @@ volume_group_backup:
             "volume_backup_ids": ["ocid1.volumebackup.oc1.iad.xxxxxEXAMPLExxxxx"],
             "volume_group_id": "ocid1.volumegroup.oc1.iad.xxxxxEXAMPLExxxxx"
     }
+volume_group_backup_copies:
+    description: The copies of the volume group backups in each of the I(destination_regions), one per volume group
+                 backup and destination region. Each copy contains the C(region), the OCID of the source volume group
+                 backup (C(source_volume_group_backup_id)), the copied volume group backup (C(volume_group_backup)),
+                 whether it was copied by this task (C(changed)) and, if the copy failed, the C(error).
+    returned: When volume group backups are copied with I(destination_regions)
+    type: list
+    sample: [{
+            "region": "us-phoenix-1",
+            "source_volume_group_backup_id": "ocid1.volumegroupbackup.oc1.iad.xxxxxEXAMPLExxxxx",
+            "volume_group_backup": {
+                "compartment_id": "ocid1.compartment.oc1..xxxxxEXAMPLExxxxx",
+                "display_name": "ansible_backup",
+                "id": "ocid1.volumegroupbackup.oc1.phx.xxxxxEXAMPLExxxxx",
+                "lifecycle_state": "AVAILABLE",
+                "source_volume_group_backup_id": "ocid1.volumegroupbackup.oc1.iad.xxxxxEXAMPLExxxxx"
+            },
+            "changed": true
+        }]
 """
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.oracle import oci_utils
+from ansible.module_utils.oracle import oci_utils, oci_blockstorage_utils
 
 
 try:
@@ -256,6 +314,20 @@ def update_volume_group_backup(block_storage_client, module):
     )
 
 
+def copy_volume_group_backups(block_storage_client, module):
+    volume_group_backup_id = module.params["volume_group_backup_id"]
+    volume_group_backup_ids = module.params["volume_group_backup_ids"] or (
+        [volume_group_backup_id] if volume_group_backup_id else []
+    )
+    if not volume_group_backup_ids:
+        module.fail_json(
+            msg="volume_group_backup_id or volume_group_backup_ids is required with destination_regions."
+        )
+    return oci_blockstorage_utils.copy_backups_to_regions(
+        block_storage_client, module, "volume_group_backup", volume_group_backup_ids
+    )
+
+
 def main():
     module_args = oci_utils.get_taggable_arg_spec(
         supports_create=True, supports_wait=True
@@ -277,6 +349,11 @@ def main():
                 choices=["FULL", "INCREMENTAL"],
             ),
             volume_group_backup_id=dict(type="str", required=False, aliases=["id"]),
+            volume_group_backup_ids=dict(type="list", required=False),
+            destination_regions=dict(type="list", required=False),
+            max_copies_per_region=dict(type="int", required=False, default=2),
+            enable_parallel_requests=dict(type="bool", required=False, default=True),
+            max_thread_count=dict(type="int", required=False),
             volume_group_id=dict(type="str", required=False),
         )
     )
@@ -285,6 +362,7 @@ def main():
         argument_spec=module_args,
         supports_check_mode=False,
         required_if=[["state", "absent", ["volume_group_backup_id"]]],
+        mutually_exclusive=[["volume_group_backup_id", "volume_group_backup_ids"]],
     )
 
     if not HAS_OCI_PY_SDK:
@@ -298,6 +376,9 @@ def main():
     if state == "absent":
         result = delete_volume_group_backup(block_storage_client, module)
 
+    elif module.params["destination_regions"]:
+        result = copy_volume_group_backups(block_storage_client, module)
+
     else:
         if volume_group_backup_id is None:
             if module.params["compartment_id"]:
@@ -0,0 +1,30 @@
+# Copyright (c) 2019, Oracle and/or its affiliates.
+# This software is made available to you under the terms of the GPL 3.0 license or the Apache 2.0 license.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0
+# See LICENSE.TXT for details.
+
+
+class ModuleDocFragment(object):
+    DOCUMENTATION = """
+    options:
+        use_vcn_snapshot:
+            description: When the resources of a VCN are listed with I(compartment_id) and I(vcn_id), read them from a
+                         snapshot of the VCN cached in I(cache_dir). The snapshot holds the subnets, security lists,
+                         route tables, DHCP options and internet, NAT and service gateways of the VCN, fetched
+                         concurrently in a single pass, so that consecutive facts tasks on the same VCN do not list the
+                         VCN again. The snapshot is taken again when it is older than I(cache_max_age) seconds.
+            required: false
+            default: false
+            type: bool
+        cache_dir:
+            description: The directory in which the snapshot of the VCN used by I(use_vcn_snapshot) is cached.
+            required: false
+            default: The system temporary directory
+        cache_max_age:
+            description: The number of seconds for which the snapshot of the VCN used by I(use_vcn_snapshot) is
+                         considered valid.
+            required: false
+            default: 300
+            type: int
+    """
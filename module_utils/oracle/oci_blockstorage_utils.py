@@ -0,0 +1,248 @@
+# Copyright (c) 2019, Oracle and/or its affiliates.
+# This software is made available to you under the terms of the GPL 3.0 license or the Apache 2.0 license.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0
+# See LICENSE.TXT for details.
+
+from ansible.module_utils.oracle import oci_utils
+
+try:
+    from oci.core import models
+    from oci.core.blockstorage_client import BlockstorageClient
+    from oci.util import to_dict
+    from oci.exceptions import ServiceError
+
+    HAS_OCI_PY_SDK = True
+except ImportError:
+    HAS_OCI_PY_SDK = False
+
+
+logger = oci_utils.get_logger("oci_blockstorage_utils")
+
+
+def _debug(s):
+    get_logger().debug(s)
+
+
+def get_logger():
+    return logger
+
+
+# How the backups of each type are copied to other regions, by the resource type of the backup:
+#   get_fn/get_param: The BlockstorageClient function to get a backup, and the name of its OCID argument
+#   list_fn: The BlockstorageClient function to list the backups of a compartment
+#   copy_fn: The BlockstorageClient function to copy a backup to another region
+#   copy_details_class/copy_details_param: The model of the copy details, and the name of its argument in copy_fn
+#   source_id_attribute: The attribute of a copied backup holding the OCID of the backup it was copied from
+BACKUP_COPY_OPERATIONS = {
+    "volume_backup": dict(
+        get_fn="get_volume_backup",
+        get_param="volume_backup_id",
+        list_fn="list_volume_backups",
+        copy_fn="copy_volume_backup",
+        copy_details_class="CopyVolumeBackupDetails",
+        copy_details_param="copy_volume_backup_details",
+        source_id_attribute="source_volume_backup_id",
+    ),
+    "volume_group_backup": dict(
+        get_fn="get_volume_group_backup",
+        get_param="volume_group_backup_id",
+        list_fn="list_volume_group_backups",
+        copy_fn="copy_volume_group_backup",
+        copy_details_class="CopyVolumeGroupBackupDetails",
+        copy_details_param="copy_volume_group_backup_details",
+        source_id_attribute="source_volume_group_backup_id",
+    ),
+    "boot_volume_backup": dict(
+        get_fn="get_boot_volume_backup",
+        get_param="boot_volume_backup_id",
+        list_fn="list_boot_volume_backups",
+        copy_fn="copy_boot_volume_backup",
+        copy_details_class="CopyBootVolumeBackupDetails",
+        copy_details_param="copy_boot_volume_backup_details",
+        source_id_attribute="source_boot_volume_backup_id",
+    ),
+}
+
+# Backups in these states are ignored when looking for an existing copy of a backup
+DEAD_BACKUP_STATES = ["TERMINATING", "TERMINATED", "FAULTY"]
+
+
+def get_backup_copies_index(block_storage_client, resource_type, compartment_ids):
+    """
+    Index the copies of backups in the region of `block_storage_client` by the OCID of the backup they were copied
+    from, listing the backups of each compartment once.
+    :return: A dictionary of source backup OCID to the copied backup
+    """
+    operation = BACKUP_COPY_OPERATIONS[resource_type]
+    list_fn = getattr(block_storage_client, operation["list_fn"])
+    index = dict()
+    for compartment_id in compartment_ids:
+        for backup in oci_utils.list_all_resources(
+            list_fn, compartment_id=compartment_id
+        ):
+            source_id = getattr(backup, operation["source_id_attribute"])
+            if source_id and backup.lifecycle_state not in DEAD_BACKUP_STATES:
+                index[source_id] = backup
+    return index
+
+
+def copy_backups_to_regions(block_storage_client, module, resource_type, backup_ids):
+    """
+    Copy the backups `backup_ids` of type `resource_type` to each of the I(destination_regions). The destination
+    regions are processed in parallel. In each region, the backups that already have a copy are found through an index
+    of the copies of the region, built from a single listing per compartment, and the other backups are copied in
+    batches of at most I(max_copies_per_region) copies. Each batch is waited on as a whole, with one listing per
+    compartment in each poll round, before the next batch is started. The last batch is not waited on if
+    I(wait=False).
+    :return: A dictionary with the 'changed' state and the list of copies (`<resource_type>_copies`), one per backup
+             and destination region. Each copy has the `region`, the source backup OCID, the copied backup, `changed`
+             and, if the copy failed, an `error`.
+    """
+    operation = BACKUP_COPY_OPERATIONS[resource_type]
+    source_id_key = "source_{0}_id".format(resource_type)
+    backups_by_id = oci_utils.get_resources_by_id(
+        getattr(block_storage_client, operation["get_fn"]),
+        operation["get_param"],
+        backup_ids,
+        module,
+    )
+    backups = [
+        backups_by_id[backup_id]
+        for index, backup_id in enumerate(backup_ids)
+        if backup_id not in backup_ids[:index]
+    ]
+    compartment_ids = sorted(set(backup.compartment_id for backup in backups))
+    copy_fn = getattr(block_storage_client, operation["copy_fn"])
+    copy_details_class = getattr(models, operation["copy_details_class"])
+    wait = module.params.get("wait", True)
+
+    def get_backup_copy(region, backup, copied_backup=None, changed=False, error=None):
+        backup_copy = {
+            "region": region,
+            source_id_key: backup.id,
+            resource_type: copied_backup,
+            "changed": changed,
+        }
+        if error is not None:
+            backup_copy["error"] = error
+        return backup_copy
+
+    def copy_backups_to_region(region):
+        # Runs in a worker thread, so errors are returned to the caller instead of failing the module here
+        try:
+            region_client = oci_utils.create_service_client(
+                module, BlockstorageClient, region=region
+            )
+            copies_index = get_backup_copies_index(
+                region_client, resource_type, compartment_ids
+            )
+        except ServiceError as ex:
+            return [
+                get_backup_copy(region, backup, error=ex.message) for backup in backups
+            ]
+
+        backup_copies = dict()
+        backups_to_copy = []
+        for backup in backups:
+            if backup.id in copies_index:
+                _debug("Backup {0} already has a copy in {1}".format(backup.id, region))
+                backup_copies[backup.id] = get_backup_copy(
+                    region, backup, to_dict(copies_index[backup.id])
+                )
+            else:
+                backups_to_copy.append(backup)
+
+        batches = oci_utils.get_batches(
+            backups_to_copy, module.params.get("max_copies_per_region")
+        )
+        for batch_index, batch in enumerate(batches):
+            copied_backups = dict()
+            for backup in batch:
+                try:
+                    copied_backup = oci_utils.call_with_backoff(
+                        copy_fn,
+                        **{
+                            operation["get_param"]: backup.id,
+                            operation["copy_details_param"]: copy_details_class(
+                                destination_region=region
+                            ),
+                        }
+                    ).data
+                    copied_backups[copied_backup.id] = backup
+                    backup_copies[backup.id] = get_backup_copy(
+                        region, backup, to_dict(copied_backup), changed=True
+                    )
+                except ServiceError as ex:
+                    backup_copies[backup.id] = get_backup_copy(
+                        region, backup, error=ex.message
+                    )
+            if not copied_backups or (not wait and batch_index == len(batches) - 1):
+                continue
+
+            try:
+                waited_backups, timed_out_ids = oci_utils.wait_for_resources_lifecycle_state(
+                    module,
+                    getattr(region_client, operation["list_fn"]),
+                    [
+                        dict(compartment_id=compartment_id)
+                        for compartment_id in compartment_ids
+                    ],
+                    list(copied_backups),
+                    ["AVAILABLE"],
+                )
+            except ServiceError as ex:
+                waited_backups, timed_out_ids = dict(), list(copied_backups)
+                for backup in copied_backups.values():
+                    backup_copies[backup.id]["error"] = ex.message
+            for copied_backup_id, backup in copied_backups.items():
+                if copied_backup_id in waited_backups:
+                    backup_copies[backup.id][resource_type] = waited_backups[
+                        copied_backup_id
+                    ]
+                if copied_backup_id in timed_out_ids:
+                    backup_copies[backup.id].setdefault(
+                        "error", "Timed out waiting for the copy to be AVAILABLE"
+                    )
+            if timed_out_ids:
+                # Do not start more copies while the copies of this batch are still in progress
+                for backup in backups_to_copy:
+                    if backup.id not in backup_copies:
+                        backup_copies[backup.id] = get_backup_copy(
+                            region,
+                            backup,
+                            error="Not copied, as earlier copies to {0} are not complete".format(
+                                region
+                            ),
+                        )
+                break
+        return [backup_copies[backup.id] for backup in backups]
+
+    region_copies = oci_utils.execute_tasks(
+        copy_backups_to_region, module.params["destination_regions"], module
+    )
+    backup_copies = [backup_copy for copies in region_copies for backup_copy in copies]
+    result = {
+        "changed": any(backup_copy["changed"] for backup_copy in backup_copies),
+        resource_type + "_copies": backup_copies,
+    }
+    failed_copies = [
+        backup_copy for backup_copy in backup_copies if "error" in backup_copy
+    ]
+    if failed_copies:
+        module.fail_json(
+            msg="Failed {0} of {1} copies: {2}".format(
+                len(failed_copies),
+                len(backup_copies),
+                "; ".join(
+                    "{0} to {1}: {2}".format(
+                        backup_copy[source_id_key],
+                        backup_copy["region"],
+                        backup_copy["error"],
+                    )
+                    for backup_copy in failed_copies
+                ),
+            ),
+            **result
+        )
+    return result
@@ -44,30 +44,7 @@ def get_logger():
 
 
 def wait_on_work_request(client, response, module):
-    try:
-        if module.params.get("wait", None):
-            wait_response = oci.wait_until(
-                client,
-                response,
-                evaluate_response=lambda r: r.data.status == "SUCCEEDED",
-                max_wait_seconds=module.params.get(
-                    "wait_timeout", MAX_WAIT_TIMEOUT_IN_SECONDS
-                ),
-            )
-        else:
-            wait_response = oci.wait_until(
-                client,
-                response,
-                evaluate_response=lambda r: r.data.status == "ACCEPTED",
-                max_wait_seconds=module.params.get(
-                    "wait_timeout", MAX_WAIT_TIMEOUT_IN_SECONDS
-                ),
-            )
-    except MaximumWaitTimeExceeded as ex:
-        module.fail_json(msg=str(ex))
-    except ServiceError as ex:
-        module.fail_json(msg=str(ex))
-    return wait_response.data
+    return oci_utils.wait_on_work_request(client, response, module)
 
 
 def wait_on_resource(
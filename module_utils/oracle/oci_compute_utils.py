@@ -4,10 +4,15 @@
 # Apache License v2.0
 # See LICENSE.TXT for details.
 
+import threading
+import time
+
 from ansible.module_utils.oracle import oci_utils
+from ansible.module_utils import six
 
 try:
     from oci.util import to_dict
+    from oci.exceptions import ServiceError
 
     HAS_OCI_PY_SDK = True
 except ImportError:
@@ -55,3 +60,497 @@ def get_boot_volume_attachment(compute_client, instance):
     if boot_volume_attachments:
         return boot_volume_attachments[0]
     return None
+
+
+# Volume attachments in these states count as the volume being attached to the instance
+ACTIVE_VOLUME_ATTACHMENT_STATES = ["ATTACHING", "ATTACHED"]
+
+
+def get_volume_attachment_changes(
+    volume_attachments, volumes, purge_volume_attachments
+):
+    """
+    Compute the difference between the volume attachments of an instance and the desired volumes of the instance.
+    :param volume_attachments: List of all the volume attachments (as dicts) of the instance
+    :param volumes: List of the desired volumes. Each volume is a dict with a "volume_id" and an optional
+                    "attachment_state" (present/absent).
+    :param purge_volume_attachments: Whether to detach the attached volumes that are not in `volumes`
+    :return: A tuple of the list of volumes to attach and the list of volume attachments (as dicts) to detach
+    """
+    active_attachments = dict()
+    for volume_attachment in volume_attachments:
+        if volume_attachment["lifecycle_state"] in ACTIVE_VOLUME_ATTACHMENT_STATES:
+            active_attachments.setdefault(
+                volume_attachment["volume_id"], volume_attachment
+            )
+
+    volumes_to_attach = []
+    attachments_to_detach = []
+    desired_volume_ids = set()
+    for volume in volumes:
+        volume_id = volume["volume_id"]
+        if (volume.get("attachment_state") or "present") == "present":
+            desired_volume_ids.add(volume_id)
+            if volume_id not in active_attachments:
+                volumes_to_attach.append(volume)
+        elif volume_id in active_attachments:
+            attachments_to_detach.append(active_attachments.pop(volume_id))
+
+    if purge_volume_attachments:
+        for volume_id, volume_attachment in six.iteritems(active_attachments):
+            if volume_id not in desired_volume_ids:
+                attachments_to_detach.append(volume_attachment)
+    return volumes_to_attach, attachments_to_detach
+
+
+def reconcile_volume_attachments(
+    compute_client,
+    module,
+    instance,
+    attach_volume_details_list,
+    attachments_to_detach,
+):
+    """
+    Attach and detach volumes to and from an instance. All the attach and detach requests are issued together as per
+    the I(enable_parallel_requests) and I(max_thread_count) options, and when I(wait=yes) all the volume attachments
+    are waited on together with a single grouped lifecycle polling of the volume attachments of the instance. Volume
+    attachments to detach that are still ATTACHING are first waited on to be ATTACHED, as only ATTACHED volume
+    attachments can be detached.
+    :param compute_client: The compute client to use
+    :param module: Instance of AnsibleModule
+    :param instance: The instance (as a dict) to attach the volumes to and detach the volumes from
+    :param attach_volume_details_list: List of AttachVolumeDetails for the volumes to attach
+    :param attachments_to_detach: List of the volume attachments (as dicts) to detach
+    :return: A list with the outcome of each volume attachment change. The outcome contains the "action"
+             (ATTACH/DETACH), the "volume_id", the "volume_attachment" and whether it "changed". The outcome of a failed
+             change or of a change that did not complete within I(wait_timeout) contains an "error".
+    """
+    list_kwargs = [
+        dict(compartment_id=instance["compartment_id"], instance_id=instance["id"])
+    ]
+    outcomes = []
+    attaching_ids = [
+        volume_attachment["id"]
+        for volume_attachment in attachments_to_detach
+        if volume_attachment["lifecycle_state"] == "ATTACHING"
+    ]
+    if attaching_ids:
+        _debug(
+            "Waiting for {0} volume attachments to be ATTACHED before detaching them".format(
+                len(attaching_ids)
+            )
+        )
+        volume_attachments, timed_out_ids = oci_utils.wait_for_resources_lifecycle_state(
+            module,
+            compute_client.list_volume_attachments,
+            list_kwargs,
+            attaching_ids,
+            ["ATTACHED", "DETACHED"],
+        )
+        ready_attachments = []
+        for volume_attachment in attachments_to_detach:
+            volume_attachment = volume_attachments.get(
+                volume_attachment["id"], volume_attachment
+            )
+            if volume_attachment["id"] in timed_out_ids:
+                outcomes.append(
+                    dict(
+                        action="DETACH",
+                        volume_id=volume_attachment["volume_id"],
+                        volume_attachment=volume_attachment,
+                        changed=False,
+                        error="Timed out waiting for ATTACHED state before detaching",
+                    )
+                )
+            elif volume_attachment["lifecycle_state"] == "ATTACHED":
+                ready_attachments.append(volume_attachment)
+        attachments_to_detach = ready_attachments
+
+    tasks = [("ATTACH", details) for details in attach_volume_details_list] + [
+        ("DETACH", volume_attachment) for volume_attachment in attachments_to_detach
+    ]
+
+    def request_change(task):
+        action, arg = task
+        try:
+            if action == "ATTACH":
+                volume_id = arg.volume_id
+                volume_attachment = to_dict(
+                    oci_utils.call_with_backoff(
+                        compute_client.attach_volume, attach_volume_details=arg
+                    ).data
+                )
+            else:
+                volume_id = arg["volume_id"]
+                volume_attachment = arg
+                oci_utils.call_with_backoff(
+                    compute_client.detach_volume, volume_attachment_id=arg["id"]
+                )
+        except ServiceError as ex:
+            return dict(
+                action=action,
+                volume_id=volume_id,
+                volume_attachment=None if action == "ATTACH" else arg,
+                changed=False,
+                error=ex.message,
+            )
+        return dict(
+            action=action,
+            volume_id=volume_id,
+            volume_attachment=volume_attachment,
+            changed=True,
+        )
+
+    requested_outcomes = oci_utils.execute_tasks(request_change, tasks, module)
+    outcomes.extend(requested_outcomes)
+
+    pending = [outcome for outcome in requested_outcomes if "error" not in outcome]
+    if pending and module.params.get("wait", True):
+        target_states = dict(ATTACH="ATTACHED", DETACH="DETACHED")
+        volume_attachments, timed_out_ids = oci_utils.wait_for_resources_lifecycle_state(
+            module,
+            compute_client.list_volume_attachments,
+            list_kwargs,
+            [outcome["volume_attachment"]["id"] for outcome in pending],
+            dict(
+                (
+                    outcome["volume_attachment"]["id"],
+                    [target_states[outcome["action"]]],
+                )
+                for outcome in pending
+            ),
+        )
+        for outcome in pending:
+            volume_attachment_id = outcome["volume_attachment"]["id"]
+            if volume_attachment_id in volume_attachments:
+                outcome["volume_attachment"] = volume_attachments[volume_attachment_id]
+            if volume_attachment_id in timed_out_ids:
+                outcome["error"] = "Timed out waiting for {0} state".format(
+                    target_states[outcome["action"]]
+                )
+
+    return outcomes
+
+
+# The power action to execute on a compute instance or an instance pool to reach the desired 'state'
+POWER_ACTIONS = {
+    "stopped": "STOP",
+    "running": "START",
+    "reset": "RESET",
+    "softreset": "SOFTRESET",
+}
+
+# The desired lifecycle state for a compute instance or an instance pool to reach the user specified 'state'
+POWER_ACTION_LIFECYCLE_STATES = {
+    "stopped": "STOPPED",
+    "running": "RUNNING",
+    "reset": "RUNNING",
+    "softreset": "RUNNING",
+}
+
+
+def is_power_action_required(current_lifecycle_state, desired_state):
+    # Resets always require a power action. Other power actions are required only if the current state doesn't match
+    # the desired state.
+    return (
+        desired_state in ["softreset", "reset"]
+        or current_lifecycle_state != POWER_ACTION_LIFECYCLE_STATES[desired_state]
+    )
+
+
+def perform_power_action_in_batches(
+    module, resources, desired_state, power_action_fn, list_fn
+):
+    """
+    Perform a power action on a set of compute instances or instance pools in rolling batches of
+    I(batch_size) resources. The power actions within a batch are issued in parallel as per the
+    I(enable_parallel_requests) and I(max_thread_count) options, and when I(wait=yes) the whole batch is waited on
+    with grouped lifecycle polling before the next batch is released.
+    :param module: Instance of AnsibleModule
+    :param resources: List of resource model instances to perform the power action on
+    :param desired_state: The user specified 'state'. e.g. "stopped"
+    :param power_action_fn: Function that accepts a resource OCID and a power action (e.g. "STOP") and performs the
+                            power action on the resource
+    :param list_fn: Function in the SDK to list the resources by compartment. Used for waiting on a batch.
+                    e.g. compute_client.list_instances
+    :return: A tuple of the list of resources (as dicts) after the power action and a list of per-resource outcomes
+    """
+    action = POWER_ACTIONS[desired_state]
+    lifecycle_state = POWER_ACTION_LIFECYCLE_STATES[desired_state]
+    final_resources = [to_dict(resource) for resource in resources]
+    outcomes = [
+        dict(
+            id=resource.id,
+            display_name=resource.display_name,
+            action=None,
+            changed=False,
+            lifecycle_state=resource.lifecycle_state,
+        )
+        for resource in resources
+    ]
+    index_by_id = dict((resource.id, idx) for idx, resource in enumerate(resources))
+
+    def _power_action(resource):
+        try:
+            power_action_fn(resource.id, action)
+            return None
+        except ServiceError as ex:
+            return ex.message
+
+    for batch in oci_utils.get_batches(list(resources), module.params["batch_size"]):
+        batch = [
+            resource
+            for resource in batch
+            if is_power_action_required(resource.lifecycle_state, desired_state)
+        ]
+        if not batch:
+            continue
+        _debug(
+            "Performing power action {0} on {1} resources".format(action, len(batch))
+        )
+        errors = oci_utils.execute_tasks(_power_action, batch, module)
+        acted_ids = []
+        for resource, error in zip(batch, errors):
+            outcome = outcomes[index_by_id[resource.id]]
+            outcome["action"] = action
+            if error is None:
+                outcome["changed"] = True
+                acted_ids.append(resource.id)
+            else:
+                outcome["error"] = error
+
+        if acted_ids and module.params.get("wait", None):
+            compartment_ids = set(resource.compartment_id for resource in batch)
+            kwargs_lists = [dict(compartment_id=c) for c in sorted(compartment_ids)]
+            waited, timed_out_ids = oci_utils.wait_for_resources_lifecycle_state(
+                module, list_fn, kwargs_lists, acted_ids, [lifecycle_state]
+            )
+            for resource_id, resource in six.iteritems(waited):
+                idx = index_by_id[resource_id]
+                final_resources[idx] = resource
+                outcomes[idx]["lifecycle_state"] = resource["lifecycle_state"]
+            timeout_msg = "Timed out waiting for lifecycle_state to reach {0}".format(
+                lifecycle_state
+            )
+            for resource_id in timed_out_ids:
+                outcomes[index_by_id[resource_id]]["error"] = timeout_msg
+
+        if any("error" in outcome for outcome in outcomes):
+            # Do not release the next batch if a power action in this batch has failed
+            break
+
+    return final_resources, outcomes
+
+
+# Instances in these states are on their way out of an instance pool
+INSTANCE_POOL_LEAVING_STATES = ["TERMINATING", "TERMINATED"]
+
+
+def wait_for_instance_pool_instances(
+    compute_management_client,
+    module,
+    instance_pool_id,
+    size,
+    count_of_instances_to_wait,
+    deadline=None,
+):
+    """
+    Wait for an instance pool to be done scaling to `size` instances, with at least `count_of_instances_to_wait` of
+    its instances in RUNNING state. Each poll round gets the instance pool once and lists its instances once, with an
+    exponentially increasing poll interval.
+    :param compute_management_client: The compute management client to use
+    :param module: Instance of AnsibleModule
+    :param instance_pool_id: The OCID of the instance pool
+    :param size: The size the instance pool is scaling to
+    :param count_of_instances_to_wait: The number of instances of the instance pool to wait for to be RUNNING
+    :param deadline: The time, as returned by time.time(), after which to stop waiting. Used to share a single timeout
+                     across several waits. By default, the wait times out after I(wait_timeout) seconds.
+    :return: A tuple of the last seen state of the instance pool (as a dict), the number of RUNNING instances in the
+             instance pool, and whether the wait timed out.
+    """
+    start_time = time.time()
+    if deadline is None:
+        deadline = start_time + module.params.get(
+            "wait_timeout", oci_utils.MAX_WAIT_TIMEOUT_IN_SECONDS
+        )
+    max_wait_seconds = deadline - start_time
+    poll_interval = 1
+    while True:
+        instance_pool = oci_utils.call_with_backoff(
+            compute_management_client.get_instance_pool,
+            instance_pool_id=instance_pool_id,
+        ).data
+        instances = [
+            instance
+            for instance in oci_utils.list_all_resources(
+                compute_management_client.list_instance_pool_instances,
+                compartment_id=instance_pool.compartment_id,
+                instance_pool_id=instance_pool_id,
+            )
+            if instance.state not in INSTANCE_POOL_LEAVING_STATES
+        ]
+        running_count = len(
+            [instance for instance in instances if instance.state == "RUNNING"]
+        )
+        if (
+            instance_pool.lifecycle_state != "SCALING"
+            and len(instances) <= size
+            and running_count >= count_of_instances_to_wait
+        ):
+            return to_dict(instance_pool), running_count, False
+
+        elapsed_seconds = time.time() - start_time
+        if elapsed_seconds >= max_wait_seconds:
+            return to_dict(instance_pool), running_count, True
+        _debug(
+            "Instance pool {0} has {1} of {2} instances RUNNING.".format(
+                instance_pool_id, running_count, size
+            )
+        )
+        time.sleep(min(poll_interval, max_wait_seconds - elapsed_seconds))
+        poll_interval = min(poll_interval * 2, oci_utils.MAX_POLL_INTERVAL_IN_SECONDS)
+
+
+# Compute catalogs loaded in the current run, keyed by the catalog's cache file
+_compute_catalogs = dict()
+_compute_catalogs_lock = threading.Lock()
+
+
+def get_compute_catalog(compute_client, module, compartment_id, availability_domain):
+    """
+    Return the catalog of shapes available in an availability domain and of images available in a compartment. The
+    catalog is persisted in I(cache_dir) and is reused for I(cache_max_age) seconds, and is loaded only once per run
+    even when instances are launched in parallel.
+    :param compute_client: The compute client to use to list shapes and images
+    :param module: An AnsibleModule with the I(cache_dir) and I(cache_max_age) options
+    :param compartment_id: The OCID of the compartment
+    :param availability_domain: The name of the availability domain
+    :return: A dict with the list of available "shapes", an index of "images" by OCID, and an index of "image_shapes"
+             which maps an image OCID to the list of shapes compatible with the image
+    """
+    cache_file = oci_utils.get_cache_file(
+        module.params["cache_dir"],
+        "compute-catalog",
+        endpoint=getattr(compute_client.base_client, "endpoint", None),
+        compartment_id=compartment_id,
+        availability_domain=availability_domain,
+    )
+    with _compute_catalogs_lock:
+        if cache_file in _compute_catalogs:
+            return _compute_catalogs[cache_file]
+
+        catalog = None
+        if oci_utils.is_cache_valid(cache_file, module.params["cache_max_age"]):
+            _debug("Reading compute catalog from cache {0}".format(cache_file))
+            catalog = oci_utils.read_from_cache(cache_file)
+        if catalog is None:
+            _debug("Building compute catalog for {0}".format(availability_domain))
+            shapes = oci_utils.list_all_resources(
+                compute_client.list_shapes,
+                compartment_id=compartment_id,
+                availability_domain=availability_domain,
+            )
+            images = oci_utils.list_all_resources(
+                compute_client.list_images, compartment_id=compartment_id
+            )
+            catalog = dict(
+                compartment_id=compartment_id,
+                availability_domain=availability_domain,
+                shapes=sorted(set(shape.shape for shape in shapes)),
+                images=dict((image.id, _get_image_summary(image)) for image in images),
+                image_shapes=dict(),
+            )
+            oci_utils.write_to_cache(cache_file, catalog)
+        catalog["cache_file"] = cache_file
+        _compute_catalogs[cache_file] = catalog
+        return catalog
+
+
+def _get_image_summary(image):
+    return dict(
+        display_name=image.display_name,
+        lifecycle_state=image.lifecycle_state,
+        operating_system=image.operating_system,
+        operating_system_version=image.operating_system_version,
+    )
+
+
+def get_catalog_image(compute_client, catalog, image_id, refresh=False):
+    """
+    Return the summary of an image from the compute catalog. Images that are not in the catalog, such as custom images
+    in other compartments, are fetched and added to the catalog.
+    :param refresh: Whether to fetch the image again even if it is in the catalog, e.g. because its state may have
+                    changed since the catalog was cached. The refreshed image is persisted in the catalog's cache file.
+    """
+    if refresh or image_id not in catalog["images"]:
+        image = oci_utils.call_with_backoff(
+            compute_client.get_image, image_id=image_id
+        ).data
+        with _compute_catalogs_lock:
+            catalog["images"][image_id] = _get_image_summary(image)
+            if refresh:
+                oci_utils.write_to_cache(catalog["cache_file"], catalog)
+    return catalog["images"][image_id]
+
+
+def get_catalog_image_shapes(compute_client, module, catalog, image_id):
+    """
+    Return the list of shapes compatible with an image, from the compute catalog. The compatible shapes of an image are
+    looked up on first use and persisted in the catalog's cache file.
+    """
+    if image_id not in catalog["image_shapes"]:
+        shapes = oci_utils.list_all_resources(
+            compute_client.list_shapes,
+            compartment_id=catalog["compartment_id"],
+            availability_domain=catalog["availability_domain"],
+            image_id=image_id,
+        )
+        with _compute_catalogs_lock:
+            catalog["image_shapes"][image_id] = sorted(
+                set(shape.shape for shape in shapes)
+            )
+            oci_utils.write_to_cache(catalog["cache_file"], catalog)
+    return catalog["image_shapes"][image_id]
+
+
+def validate_launch_instance_details(compute_client, module, launch_instance_details):
+    """
+    Validate the shape and the image of an instance that is about to be launched against the compute catalog, and fail
+    the module if the instance cannot be launched. This avoids submitting launch requests that are bound to fail.
+    """
+    lid = launch_instance_details
+    try:
+        catalog = get_compute_catalog(
+            compute_client, module, lid.compartment_id, lid.availability_domain
+        )
+        if lid.shape not in catalog["shapes"]:
+            module.fail_json(
+                msg="Shape {0} is not available in availability domain {1}. Available shapes: {2}".format(
+                    lid.shape, lid.availability_domain, ", ".join(catalog["shapes"])
+                )
+            )
+
+        image_id = getattr(lid.source_details, "image_id", None)
+        if image_id is None:
+            return
+        image = get_catalog_image(compute_client, catalog, image_id)
+        if image["lifecycle_state"] != "AVAILABLE":
+            # The image may have become AVAILABLE since the catalog was cached, e.g. after an import
+            image = get_catalog_image(compute_client, catalog, image_id, refresh=True)
+        if image["lifecycle_state"] != "AVAILABLE":
+            module.fail_json(
+                msg="Image {0} is in {1} state and cannot be used to launch an instance.".format(
+                    image_id, image["lifecycle_state"]
+                )
+            )
+        compatible_shapes = get_catalog_image_shapes(
+            compute_client, module, catalog, image_id
+        )
+        if lid.shape not in compatible_shapes:
+            module.fail_json(
+                msg="Shape {0} is not compatible with image {1}. Compatible shapes: {2}".format(
+                    lid.shape, image_id, ", ".join(compatible_shapes)
+                )
+            )
+    except ServiceError as ex:
+        module.fail_json(msg=ex.message)
@@ -4,8 +4,15 @@
 # Apache License v2.0
 # See LICENSE.TXT for details.
 
+import base64
+import binascii
+import hashlib
+import os
+import re
+
 from ansible.module_utils.oracle import oci_utils
 from ansible.module_utils import six
+from ansible.module_utils._text import to_bytes
 from ansible.module_utils.facts.utils import get_file_content
 
 try:
@@ -38,20 +45,32 @@ MAX_WAIT_TIMEOUT_IN_SECONDS = 1200
 
 logger = oci_utils.get_logger("oci_lb_utils")
 
+PEM_BLOCK_PATTERN = re.compile(
+    r"-----BEGIN ([A-Z0-9 ]+)-----(.*?)-----END \1-----", re.DOTALL
+)
+
+# Contents of the certificate files read in this run, by path, with the modification time of the file when read
+_certificate_file_contents = dict()
+
+# Fingerprints of the PEM encoded certificates seen in this run, by PEM string
+_pem_fingerprints = dict()
+
+PATH_MATCH_TYPES = [
+    "EXACT_MATCH",
+    "FORCE_LONGEST_PREFIX_MATCH",
+    "PREFIX_MATCH",
+    "SUFFIX_MATCH",
+]
+
 
 def verify_work_request(lb_client, response):
     work_request_id = None
     if response is not None:
         work_request_id = response.headers.get("opc-work-request-id")
-    oci.wait_until(
-        lb_client,
-        lb_client.get_work_request(work_request_id),
-        evaluate_response=lambda r: r.data.lifecycle_state in ["SUCCEEDED", "FAILED"],
-    )
-    response = lb_client.get_work_request(work_request_id)
-    if response.data.lifecycle_state == "FAILED":
-        raise ClientError(Exception(response.data.error_details))
-    return response
+    work_request = wait_for_work_request(lb_client, None, work_request_id)
+    if work_request["lifecycle_state"] == "FAILED":
+        raise ClientError(Exception(work_request["error_details"]))
+    return work_request
 
 
 def create_or_update_lb_resources_and_wait(
@@ -75,11 +94,11 @@ def create_or_update_lb_resources_and_wait(
         if wait_applicable and module.params.get("wait", None):
             if states is None:
                 states = module.params.get("wait_until") or DEFAULT_COMPLETED_STATES
-            response = get_work_request_response(
-                lb_client, work_request_id, states, module
+            work_request = wait_for_work_request(
+                lb_client, module, work_request_id, states
             )
-            if response.data.lifecycle_state == "FAILED":
-                module.fail_json(msg=response.data.error_details)
+            if work_request["lifecycle_state"] == "FAILED":
+                module.fail_json(msg=work_request["error_details"])
 
             if kwargs_get:
                 if get_sub_resource_fn:
@@ -91,7 +110,7 @@ def create_or_update_lb_resources_and_wait(
             else:
                 result[resource_type] = to_dict(
                     oci_utils.call_with_backoff(
-                        get_fn, **{get_param: to_dict(response.data).get(get_param)}
+                        get_fn, **{get_param: work_request.get(get_param)}
                     ).data
                 )
         result["changed"] = True
@@ -132,11 +151,11 @@ def delete_lb_resources_and_wait(
                 if states is None:
                     states = module.params.get("wait_until") or DEFAULT_COMPLETED_STATES
 
-            response = get_work_request_response(
-                lb_client, work_request_id, states, module
+            work_request = wait_for_work_request(
+                lb_client, module, work_request_id, states
             )
-            if response.data.lifecycle_state == "FAILED":
-                module.fail_json(msg=response.data.error_details)
+            if work_request["lifecycle_state"] == "FAILED":
+                module.fail_json(msg=work_request["error_details"])
             result["changed"] = True
         else:
             result[resource_type] = dict()
@@ -149,17 +168,74 @@ def delete_lb_resources_and_wait(
     return result
 
 
-def get_work_request_response(lb_client, work_request_id, states, module):
-    work_request_response = oci_utils.call_with_backoff(
-        lb_client.get_work_request, work_request_id=work_request_id
+def wait_for_work_request(lb_client, module, work_request_id, states=None):
+    """
+    Wait for a work request of a load balancer to get into one of `states`, or to complete.
+    :return: The work request (as a dict)
+    """
+    work_requests, timed_out_ids = oci_utils.wait_for_work_requests(
+        lb_client,
+        module,
+        [work_request_id],
+        adapter="LoadBalancerClient",
+        states=states,
     )
-    response = oci.wait_until(
+    if timed_out_ids:
+        raise MaximumWaitTimeExceeded(
+            "Timed out waiting for work request {0}".format(work_request_id)
+        )
+    return work_requests[work_request_id]
+
+
+def wait_for_work_requests(lb_client, module, load_balancer_id, work_request_ids):
+    """
+    Wait for a group of work requests of a load balancer to complete, with one listing of the work requests of the
+    load balancer in each poll round instead of one poll loop per work request.
+    :return: A dictionary of work request OCID to the completed work request (as a dict)
+    """
+    work_requests, timed_out_ids = oci_utils.wait_for_work_requests(
         lb_client,
-        work_request_response,
-        evaluate_response=lambda r: r.data.lifecycle_state in states,
-        max_wait_seconds=module.params.get("wait_timeout", MAX_WAIT_TIMEOUT_IN_SECONDS),
+        module,
+        work_request_ids,
+        adapter="LoadBalancerClient",
+        list_fn=lb_client.list_work_requests,
+        kwargs_lists=[dict(load_balancer_id=load_balancer_id)],
     )
-    return response
+    if timed_out_ids:
+        raise MaximumWaitTimeExceeded(
+            "Timed out waiting for work requests {0}".format(
+                ", ".join(sorted(timed_out_ids))
+            )
+        )
+    return work_requests
+
+
+def get_details_from_resource(details_type, resource):
+    """
+    Convert a load balancer resource model, or a list of them, to a details model used by the create and update
+    operations, e.g. a Listener's SSLConfiguration to SSLConfigurationDetails.
+    :param details_type: The swagger type of the details, e.g. "SSLConfigurationDetails" or "list[BackendDetails]"
+    :param resource: The resource model
+    """
+    if resource is None:
+        return None
+    if details_type.startswith("list["):
+        return [
+            get_details_from_resource(details_type[5:-1], resource_item)
+            for resource_item in resource
+        ]
+    details_class = getattr(oci.load_balancer.models, details_type, None)
+    if details_class is None:
+        return resource
+    details = details_class()
+    for attribute, attribute_type in six.iteritems(details.swagger_types):
+        details.__setattr__(
+            attribute,
+            get_details_from_resource(
+                attribute_type, getattr(resource, attribute, None)
+            ),
+        )
+    return details
 
 
 def get_backend_name(module):
@@ -235,7 +311,7 @@ def create_certificates(certificate_details_dict):
         for attribute in attributes:
             if value.get(attribute) is not None:
                 certificate_details.__setattr__(
-                    attribute, get_file_content(value.get(attribute, None))
+                    attribute, get_certificate_file_content(value.get(attribute))
                 )
         result_certificates.update({key: certificate_details})
     return result_certificates
@@ -403,31 +479,19 @@ def create_path_routes(path_routes_list):
         raise ClientError(
             "path_routes is mandatory attribute for path_route_set and can not be empty."
         )
-    HashedPathMatchType = oci_utils.generate_subclass(PathMatchType)
-    path_match_type = dict(
-        EXACT_MATCH=HashedPathMatchType(
-            match_type=PathMatchType.MATCH_TYPE_EXACT_MATCH
-        ),
-        FORCE_LONGEST_PREFIX_MATCH=HashedPathMatchType(
-            match_type=PathMatchType.MATCH_TYPE_FORCE_LONGEST_PREFIX_MATCH
-        ),
-        PREFIX_MATCH=HashedPathMatchType(
-            match_type=PathMatchType.MATCH_TYPE_PREFIX_MATCH
-        ),
-        SUFFIX_MATCH=HashedPathMatchType(
-            match_type=PathMatchType.MATCH_TYPE_SUFFIX_MATCH
-        ),
-    )
     result_path_routes = list()
-    HashedPathRoute = oci_utils.generate_subclass(PathRoute)
     for path_route_entry in path_routes_list:
-        path_route = HashedPathRoute()
+        path_route = PathRoute()
         backend_set_name = path_route_entry.get("backend_set_name", None)
         path = path_route_entry.get("path", None)
-        path_match_type = path_match_type.get(
-            path_route_entry.get("path_match_type", None).get("match_type", None)
+        match_type = (path_route_entry.get("path_match_type", None) or dict()).get(
+            "match_type", None
         )
-        if backend_set_name is None or path is None or path_match_type is None:
+        if (
+            backend_set_name is None
+            or path is None
+            or match_type not in PATH_MATCH_TYPES
+        ):
             raise ClientError(
                 Exception(
                     "backend_set_name, path and path_match_type are mandatory attributes for"
@@ -436,11 +500,114 @@ def create_path_routes(path_routes_list):
             )
         path_route.backend_set_name = backend_set_name
         path_route.path = path
-        path_route.path_match_type = path_match_type
+        path_route.path_match_type = PathMatchType(match_type=match_type)
         result_path_routes.append(path_route)
+    conflicts = compile_path_routes(result_path_routes)["conflicts"]
+    if conflicts:
+        raise ClientError(Exception("Conflicting path routes: " + "; ".join(conflicts)))
     return result_path_routes
 
 
+def get_path_route_key(path_route):
+    """
+    Get the canonical tuple of a path route, (match type, path, backend set name). Path strings are case-insensitive.
+    """
+    return (
+        to_dict(path_route.path_match_type or dict()).get("match_type"),
+        path_route.path.lower(),
+        path_route.backend_set_name,
+    )
+
+
+def _add_path_to_trie(trie, path, index):
+    node = trie
+    for character in path:
+        node = node.setdefault(character, dict())
+    # The None key of a node holds the index of the first route whose path ends at the node
+    node.setdefault(None, index)
+
+
+def _get_first_route_in_trie(trie, path):
+    # Get the index of the first route of the trie whose path is a prefix of `path`, or None
+    node = trie
+    first_index = node.get(None)
+    for character in path:
+        node = node.get(character)
+        if node is None:
+            break
+        if node.get(None) is not None and (
+            first_index is None or node[None] < first_index
+        ):
+            first_index = node[None]
+    return first_index
+
+
+def compile_path_routes(path_routes):
+    """
+    Compile the path routes of a path route set, checking them for conflicts and unreachable routes in a single pass
+    over their paths. The paths of the PREFIX_MATCH and FORCE_LONGEST_PREFIX_MATCH routes are indexed in a prefix trie
+    per match type, and the paths of the SUFFIX_MATCH routes in a trie of the reversed paths. The service applies the
+    EXACT_MATCH routes first, then the FORCE_LONGEST_PREFIX_MATCH routes, the longest prefix winning, then the
+    PREFIX_MATCH and SUFFIX_MATCH routes in order, the first matching route winning. So only a PREFIX_MATCH or
+    SUFFIX_MATCH route can be unreachable, when an earlier PREFIX_MATCH or SUFFIX_MATCH route matches all the paths it
+    matches. Across the two match types that is only the case for an earlier catch-all route, a prefix of "/" or an
+    empty suffix, as paths start with "/".
+    :param path_routes: A list of PathRoute
+    :return: A dictionary with the canonical tuples of the routes (keys, see get_path_route_key), the routes by match
+     type and path (routes), the conflicts (routes with the same match type and path and different backend sets), the
+     duplicate routes (duplicates), and the unreachable routes with the route shadowing them (unreachable)
+    """
+    compiled_path_routes = dict(
+        keys=[], routes=dict(), conflicts=[], duplicates=[], unreachable=[]
+    )
+    tries = dict((match_type, dict()) for match_type in PATH_MATCH_TYPES)
+    keys = compiled_path_routes["keys"]
+    for index, path_route in enumerate(path_routes):
+        key = get_path_route_key(path_route)
+        keys.append(key)
+        match_type, path, backend_set_name = key
+        previous_index = compiled_path_routes["routes"].get((match_type, path))
+        if previous_index is not None:
+            if keys[previous_index][2] != backend_set_name:
+                compiled_path_routes["conflicts"].append(
+                    "{0} {1} routes to both {2} and {3}".format(
+                        match_type,
+                        path_route.path,
+                        keys[previous_index][2],
+                        backend_set_name,
+                    )
+                )
+            else:
+                compiled_path_routes["duplicates"].append(key)
+            continue
+        compiled_path_routes["routes"][(match_type, path)] = index
+        shadowing_indexes = []
+        if match_type == "PREFIX_MATCH":
+            shadowing_indexes = [
+                _get_first_route_in_trie(tries["PREFIX_MATCH"], path),
+                _get_first_route_in_trie(tries["SUFFIX_MATCH"], ""),
+            ]
+        elif match_type == "SUFFIX_MATCH":
+            shadowing_indexes = [
+                _get_first_route_in_trie(tries["SUFFIX_MATCH"], path[::-1]),
+                _get_first_route_in_trie(tries["PREFIX_MATCH"], "/"),
+            ]
+        shadowing_indexes = [
+            shadowing_index
+            for shadowing_index in shadowing_indexes
+            if shadowing_index is not None
+        ]
+        if shadowing_indexes:
+            compiled_path_routes["unreachable"].append(
+                dict(path_route=key, shadowed_by=keys[min(shadowing_indexes)])
+            )
+        if match_type == "SUFFIX_MATCH":
+            _add_path_to_trie(tries[match_type], path[::-1], index)
+        elif match_type != "EXACT_MATCH":
+            _add_path_to_trie(tries[match_type], path, index)
+    return compiled_path_routes
+
+
 def create_hostnames(hostnames_dicts):
     if hostnames_dicts is None:
         return None
@@ -505,14 +672,16 @@ def get_certificate(lb_client, module, lb_id, name):
     return existing_certificate
 
 
-def get_create_certificate_details(module, name):
+def get_create_certificate_details(module, name, certificate_params=None):
+    if certificate_params is None:
+        certificate_params = module.params
     certificate_input_details = dict(
         {
             "certificate_name": name,
-            "ca_certificate": module.params.get("ca_certificate"),
-            "passphrase": module.params.get("passphrase"),
-            "private_key": module.params.get("private_key"),
-            "public_certificate": module.params.get("public_certificate"),
+            "ca_certificate": certificate_params.get("ca_certificate"),
+            "passphrase": certificate_params.get("passphrase"),
+            "private_key": certificate_params.get("private_key"),
+            "public_certificate": certificate_params.get("public_certificate"),
         }
     )
     certificate_details = create_certificates(
@@ -527,18 +696,83 @@ def get_create_certificate_details(module, name):
 
 
 def is_same_certificate(create_certificate_details, certificate):
-    same_certificate = True
-    if next(
-        (
-            attribute
-            for attribute in certificate.attribute_map
-            if getattr(certificate, attribute)
-            != getattr(create_certificate_details, attribute)
-        ),
-        None,
-    ):
-        same_certificate = False
-    return same_certificate
+    return (
+        create_certificate_details.certificate_name == certificate.certificate_name
+        and get_certificate_fingerprint(create_certificate_details)
+        == get_certificate_fingerprint(certificate)
+    )
+
+
+def get_certificate_file_content(path):
+    """
+    Get the content of a certificate file. A file is only read again if it was modified since it was last read in
+    this run.
+    """
+    if path is None:
+        return None
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return get_file_content(path)
+    cached_content = _certificate_file_contents.get(path)
+    if cached_content is None or cached_content[0] != mtime:
+        cached_content = (mtime, get_file_content(path))
+        _certificate_file_contents[path] = cached_content
+    return cached_content[1]
+
+
+def get_pem_fingerprint(pem):
+    """
+    Get the fingerprint of PEM encoded certificates, the SHA-256 digests of the DER encoding of each PEM block. Two
+    encodings of the same certificates that only differ by their line breaks or whitespaces have the same fingerprint.
+    Text that is not PEM encoded is fingerprinted without its whitespaces.
+    """
+    if pem is None:
+        return None
+    fingerprint = _pem_fingerprints.get(pem)
+    if fingerprint is None:
+        try:
+            ders = [
+                base64.b64decode(to_bytes("".join(body.split())))
+                for label, body in PEM_BLOCK_PATTERN.findall(pem)
+            ]
+        except (binascii.Error, TypeError):
+            ders = []
+        if not ders:
+            ders = [to_bytes("".join(pem.split()))]
+        fingerprint = ":".join(hashlib.sha256(der).hexdigest() for der in ders)
+        _pem_fingerprints[pem] = fingerprint
+    return fingerprint
+
+
+def get_certificate_fingerprint(certificate):
+    """
+    Get the fingerprint of a certificate bundle, from its public certificate and its CA certificate. The private key
+    of a certificate bundle is not returned by the service, and is not part of the fingerprint.
+    :param certificate: A Certificate, CertificateDetails or CreateCertificateDetails
+    """
+    return (
+        get_pem_fingerprint(certificate.public_certificate),
+        get_pem_fingerprint(certificate.ca_certificate),
+    )
+
+
+def get_certificates_index(lb_client, module, lb_id):
+    """
+    Index the certificate bundles of a load balancer by name, from a single listing of the certificates.
+    :return: A dictionary of certificate name to certificate
+    """
+    certificates_index = dict()
+    try:
+        certificates = oci_utils.call_with_backoff(
+            lb_client.list_certificates, load_balancer_id=lb_id
+        ).data
+    except ServiceError as ex:
+        logger.error("Failed to list the certificates", exc_info=True)
+        module.fail_json(msg=ex.message)
+    for certificate in certificates:
+        certificates_index[certificate.certificate_name] = certificate
+    return certificates_index
 
 
 def generic_hash(obj):
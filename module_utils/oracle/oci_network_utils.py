@@ -0,0 +1,1059 @@
+# Copyright (c) 2019, Oracle and/or its affiliates.
+# This software is made available to you under the terms of the GPL 3.0 license or the Apache 2.0 license.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0
+# See LICENSE.TXT for details.
+
+import binascii
+import bisect
+import heapq
+import socket
+from collections import namedtuple
+
+from ansible.module_utils.oracle import oci_utils
+from ansible.module_utils import six
+
+try:
+    from oci.util import to_dict
+    from oci.core.models import (
+        IngressSecurityRule,
+        EgressSecurityRule,
+        IcmpOptions,
+        TcpOptions,
+        UdpOptions,
+        PortRange,
+    )
+
+    HAS_OCI_PY_SDK = True
+except ImportError:
+    HAS_OCI_PY_SDK = False
+
+
+logger = oci_utils.get_logger("oci_network_utils")
+
+
+def _debug(s):
+    get_logger().debug(s)
+
+
+def get_logger():
+    return logger
+
+
+# A port range that is not specified in a security rule covers all the ports
+FULL_PORT_RANGE = (1, 65535)
+
+# Protocols of security rules whose port ranges can be specified
+PORT_RANGE_PROTOCOLS = {"6": "tcp_options", "17": "udp_options"}
+
+# Protocols of security rules whose ICMP type and code can be specified
+ICMP_PROTOCOLS = ["1", "58"]
+
+# Indexes of the addresses reserved in every subnet, negative indexes counting from the end of the subnet
+SUBNET_RESERVED_ADDRESS_INDEXES = [0, 1, -1]
+
+# A security rule compiled into a canonical form. CIDR blocks are normalized to an IP version, an integer network
+# address and a prefix length, and the source and destination port ranges of a rule to (min, max) intervals. Other
+# addresses (such as service CIDR labels) are kept as is in `network`, and only match the same address.
+CompiledSecurityRule = namedtuple(
+    "CompiledSecurityRule",
+    [
+        "direction",
+        "address_type",
+        "is_stateless",
+        "version",
+        "network",
+        "prefixlen",
+        "protocol",
+        "src_ports",
+        "icmp",
+        "dst_ports",
+    ],
+)
+
+
+def parse_cidr_block(cidr_block):
+    """
+    Parse a CIDR block into its IP version, its integer network address and its prefix length. The host bits of the
+    address are cleared, so that "10.0.0.5/24" and "10.0.0.0/24" result in the same network.
+    :param cidr_block: An IPv4 or IPv6 CIDR block, e.g. "10.0.0.0/16". A single address is a /32 (or /128) block.
+    :return: A tuple of the IP version (4 or 6), the network address as an integer and the prefix length
+    :raises ValueError: If the CIDR block is invalid
+    """
+    address, _, prefixlen = cidr_block.partition("/")
+    if ":" in address:
+        family, version = socket.AF_INET6, 6
+    else:
+        family, version = socket.AF_INET, 4
+    address_bits = _get_address_bits(version)
+    try:
+        value = int(binascii.hexlify(socket.inet_pton(family, address)), 16)
+        prefixlen = int(prefixlen) if prefixlen else address_bits
+    except (socket.error, ValueError):
+        raise ValueError("Invalid CIDR block {0}".format(cidr_block))
+    if not 0 <= prefixlen <= address_bits:
+        raise ValueError("Invalid CIDR block {0}".format(cidr_block))
+    return version, value & _get_network_mask(version, prefixlen), prefixlen
+
+
+def format_cidr_block(version, network, prefixlen):
+    """
+    Format an IP version, an integer network address and a prefix length as a CIDR block, e.g. "10.0.0.0/16".
+    """
+    address_bits = _get_address_bits(version)
+    family = socket.AF_INET6 if version == 6 else socket.AF_INET
+    packed = binascii.unhexlify("{0:0{1}x}".format(network, address_bits // 4))
+    return "{0}/{1}".format(socket.inet_ntop(family, packed), prefixlen)
+
+
+def format_ip_address(version, address):
+    """
+    Format an IP version and an integer address as an IP address, e.g. "10.0.0.5".
+    """
+    return format_cidr_block(version, address, _get_address_bits(version)).partition(
+        "/"
+    )[0]
+
+
+def _get_subnet_address_bitmap(cidr_block, used_ip_addresses):
+    version, network, prefixlen = parse_cidr_block(cidr_block)
+    if version != 4:
+        raise ValueError("Only IPv4 subnets are supported, got {0}".format(cidr_block))
+    size = 1 << (32 - prefixlen)
+    # One byte per address of the subnet, set for the addresses that cannot be allocated. The first two addresses
+    # (network address and default gateway) and the last address (broadcast address) of a subnet are reserved.
+    bitmap = bytearray(size)
+    for index in SUBNET_RESERVED_ADDRESS_INDEXES:
+        bitmap[index % size] = 1
+    for ip_address in used_ip_addresses:
+        _, address, _ = parse_cidr_block(ip_address)
+        if network <= address < network + size:
+            bitmap[address - network] = 1
+    return network, bitmap
+
+
+def get_free_ip_addresses(cidr_block, used_ip_addresses, count):
+    """
+    Find the lowest free IPv4 addresses of a subnet, given the addresses of the subnet already in use.
+    :param cidr_block: The CIDR block of the subnet, e.g. "10.0.0.0/24"
+    :param used_ip_addresses: The IP addresses in use in the subnet. Addresses outside of the subnet are ignored.
+    :param count: The number of free addresses to return
+    :return: A list of at most `count` free IP addresses, in ascending order
+    :raises ValueError: If the CIDR block or one of the used IP addresses is invalid
+    """
+    network, bitmap = _get_subnet_address_bitmap(cidr_block, used_ip_addresses)
+    free_ip_addresses = []
+    index = bitmap.find(b"\x00")
+    while index != -1 and len(free_ip_addresses) < count:
+        free_ip_addresses.append(format_ip_address(4, network + index))
+        index = bitmap.find(b"\x00", index + 1)
+    return free_ip_addresses
+
+
+def is_assignable_ip_address(cidr_block, ip_address):
+    """
+    Check whether an IPv4 address is in a subnet and is not one of the addresses reserved in the subnet.
+    :raises ValueError: If the CIDR block or the IP address is invalid
+    """
+    network, bitmap = _get_subnet_address_bitmap(cidr_block, [])
+    _, address, _ = parse_cidr_block(ip_address)
+    return network <= address < network + len(bitmap) and not bitmap[address - network]
+
+
+def get_cidr_allocator(cidr_block, allocated_cidr_blocks):
+    """
+    Create an allocator of the free CIDR blocks of an address space, e.g. of the subnets of a VCN. The free address
+    space is kept as the smallest set of aligned free blocks. The network addresses of the free blocks of each prefix
+    length are kept in a set, to look a block up in constant time when reserving it, and in a min-heap, to find the
+    lowest free block when allocating one. Blocks taken out of the set are dropped from the heap lazily, once they reach
+    its top. A block is thus reserved or allocated in O(log n) time for each prefix length.
+    :param cidr_block: The CIDR block of the address space, e.g. the CIDR block of the VCN
+    :param allocated_cidr_blocks: The CIDR blocks already allocated in the address space, e.g. the CIDR blocks of the
+                                  existing subnets of the VCN
+    :return: The allocator, to use with `allocate_cidr_block` and `reserve_cidr_block`
+    :raises ValueError: If a CIDR block is invalid, or if an allocated CIDR block is not within the address space or
+                        overlaps with another allocated CIDR block
+    """
+    version, network, prefixlen = parse_cidr_block(cidr_block)
+    allocator = dict(
+        cidr_block=format_cidr_block(version, network, prefixlen),
+        version=version,
+        network=network,
+        prefixlen=prefixlen,
+        free_blocks={prefixlen: set([network])},
+        free_block_heaps={prefixlen: [network]},
+    )
+    for allocated_cidr_block in allocated_cidr_blocks:
+        reserve_cidr_block(allocator, allocated_cidr_block)
+    return allocator
+
+
+def _take_free_block(allocator, block_network, block_prefixlen, network, prefixlen):
+    # Remove a free block and give back the parts of it around the allocated block, each level of the split leaving
+    # the half of the block that does not contain the allocated block free.
+    allocator["free_blocks"][block_prefixlen].discard(block_network)
+    address_bits = _get_address_bits(allocator["version"])
+    for half_prefixlen in range(block_prefixlen + 1, prefixlen + 1):
+        half_network = network & _get_network_mask(allocator["version"], half_prefixlen)
+        buddy_network = half_network ^ (1 << (address_bits - half_prefixlen))
+        allocator["free_blocks"].setdefault(half_prefixlen, set()).add(buddy_network)
+        heapq.heappush(
+            allocator["free_block_heaps"].setdefault(half_prefixlen, []),
+            buddy_network,
+        )
+
+
+def _get_lowest_free_block(allocator, prefixlen):
+    # Return the network address of the lowest free block of a prefix length, or None if there is none, first dropping
+    # the blocks that were taken since they were pushed to the heap
+    blocks = allocator["free_blocks"].get(prefixlen, set())
+    heap = allocator["free_block_heaps"].get(prefixlen, [])
+    while heap and heap[0] not in blocks:
+        heapq.heappop(heap)
+    return heap[0] if heap else None
+
+
+def _is_within_allocator(allocator, version, network, prefixlen):
+    return (
+        version == allocator["version"]
+        and prefixlen >= allocator["prefixlen"]
+        and network & _get_network_mask(version, allocator["prefixlen"])
+        == allocator["network"]
+    )
+
+
+def reserve_cidr_block(allocator, cidr_block):
+    """
+    Mark a CIDR block as allocated, e.g. to validate the CIDR block of a new subnet before creating it.
+    :raises ValueError: If the CIDR block is invalid, is not within the address space of the allocator or overlaps with
+                        an allocated CIDR block
+    """
+    version, network, prefixlen = parse_cidr_block(cidr_block)
+    if not _is_within_allocator(allocator, version, network, prefixlen):
+        raise ValueError(
+            "CIDR block {0} is not within {1}".format(
+                cidr_block, allocator["cidr_block"]
+            )
+        )
+    for block_prefixlen in range(allocator["prefixlen"], prefixlen + 1):
+        block_network = network & _get_network_mask(version, block_prefixlen)
+        if block_network in allocator["free_blocks"].get(block_prefixlen, ()):
+            _take_free_block(
+                allocator, block_network, block_prefixlen, network, prefixlen
+            )
+            return
+    raise ValueError(
+        "CIDR block {0} overlaps with an allocated CIDR block".format(cidr_block)
+    )
+
+
+def allocate_cidr_block(allocator, prefixlen):
+    """
+    Allocate the free CIDR block of a prefix length with the lowest network address.
+    :return: The allocated CIDR block, e.g. "10.0.2.0/24"
+    :raises ValueError: If the prefix length is invalid, or if there is no free CIDR block of that size left
+    """
+    address_bits = _get_address_bits(allocator["version"])
+    if not allocator["prefixlen"] <= prefixlen <= address_bits:
+        raise ValueError(
+            "Invalid prefix length {0} for {1}".format(
+                prefixlen, allocator["cidr_block"]
+            )
+        )
+    candidates = []
+    for block_prefixlen in range(allocator["prefixlen"], prefixlen + 1):
+        block_network = _get_lowest_free_block(allocator, block_prefixlen)
+        if block_network is not None:
+            candidates.append((block_network, block_prefixlen))
+    if not candidates:
+        raise ValueError(
+            "No free /{0} CIDR block left in {1}".format(
+                prefixlen, allocator["cidr_block"]
+            )
+        )
+    block_network, block_prefixlen = min(candidates)
+    _take_free_block(
+        allocator, block_network, block_prefixlen, block_network, prefixlen
+    )
+    return format_cidr_block(allocator["version"], block_network, prefixlen)
+
+
+def get_cidr_allocators(cidr_blocks, allocated_cidr_blocks):
+    """
+    Create one allocator per CIDR block of an address space made of several CIDR blocks, e.g. the CIDR blocks of a VCN.
+    Each allocated CIDR block is reserved in the allocator of the CIDR block that contains it.
+    :param cidr_blocks: The CIDR blocks of the address space, e.g. the CIDR blocks of the VCN
+    :param allocated_cidr_blocks: The CIDR blocks already allocated in the address space, e.g. the CIDR blocks of the
+                                  existing subnets of the VCN
+    :return: The list of allocators, to use with `allocate_cidr_block_in` and `reserve_cidr_block_in`
+    :raises ValueError: If a CIDR block is invalid, or if an allocated CIDR block is not within the address space or
+                        overlaps with another allocated CIDR block
+    """
+    allocators = [get_cidr_allocator(cidr_block, []) for cidr_block in cidr_blocks]
+    for allocated_cidr_block in allocated_cidr_blocks:
+        reserve_cidr_block_in(allocators, allocated_cidr_block)
+    return allocators
+
+
+def reserve_cidr_block_in(allocators, cidr_block):
+    """
+    Mark a CIDR block as allocated in the allocator, from `get_cidr_allocators`, of the CIDR block that contains it.
+    :raises ValueError: If the CIDR block is invalid, is not within the CIDR block of any of the allocators or overlaps
+                        with an allocated CIDR block
+    """
+    version, network, prefixlen = parse_cidr_block(cidr_block)
+    for allocator in allocators:
+        if _is_within_allocator(allocator, version, network, prefixlen):
+            reserve_cidr_block(allocator, cidr_block)
+            return
+    raise ValueError(
+        "CIDR block {0} is not within {1}".format(
+            cidr_block, ", ".join(allocator["cidr_block"] for allocator in allocators)
+        )
+    )
+
+
+def allocate_cidr_block_in(allocators, prefixlen):
+    """
+    Allocate a free CIDR block of a prefix length from the first of the allocators, from `get_cidr_allocators`, that
+    has one.
+    :return: The allocated CIDR block, e.g. "10.0.2.0/24"
+    :raises ValueError: If none of the allocators has a free CIDR block of that size left
+    """
+    for allocator in allocators:
+        try:
+            return allocate_cidr_block(allocator, prefixlen)
+        except ValueError:
+            continue
+    raise ValueError(
+        "No free /{0} CIDR block left in {1}".format(
+            prefixlen, ", ".join(allocator["cidr_block"] for allocator in allocators)
+        )
+    )
+
+
+def get_vcn_cidr_blocks(vcn):
+    """
+    Return the CIDR blocks of a VCN (a Vcn or a dict). VCNs created before VCNs could have several CIDR blocks, or
+    read with an SDK that does not know about them, only have a cidr_block.
+    """
+    if isinstance(vcn, dict):
+        return vcn.get("cidr_blocks") or [vcn["cidr_block"]]
+    return getattr(vcn, "cidr_blocks", None) or [vcn.cidr_block]
+
+
+def normalize_cidr_block(cidr_block):
+    """
+    Normalize a CIDR block, clearing its host bits, e.g. "10.0.0.5/24" to "10.0.0.0/24".
+    :raises ValueError: If the CIDR block is invalid
+    """
+    return format_cidr_block(*parse_cidr_block(cidr_block))
+
+
+def _get_merged_intervals(cidr_blocks):
+    # The address intervals (first and last address) covered by a list of CIDR blocks, merged and sorted by IP version
+    intervals = []
+    for cidr_block in cidr_blocks:
+        version, network, prefixlen = parse_cidr_block(cidr_block)
+        size = 1 << (_get_address_bits(version) - prefixlen)
+        intervals.append((version, network, network + size - 1))
+    merged_intervals = []
+    for version, first, last in sorted(intervals):
+        if (
+            merged_intervals
+            and merged_intervals[-1][0] == version
+            and first <= merged_intervals[-1][2] + 1
+        ):
+            merged_intervals[-1][2] = max(merged_intervals[-1][2], last)
+        else:
+            merged_intervals.append([version, first, last])
+    return merged_intervals
+
+
+def _get_interval_cidr_blocks(version, first, last):
+    # The smallest list of CIDR blocks covering exactly the addresses from `first` to `last`
+    address_bits = _get_address_bits(version)
+    cidr_blocks = []
+    while first <= last:
+        # The largest block aligned on `first`, shrunk until it ends before `last`
+        size = first & -first if first else 1 << address_bits
+        while first + size - 1 > last:
+            size >>= 1
+        prefixlen = address_bits - size.bit_length() + 1
+        cidr_blocks.append(format_cidr_block(version, first, prefixlen))
+        first += size
+    return cidr_blocks
+
+
+def aggregate_cidr_blocks(cidr_blocks):
+    """
+    Aggregate CIDR blocks into the smallest list of CIDR blocks covering exactly the same addresses. Duplicate and
+    contained CIDR blocks are dropped, and adjacent CIDR blocks are merged into their covering supernets, e.g.
+    ["10.0.0.0/25", "10.0.0.128/25", "10.0.0.64/26"] to ["10.0.0.0/24"].
+    :return: The aggregated CIDR blocks, sorted by IP version and network address
+    :raises ValueError: If a CIDR block is invalid
+    """
+    aggregated_cidr_blocks = []
+    for version, first, last in _get_merged_intervals(cidr_blocks):
+        aggregated_cidr_blocks.extend(_get_interval_cidr_blocks(version, first, last))
+    return aggregated_cidr_blocks
+
+
+def get_cidr_block_set_delta(cidr_blocks, existing_cidr_blocks, purge=False):
+    """
+    Compute the minimal changes to make to a set of existing CIDR blocks, so that it contains the desired CIDR blocks.
+    CIDR blocks are compared once normalized, so that "10.0.0.5/24" matches "10.0.0.0/24".
+    :param cidr_blocks: The desired CIDR blocks
+    :param existing_cidr_blocks: The existing CIDR blocks
+    :param purge: Whether the existing CIDR blocks that are not desired must be deleted. If False, the desired CIDR
+                  blocks whose addresses are already covered by the existing CIDR blocks are not added.
+    :return: A tuple of the sorted list of normalized CIDR blocks to add and the sorted list of existing CIDR blocks to
+             delete, as they exist
+    :raises ValueError: If a CIDR block is invalid
+    """
+    desired = set(normalize_cidr_block(cidr_block) for cidr_block in cidr_blocks)
+    existing = dict(
+        (normalize_cidr_block(cidr_block), cidr_block)
+        for cidr_block in existing_cidr_blocks
+    )
+    to_add = desired.difference(existing)
+    to_delete = []
+    if purge:
+        to_delete = [
+            existing[cidr_block] for cidr_block in set(existing).difference(desired)
+        ]
+    elif to_add:
+        existing_intervals = _get_merged_intervals(existing)
+        interval_keys = [tuple(interval[:2]) for interval in existing_intervals]
+        covered = set()
+        for cidr_block in to_add:
+            version, network, prefixlen = parse_cidr_block(cidr_block)
+            last = network + (1 << (_get_address_bits(version) - prefixlen)) - 1
+            index = bisect.bisect_right(interval_keys, (version, network)) - 1
+            if (
+                index >= 0
+                and existing_intervals[index][0] == version
+                and existing_intervals[index][2] >= last
+            ):
+                covered.add(cidr_block)
+        to_add.difference_update(covered)
+    return (
+        sorted(to_add, key=parse_cidr_block),
+        sorted(to_delete, key=parse_cidr_block),
+    )
+
+
+def _get_address_bits(version):
+    return 128 if version == 6 else 32
+
+
+def _get_network_mask(version, prefixlen):
+    address_bits = _get_address_bits(version)
+    return ((1 << address_bits) - 1) ^ ((1 << (address_bits - prefixlen)) - 1)
+
+
+def _get_port_range(port_range):
+    if port_range is None:
+        return FULL_PORT_RANGE
+    # Ports specified in a playbook can be strings
+    return int(port_range.min), int(port_range.max)
+
+
+def _get_icmp(icmp_options):
+    return tuple(
+        None if value is None else int(value)
+        for value in (icmp_options.type, icmp_options.code)
+    )
+
+
+def compile_security_rule(security_rule):
+    """
+    Compile an ingress or egress security rule into a CompiledSecurityRule.
+    :param security_rule: An IngressSecurityRule or EgressSecurityRule (or a hashed instance of them)
+    :return: The CompiledSecurityRule for the security rule
+    :raises ValueError: If the security rule has an invalid CIDR block
+    """
+    if "source" in security_rule.attribute_map:
+        direction = "ingress"
+        address = security_rule.source
+        address_type = security_rule.source_type or "CIDR_BLOCK"
+    else:
+        direction = "egress"
+        address = security_rule.destination
+        address_type = security_rule.destination_type or "CIDR_BLOCK"
+
+    if address_type == "CIDR_BLOCK":
+        version, network, prefixlen = parse_cidr_block(address)
+    else:
+        version, network, prefixlen = None, address, None
+
+    protocol = str(security_rule.protocol).lower()
+    src_ports = dst_ports = FULL_PORT_RANGE
+    icmp = None
+    if protocol in PORT_RANGE_PROTOCOLS:
+        options = getattr(security_rule, PORT_RANGE_PROTOCOLS[protocol])
+        if options is not None:
+            src_ports = _get_port_range(options.source_port_range)
+            dst_ports = _get_port_range(options.destination_port_range)
+    elif protocol in ICMP_PROTOCOLS and security_rule.icmp_options is not None:
+        icmp = _get_icmp(security_rule.icmp_options)
+
+    return CompiledSecurityRule(
+        direction=direction,
+        address_type=address_type,
+        is_stateless=bool(security_rule.is_stateless),
+        version=version,
+        network=network,
+        prefixlen=prefixlen,
+        protocol=protocol,
+        src_ports=src_ports,
+        icmp=icmp,
+        dst_ports=dst_ports,
+    )
+
+
+def decompile_security_rule(compiled_security_rule):
+    """
+    Create a hashed IngressSecurityRule or EgressSecurityRule from a CompiledSecurityRule.
+    """
+    rule = compiled_security_rule
+    if rule.address_type == "CIDR_BLOCK":
+        address = format_cidr_block(rule.version, rule.network, rule.prefixlen)
+    else:
+        address = rule.network
+
+    if rule.direction == "ingress":
+        security_rule = oci_utils.create_hashed_instance(IngressSecurityRule)
+        security_rule.source = address
+        security_rule.source_type = rule.address_type
+    else:
+        security_rule = oci_utils.create_hashed_instance(EgressSecurityRule)
+        security_rule.destination = address
+        security_rule.destination_type = rule.address_type
+    security_rule.is_stateless = rule.is_stateless
+    security_rule.protocol = rule.protocol
+
+    if rule.protocol in PORT_RANGE_PROTOCOLS and (
+        rule.src_ports != FULL_PORT_RANGE or rule.dst_ports != FULL_PORT_RANGE
+    ):
+        options_class = TcpOptions if rule.protocol == "6" else UdpOptions
+        options = oci_utils.create_hashed_instance(options_class)
+        if rule.src_ports != FULL_PORT_RANGE:
+            options.source_port_range = _get_hashed_port_range(rule.src_ports)
+        if rule.dst_ports != FULL_PORT_RANGE:
+            options.destination_port_range = _get_hashed_port_range(rule.dst_ports)
+        setattr(security_rule, PORT_RANGE_PROTOCOLS[rule.protocol], options)
+    elif rule.icmp is not None:
+        icmp_options = oci_utils.create_hashed_instance(IcmpOptions)
+        icmp_options.type, icmp_options.code = rule.icmp
+        security_rule.icmp_options = icmp_options
+    return security_rule
+
+
+def _get_hashed_port_range(port_range):
+    hashed_port_range = oci_utils.create_hashed_instance(PortRange)
+    hashed_port_range.min, hashed_port_range.max = port_range
+    return hashed_port_range
+
+
+def _get_bucket_key(compiled_security_rule):
+    # Everything but the destination port range, which is indexed as an interval within the bucket
+    return compiled_security_rule[:-1]
+
+
+def build_security_rule_index(compiled_security_rules):
+    """
+    Build an index of compiled security rules to answer "is this rule covered by one of the indexed rules" queries.
+    The rules are bucketed by everything but their destination port range. Within a bucket, the destination port
+    ranges are sorted by (min, -max) along with the running maximum of their max port, so that whether a port range
+    is contained in one of the port ranges of the bucket is answered with a binary search. The addresses of the rules
+    are also indexed so that only the buckets of the addresses in use are looked up.
+    :param compiled_security_rules: An iterable of CompiledSecurityRule
+    :return: The index, to be used with `is_security_rule_covered`
+    """
+    port_ranges_by_bucket = dict()
+    for compiled_security_rule in set(compiled_security_rules):
+        port_ranges_by_bucket.setdefault(
+            _get_bucket_key(compiled_security_rule), []
+        ).append(compiled_security_rule.dst_ports)
+
+    buckets = dict()
+    for bucket_key, port_ranges in six.iteritems(port_ranges_by_bucket):
+        port_ranges.sort(key=lambda port_range: (port_range[0], -port_range[1]))
+        max_ports = []
+        max_port = 0
+        for port_range in port_ranges:
+            max_port = max(max_port, port_range[1])
+            max_ports.append(max_port)
+        buckets[bucket_key] = (
+            [(port_range[0], -port_range[1]) for port_range in port_ranges],
+            max_ports,
+        )
+    address_keys = set(_get_address_key(bucket_key) for bucket_key in buckets)
+    return buckets, address_keys
+
+
+def _get_address_key(compiled_security_rule):
+    # direction, address_type, is_stateless, version, network and prefixlen
+    return compiled_security_rule[:6]
+
+
+def _get_covering_bucket_keys(compiled_security_rule, address_keys):
+    # The buckets that can hold a rule covering this rule: rules for one of the CIDR blocks enclosing the rule's CIDR
+    # block (at most 33 for IPv4 and 129 for IPv6), for all the protocols or for the same protocol with all the source
+    # ports or an equal source port range, and all the ICMP types/codes or the same ICMP type.
+    rule = compiled_security_rule
+    if rule.address_type == "CIDR_BLOCK":
+        networks = [
+            (rule.network & _get_network_mask(rule.version, prefixlen), prefixlen)
+            for prefixlen in range(rule.prefixlen, -1, -1)
+        ]
+    else:
+        networks = [(rule.network, rule.prefixlen)]
+
+    src_ports_options = [rule.src_ports]
+    if rule.src_ports != FULL_PORT_RANGE:
+        src_ports_options.append(FULL_PORT_RANGE)
+    icmp_options = [rule.icmp]
+    if rule.icmp is not None:
+        if rule.icmp[1] is not None:
+            icmp_options.append((rule.icmp[0], None))
+        icmp_options.append(None)
+
+    bucket_keys = []
+    for network, prefixlen in networks:
+        address_key = (
+            rule.direction,
+            rule.address_type,
+            rule.is_stateless,
+            rule.version,
+            network,
+            prefixlen,
+        )
+        if address_key not in address_keys:
+            continue
+        bucket_keys.append(address_key + ("all", FULL_PORT_RANGE, None))
+        if rule.protocol != "all":
+            for src_ports in src_ports_options:
+                for icmp in icmp_options:
+                    bucket_keys.append(address_key + (rule.protocol, src_ports, icmp))
+    return bucket_keys
+
+
+def is_security_rule_covered(index, compiled_security_rule, exclude_self=False):
+    """
+    Check whether a compiled security rule is covered by (that is, allows no more traffic than) one of the rules of an
+    index. A rule covers another rule if both have the same direction, address type and statefulness, and its CIDR
+    block, protocol, port ranges and ICMP type/code include the other rule's. The check is conservative: a source port
+    range is only considered to be covered by an equal source port range or by all the source ports.
+    :param index: An index built with `build_security_rule_index`
+    :param compiled_security_rule: The CompiledSecurityRule to check
+    :param exclude_self: Whether to ignore the rule itself when it is part of the index
+    :return: True if the rule is covered by a rule of the index
+    """
+    buckets, address_keys = index
+    min_port, max_port = compiled_security_rule.dst_ports
+    own_bucket_key = _get_bucket_key(compiled_security_rule)
+    for bucket_key in _get_covering_bucket_keys(compiled_security_rule, address_keys):
+        bucket = buckets.get(bucket_key)
+        if bucket is None:
+            continue
+        sorted_ports, max_ports = bucket
+        if exclude_self and bucket_key == own_bucket_key:
+            # Only the port ranges sorted before the rule's own port range can strictly contain it
+            position = bisect.bisect_left(sorted_ports, (min_port, -max_port))
+        else:
+            # All the port ranges starting at or before the rule's min port
+            position = bisect.bisect_right(sorted_ports, (min_port, 1))
+        if position > 0 and max_ports[position - 1] >= max_port:
+            return True
+    return False
+
+
+def _merge_port_ranges(compiled_security_rules):
+    # Merge the overlapping and adjacent destination port ranges of rules that are otherwise equal
+    port_ranges_by_bucket = dict()
+    merged_rules = set()
+    for rule in compiled_security_rules:
+        if rule.protocol in PORT_RANGE_PROTOCOLS:
+            port_ranges_by_bucket.setdefault(_get_bucket_key(rule), []).append(
+                rule.dst_ports
+            )
+        else:
+            merged_rules.add(rule)
+
+    for bucket_key, port_ranges in six.iteritems(port_ranges_by_bucket):
+        port_ranges.sort()
+        min_port, max_port = port_ranges[0]
+        for next_min_port, next_max_port in port_ranges[1:]:
+            if next_min_port <= max_port + 1:
+                max_port = max(max_port, next_max_port)
+            else:
+                merged_rules.add(
+                    CompiledSecurityRule(*(bucket_key + ((min_port, max_port),)))
+                )
+                min_port, max_port = next_min_port, next_max_port
+        merged_rules.add(CompiledSecurityRule(*(bucket_key + ((min_port, max_port),))))
+    return merged_rules
+
+
+def _merge_cidr_blocks(compiled_security_rules):
+    # Merge the sibling CIDR blocks (e.g. 10.0.0.0/25 and 10.0.0.128/25 into 10.0.0.0/24) of rules that are otherwise
+    # equal
+    networks_by_group = dict()
+    merged_rules = set()
+    for rule in compiled_security_rules:
+        if rule.address_type == "CIDR_BLOCK":
+            group_key = rule._replace(network=None, prefixlen=None)
+            networks_by_group.setdefault(group_key, set()).add(
+                (rule.network, rule.prefixlen)
+            )
+        else:
+            merged_rules.add(rule)
+
+    for group_key, networks in six.iteritems(networks_by_group):
+        address_bits = _get_address_bits(group_key.version)
+        merged = True
+        while merged:
+            merged = False
+            for network, prefixlen in sorted(networks, key=lambda n: -n[1]):
+                if prefixlen == 0 or (network, prefixlen) not in networks:
+                    continue
+                host_bit = 1 << (address_bits - prefixlen)
+                sibling = (network ^ host_bit, prefixlen)
+                if sibling in networks:
+                    networks.discard((network, prefixlen))
+                    networks.discard(sibling)
+                    networks.add((network & ~host_bit, prefixlen - 1))
+                    merged = True
+        for network, prefixlen in networks:
+            merged_rules.add(group_key._replace(network=network, prefixlen=prefixlen))
+    return merged_rules
+
+
+def minimize_security_rules(security_rules):
+    """
+    Minimize a list of ingress or egress security rules, without changing the traffic they allow. Duplicate rules are
+    removed, the overlapping or adjacent port ranges and the sibling CIDR blocks of otherwise equal rules are merged,
+    and the rules covered by another rule are removed.
+    :param security_rules: A list of IngressSecurityRule or EgressSecurityRule (or hashed instances of them)
+    :return: The minimized list of security rules. The rules that are kept as is are returned in their original order,
+             followed by the merged rules.
+    :raises ValueError: If a security rule has an invalid CIDR block
+    """
+    # The first occurrence, and its position, of each distinct rule
+    original_rules = dict()
+    for position, security_rule in enumerate(security_rules):
+        original_rules.setdefault(
+            compile_security_rule(security_rule), (position, security_rule)
+        )
+
+    compiled_rules = set(original_rules)
+    rule_count = None
+    while rule_count != len(compiled_rules):
+        rule_count = len(compiled_rules)
+        compiled_rules = _merge_cidr_blocks(_merge_port_ranges(compiled_rules))
+
+    index = build_security_rule_index(compiled_rules)
+    minimized_rules = set(
+        rule
+        for rule in compiled_rules
+        if not is_security_rule_covered(index, rule, exclude_self=True)
+    )
+    _debug(
+        "Minimized {0} security rules to {1} rules".format(
+            len(security_rules), len(minimized_rules)
+        )
+    )
+
+    kept_rules = sorted(
+        original_rules[rule] for rule in minimized_rules if rule in original_rules
+    )
+    merged_rules = sorted(
+        (rule for rule in minimized_rules if rule not in original_rules),
+        key=_get_sort_key,
+    )
+    return [security_rule for position, security_rule in kept_rules] + [
+        decompile_security_rule(rule) for rule in merged_rules
+    ]
+
+
+def get_security_rule_delta(security_rules, existing_security_rules):
+    """
+    Compute the minimal change that turns the existing security rules of a security list into the desired security
+    rules. The rules are compared by their compiled form, so that rules that only differ in their representation (e.g.
+    the protocol "6" and 6, or an unset and a full port range) are equal.
+    :param security_rules: The desired list of IngressSecurityRule or EgressSecurityRule (or hashed instances of them)
+    :param existing_security_rules: The current list of security rules
+    :return: A tuple of the list of security rules to add, in the order of `security_rules`, and the set of compiled
+             rules (CompiledSecurityRule) to remove
+    :raises ValueError: If a security rule has an invalid CIDR block
+    """
+    existing_compiled_rules = set(
+        compile_security_rule(security_rule)
+        for security_rule in existing_security_rules or []
+    )
+    security_rules_to_add = []
+    seen_compiled_rules = set()
+    for security_rule in security_rules or []:
+        compiled_rule = compile_security_rule(security_rule)
+        if (
+            compiled_rule not in existing_compiled_rules
+            and compiled_rule not in seen_compiled_rules
+        ):
+            security_rules_to_add.append(security_rule)
+        seen_compiled_rules.add(compiled_rule)
+    return security_rules_to_add, existing_compiled_rules - seen_compiled_rules
+
+
+def apply_security_rule_delta(
+    existing_security_rules, security_rules_to_add, compiled_rules_to_remove
+):
+    """
+    Apply a delta computed by `get_security_rule_delta` to a (possibly more recent) list of existing security rules.
+    The existing security rules that are not removed keep their order and the added security rules are appended to
+    them.
+    :return: A tuple of the resulting list of security rules and whether it differs from the existing security rules
+    :raises ValueError: If a security rule has an invalid CIDR block
+    """
+    existing_security_rules = existing_security_rules or []
+    security_rules = []
+    remaining_compiled_rules = set()
+    for security_rule in existing_security_rules:
+        compiled_rule = compile_security_rule(security_rule)
+        if compiled_rule not in compiled_rules_to_remove:
+            security_rules.append(security_rule)
+            remaining_compiled_rules.add(compiled_rule)
+    changed = len(security_rules) != len(existing_security_rules)
+    for security_rule in security_rules_to_add:
+        compiled_rule = compile_security_rule(security_rule)
+        if compiled_rule not in remaining_compiled_rules:
+            security_rules.append(security_rule)
+            remaining_compiled_rules.add(compiled_rule)
+            changed = True
+    return security_rules, changed
+
+
+def _get_sort_key(compiled_security_rule):
+    rule = compiled_security_rule
+    return (
+        rule.direction,
+        rule.address_type,
+        rule.version or 0,
+        rule.network if rule.version else 0,
+        str(rule.network),
+        rule.prefixlen or 0,
+        rule.protocol,
+        rule.is_stateless,
+        rule.src_ports,
+        rule.dst_ports,
+        tuple(-1 if value is None else value for value in rule.icmp or (None, None)),
+    )
+
+
+def get_security_rules(security_rule_type, input_security_rules):
+    """
+    Build hashable security rule models from the security rules specified as module options.
+    :param security_rule_type: "ingress_security_rules" or "egress_security_rules"
+    :param input_security_rules: List of dicts describing the security rules
+    :return: List of hashable IngressSecurityRule or EgressSecurityRule
+    """
+    security_rule = None
+    security_rules = []
+    for input_security_rule in input_security_rules:
+        if security_rule_type == "ingress_security_rules":
+            security_rule = oci_utils.create_hashed_instance(IngressSecurityRule)
+            security_rule.source = input_security_rule["source"]
+            security_rule.source_type = input_security_rule.get(
+                "source_type", "CIDR_BLOCK"
+            )
+        elif security_rule_type == "egress_security_rules":
+            security_rule = oci_utils.create_hashed_instance(EgressSecurityRule)
+            security_rule.destination = input_security_rule["destination"]
+            security_rule.destination_type = input_security_rule.get(
+                "destination_type", "CIDR_BLOCK"
+            )
+        input_icmp_options = input_security_rule.get("icmp_options", None)
+        if input_icmp_options:
+            icmp_options = oci_utils.create_hashed_instance(IcmpOptions)
+            icmp_options.type = input_icmp_options.get("type")
+            icmp_options.code = input_icmp_options.get("code", None)
+            security_rule.icmp_options = icmp_options
+
+        input_tcp_options = input_security_rule.get("tcp_options", None)
+        if input_tcp_options:
+            tcp_options = oci_utils.create_hashed_instance(TcpOptions)
+            _get_protocol_option(input_tcp_options, tcp_options)
+            security_rule.tcp_options = tcp_options
+        input_udp_options = input_security_rule.get("udp_options", None)
+        if input_udp_options:
+            udp_options = oci_utils.create_hashed_instance(UdpOptions)
+            _get_protocol_option(input_udp_options, udp_options)
+            security_rule.udp_options = udp_options
+
+        security_rule.is_stateless = input_security_rule.get("is_stateless", False)
+        if security_rule.is_stateless is None:
+            security_rule.is_stateless = False
+        security_rule.protocol = input_security_rule.get("protocol").lower()
+        security_rules.append(security_rule)
+
+    return security_rules
+
+
+def _get_protocol_option(input_protocol_options, protocol_options):
+    port_range = None
+    input_destination_port_range = input_protocol_options.get(
+        "destination_port_range", None
+    )
+    if input_destination_port_range:
+        port_range = oci_utils.create_hashed_instance(PortRange)
+        port_range.min = input_destination_port_range["min"]
+        port_range.max = input_destination_port_range["max"]
+        protocol_options.destination_port_range = port_range
+    input_source_port_range = input_protocol_options.get("source_port_range", None)
+    if input_source_port_range:
+        port_range = oci_utils.create_hashed_instance(PortRange)
+        port_range.min = input_source_port_range["min"]
+        port_range.max = input_source_port_range["max"]
+        protocol_options.source_port_range = port_range
+
+
+# The SDK functions listing the resources of each type that belong to a VCN
+VCN_RESOURCE_LIST_FUNCTIONS = {
+    "dhcp_options": "list_dhcp_options",
+    "internet_gateway": "list_internet_gateways",
+    "nat_gateway": "list_nat_gateways",
+    "route_table": "list_route_tables",
+    "security_list": "list_security_lists",
+    "service_gateway": "list_service_gateways",
+    "subnet": "list_subnets",
+}
+
+VCN_RESOURCE_TERMINATED_STATES = ["TERMINATING", "TERMINATED"]
+
+DEFAULT_VCN_SNAPSHOT_MAX_AGE_IN_SECONDS = 300
+
+
+def get_vcn_snapshot(
+    virtual_network_client,
+    module,
+    compartment_id,
+    vcn_id,
+    resource_types=None,
+    exclude_terminated=True,
+):
+    """
+    Take a snapshot of the networking resources of a VCN, with a single listing for each resource type. The listings
+    are done concurrently, as requested through the `enable_parallel_requests` and `max_thread_count` module options.
+    :param virtual_network_client: Instance of VirtualNetworkClient
+    :param module: Instance of AnsibleModule
+    :param compartment_id: OCID of the compartment of the resources
+    :param vcn_id: OCID of the VCN
+    :param resource_types: The resource types to list, from VCN_RESOURCE_LIST_FUNCTIONS. All of them by default.
+    :param exclude_terminated: Whether to leave out the resources that are being terminated or are terminated
+    :return: A dictionary of resource type to the list of resources of that type
+    """
+    resource_types = sorted(resource_types or VCN_RESOURCE_LIST_FUNCTIONS)
+
+    def list_resources(resource_type):
+        list_fn = getattr(
+            virtual_network_client, VCN_RESOURCE_LIST_FUNCTIONS[resource_type]
+        )
+        return [
+            resource
+            for resource in oci_utils.list_all_resources(
+                list_fn, compartment_id=compartment_id, vcn_id=vcn_id
+            )
+            if not exclude_terminated
+            or resource.lifecycle_state not in VCN_RESOURCE_TERMINATED_STATES
+        ]
+
+    _debug("Taking a snapshot of {0} in VCN {1}".format(resource_types, vcn_id))
+    return dict(
+        zip(
+            resource_types,
+            oci_utils.execute_tasks(list_resources, resource_types, module),
+        )
+    )
+
+
+def get_vcn_snapshot_arg_spec():
+    """
+    Return the module options of the networking facts modules to read the resources of a VCN from a cached snapshot.
+    """
+    vcn_snapshot_arg_spec = oci_utils.get_cache_arg_spec()
+    vcn_snapshot_arg_spec["cache_max_age"].update(
+        default=DEFAULT_VCN_SNAPSHOT_MAX_AGE_IN_SECONDS
+    )
+    vcn_snapshot_arg_spec.update(
+        use_vcn_snapshot=dict(type="bool", required=False, default=False)
+    )
+    return vcn_snapshot_arg_spec
+
+
+def get_cached_vcn_snapshot(virtual_network_client, module, compartment_id, vcn_id):
+    """
+    Return a snapshot of all the networking resources of a VCN, including the terminated ones. The snapshot is
+    persisted in I(cache_dir) and is reused for I(cache_max_age) seconds.
+    :return: A dictionary of resource type to the list of resources (as dicts) of that type
+    """
+    cache_file = oci_utils.get_cache_file(
+        module.params["cache_dir"],
+        "vcn-snapshot",
+        endpoint=getattr(virtual_network_client.base_client, "endpoint", None),
+        compartment_id=compartment_id,
+        vcn_id=vcn_id,
+    )
+    if oci_utils.is_cache_valid(cache_file, module.params["cache_max_age"]):
+        _debug("Reading snapshot of VCN {0} from {1}".format(vcn_id, cache_file))
+        snapshot = oci_utils.read_from_cache(cache_file)
+        if snapshot is not None:
+            return snapshot
+
+    snapshot = dict()
+    for resource_type, resources in six.iteritems(
+        get_vcn_snapshot(
+            virtual_network_client,
+            module,
+            compartment_id,
+            vcn_id,
+            exclude_terminated=False,
+        )
+    ):
+        snapshot[resource_type] = to_dict(resources)
+    oci_utils.write_to_cache(cache_file, snapshot)
+    return snapshot
+
+
+def list_vcn_resources(
+    virtual_network_client, module, resource_type, compartment_id, vcn_id, **filters
+):
+    """
+    List the resources of a type in a VCN, from the cached snapshot of the VCN if I(use_vcn_snapshot) is set, or with
+    a listing otherwise.
+    :param resource_type: The resource type, from VCN_RESOURCE_LIST_FUNCTIONS
+    :param filters: Attribute values the resources must have, such as display_name or lifecycle_state. Filters set to
+                    None are ignored.
+    :return: The list of resources (as dicts)
+    """
+    filters = dict((key, value) for key, value in filters.items() if value is not None)
+    if not module.params.get("use_vcn_snapshot"):
+        return to_dict(
+            oci_utils.list_all_resources(
+                getattr(
+                    virtual_network_client, VCN_RESOURCE_LIST_FUNCTIONS[resource_type]
+                ),
+                compartment_id=compartment_id,
+                vcn_id=vcn_id,
+                **filters
+            )
+        )
+
+    snapshot = get_cached_vcn_snapshot(
+        virtual_network_client, module, compartment_id, vcn_id
+    )
+    return [
+        resource
+        for resource in snapshot[resource_type]
+        if all(resource.get(key) == value for key, value in filters.items())
+    ]
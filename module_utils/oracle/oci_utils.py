@@ -5,11 +5,15 @@
 # See LICENSE.TXT for details.
 from __future__ import absolute_import
 
+import copy
+import hashlib
+import json
 import logging
 import logging.config
 import os
 import tempfile
 from datetime import datetime
+from multiprocessing.dummy import Pool as ThreadPool
 from operator import eq
 
 import time
@@ -40,12 +44,69 @@ except ImportError:
 
 
 from ansible.module_utils.basic import _load_params
+from ansible.module_utils import six
 from ansible.module_utils._text import to_bytes
 
 __version__ = "1.5.0"
 
 MAX_WAIT_TIMEOUT_IN_SECONDS = 1200
 
+MAX_POLL_INTERVAL_IN_SECONDS = 30
+
+DEFAULT_CACHE_MAX_AGE_IN_SECONDS = 3600
+
+MAX_IF_MATCH_UPDATE_ATTEMPTS = 5
+
+# How the work requests of each service are waited on, by the class name of the service client:
+#   state_attribute: The attribute of a work request holding its status
+#   succeeded_states, failed_states: The states of a completed work request
+#   errors_attribute, logs_attribute: The attributes of a work request holding its errors and logs, if any
+#   errors_fn, logs_fn: The functions of the client listing the errors and logs of a work request, if any
+#   kwargs_attributes: The attributes of a work request passed, besides its id, to errors_fn and logs_fn
+WORK_REQUEST_ADAPTERS = {
+    "LoadBalancerClient": dict(
+        state_attribute="lifecycle_state",
+        succeeded_states=["SUCCEEDED"],
+        failed_states=["FAILED"],
+        errors_attribute="error_details",
+    ),
+    "ContainerEngineClient": dict(
+        state_attribute="status",
+        succeeded_states=["SUCCEEDED"],
+        failed_states=["FAILED", "CANCELED"],
+        errors_fn="list_work_request_errors",
+        logs_fn="list_work_request_logs",
+        kwargs_attributes=["compartment_id"],
+    ),
+    "IdentityClient": dict(
+        state_attribute="status",
+        succeeded_states=["SUCCEEDED"],
+        failed_states=["FAILED", "CANCELED"],
+        errors_attribute="errors",
+        logs_attribute="logs",
+    ),
+    "ObjectStorageClient": dict(
+        state_attribute="status",
+        succeeded_states=["COMPLETED"],
+        failed_states=["FAILED", "CANCELED"],
+        errors_fn="list_work_request_errors",
+        logs_fn="list_work_request_logs",
+    ),
+    "WorkRequestClient": dict(
+        state_attribute="status",
+        succeeded_states=["SUCCEEDED"],
+        failed_states=["FAILED", "CANCELED"],
+        errors_fn="list_work_request_errors",
+        logs_fn="list_work_request_logs",
+    ),
+}
+
+DEFAULT_WORK_REQUEST_ADAPTER = dict(
+    state_attribute="status",
+    succeeded_states=["SUCCEEDED"],
+    failed_states=["FAILED", "CANCELED"],
+)
+
 # If a resource is in one of these states it would be considered inactive
 DEAD_STATES = [
     "TERMINATING",
@@ -74,6 +135,14 @@ DEFAULT_READY_STATES = [
 # If a resource is in one of these states, it would be considered deleted
 DEFAULT_TERMINATED_STATES = ["TERMINATED", "DETACHED", "DELETED"]
 
+# Rules of a retention policy that keep the newest resource of each of the N most recent periods
+RETENTION_POLICY_PERIOD_RULES = ["keep_daily", "keep_weekly", "keep_monthly"]
+
+RETENTION_POLICY_RULES = ["keep_last"] + RETENTION_POLICY_PERIOD_RULES
+
+# Types of the attribute values that are compared as is when matching existing resources against the user's inputs
+SCALAR_ATTRIBUTE_TYPES = six.string_types + six.integer_types + (bool, float)
+
 
 def get_common_arg_spec(supports_create=False, supports_wait=False):
     """
@@ -253,14 +322,19 @@ def get_oci_config(module, service_client_class=None):
     return config
 
 
-def create_service_client(module, service_client_class):
+def create_service_client(module, service_client_class, region=None):
     """
     Creates a service client using the common module options provided by the user.
     :param module: An AnsibleModule that represents user provided options for a Task
     :param service_client_class: A class that represents a client to an OCI Service
+    :param region: An optional region to create the client for, instead of the region in the module options and
+                   configuration. This is used to call the services of other regions, e.g. to copy resources across
+                   regions.
     :return: A fully configured client
     """
     config = get_oci_config(module, service_client_class)
+    if region is not None:
+        config["region"] = region
     kwargs = {}
 
     if _is_instance_principal_auth(module):
@@ -755,20 +829,28 @@ def check_and_create_resource(
         )
     )
 
+    identifying_attribute_values = _get_identifying_attribute_values(
+        module, attributes_to_consider, default_attribute_values
+    )
     for resource in existing_resources:
-        if _is_resource_active(resource, dead_states):
+        if _is_resource_active(
+            resource, dead_states
+        ) and _does_resource_match_identifying_attribute_values(
+            resource, identifying_attribute_values
+        ):
+            resource_dict = to_dict(resource)
             _debug(
                 "Comparing user specified values {0} against an existing resource's "
-                "values {1}".format(module.params, to_dict(resource))
+                "values {1}".format(module.params, resource_dict)
             )
             if does_existing_resource_match_user_inputs(
-                to_dict(resource),
+                resource_dict,
                 module,
                 attributes_to_consider,
                 exclude_attributes,
                 default_attribute_values,
             ):
-                resource_matched = to_dict(resource)
+                resource_matched = resource_dict
                 break
 
     if resource_matched:
@@ -807,6 +889,44 @@ def _get_attributes_to_consider(exclude_attributes, model, module):
     return attributes_to_consider
 
 
+def _get_identifying_attribute_values(
+    module, attributes_to_consider, default_attribute_values
+):
+    """
+    Get the user provided values of the attributes to consider that are plain scalars, like compartment_id or
+    shape_name. An existing resource with a different value for one of these attributes can never match the user's
+    inputs, so they are compared on the resource models first, and only the remaining candidates are converted to
+    dictionaries and deep compared.
+    :return: A dictionary of attribute name to the user provided value
+    """
+    identifying_attribute_values = dict()
+    for attr in attributes_to_consider:
+        # A resource still matches when it has the default value of such an attribute
+        if attr in default_attribute_values:
+            continue
+        user_provided_value_for_attr = _get_user_provided_value(module, attr)
+        if isinstance(user_provided_value_for_attr, SCALAR_ATTRIBUTE_TYPES):
+            identifying_attribute_values[attr] = user_provided_value_for_attr
+    return identifying_attribute_values
+
+
+def _does_resource_match_identifying_attribute_values(
+    resource, identifying_attribute_values
+):
+    for attr, user_provided_value_for_attr in six.iteritems(
+        identifying_attribute_values
+    ):
+        if attr not in resource.attribute_map:
+            continue
+        resources_value_for_attr = getattr(resource, attr)
+        if (
+            isinstance(resources_value_for_attr, SCALAR_ATTRIBUTE_TYPES)
+            and resources_value_for_attr != user_provided_value_for_attr
+        ):
+            return False
+    return True
+
+
 def _is_resource_active(resource, dead_states):
     if dead_states is None:
         dead_states = DEAD_STATES
@@ -864,6 +984,21 @@ def has_user_provided_value_for_option(module, option):
     return False
 
 
+def get_module_with_params_overlay(module, params_overlay):
+    """
+    Get a view of an AnsibleModule in which some options have other values, e.g. to present a normalized value of an
+    option to check_and_create_resource. Unlike a deep copy of the module, the view shares the argument spec, aliases
+    and all the other state of the module, and only the params dictionary is copied, shallowly.
+    :param module: Instance of AnsibleModule
+    :param params_overlay: A dictionary of option name to the value of the option in the view
+    :return: A view of the module with the options in params_overlay replaced
+    """
+    module_view = copy.copy(module)
+    module_view.params = dict(module.params)
+    module_view.params.update(params_overlay)
+    return module_view
+
+
 def create_resource(resource_type, create_fn, kwargs_create, module):
     """
     Create an OCI resource
@@ -1162,6 +1297,45 @@ def check_if_user_value_matches_resources_attr(
             res[0] = False
 
 
+def is_value_matching(desired_value, existing_value):
+    """
+    Check whether an existing attribute value, as returned by `to_dict`, matches a desired attribute value. The keys of
+    the desired value that are None are not compared, and lists are compared without considering the order of their
+    items. Scalars are compared as text, as the options of dict or list type are not converted by Ansible, and numbers
+    (e.g. ports) may be given as strings.
+    """
+    if desired_value is None:
+        return True
+    if isinstance(desired_value, dict):
+        existing_value = {} if existing_value is None else existing_value
+        if not isinstance(existing_value, dict):
+            return False
+        return all(
+            is_value_matching(value, existing_value.get(key))
+            for key, value in six.iteritems(desired_value)
+        )
+    if isinstance(desired_value, list):
+        if not isinstance(existing_value, list) or len(desired_value) != len(
+            existing_value
+        ):
+            return False
+        unmatched_values = list(existing_value)
+        for value in desired_value:
+            index = next(
+                (
+                    index
+                    for index, unmatched_value in enumerate(unmatched_values)
+                    if is_value_matching(value, unmatched_value)
+                ),
+                None,
+            )
+            if index is None:
+                return False
+            unmatched_values.pop(index)
+        return True
+    return six.text_type(desired_value) == six.text_type(existing_value)
+
+
 def are_dicts_equal(
     option_name,
     existing_resource_dict,
@@ -1445,43 +1619,579 @@ def wait_for_resource_lifecycle_state(
     return resource
 
 
-def wait_on_work_request(client, response, module):
+def wait_for_resources_lifecycle_state(
+    module,
+    list_fn,
+    kwargs_lists,
+    resource_ids,
+    states,
+    state_attribute="lifecycle_state",
+):
+    """
+    A utility function to wait for a group of resources to get into one of the specified lifecycle states. Instead of
+    waiting on every resource with its own GET and poll loop, each poll round lists the resources once per entry in
+    `kwargs_lists` and evaluates all the pending resources from that listing.
+    :param module: Instance of AnsibleModule.
+    :param list_fn: Function in the SDK to list the resources. e.g. compute_client.list_instances
+    :param kwargs_lists: List of dictionaries of arguments for the list function. One listing is done for each entry in
+                         a poll round. e.g. [{"compartment_id": "ocid1.compartment.oc1..xxxxxEXAMPLExxxxx"}]
+    :param resource_ids: The OCIDs of the resources to wait on.
+    :param states: List of lifecycle states to wait for. e.g. ["RUNNING"]. To wait for different states for different
+                   resources, a dictionary of resource OCID to the list of lifecycle states to wait for that resource.
+    :param state_attribute: The attribute of the resources holding the state to wait for. e.g. "peering_status"
+    :return: A tuple of a dictionary of resource OCID to the last seen state of the resource (as a dict), and a list of
+             OCIDs of the resources that did not get into one of the `states` within `wait_timeout` seconds.
+    """
+    max_wait_seconds = module.params.get("wait_timeout", MAX_WAIT_TIMEOUT_IN_SECONDS)
+    if isinstance(states, dict):
+        states_by_id = states
+    else:
+        states_by_id = dict((resource_id, states) for resource_id in resource_ids)
+    # A resource that is no longer returned by the list function is considered deleted
+    succeed_on_not_found_ids = set(
+        resource_id
+        for resource_id in resource_ids
+        if any(
+            state in DEFAULT_TERMINATED_STATES for state in states_by_id[resource_id]
+        )
+    )
+    pending_ids = set(resource_ids)
+    resources = dict()
+    start_time = time.time()
+    poll_interval = 1
+    while True:
+        listed_ids = set()
+        for kwargs_list in kwargs_lists:
+            for resource in list_all_resources(list_fn, **dict(kwargs_list)):
+                if resource.id in pending_ids:
+                    listed_ids.add(resource.id)
+                    resources[resource.id] = to_dict(resource)
+                    if getattr(resource, state_attribute) in states_by_id[resource.id]:
+                        pending_ids.discard(resource.id)
+        pending_ids.difference_update(succeed_on_not_found_ids - listed_ids)
+        if not pending_ids:
+            break
+        elapsed_seconds = time.time() - start_time
+        if elapsed_seconds >= max_wait_seconds:
+            break
+        _debug(
+            "{0} resources are yet to reach {1} state.".format(len(pending_ids), states)
+        )
+        time.sleep(min(poll_interval, max_wait_seconds - elapsed_seconds))
+        poll_interval = min(poll_interval * 2, MAX_POLL_INTERVAL_IN_SECONDS)
+    return resources, list(pending_ids)
+
+
+def get_work_request_adapter(client, adapter=None):
+    """
+    Get how the work requests of a service are waited on. See WORK_REQUEST_ADAPTERS.
+    :param client: OCI service client instance of the service
+    :param adapter: The name of the adapter to use, instead of the class name of `client`. e.g. "LoadBalancerClient"
+    """
+    return WORK_REQUEST_ADAPTERS.get(
+        adapter or type(client).__name__, DEFAULT_WORK_REQUEST_ADAPTER
+    )
+
+
+def is_work_request_failed(client, work_request, adapter=None):
+    """
+    Check whether a work request (as a dict) completed without succeeding.
+    """
+    work_request_adapter = get_work_request_adapter(client, adapter)
+    return (
+        work_request.get(work_request_adapter["state_attribute"])
+        in work_request_adapter["failed_states"]
+    )
+
+
+def get_work_request_error_message(work_request):
+    """
+    Get a message describing the errors of a failed work request, as returned by `wait_for_work_requests`.
+    """
+    messages = [
+        error.get("message") or str(error) for error in work_request.get("errors") or []
+    ]
+    return "Work request {0} failed{1}".format(
+        work_request.get("id"), ": " + "; ".join(messages) if messages else ""
+    )
+
+
+def _get_work_request_details(client, work_request_adapter, work_request, detail):
+    # Collect the errors or logs of a failed work request, from the work request itself or from the service
+    attribute = work_request_adapter.get(detail + "_attribute")
+    if attribute:
+        return work_request.get(attribute) or []
+    fn_name = work_request_adapter.get(detail + "_fn")
+    if not fn_name:
+        return []
+    kwargs_fn = dict(
+        (kwargs_attribute, work_request.get(kwargs_attribute))
+        for kwargs_attribute in work_request_adapter.get("kwargs_attributes", [])
+    )
     try:
-        if module.params.get("wait", None):
-            _debug(
-                "Waiting for work request with id {0} to reach SUCCEEDED state.".format(
-                    response.data.id
-                )
+        return [
+            to_dict(item)
+            for item in list_all_resources(
+                getattr(client, fn_name),
+                work_request_id=work_request["id"],
+                **kwargs_fn
             )
-            wait_response = oci.wait_until(
-                client,
-                response,
-                evaluate_response=lambda r: r.data.status == "SUCCEEDED",
-                max_wait_seconds=module.params.get(
-                    "wait_timeout", MAX_WAIT_TIMEOUT_IN_SECONDS
-                ),
+        ]
+    except ServiceError as ex:
+        # The work request already failed, the failure is reported without its details
+        _debug(
+            "Unable to list the {0} of work request {1}: {2}".format(
+                detail, work_request["id"], ex.message
             )
+        )
+        return []
+
+
+def wait_for_work_requests(
+    client,
+    module,
+    work_request_ids,
+    adapter=None,
+    list_fn=None,
+    kwargs_lists=None,
+    states=None,
+):
+    """
+    A utility function to wait for a group of work requests of a service to complete. Each poll round either lists the
+    work requests once per entry in `kwargs_lists`, or gets each pending work request. The poll interval doubles while
+    none of the work requests progresses and is halved when one does. The errors and logs of the failed work requests
+    are collected once they complete.
+    :param client: OCI service client instance of the service of the work requests
+    :param module: Instance of AnsibleModule, or None to wait for at most MAX_WAIT_TIMEOUT_IN_SECONDS seconds
+    :param work_request_ids: The OCIDs of the work requests to wait on
+    :param adapter: The name of the adapter of the service in WORK_REQUEST_ADAPTERS, if it is not the class name of
+                    `client`. e.g. "LoadBalancerClient"
+    :param list_fn: Function in the SDK to list the work requests. e.g. lb_client.list_work_requests
+    :param kwargs_lists: List of dictionaries of arguments for the list function. e.g. [{"load_balancer_id": lb_id}]
+    :param states: The states to wait for. Defaults to the states of completed work requests. Failed work requests
+                   are always considered complete.
+    :return: A tuple of a dictionary of work request OCID to the last seen work request (as a dict, with its
+             percent_complete, and the errors and logs of the work request if it failed), and a list of OCIDs of the
+             work requests that did not complete within `wait_timeout` seconds.
+    """
+    work_request_adapter = get_work_request_adapter(client, adapter)
+    state_attribute = work_request_adapter["state_attribute"]
+    completed_states = (
+        work_request_adapter["succeeded_states"] + work_request_adapter["failed_states"]
+    )
+    if states is None:
+        states = completed_states
+    max_wait_seconds = MAX_WAIT_TIMEOUT_IN_SECONDS
+    if module is not None:
+        max_wait_seconds = module.params.get(
+            "wait_timeout", MAX_WAIT_TIMEOUT_IN_SECONDS
+        )
+    pending_ids = set(work_request_ids)
+    work_requests = dict()
+    start_time = time.time()
+    poll_interval = 1
+    while True:
+        if list_fn is not None:
+            polled_work_requests = [
+                work_request
+                for kwargs_list in kwargs_lists or [dict()]
+                for work_request in list_all_resources(list_fn, **dict(kwargs_list))
+                if work_request.id in pending_ids
+            ]
         else:
-            _debug(
-                "Waiting for work request with id {0} to reach ACCEPTED state.".format(
-                    response.data.id
+            polled_work_requests = [
+                call_with_backoff(client.get_work_request, work_request_id=wr_id).data
+                for wr_id in sorted(pending_ids)
+            ]
+        progressed = False
+        for polled_work_request in polled_work_requests:
+            work_request = to_dict(polled_work_request)
+            state = work_request.get(state_attribute)
+            if work_request.get("percent_complete") is None:
+                work_request["percent_complete"] = (
+                    100.0 if state in completed_states else None
+                )
+            previous_work_request = work_requests.get(work_request["id"], dict())
+            if (state, work_request["percent_complete"]) != (
+                previous_work_request.get(state_attribute),
+                previous_work_request.get("percent_complete"),
+            ):
+                progressed = True
+            if state in work_request_adapter["failed_states"]:
+                for detail in ["errors", "logs"]:
+                    work_request[detail] = _get_work_request_details(
+                        client, work_request_adapter, work_request, detail
+                    )
+            work_requests[work_request["id"]] = work_request
+            if state in states or state in work_request_adapter["failed_states"]:
+                pending_ids.discard(work_request["id"])
+        if not pending_ids:
+            break
+        elapsed_seconds = time.time() - start_time
+        if elapsed_seconds >= max_wait_seconds:
+            break
+        _debug(
+            "Waiting for work requests: {0}".format(
+                ", ".join(
+                    "{0} {1} ({2}%)".format(
+                        wr_id,
+                        work_requests.get(wr_id, dict()).get(state_attribute),
+                        work_requests.get(wr_id, dict()).get("percent_complete"),
+                    )
+                    for wr_id in sorted(pending_ids)
                 )
             )
-            wait_response = oci.wait_until(
-                client,
-                response,
-                evaluate_response=lambda r: r.data.status == "ACCEPTED",
-                max_wait_seconds=module.params.get(
-                    "wait_timeout", MAX_WAIT_TIMEOUT_IN_SECONDS
+        )
+        if progressed:
+            poll_interval = max(poll_interval / 2.0, 1)
+        else:
+            poll_interval = min(poll_interval * 2, MAX_POLL_INTERVAL_IN_SECONDS)
+        time.sleep(min(poll_interval, max_wait_seconds - elapsed_seconds))
+    return work_requests, list(pending_ids)
+
+
+def execute_tasks(task_method, list_of_params, module):
+    """
+    Execute `task_method` once for each entry in `list_of_params`, either in parallel or sequentially as requested by
+    the user through the `enable_parallel_requests` and `max_thread_count` module options.
+    :param task_method: A function that accepts a single argument.
+    :param list_of_params: List of arguments to call `task_method` with.
+    :param module: Instance of AnsibleModule.
+    :return: List of results of `task_method`, in the same order as `list_of_params`.
+    """
+    if module.params.get("enable_parallel_requests", True):
+        # construct a ThreadPool
+        pool = ThreadPool(module.params.get("max_thread_count"))
+        # run task_method in parallel, collecting results
+        results = pool.map(task_method, list_of_params)
+        pool.close()
+
+        # wait for all the tasks to complete
+        pool.join()
+
+        # terminate the pool
+        pool.terminate()
+    else:
+        # perform task_method in a sequential manner
+        results = []
+        for params in list_of_params:
+            results.append(task_method(params))
+
+    return results
+
+
+def get_resources_by_id(get_fn, get_param, resource_ids, module):
+    """
+    Get a group of resources by their OCIDs, in parallel as per the `enable_parallel_requests` and `max_thread_count`
+    module options. The module fails with the errors of all the failed requests if a resource cannot be fetched.
+    :param get_fn: Function in the SDK to get the resource. e.g. virtual_network_client.get_local_peering_gateway
+    :param get_param: Name of the argument of `get_fn` to pass the OCID as. e.g. "local_peering_gateway_id"
+    :param resource_ids: The OCIDs of the resources. Duplicates are fetched once.
+    :param module: Instance of AnsibleModule.
+    :return: A dictionary of OCID to the resource
+    """
+    resource_ids = sorted(set(resource_ids))
+
+    def get_resource(resource_id):
+        # Runs in a worker thread, so errors are returned to the caller instead of failing the module here
+        try:
+            return call_with_backoff(get_fn, **{get_param: resource_id}).data, None
+        except ServiceError as ex:
+            return None, "{0}: {1}".format(resource_id, ex.message)
+
+    outcomes = execute_tasks(get_resource, resource_ids, module)
+    errors = [error for _, error in outcomes if error]
+    if errors:
+        module.fail_json(msg="; ".join(errors))
+    return dict(
+        (resource_id, resource)
+        for resource_id, (resource, _) in zip(resource_ids, outcomes)
+    )
+
+
+def get_dependency_levels(dependencies):
+    """
+    Group the nodes of a dependency graph into levels, such that every node only depends on nodes of the earlier
+    levels. The nodes of a level do not depend on each other, and can be created or updated in parallel.
+    :param dependencies: A dictionary of node to the collection of nodes it depends on. Every node must be a key of the
+                         dictionary, even if it has no dependencies.
+    :return: A list of levels, each level being a sorted list of nodes
+    :raises ValueError: If a node depends on an unknown node, or if the dependencies are cyclic
+    """
+    pending_dependencies = dict()
+    for node, node_dependencies in dependencies.items():
+        unknown_dependencies = set(node_dependencies) - set(dependencies)
+        if unknown_dependencies:
+            raise ValueError(
+                "{0} depends on unknown {1}".format(node, sorted(unknown_dependencies))
+            )
+        pending_dependencies[node] = set(node_dependencies)
+    levels = []
+    resolved_nodes = set()
+    while pending_dependencies:
+        level = sorted(
+            node
+            for node, node_dependencies in pending_dependencies.items()
+            if node_dependencies <= resolved_nodes
+        )
+        if not level:
+            raise ValueError(
+                "Cyclic dependencies between {0}".format(sorted(pending_dependencies))
+            )
+        for node in level:
+            del pending_dependencies[node]
+        resolved_nodes.update(level)
+        levels.append(level)
+    return levels
+
+
+def get_batches(items, batch_size):
+    """
+    Split `items` into consecutive batches of at most `batch_size` items. All the items are returned in a single batch
+    if `batch_size` is not specified.
+    """
+    if not batch_size:
+        return [items] if items else []
+    return [items[i : i + batch_size] for i in range(0, len(items), batch_size)]
+
+
+def is_resource_tagged_with(resource, defined_tags):
+    """
+    Check if all the defined tags in `defined_tags` are applied to `resource`.
+    :param resource: A resource model instance that supports 'defined_tags' as an attribute
+    :param defined_tags: A dict of tag namespace to a dict of tag key/values. e.g. {"Operations": {"CostCenter": "42"}}
+    :return: True if the resource is tagged with all the specified defined tags
+    """
+    resource_defined_tags = getattr(resource, "defined_tags", None) or {}
+    for namespace in defined_tags:
+        if namespace not in resource_defined_tags:
+            return False
+        resource_tags_in_namespace = resource_defined_tags[namespace]
+        if not all(
+            resource_tags_in_namespace.get(k) == v
+            for k, v in defined_tags[namespace].items()
+        ):
+            return False
+    return True
+
+
+def _get_retention_period_key(rule, timestamp):
+    if rule == "keep_daily":
+        return timestamp.date()
+    if rule == "keep_weekly":
+        return tuple(timestamp.isocalendar()[:2])
+    return timestamp.year, timestamp.month
+
+
+def get_retained_resources(resources, retention_policy, time_attribute="time_created"):
+    """
+    Evaluate a retention policy on a group of resources, typically the backups of a volume or of a database. The
+    resources are sorted by `time_attribute`, newest first, and a resource is kept if any rule of the policy keeps it:
+      keep_last: The `keep_last` newest resources are kept.
+      keep_daily/keep_weekly/keep_monthly: For each of the N most recent days/ISO weeks/months that have resources, the
+        newest resource of the day/week/month is kept.
+    :param resources: The resources to evaluate the policy on
+    :param retention_policy: A dictionary of rule to the number of resources or periods the rule keeps. Rules that are
+                             not specified or are 0 do not keep any resource.
+    :param time_attribute: The attribute of the resources holding their creation time, as a datetime
+    :return: A tuple of the list of resources to keep and the list of resources to remove, both newest first
+    """
+    resources = sorted(
+        resources, key=lambda resource: getattr(resource, time_attribute), reverse=True
+    )
+    kept_ids = set(
+        resource.id for resource in resources[: retention_policy.get("keep_last") or 0]
+    )
+    for rule in RETENTION_POLICY_PERIOD_RULES:
+        period_count = retention_policy.get(rule) or 0
+        periods = set()
+        for resource in resources:
+            if len(periods) >= period_count:
+                break
+            period = _get_retention_period_key(rule, getattr(resource, time_attribute))
+            if period not in periods:
+                periods.add(period)
+                kept_ids.add(resource.id)
+    return (
+        [resource for resource in resources if resource.id in kept_ids],
+        [resource for resource in resources if resource.id not in kept_ids],
+    )
+
+
+def apply_retention_policy(
+    module,
+    resource_type,
+    list_fn,
+    kwargs_lists,
+    delete_fn,
+    delete_param,
+    group_attribute,
+    states,
+    time_attribute="time_created",
+):
+    """
+    Apply the retention policy I(retention_policy) on resources, typically backups. The resources are listed once per
+    entry in `kwargs_lists`, with the listings done in parallel, and grouped by `group_attribute`. The policy is then
+    evaluated on each group in memory, and the resources it does not keep are deleted in parallel, without waiting on
+    each deletion. If I(wait=True), the deleted resources are waited on together, with one listing per entry in
+    `kwargs_lists` in each poll round.
+    :param module: Instance of AnsibleModule.
+    :param resource_type: The type of the resources. e.g. "volume_backup"
+    :param list_fn: Function in the SDK to list the resources. e.g. block_storage_client.list_volume_backups
+    :param kwargs_lists: List of dictionaries of arguments for the list function, e.g. one per compartment
+    :param delete_fn: Function in the SDK to delete a resource. e.g. block_storage_client.delete_volume_backup
+    :param delete_param: Name of the argument of `delete_fn` to pass the OCID as. e.g. "volume_backup_id"
+    :param group_attribute: The attribute of the resources the policy is evaluated separately for. e.g. "volume_id"
+    :param states: The lifecycle states of the resources the policy is evaluated on. Resources in other states (being
+                   created or deleted) are neither kept nor removed by the policy.
+    :param time_attribute: The attribute of the resources holding their creation time
+    :return: A dictionary with the 'changed' state, the resources kept (`kept_<resource_type>s`) and the resources
+             removed (`removed_<resource_type>s`), newest first within each group
+    """
+    retention_policy = module.params["retention_policy"]
+    unknown_rules = set(retention_policy) - set(RETENTION_POLICY_RULES)
+    if unknown_rules:
+        module.fail_json(
+            msg="Unsupported rules in retention_policy: {0}. Supported rules are {1}.".format(
+                ", ".join(sorted(unknown_rules)), ", ".join(RETENTION_POLICY_RULES)
+            )
+        )
+    negative_rules = [
+        rule
+        for rule in RETENTION_POLICY_RULES
+        if retention_policy.get(rule) is not None and retention_policy[rule] < 0
+    ]
+    if negative_rules:
+        module.fail_json(
+            msg="Rules of retention_policy must not be negative: {0}.".format(
+                ", ".join(negative_rules)
+            )
+        )
+    if not any(retention_policy.get(rule) for rule in RETENTION_POLICY_RULES):
+        module.fail_json(msg="retention_policy must keep at least one resource.")
+
+    def list_resources(kwargs_list):
+        # Runs in a worker thread, so errors are returned to the caller instead of failing the module here
+        try:
+            return list_all_resources(list_fn, **kwargs_list), None
+        except ServiceError as ex:
+            return None, ex.message
+
+    outcomes = execute_tasks(list_resources, kwargs_lists, module)
+    errors = [error for _, error in outcomes if error]
+    if errors:
+        module.fail_json(msg="; ".join(errors))
+
+    groups = dict()
+    listed_ids = set()
+    for resources, _ in outcomes:
+        for resource in resources:
+            if resource.id not in listed_ids and resource.lifecycle_state in states:
+                listed_ids.add(resource.id)
+                groups.setdefault(getattr(resource, group_attribute), []).append(
+                    resource
+                )
+
+    kept_resources = []
+    removed_resources = []
+    for group in sorted(groups):
+        kept, removed = get_retained_resources(
+            groups[group], retention_policy, time_attribute
+        )
+        kept_resources.extend(kept)
+        removed_resources.extend(removed)
+    _debug(
+        "Retention policy keeps {0} and removes {1} {2}s".format(
+            len(kept_resources), len(removed_resources), resource_type
+        )
+    )
+
+    def delete_resource(resource):
+        # Runs in a worker thread, so errors are returned to the caller instead of failing the module here
+        try:
+            call_with_backoff(delete_fn, **{delete_param: resource.id})
+            return None
+        except ServiceError as ex:
+            if ex.status == 404:
+                return None
+            return "{0}: {1}".format(resource.id, ex.message)
+
+    errors = execute_tasks(delete_resource, removed_resources, module)
+    removed_resources = [
+        resource for resource, error in zip(removed_resources, errors) if not error
+    ]
+    result = {
+        "changed": bool(removed_resources),
+        "kept_{0}s".format(resource_type): to_dict(kept_resources),
+        "removed_{0}s".format(resource_type): to_dict(removed_resources),
+    }
+    errors = [error for error in errors if error]
+    if errors:
+        module.fail_json(
+            msg="Failed to delete {0} {1}s: {2}".format(
+                len(errors), resource_type, "; ".join(errors)
+            ),
+            **result
+        )
+
+    if removed_resources and module.params.get("wait", None):
+        try:
+            waited_resources, timed_out_ids = wait_for_resources_lifecycle_state(
+                module,
+                list_fn,
+                kwargs_lists,
+                [resource.id for resource in removed_resources],
+                DEFAULT_TERMINATED_STATES,
+            )
+        except ServiceError as ex:
+            module.fail_json(msg=ex.message, **result)
+        result["removed_{0}s".format(resource_type)] = [
+            waited_resources.get(resource["id"], resource)
+            for resource in result["removed_{0}s".format(resource_type)]
+        ]
+        if timed_out_ids:
+            module.fail_json(
+                msg="Timed out waiting for {0}s {1} to be deleted.".format(
+                    resource_type, ", ".join(sorted(timed_out_ids))
                 ),
+                **result
             )
-    except MaximumWaitTimeExceeded as ex:
-        _debug(str(ex))
-        module.fail_json(msg=str(ex))
+    return result
+
+
+def wait_on_work_request(client, response, module):
+    """
+    Wait for the work request in `response` to complete if the module's `wait` option is set, and fail the module
+    with the errors of the work request if it failed.
+    :param client: OCI service client instance of the service of the work request
+    :param response: The response of the GET of the work request
+    :param module: Instance of AnsibleModule.
+    :return: The work request (as a dict)
+    """
+    work_request = response.data
+    if not module.params.get("wait", None):
+        # A work request is ACCEPTED as soon as it is created
+        return to_dict(work_request)
+    _debug("Waiting for work request with id {0} to complete.".format(work_request.id))
+    try:
+        work_requests, timed_out_ids = wait_for_work_requests(
+            client, module, [work_request.id]
+        )
     except ServiceError as ex:
         _debug(str(ex))
         module.fail_json(msg=str(ex))
-    return wait_response.data
+    if timed_out_ids:
+        module.fail_json(
+            msg="Timed out waiting for work request {0} to complete".format(
+                work_request.id
+            )
+        )
+    work_request = work_requests[work_request.id]
+    if is_work_request_failed(client, work_request):
+        module.fail_json(
+            msg=get_work_request_error_message(work_request), work_request=work_request
+        )
+    return work_request
 
 
 def delete_and_wait(
@@ -1871,8 +2581,6 @@ def get_attached_instance_info(
     config = get_oci_config(module)
     identity_client = create_service_client(module, IdentityClient)
 
-    volume_attachments = []
-
     if lookup_attached_instance:
         # Get all the compartments in the tenancy
         compartments = to_dict(
@@ -1881,24 +2589,28 @@ def get_attached_instance_info(
             ).data
         )
         # For each compartment, get the volume attachments for the compartment_id with the other args in
-        # list_attachments_args.
+        # list_attachments_args, and stop at the first compartment which has an active attachment.
         for compartment in compartments:
             list_attachments_args["compartment_id"] = compartment["id"]
             try:
-                volume_attachments += list_all_resources(
-                    list_attachments_fn, **list_attachments_args
+                volume_attachment = _get_active_volume_attachment(
+                    list_all_resources(list_attachments_fn, **list_attachments_args)
                 )
+                if volume_attachment is not None:
+                    return volume_attachment
 
             # Pass ServiceError due to authorization issue in accessing volume attachments of a compartment
             except ServiceError as ex:
                 if ex.status == 404:
                     pass
+        return None
+
+    return _get_active_volume_attachment(
+        list_all_resources(list_attachments_fn, **list_attachments_args)
+    )
 
-    else:
-        volume_attachments = list_all_resources(
-            list_attachments_fn, **list_attachments_args
-        )
 
+def _get_active_volume_attachment(volume_attachments):
     volume_attachments = to_dict(volume_attachments)
     # volume_attachments has attachments in DETACHING or DETACHED state. Return the volume attachment in ATTACHING or
     # ATTACHED state
@@ -1969,6 +2681,198 @@ def get_component_list_difference(
     return None, False
 
 
+def get_component_list_delta(components, existing_components):
+    """
+    Compute the minimal change that turns a list of existing components into a list of components.
+    :param components: The desired list of hashable components
+    :param existing_components: The current list of hashable components
+    :return: A tuple of the list of components to add, in the order of `components`, and the set of components to
+     remove
+    """
+    components = components or []
+    existing_components = set(existing_components or [])
+    components_to_add = []
+    seen_components = set()
+    for component in components:
+        if component not in existing_components and component not in seen_components:
+            components_to_add.append(component)
+        seen_components.add(component)
+    return components_to_add, existing_components - seen_components
+
+
+def apply_component_list_delta(
+    existing_components, components_to_add, components_to_remove
+):
+    """
+    Apply a delta computed by `get_component_list_delta` to a (possibly more recent) list of existing components. The
+    existing components that are not removed keep their order and the added components are appended to them.
+    :return: A tuple of the resulting list of components and whether it differs from the existing components
+    """
+    existing_components = existing_components or []
+    components = [
+        component
+        for component in existing_components
+        if component not in components_to_remove
+    ]
+    changed = len(components) != len(existing_components)
+    remaining_components = set(components)
+    for component in components_to_add:
+        if component not in remaining_components:
+            components.append(component)
+            remaining_components.add(component)
+            changed = True
+    return components, changed
+
+
+def update_with_if_match(
+    resource_type,
+    client,
+    update_fn,
+    get_kwargs_update_fn,
+    get_fn,
+    get_param,
+    resource_id,
+    module,
+    max_attempts=MAX_IF_MATCH_UPDATE_ATTEMPTS,
+):
+    """
+    Update a resource with an ETag guarded read-modify-write. The resource is read along with its ETag, the update
+    arguments are computed from the resource read, and the update is sent with an `if-match` header. If the resource
+    was changed by someone else in between (HTTP 412), the resource is read again and the update is computed again.
+    :param resource_type: Type of the resource to be updated. e.g. "security_list"
+    :param client: OCI service client instance. e.g. VirtualNetworkClient()
+    :param update_fn: Function in the SDK to update the resource. e.g. virtual_network_client.update_security_list
+    :param get_kwargs_update_fn: Function which takes the current resource and returns the dictionary of arguments to
+     be used to call update_fn, or None if the resource does not need to be updated
+    :param get_fn: Function in the SDK to get the resource. e.g. virtual_network_client.get_security_list
+    :param get_param: Name of the argument in the SDK get function. e.g. "security_list_id"
+    :param resource_id: Identifier of the resource to update
+    :param module: Instance of AnsibleModule.
+    :param max_attempts: Maximum number of read-modify-write attempts
+    :return: A dictionary containing the resource & the "changed" status. e.g. {"vcn":{x:y}, "changed":True}
+    """
+    for attempt in range(1, max_attempts + 1):
+        response = call_with_backoff(get_fn, **{get_param: resource_id})
+        kwargs_update = get_kwargs_update_fn(response.data)
+        if kwargs_update is None:
+            return {resource_type: to_dict(response.data), "changed": False}
+        kwargs_update["if_match"] = response.headers.get("etag")
+        try:
+            resource = to_dict(call_with_backoff(update_fn, **kwargs_update).data)
+        except ServiceError as ex:
+            if ex.status != 412:
+                raise
+            _debug(
+                "{0} {1} was modified concurrently, attempt {2} of {3}".format(
+                    resource_type, resource_id, attempt, max_attempts
+                )
+            )
+            continue
+        _debug("Updated {0}, {1}".format(resource_type, resource))
+        resource = wait_for_resource_lifecycle_state(
+            client, module, True, None, get_fn, get_param, resource, None, resource_type
+        )
+        return {resource_type: resource, "changed": True}
+    module.fail_json(
+        msg="{0} {1} was modified concurrently {2} times while updating it.".format(
+            resource_type, resource_id, max_attempts
+        )
+    )
+
+
+def get_retention_policy_arg_spec():
+    """
+    Return the module options used to apply a retention policy on backups.
+    """
+    return dict(
+        retention_policy=dict(
+            type="dict",
+            required=False,
+            options=dict(
+                keep_last=dict(type="int", required=False),
+                keep_daily=dict(type="int", required=False),
+                keep_weekly=dict(type="int", required=False),
+                keep_monthly=dict(type="int", required=False),
+            ),
+        ),
+        compartment_ids=dict(type="list", required=False),
+    )
+
+
+def get_cache_arg_spec():
+    """
+    Return the module options used to control the on-disk cache of OCI resources that rarely change.
+    """
+    return dict(
+        cache_dir=dict(type="str", required=False, default=tempfile.gettempdir()),
+        cache_max_age=dict(
+            type="int", required=False, default=DEFAULT_CACHE_MAX_AGE_IN_SECONDS
+        ),
+    )
+
+
+def get_cache_file(cache_dir, cache_name, **cache_key_params):
+    """
+    Return the path of the cache file for the specified cache name and parameters. The name of the cache file is
+    derived from a hash of the parameters, so that different parameters do not share a cache file.
+    :param cache_dir: The directory to store the cache file in
+    :param cache_name: A name that identifies the type of the cached data. e.g. "compute-catalog"
+    :param cache_key_params: The parameters that identify the cached data. e.g. compartment_id="ocid1.compartment..."
+    :return: The path of the cache file
+    """
+    params_str = u""
+    for key in sorted(cache_key_params):
+        params_str += u"@{0}:{1}@".format(key, cache_key_params[key])
+    hashed_params_str = hashlib.md5(params_str.encode("utf-8")).hexdigest()
+    _debug(
+        u"Cache file name formed from the params {0} is {1}.".format(
+            params_str, hashed_params_str
+        )
+    )
+    return os.path.join(
+        cache_dir, "ansible-oci-{0}-{1}.cache".format(cache_name, hashed_params_str)
+    )
+
+
+def is_cache_valid(cache_file, cache_max_age):
+    if os.path.isfile(to_bytes(cache_file)):
+        mod_time = os.path.getmtime(to_bytes(cache_file))
+        if (mod_time + float(cache_max_age)) > time.time():
+            return True
+        _debug("Cache {0} is outdated.".format(cache_file))
+    return False
+
+
+def read_from_cache(cache_file):
+    """
+    Read the data of a cache file.
+    :return: The data, or None if the cache file cannot be read or is corrupt, e.g. truncated
+    """
+    try:
+        with open(to_bytes(cache_file), "r") as cache:
+            return json.loads(cache.read())
+    except (IOError, OSError, ValueError) as ex:
+        # The cache is only an optimization, so the data is rebuilt instead
+        _debug("Could not read from cache {0}: {1}".format(cache_file, ex))
+        return None
+
+
+def write_to_cache(cache_file, data):
+    json_data = json.dumps(data, sort_keys=True, indent=2, default=str)
+    cache_dir = os.path.dirname(cache_file)
+    try:
+        if not os.path.isdir(to_bytes(cache_dir)):
+            os.makedirs(to_bytes(cache_dir))
+        # Write to a temporary file and rename it, so that concurrent readers never see a partially written cache file
+        fd, tmp_cache_file = tempfile.mkstemp(dir=cache_dir)
+        with os.fdopen(fd, "w") as f:
+            f.write(json_data)
+        os.rename(tmp_cache_file, cache_file)
+    except (IOError, OSError) as ex:
+        # The cache is only an optimization, so carry on without it
+        _debug("Could not write to cache {0}: {1}".format(cache_file, ex))
+
+
 def write_to_file(path, content):
     with open(to_bytes(path), "wb") as dest_file:
         dest_file.write(content)
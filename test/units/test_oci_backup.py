@@ -7,13 +7,14 @@
 import pytest
 from nose.plugins.skip import SkipTest
 import logging
+from datetime import datetime
 from ansible.modules.cloud.oracle import oci_backup
 from ansible.module_utils.oracle import oci_utils
 
 try:
     import oci
     from oci.util import to_dict
-    from oci.database.models import Backup
+    from oci.database.models import Backup, BackupSummary
     from oci.exceptions import ServiceError
 except ImportError:
     raise SkipTest("test_backup.py requires `oci` module")
@@ -77,6 +78,62 @@ def test_delete_backup(db_client, delete_and_wait_patch):
     assert result["backup"]["display_name"] is backup.display_name
 
 
+def test_apply_backup_retention_policy_keeps_newest_backup_per_week(db_client):
+    module = get_module(
+        dict(
+            compartment_ids=None,
+            retention_policy=dict(keep_weekly=2),
+            wait=False,
+            enable_parallel_requests=True,
+            max_thread_count=None,
+        )
+    )
+    db_client.list_backups.return_value = get_response(
+        200,
+        None,
+        [
+            get_backup_summary("ocid1.backup.mon1", datetime(2019, 3, 4)),
+            get_backup_summary("ocid1.backup.fri1", datetime(2019, 3, 8)),
+            get_backup_summary("ocid1.backup.mon2", datetime(2019, 3, 11)),
+            get_backup_summary("ocid1.backup.wed2", datetime(2019, 3, 13)),
+            get_backup_summary("ocid1.backup.old", datetime(2019, 2, 25)),
+            get_backup_summary(
+                "ocid1.backup.creating", datetime(2019, 3, 14), "CREATING"
+            ),
+        ],
+        None,
+    )
+
+    result = oci_backup.apply_backup_retention_policy(db_client, module)
+
+    assert result["changed"] is True
+    assert [backup["id"] for backup in result["kept_backups"]] == [
+        "ocid1.backup.wed2",
+        "ocid1.backup.fri1",
+    ]
+    assert [backup["id"] for backup in result["removed_backups"]] == [
+        "ocid1.backup.mon2",
+        "ocid1.backup.mon1",
+        "ocid1.backup.old",
+    ]
+    assert (
+        db_client.list_backups.call_args[1]["database_id"]
+        == "ocid1.database.oc1.iad.abuw"
+    )
+    assert sorted(
+        call[1]["backup_id"] for call in db_client.delete_backup.call_args_list
+    ) == ["ocid1.backup.mon1", "ocid1.backup.mon2", "ocid1.backup.old"]
+
+
+def get_backup_summary(backup_id, time_started, lifecycle_state="ACTIVE"):
+    return BackupSummary(
+        id=backup_id,
+        database_id="ocid1.database.oc1.iad.abuw",
+        lifecycle_state=lifecycle_state,
+        time_started=time_started,
+    )
+
+
 def get_backup():
     backup = Backup()
     backup.display_name = "ansible-backup"
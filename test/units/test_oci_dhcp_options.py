@@ -12,7 +12,7 @@ from ansible.module_utils.oracle import oci_utils
 try:
     import oci
     from oci.util import to_dict
-    from oci.core.models import DhcpOptions, DhcpSearchDomainOption, DhcpDnsOption
+    from oci.core.models import DhcpOptions, DhcpSearchDomainOption, DhcpDnsOption, Vcn
     from oci.exceptions import ServiceError, MaximumWaitTimeExceeded
 except ImportError:
     raise SkipTest("test_oci_dhcp_options.py requires `oci` module")
@@ -73,6 +73,11 @@ def delete_and_wait_patch(mocker):
     return mocker.patch.object(oci_utils, "delete_and_wait")
 
 
+@pytest.fixture()
+def wait_for_resources_lifecycle_state_patch(mocker):
+    return mocker.patch.object(oci_utils, "wait_for_resources_lifecycle_state")
+
+
 def test_create_or_update_dhcp_options_create(
     virtual_network_client, check_and_create_resource_patch
 ):
@@ -325,6 +330,125 @@ def test_delete_dhcp_options(virtual_network_client, delete_and_wait_patch):
     assert result["changed"] is True
 
 
+def test_get_option_keys_difference():
+    existing_option_keys = oci_dhcp_options.get_existing_option_keys(
+        [
+            get_options("DomainNameServer", "VcnLocalPlusInternet", ["10.0.0.8"], None),
+            get_options("SearchDomain", None, None, ["ansibletestvcn.oraclevcn.com"]),
+        ]
+    )
+    assert existing_option_keys == [
+        ("DomainNameServer", "VcnLocalPlusInternet", ()),
+        ("SearchDomain", ("ansibletestvcn.oraclevcn.com",)),
+    ]
+    option_keys = oci_dhcp_options.get_input_option_keys(
+        [
+            {"type": "SearchDomain", "search_domain_names": ["ansiblevcn.com"]},
+            {"type": "DomainNameServer", "server_type": "VcnLocalPlusInternet"},
+        ]
+    )
+    assert oci_dhcp_options.get_option_keys_difference(
+        option_keys, existing_option_keys, True
+    ) == (
+        [
+            ("DomainNameServer", "VcnLocalPlusInternet", ()),
+            ("SearchDomain", ("ansiblevcn.com",)),
+        ],
+        True,
+    )
+    assert oci_dhcp_options.get_option_keys_difference(
+        option_keys[1:], existing_option_keys, True
+    ) == ([("DomainNameServer", "VcnLocalPlusInternet", ())], True)
+    assert oci_dhcp_options.get_option_keys_difference(
+        option_keys[1:], existing_option_keys, False
+    ) == (existing_option_keys, False)
+    assert oci_dhcp_options.get_option_keys_difference(
+        option_keys[1:], existing_option_keys, False, True
+    ) == ([("SearchDomain", ("ansibletestvcn.oraclevcn.com",))], True)
+    options = oci_dhcp_options.get_option_models(option_keys)
+    assert options[0].search_domain_names == ["ansiblevcn.com"]
+    assert options[1].custom_dns_servers == []
+    assert oci_dhcp_options.get_option_models(option_keys)[0] is options[0]
+
+
+def test_reconcile_compartment_dhcp_options(
+    virtual_network_client, wait_for_resources_lifecycle_state_patch
+):
+    input_options = [
+        {
+            "type": "DomainNameServer",
+            "server_type": "CustomDnsServer",
+            "custom_dns_servers": ["10.0.0.8"],
+        }
+    ]
+    module = get_module(
+        dict(
+            compartment_id="ocid1.compartment.oc1..aaaa",
+            options=input_options,
+            purge_dhcp_options=True,
+            delete_dhcp_options=False,
+            freeform_tags=None,
+            defined_tags=None,
+            wait=True,
+            enable_parallel_requests=True,
+            max_thread_count=None,
+        )
+    )
+    virtual_network_client.list_vcns.return_value = get_response(
+        200,
+        None,
+        [
+            Vcn(id="ocid1.vcn.oc1..%s" % name, lifecycle_state="AVAILABLE")
+            for name in ["unchanged", "changed", "new"]
+        ],
+        None,
+    )
+    unchanged_dhcp_options = get_dhcp_options(
+        "ansible_dhcp_options",
+        [get_options("DomainNameServer", "CustomDnsServer", ["10.0.0.8"], None)],
+    )
+    unchanged_dhcp_options.vcn_id = "ocid1.vcn.oc1..unchanged"
+    changed_dhcp_options = get_dhcp_options(
+        "ansible_dhcp_options",
+        [get_options("DomainNameServer", "VcnLocalPlusInternet", [], None)],
+    )
+    changed_dhcp_options.id = "ocid1.dhcpoptions.oc1..changed"
+    changed_dhcp_options.vcn_id = "ocid1.vcn.oc1..changed"
+    virtual_network_client.list_dhcp_options.return_value = get_response(
+        200, None, [unchanged_dhcp_options, changed_dhcp_options], None
+    )
+    virtual_network_client.update_dhcp_options.return_value = get_response(
+        200, None, changed_dhcp_options, None
+    )
+    new_dhcp_options = get_dhcp_options("ansible_dhcp_options", None)
+    new_dhcp_options.id = "ocid1.dhcpoptions.oc1..new"
+    virtual_network_client.create_dhcp_options.return_value = get_response(
+        200, None, new_dhcp_options, None
+    )
+    wait_for_resources_lifecycle_state_patch.return_value = (dict(), [])
+
+    result = oci_dhcp_options.reconcile_compartment_dhcp_options(
+        virtual_network_client, module
+    )
+
+    assert result["changed"] is True
+    assert len(result["dhcp_options_list"]) == 3
+    virtual_network_client.list_dhcp_options.assert_called_once()
+    kwargs_update = virtual_network_client.update_dhcp_options.call_args[1]
+    assert kwargs_update["dhcp_id"] == "ocid1.dhcpoptions.oc1..changed"
+    assert kwargs_update["update_dhcp_details"].options[0].custom_dns_servers == [
+        "10.0.0.8"
+    ]
+    create_dhcp_details = virtual_network_client.create_dhcp_options.call_args[1][
+        "create_dhcp_details"
+    ]
+    assert create_dhcp_details.vcn_id == "ocid1.vcn.oc1..new"
+    assert sorted(wait_for_resources_lifecycle_state_patch.call_args[0][3]) == [
+        "ocid1.dhcpoptions.oc1..changed",
+        "ocid1.dhcpoptions.oc1..new",
+    ]
+
+
 def get_dhcp_options(name, options):
     dhcp_options = DhcpOptions()
     dhcp_options.compartment_id = "ocid1.compartment.oc1..aaaa"
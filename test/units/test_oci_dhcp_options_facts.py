@@ -79,6 +79,37 @@ def test_list_dhcp_optionss_service_error(
         assert error_message in ex.args[0]
 
 
+def test_list_dhcp_options_from_vcn_snapshot(
+    virtual_network_client, list_all_resources_patch, tmpdir
+):
+    module = get_module()
+    module.params.update(
+        use_vcn_snapshot=True, cache_dir=str(tmpdir), cache_max_age=300
+    )
+    dhcp_options = get_dhcp_options()
+
+    def list_all_resources(list_fn, **kwargs):
+        if list_fn == virtual_network_client.list_dhcp_options:
+            return [dhcp_options]
+        return []
+
+    list_all_resources_patch.side_effect = list_all_resources
+    result = oci_dhcp_options_facts.list_dhcp_options(virtual_network_client, module)
+    assert result["dhcp_options_list"][0]["id"] == dhcp_options.id
+    # All the resource types of the VCN are listed in a single pass
+    assert list_all_resources_patch.call_count == 7
+
+    module.params["display_name"] = dhcp_options.display_name
+    result = oci_dhcp_options_facts.list_dhcp_options(virtual_network_client, module)
+    assert result["dhcp_options_list"][0]["id"] == dhcp_options.id
+    assert list_all_resources_patch.call_count == 7
+
+    # An outdated snapshot is taken again
+    module.params["cache_max_age"] = 0
+    oci_dhcp_options_facts.list_dhcp_options(virtual_network_client, module)
+    assert list_all_resources_patch.call_count == 14
+
+
 def get_dhcp_options():
     dhcp_options = DhcpOptions()
     dhcp_options.compartment_id = "ocid1.compartment.oc1..aaaa"
@@ -0,0 +1,356 @@
+# Copyright (c) 2019 Oracle and/or its affiliates.
+# This software is made available to you under the terms of the GPL 3.0 license or the Apache 2.0 license.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0
+# See LICENSE.TXT for details.
+
+import logging
+import pytest
+from nose.plugins.skip import SkipTest
+from ansible.modules.cloud.oracle import oci_image
+from ansible.module_utils.oracle import oci_utils
+
+try:
+    import oci
+    from oci.core.models import Image
+    from oci.exceptions import ServiceError
+except ImportError:
+    raise SkipTest("test_oci_image.py requires `oci` module")
+
+
+class FakeModule(object):
+    def __init__(self, **kwargs):
+        self.params = kwargs
+
+    def fail_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+        raise Exception(kwargs["msg"])
+
+    def exit_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+
+
+def setUpModule():
+    logging.basicConfig(
+        filename="/tmp/oci_ansible_module.log", filemode="a", level=logging.INFO
+    )
+    oci_image.set_logger(logging)
+
+
+@pytest.fixture()
+def compute_client(mocker):
+    mock_compute_client = mocker.patch("oci.core.compute_client.ComputeClient")
+    return mock_compute_client.return_value
+
+
+@pytest.fixture()
+def object_storage_client(mocker):
+    mock_object_storage_client = mocker.patch(
+        "oci.object_storage.object_storage_client.ObjectStorageClient"
+    )
+    return mock_object_storage_client.return_value
+
+
+@pytest.fixture()
+def upload_manager_patch(mocker):
+    return mocker.patch.object(oci_image, "UploadManager")
+
+
+@pytest.fixture()
+def wait_for_resources_lifecycle_state_patch(mocker):
+    patch = mocker.patch.object(oci_utils, "wait_for_resources_lifecycle_state")
+    patch.side_effect = lambda module, list_fn, kwargs_lists, resource_ids, states: (
+        dict(
+            (image_id, dict(id=image_id, lifecycle_state="AVAILABLE"))
+            for image_id in resource_ids
+        ),
+        [],
+    )
+    return patch
+
+
+def test_export_image_to_documented_object_storage_tuple(
+    compute_client, object_storage_client, wait_for_resources_lifecycle_state_patch
+):
+    module = get_module(
+        state="exported",
+        image_export_details=dict(
+            destination_type="objectStorageTuple",
+            namespace_name="my_namespace",
+            bucket_name="my_bucket",
+            object_name="my_image.oci",
+        ),
+    )
+    object_storage_client.head_object.side_effect = get_not_found_error()
+    compute_client.export_image.return_value = get_response(
+        get_image("ocid1.image.oc1.iad..image1", lifecycle_state="EXPORTING")
+    )
+
+    result = oci_image.export_image(compute_client, object_storage_client, module)
+
+    assert result["changed"] is True
+    assert result["image"]["lifecycle_state"] == "AVAILABLE"
+    eid = compute_client.export_image.call_args[1]["export_image_details"]
+    assert (eid.namespace_name, eid.bucket_name, eid.object_name) == (
+        "my_namespace",
+        "my_bucket",
+        "my_image.oci",
+    )
+    wait_for_resources_lifecycle_state_patch.assert_called_once()
+
+
+def test_export_image_skips_existing_object(compute_client, object_storage_client):
+    module = get_module(
+        state="exported",
+        image_export_details=dict(
+            destination_type="objectStorageTuple",
+            namespace="my_namespace",
+            bucket="my_bucket",
+            object="my_image.oci",
+        ),
+    )
+    compute_client.get_image.return_value = get_response(
+        get_image("ocid1.image.oc1.iad..image1")
+    )
+
+    result = oci_image.export_image(compute_client, object_storage_client, module)
+
+    assert result["changed"] is False
+    assert result["image"]["id"] == "ocid1.image.oc1.iad..image1"
+    assert object_storage_client.head_object.call_args[1]["object_name"] == (
+        "my_image.oci"
+    )
+    compute_client.export_image.assert_not_called()
+
+
+def test_upload_image_file_uses_parallel_multipart_upload(
+    object_storage_client, upload_manager_patch
+):
+    module = get_module(
+        compartment_id="ocid1.compartment.oc1..xxxxxEXAMPLExxxxx",
+        image_source_details=dict(
+            source_type="objectStorageTuple",
+            namespace_name="my_namespace",
+            bucket_name="my_bucket",
+            object_name="my_image.qcow2",
+            src="/tmp/my_image.qcow2",
+        ),
+        max_thread_count=4,
+    )
+    object_storage_client.head_object.side_effect = get_not_found_error()
+    cid = oci_image._get_create_image_details(module)
+
+    oci_image.upload_image_file(
+        object_storage_client, module, "/tmp/my_image.qcow2", cid.image_source_details
+    )
+
+    upload_manager_patch.assert_called_once_with(
+        object_storage_client, allow_parallel_uploads=True, parallel_process_count=4
+    )
+    upload_file_kwargs = upload_manager_patch.return_value.upload_file.call_args[1]
+    assert [
+        upload_file_kwargs[name]
+        for name in ["namespace_name", "bucket_name", "object_name", "file_path"]
+    ] == ["my_namespace", "my_bucket", "my_image.qcow2", "/tmp/my_image.qcow2"]
+
+
+def test_upload_image_file_skips_existing_object(
+    object_storage_client, upload_manager_patch
+):
+    module = get_module(
+        compartment_id="ocid1.compartment.oc1..xxxxxEXAMPLExxxxx",
+        image_source_details=dict(
+            source_type="objectStorageTuple",
+            namespace="my_namespace",
+            bucket="my_bucket",
+            object="my_image.qcow2",
+            src="/tmp/my_image.qcow2",
+        ),
+    )
+    cid = oci_image._get_create_image_details(module)
+
+    oci_image.upload_image_file(
+        object_storage_client, module, "/tmp/my_image.qcow2", cid.image_source_details
+    )
+
+    assert cid.image_source_details.object_name == "my_image.qcow2"
+    upload_manager_patch.assert_not_called()
+
+
+def test_copy_image_to_regions_skips_regions_with_a_copy(
+    mocker,
+    compute_client,
+    object_storage_client,
+    wait_for_resources_lifecycle_state_patch,
+):
+    module = get_module(
+        image_id="ocid1.image.oc1.iad..image1",
+        destination_regions=["us-phoenix-1", "uk-london-1"],
+        staging_bucket="image-staging",
+    )
+    region_compute_clients = set_region_clients(mocker, object_storage_client)
+    compute_client.get_image.return_value = get_response(
+        get_image("ocid1.image.oc1.iad..image1")
+    )
+    object_storage_client.get_namespace.return_value = get_response("my_namespace")
+    object_storage_client.head_object.side_effect = get_not_found_error()
+    region_compute_clients["us-phoenix-1"].list_images.return_value = get_response(
+        [
+            get_image(
+                "ocid1.image.oc1.phx..copy",
+                freeform_tags={"source_image_id": "ocid1.image.oc1.iad..image1"},
+            )
+        ]
+    )
+    # An image with the same name that is not a copy of the image does not count as a copy
+    region_compute_clients["uk-london-1"].list_images.return_value = get_response(
+        [get_image("ocid1.image.oc1.lhr..other")]
+    )
+    object_storage_client.copy_object.return_value = oci.Response(
+        202, {"opc-work-request-id": "ocid1.workrequest.lhr"}, None, None
+    )
+    mocker.patch.object(
+        oci_utils,
+        "wait_for_work_requests",
+        return_value=(
+            {
+                "ocid1.workrequest.lhr": dict(
+                    id="ocid1.workrequest.lhr", status="COMPLETED"
+                )
+            },
+            [],
+        ),
+    )
+    region_compute_clients["uk-london-1"].create_image.return_value = get_response(
+        get_image("ocid1.image.oc1.lhr..copy", lifecycle_state="IMPORTING")
+    )
+
+    result = oci_image.copy_image_to_regions(compute_client, module)
+
+    assert result["changed"] is True
+    assert [
+        (image_copy["region"], image_copy["image"]["id"], image_copy["changed"])
+        for image_copy in result["image_copies"]
+    ] == [
+        ("us-phoenix-1", "ocid1.image.oc1.phx..copy", False),
+        ("uk-london-1", "ocid1.image.oc1.lhr..copy", True),
+    ]
+    # The image is exported to the staging bucket once, for all the regions
+    compute_client.export_image.assert_called_once()
+    object_storage_client.copy_object.assert_called_once()
+    assert (
+        object_storage_client.copy_object.call_args[1][
+            "copy_object_details"
+        ].destination_region
+        == "uk-london-1"
+    )
+    cid = region_compute_clients["uk-london-1"].create_image.call_args[1][
+        "create_image_details"
+    ]
+    assert cid.freeform_tags == {"source_image_id": "ocid1.image.oc1.iad..image1"}
+    assert cid.image_source_details.object_name == "ocid1.image.oc1.iad..image1.oci"
+    region_compute_clients["us-phoenix-1"].create_image.assert_not_called()
+
+
+def test_copy_image_to_regions_reports_failed_object_copy(
+    mocker, compute_client, object_storage_client
+):
+    module = get_module(
+        image_id="ocid1.image.oc1.iad..image1",
+        destination_regions=["uk-london-1"],
+        staging_bucket="image-staging",
+    )
+    region_compute_clients = set_region_clients(mocker, object_storage_client)
+    compute_client.get_image.return_value = get_response(
+        get_image("ocid1.image.oc1.iad..image1")
+    )
+    object_storage_client.get_namespace.return_value = get_response("my_namespace")
+    region_compute_clients["uk-london-1"].list_images.return_value = get_response([])
+    object_storage_client.copy_object.return_value = oci.Response(
+        202, {"opc-work-request-id": "ocid1.workrequest.lhr"}, None, None
+    )
+    mocker.patch.object(
+        oci_utils,
+        "wait_for_work_requests",
+        return_value=(
+            {
+                "ocid1.workrequest.lhr": dict(
+                    id="ocid1.workrequest.lhr",
+                    status="FAILED",
+                    errors=[dict(message="Bucket image-staging does not exist")],
+                )
+            },
+            [],
+        ),
+    )
+
+    with pytest.raises(Exception) as exc_info:
+        oci_image.copy_image_to_regions(compute_client, module)
+    assert "Failed to copy image ocid1.image.oc1.iad..image1 to 1 of 1" in str(
+        exc_info.value
+    )
+    assert "Bucket image-staging does not exist" in (
+        module.exit_kwargs["image_copies"][0]["error"]
+    )
+    # The staged image already exists, so the image is not exported again
+    compute_client.export_image.assert_not_called()
+    region_compute_clients["uk-london-1"].create_image.assert_not_called()
+
+
+def set_region_clients(mocker, object_storage_client):
+    region_compute_clients = dict(
+        (region, mocker.MagicMock()) for region in ["us-phoenix-1", "uk-london-1"]
+    )
+
+    def create_service_client(module, client_class, region=None):
+        if region is None:
+            return object_storage_client
+        return region_compute_clients[region]
+
+    mocker.patch.object(
+        oci_utils, "create_service_client", side_effect=create_service_client
+    )
+    return region_compute_clients
+
+
+def get_not_found_error():
+    return ServiceError(404, "NotFound", dict(), "The object does not exist")
+
+
+def get_image(image_id, lifecycle_state="AVAILABLE", freeform_tags=None):
+    return Image(
+        id=image_id,
+        compartment_id="ocid1.compartment.oc1..xxxxxEXAMPLExxxxx",
+        display_name="my-image",
+        lifecycle_state=lifecycle_state,
+        freeform_tags=freeform_tags,
+    )
+
+
+def get_response(data):
+    return oci.Response(200, dict(), data, None)
+
+
+def get_module(**additional_properties):
+    params = dict(
+        compartment_id=None,
+        name=None,
+        image_id="ocid1.image.oc1.iad..image1",
+        instance_id=None,
+        image_source_details=None,
+        image_export_details=None,
+        destination_regions=None,
+        staging_bucket=None,
+        destination_compartment_id=None,
+        enable_parallel_requests=True,
+        max_thread_count=None,
+        freeform_tags=None,
+        defined_tags=None,
+        state="present",
+        wait=True,
+        wait_timeout=1200,
+    )
+    params.update(additional_properties)
+    return FakeModule(**params)
@@ -4,6 +4,7 @@
 # Apache License v2.0
 # See LICENSE.TXT for details.
 
+import os
 import pytest
 import logging
 
@@ -17,7 +18,7 @@ from ansible.module_utils.oracle.oci_utils import to_dict
 try:
     import oci
     from oci.object_storage.models import Bucket
-    from ansible.module_utils.oracle import oci_utils
+    from ansible.module_utils.oracle import oci_utils, oci_compute_utils
     from oci.exceptions import ServiceError
 except ImportError:
     raise SkipTest("test_oci_bucket.py requires `oci` module")
@@ -194,3 +195,386 @@ def test_stop_running_instance_clean_first_response(
     ret_inst = res["instance"]
     # the desired state must be reached
     assert ret_inst["lifecycle_state"] == "STOPPED"
+
+
+def _get_instance(id, lifecycle_state):
+    inst = oci.core.models.Instance()
+    inst.id = id
+    inst.display_name = "instance-" + id
+    inst.compartment_id = "ocid1.compartment.oc1..xxxxxEXAMPLExxxxx"
+    inst.lifecycle_state = lifecycle_state
+    return inst
+
+
+def _mock_get_instance(compute_client, lifecycle_state):
+    instances = dict(
+        (id, _get_instance(id, lifecycle_state)) for id in ["inst1", "inst2", "inst3"]
+    )
+
+    def get_instance(instance_id, **kwargs):
+        return get_response(200, None, instances[instance_id], None)
+
+    compute_client.get_instance.side_effect = get_instance
+
+
+def get_batch_power_action_module(**kwargs):
+    params = {
+        "instance_ids": ["inst1", "inst2", "inst3"],
+        "instance_tag": None,
+        "batch_size": None,
+        "enable_parallel_requests": True,
+        "max_thread_count": None,
+        "wait": True,
+        "wait_timeout": 1200,
+    }
+    params.update(kwargs)
+    return FakeModule(**params)
+
+
+def test_power_action_on_instances_waits_with_one_listing(compute_client):
+    _mock_get_instance(compute_client, "RUNNING")
+    compute_client.list_instances.return_value = get_response(
+        200,
+        None,
+        [_get_instance(id, "STOPPED") for id in ["inst3", "inst2", "inst1"]],
+        None,
+    )
+
+    result = oci_instance.power_action_on_instances(
+        compute_client, "stopped", get_batch_power_action_module()
+    )
+
+    assert result["changed"]
+    assert compute_client.instance_action.call_count == 3
+    # a single listing to wait on all the instances of the batch
+    assert compute_client.list_instances.call_count == 1
+    assert [inst["id"] for inst in result["instances"]] == ["inst1", "inst2", "inst3"]
+    assert all(
+        outcome["action"] == "STOP" and outcome["lifecycle_state"] == "STOPPED"
+        for outcome in result["power_action_results"]
+    )
+
+
+def test_power_action_on_instances_stops_releasing_batches_on_failure(compute_client):
+    _mock_get_instance(compute_client, "RUNNING")
+    compute_client.instance_action.side_effect = ServiceError(
+        500, "InternalServerError", dict(), "Internal Server Error"
+    )
+    module = get_batch_power_action_module(batch_size=1, wait=False)
+
+    with pytest.raises(Exception) as exc_info:
+        oci_instance.power_action_on_instances(compute_client, "stopped", module)
+    assert "Power action failed on 1 of 3 instances" in str(exc_info.value)
+    outcomes = module.exit_kwargs["power_action_results"]
+    assert outcomes[0]["error"] == "Internal Server Error"
+    assert not outcomes[1]["changed"] and not outcomes[2]["changed"]
+    assert compute_client.instance_action.call_count == 1
+
+
+def _get_shape(name):
+    shape = oci.core.models.Shape()
+    shape.shape = name
+    return shape
+
+
+def _get_image(id, lifecycle_state):
+    image = oci.core.models.Image()
+    image.id = id
+    image.display_name = "image-" + id
+    image.lifecycle_state = lifecycle_state
+    return image
+
+
+@pytest.fixture()
+def validate_launch_module(tmpdir):
+    oci_compute_utils._compute_catalogs.clear()
+    module = get_module()
+    module.params.update(
+        dict(validate_launch=True, cache_dir=str(tmpdir), cache_max_age=3600)
+    )
+    yield module
+    oci_compute_utils._compute_catalogs.clear()
+
+
+def _mock_compute_catalog(compute_client, image_lifecycle_state="AVAILABLE"):
+    def list_shapes(**kwargs):
+        return get_response(200, None, [_get_shape("VM.Standard2.1")], None)
+
+    compute_client.list_shapes.side_effect = list_shapes
+    compute_client.list_images.return_value = get_response(
+        200,
+        None,
+        [_get_image("ocid1.image.oc1.phx....sa7klnoa", image_lifecycle_state)],
+        None,
+    )
+
+
+def test_launch_instance_fails_validation_for_unavailable_shape(
+    compute_client, validate_launch_module, get_oci_utils_create_and_wait_patch
+):
+    _mock_compute_catalog(compute_client)
+
+    with pytest.raises(Exception) as exc_info:
+        oci_instance.launch_instance(compute_client, validate_launch_module, None)
+    assert "Shape BM.Standard1.36 is not available" in str(exc_info.value)
+    get_oci_utils_create_and_wait_patch.assert_not_called()
+
+
+def test_launch_instance_validation_reuses_cached_catalog(
+    compute_client, validate_launch_module, get_oci_utils_create_and_wait_patch
+):
+    _mock_compute_catalog(compute_client)
+    validate_launch_module.params["shape"] = "VM.Standard2.1"
+    get_oci_utils_create_and_wait_patch.return_value = {"changed": True}
+
+    oci_instance.launch_instance(compute_client, validate_launch_module, None)
+    # a new run only has the catalog persisted in the cache directory
+    oci_compute_utils._compute_catalogs.clear()
+    oci_instance.launch_instance(compute_client, validate_launch_module, None)
+
+    assert get_oci_utils_create_and_wait_patch.call_count == 2
+    # the shapes of the AD and of the image are listed, and the images are listed only once
+    assert compute_client.list_shapes.call_count == 2
+    assert compute_client.list_images.call_count == 1
+
+
+def test_get_default_image_id_looks_up_image_in_catalog(
+    compute_client, validate_launch_module, get_oci_utils_create_and_wait_patch, tmpdir
+):
+    _mock_compute_catalog(compute_client)
+    # the cache directory is created on first use
+    cache_dir = str(tmpdir.join("cache", "compute"))
+    validate_launch_module.params.update(
+        dict(
+            cache_dir=cache_dir,
+            image_id=None,
+            shape="VM.Standard2.1",
+            source_details=dict(
+                source_type="image", image_id="ocid1.image.oc1.phx....sa7klnoa"
+            ),
+        )
+    )
+    get_oci_utils_create_and_wait_patch.return_value = {"changed": True}
+
+    image_id = oci_instance._get_default_image_id(
+        compute_client, validate_launch_module
+    )
+    oci_instance.launch_instance(compute_client, validate_launch_module, None)
+
+    assert image_id == "ocid1.image.oc1.phx....sa7klnoa"
+    # the image is answered from the catalog index, which is built once for the lookup and the launch validation
+    compute_client.get_image.assert_not_called()
+    assert compute_client.list_images.call_count == 1
+    assert len(os.listdir(cache_dir)) == 1
+
+
+def test_launch_instance_validation_refreshes_unavailable_cached_image(
+    compute_client, validate_launch_module, get_oci_utils_create_and_wait_patch
+):
+    # the image was cached while it was being imported
+    _mock_compute_catalog(compute_client, image_lifecycle_state="IMPORTING")
+    validate_launch_module.params["shape"] = "VM.Standard2.1"
+    compute_client.get_image.return_value = get_response(
+        200, None, _get_image("ocid1.image.oc1.phx....sa7klnoa", "AVAILABLE"), None
+    )
+    get_oci_utils_create_and_wait_patch.return_value = {"changed": True}
+
+    oci_instance.launch_instance(compute_client, validate_launch_module, None)
+
+    get_oci_utils_create_and_wait_patch.assert_called_once()
+    compute_client.get_image.assert_called_once()
+
+    oci_compute_utils._compute_catalogs.clear()
+    compute_client.get_image.return_value = get_response(
+        200, None, _get_image("ocid1.image.oc1.phx....sa7klnoa", "DELETED"), None
+    )
+    # the refreshed image state is persisted in the cache
+    oci_instance.launch_instance(compute_client, validate_launch_module, None)
+    assert get_oci_utils_create_and_wait_patch.call_count == 2
+    compute_client.get_image.assert_called_once()
+
+
+def test_launch_instance_fails_validation_for_unavailable_image(
+    compute_client, validate_launch_module, get_oci_utils_create_and_wait_patch
+):
+    _mock_compute_catalog(compute_client, image_lifecycle_state="IMPORTING")
+    validate_launch_module.params["shape"] = "VM.Standard2.1"
+    compute_client.get_image.return_value = get_response(
+        200, None, _get_image("ocid1.image.oc1.phx....sa7klnoa", "IMPORTING"), None
+    )
+
+    with pytest.raises(Exception) as exc_info:
+        oci_instance.launch_instance(compute_client, validate_launch_module, None)
+    assert "is in IMPORTING state" in str(exc_info.value)
+    get_oci_utils_create_and_wait_patch.assert_not_called()
+
+
+def test_launch_instance_validation_rebuilds_corrupt_cached_catalog(
+    compute_client, validate_launch_module, get_oci_utils_create_and_wait_patch, tmpdir
+):
+    _mock_compute_catalog(compute_client)
+    validate_launch_module.params["shape"] = "VM.Standard2.1"
+    get_oci_utils_create_and_wait_patch.return_value = {"changed": True}
+
+    oci_instance.launch_instance(compute_client, validate_launch_module, None)
+    oci_compute_utils._compute_catalogs.clear()
+    # truncate the persisted catalog
+    for cache_file in tmpdir.listdir():
+        cache_file.write(cache_file.read()[:20])
+    oci_instance.launch_instance(compute_client, validate_launch_module, None)
+
+    assert get_oci_utils_create_and_wait_patch.call_count == 2
+    assert compute_client.list_images.call_count == 2
+
+
+def _get_volume_attachment(id, volume_id, lifecycle_state):
+    volume_attachment = oci.core.models.VolumeAttachment()
+    volume_attachment.id = id
+    volume_attachment.volume_id = volume_id
+    volume_attachment.instance_id = "inst1"
+    volume_attachment.lifecycle_state = lifecycle_state
+    return volume_attachment
+
+
+def get_volumes_module(**kwargs):
+    params = {
+        "instance_id": "inst1",
+        "volumes": [
+            {"volume_id": "vol1"},
+            {"volume_id": "vol2", "attachment_name": "data"},
+            {"volume_id": "vol3", "attachment_state": "absent"},
+        ],
+        "purge_volume_attachments": False,
+        "enable_parallel_requests": True,
+        "max_thread_count": None,
+        "wait": True,
+        "wait_timeout": 1200,
+    }
+    params.update(kwargs)
+    return FakeModule(**params)
+
+
+def _mock_attach_volume(compute_client):
+    def attach_volume(attach_volume_details, **kwargs):
+        return get_response(
+            200,
+            None,
+            _get_volume_attachment(
+                "va-" + attach_volume_details.volume_id,
+                attach_volume_details.volume_id,
+                "ATTACHING",
+            ),
+            None,
+        )
+
+    compute_client.attach_volume.side_effect = attach_volume
+
+
+def test_handle_volumes_reconciles_all_attachments_together(compute_client):
+    _mock_get_instance(compute_client, "RUNNING")
+    _mock_attach_volume(compute_client)
+    compute_client.list_volume_attachments.side_effect = [
+        # the attachments of the instance before the reconciliation
+        get_response(
+            200,
+            None,
+            [
+                _get_volume_attachment("va-vol1", "vol1", "ATTACHED"),
+                _get_volume_attachment("va-vol3", "vol3", "ATTACHED"),
+                _get_volume_attachment("va-vol4", "vol4", "ATTACHED"),
+            ],
+            None,
+        ),
+        # the attaches and detaches are waited on together
+        get_response(
+            200,
+            None,
+            [
+                _get_volume_attachment("va-vol1", "vol1", "ATTACHED"),
+                _get_volume_attachment("va-vol2", "vol2", "ATTACHING"),
+                _get_volume_attachment("va-vol3", "vol3", "DETACHED"),
+                _get_volume_attachment("va-vol4", "vol4", "ATTACHED"),
+            ],
+            None,
+        ),
+        get_response(
+            200,
+            None,
+            [
+                _get_volume_attachment("va-vol1", "vol1", "ATTACHED"),
+                _get_volume_attachment("va-vol2", "vol2", "ATTACHED"),
+                _get_volume_attachment("va-vol3", "vol3", "DETACHED"),
+                _get_volume_attachment("va-vol4", "vol4", "ATTACHED"),
+            ],
+            None,
+        ),
+    ]
+
+    result = oci_instance.handle_volumes(compute_client, get_volumes_module())
+
+    assert result["changed"]
+    compute_client.attach_volume.assert_called_once()
+    assert (
+        compute_client.attach_volume.call_args[1]["attach_volume_details"].display_name
+        == "data"
+    )
+    compute_client.detach_volume.assert_called_once()
+    assert (
+        compute_client.detach_volume.call_args[1]["volume_attachment_id"] == "va-vol3"
+    )
+    assert compute_client.list_volume_attachments.call_count == 3
+    assert [
+        (outcome["action"], outcome["volume_attachment"]["lifecycle_state"])
+        for outcome in result["volume_attachment_results"]
+    ] == [("ATTACH", "ATTACHED"), ("DETACH", "DETACHED")]
+
+
+def test_handle_volumes_detaches_attaching_attachments_once_attached(compute_client):
+    _mock_get_instance(compute_client, "RUNNING")
+    compute_client.list_volume_attachments.side_effect = [
+        get_response(
+            200, None, [_get_volume_attachment("va-vol3", "vol3", "ATTACHING")], None
+        ),
+        get_response(
+            200, None, [_get_volume_attachment("va-vol3", "vol3", "ATTACHED")], None
+        ),
+    ]
+    module = get_volumes_module(
+        volumes=[{"volume_id": "vol3", "attachment_state": "absent"}], wait=False
+    )
+
+    result = oci_instance.handle_volumes(compute_client, module)
+
+    assert result["changed"]
+    compute_client.detach_volume.assert_called_once()
+    assert (
+        compute_client.detach_volume.call_args[1]["volume_attachment_id"] == "va-vol3"
+    )
+    assert [
+        (outcome["action"], outcome["volume_attachment"]["lifecycle_state"])
+        for outcome in result["volume_attachment_results"]
+    ] == [("DETACH", "ATTACHED")]
+
+
+def test_handle_volumes_purges_unspecified_attachments(compute_client):
+    _mock_get_instance(compute_client, "RUNNING")
+    compute_client.list_volume_attachments.return_value = get_response(
+        200,
+        None,
+        [
+            _get_volume_attachment("va-vol1", "vol1", "ATTACHED"),
+            _get_volume_attachment("va-vol2", "vol2", "ATTACHED"),
+            _get_volume_attachment("va-vol4", "vol4", "ATTACHED"),
+        ],
+        None,
+    )
+    module = get_volumes_module(purge_volume_attachments=True, wait=False)
+
+    result = oci_instance.handle_volumes(compute_client, module)
+
+    assert result["changed"]
+    compute_client.attach_volume.assert_not_called()
+    compute_client.detach_volume.assert_called_once()
+    assert (
+        compute_client.detach_volume.call_args[1]["volume_attachment_id"] == "va-vol4"
+    )
@@ -0,0 +1,284 @@
+# Copyright (c) 2019 Oracle and/or its affiliates.
+# This software is made available to you under the terms of the GPL 3.0 license or the Apache 2.0 license.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0
+# See LICENSE.TXT for details.
+
+import logging
+import time
+import pytest
+from nose.plugins.skip import SkipTest
+from ansible.modules.cloud.oracle import oci_instance_pool
+from ansible.module_utils.oracle import oci_utils, oci_compute_utils
+
+try:
+    import oci
+    from oci.core.models import InstancePool, InstanceSummary
+    from oci.exceptions import ServiceError
+except ImportError:
+    raise SkipTest("test_oci_instance_pool.py requires `oci` module")
+
+
+class FakeModule(object):
+    def __init__(self, **kwargs):
+        self.params = kwargs
+
+    def fail_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+        raise Exception(kwargs["msg"])
+
+    def exit_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+
+
+def setUpModule():
+    logging.basicConfig(
+        filename="/tmp/oci_ansible_module.log", filemode="a", level=logging.INFO
+    )
+    oci_instance_pool.set_logger(logging)
+
+
+@pytest.fixture()
+def compute_management_client(mocker):
+    mock_compute_management_client = mocker.patch(
+        "oci.core.compute_management_client.ComputeManagementClient"
+    )
+    return mock_compute_management_client.return_value
+
+
+@pytest.fixture()
+def wait_for_resources_lifecycle_state_patch(mocker):
+    return mocker.patch.object(oci_utils, "wait_for_resources_lifecycle_state")
+
+
+@pytest.fixture()
+def wait_for_instance_pool_instances_patch(mocker):
+    return mocker.patch.object(oci_compute_utils, "wait_for_instance_pool_instances")
+
+
+def test_scale_instance_pool_in_steps_with_one_deadline(
+    compute_management_client, wait_for_instance_pool_instances_patch
+):
+    module = get_module(
+        instance_pool_id="ocid1.instancepool.oc1..pool1",
+        size=7,
+        size_increment=2,
+        count_of_instances_to_wait=None,
+        wait=False,
+    )
+    compute_management_client.get_instance_pool.return_value = get_response(
+        get_instance_pool("ocid1.instancepool.oc1..pool1", "RUNNING", size=2)
+    )
+    wait_for_instance_pool_instances_patch.side_effect = lambda compute_management_client, module, instance_pool_id, size, count_of_instances_to_wait, deadline: (
+        dict(id=instance_pool_id, size=size, lifecycle_state="RUNNING"),
+        count_of_instances_to_wait,
+        False,
+    )
+
+    scaling_steps = oci_instance_pool.scale_instance_pool(
+        compute_management_client, module
+    )
+
+    assert [(step["size"], step["running_instances"]) for step in scaling_steps] == [
+        (4, 4),
+        (6, 6),
+        (7, 0),
+    ]
+    assert [
+        call[1]["update_instance_pool_details"].size
+        for call in compute_management_client.update_instance_pool.call_args_list
+    ] == [4, 6, 7]
+    # Every step, including the last one with wait=no, waits for the instance pool to be done scaling before the
+    # instance pool is updated again, and all the waits share the same deadline
+    wait_calls = wait_for_instance_pool_instances_patch.call_args_list
+    assert [call[0][3:] for call in wait_calls] == [(4, 4), (6, 6), (7, 0)]
+    assert len(set(call[1]["deadline"] for call in wait_calls)) == 1
+
+
+def test_scale_instance_pool_fails_on_timed_out_step(
+    compute_management_client, wait_for_instance_pool_instances_patch
+):
+    module = get_module(
+        instance_pool_id="ocid1.instancepool.oc1..pool1",
+        size=2,
+        size_increment=3,
+        count_of_instances_to_wait=None,
+    )
+    compute_management_client.get_instance_pool.return_value = get_response(
+        get_instance_pool("ocid1.instancepool.oc1..pool1", "RUNNING", size=10)
+    )
+    wait_for_instance_pool_instances_patch.side_effect = [
+        (dict(id="ocid1.instancepool.oc1..pool1", size=7), 7, False),
+        (dict(id="ocid1.instancepool.oc1..pool1", size=4), 5, True),
+    ]
+
+    with pytest.raises(Exception) as exc_info:
+        oci_instance_pool.scale_instance_pool(compute_management_client, module)
+    assert "to scale to 4 instances" in str(exc_info.value)
+    assert [
+        (step["size"], step["running_instances"])
+        for step in module.exit_kwargs["scaling_steps"]
+    ] == [(7, 7), (4, 5)]
+    assert compute_management_client.update_instance_pool.call_count == 2
+
+
+def test_wait_for_instance_pool_instances_times_out_at_deadline(
+    compute_management_client,
+):
+    compute_management_client.get_instance_pool.return_value = get_response(
+        get_instance_pool("ocid1.instancepool.oc1..pool1", "SCALING", size=3)
+    )
+    compute_management_client.list_instance_pool_instances.return_value = get_response(
+        [InstanceSummary(id="ocid1.instance.oc1..i1", state="RUNNING")]
+    )
+
+    instance_pool, running_count, timed_out = (
+        oci_compute_utils.wait_for_instance_pool_instances(
+            compute_management_client,
+            get_module(wait_timeout=1200),
+            "ocid1.instancepool.oc1..pool1",
+            3,
+            1,
+            deadline=time.time() - 1,
+        )
+    )
+
+    assert timed_out is True
+    assert running_count == 1
+    assert instance_pool["lifecycle_state"] == "SCALING"
+    compute_management_client.get_instance_pool.assert_called_once()
+
+
+def test_power_action_on_instance_pools_by_ids_in_batches(
+    compute_management_client, wait_for_resources_lifecycle_state_patch
+):
+    module = get_module(
+        instance_pool_ids=[
+            "ocid1.instancepool.oc1..pool1",
+            "ocid1.instancepool.oc1..pool2",
+            "ocid1.instancepool.oc1..pool3",
+        ],
+        batch_size=2,
+    )
+    instance_pools = dict(
+        (pool.id, pool)
+        for pool in [
+            get_instance_pool("ocid1.instancepool.oc1..pool1", "RUNNING"),
+            get_instance_pool("ocid1.instancepool.oc1..pool2", "STOPPED"),
+            get_instance_pool("ocid1.instancepool.oc1..pool3", "RUNNING"),
+        ]
+    )
+    compute_management_client.get_instance_pool.side_effect = (
+        lambda instance_pool_id, **kwargs: get_response(
+            instance_pools[instance_pool_id]
+        )
+    )
+    wait_for_resources_lifecycle_state_patch.side_effect = (
+        lambda module, list_fn, kwargs_lists, resource_ids, states: (
+            dict(
+                (pool_id, dict(id=pool_id, lifecycle_state="STOPPED"))
+                for pool_id in resource_ids
+            ),
+            [],
+        )
+    )
+
+    result = oci_instance_pool.power_action_on_instance_pools(
+        compute_management_client, module
+    )
+
+    assert result["changed"] is True
+    assert [
+        (outcome["id"], outcome["action"], outcome["changed"])
+        for outcome in result["power_action_results"]
+    ] == [
+        ("ocid1.instancepool.oc1..pool1", "STOP", True),
+        ("ocid1.instancepool.oc1..pool2", None, False),
+        ("ocid1.instancepool.oc1..pool3", "STOP", True),
+    ]
+    assert [pool["lifecycle_state"] for pool in result["instance_pools"]] == [
+        "STOPPED"
+    ] * 3
+    assert sorted(
+        call[1]["instance_pool_id"]
+        for call in compute_management_client.stop_instance_pool.call_args_list
+    ) == ["ocid1.instancepool.oc1..pool1", "ocid1.instancepool.oc1..pool3"]
+    # One grouped wait per batch
+    assert [
+        call[0][3] for call in wait_for_resources_lifecycle_state_patch.call_args_list
+    ] == [["ocid1.instancepool.oc1..pool1"], ["ocid1.instancepool.oc1..pool3"]]
+
+
+def test_power_action_on_instance_pools_by_tag_stops_after_failed_batch(
+    compute_management_client, wait_for_resources_lifecycle_state_patch
+):
+    module = get_module(
+        instance_pool_tag={"Operations": {"Tier": "web"}},
+        state="running",
+        batch_size=1,
+    )
+    compute_management_client.list_instance_pools.return_value = get_response(
+        [
+            get_instance_pool("ocid1.instancepool.oc1..web1", "STOPPED", "web"),
+            get_instance_pool("ocid1.instancepool.oc1..db1", "STOPPED", "db"),
+            get_instance_pool("ocid1.instancepool.oc1..web2", "TERMINATED", "web"),
+            get_instance_pool("ocid1.instancepool.oc1..web3", "STOPPED", "web"),
+        ]
+    )
+    compute_management_client.start_instance_pool.side_effect = ServiceError(
+        409, "Conflict", dict(), "Instance pool is scaling"
+    )
+
+    with pytest.raises(Exception) as exc_info:
+        oci_instance_pool.power_action_on_instance_pools(
+            compute_management_client, module
+        )
+    assert "Power action failed on 1 of 2 instance pools" in str(exc_info.value)
+    assert [
+        (outcome["id"], outcome["action"], outcome.get("error"))
+        for outcome in module.exit_kwargs["power_action_results"]
+    ] == [
+        ("ocid1.instancepool.oc1..web1", "START", "Instance pool is scaling"),
+        ("ocid1.instancepool.oc1..web3", None, None),
+    ]
+    assert module.exit_kwargs["changed"] is False
+    compute_management_client.start_instance_pool.assert_called_once()
+    assert (
+        compute_management_client.start_instance_pool.call_args[1]["instance_pool_id"]
+        == "ocid1.instancepool.oc1..web1"
+    )
+    wait_for_resources_lifecycle_state_patch.assert_not_called()
+
+
+def get_instance_pool(instance_pool_id, lifecycle_state, tier=None, size=None):
+    return InstancePool(
+        id=instance_pool_id,
+        size=size,
+        display_name=instance_pool_id.split("..")[-1],
+        compartment_id="ocid1.compartment.oc1..xxxxxEXAMPLExxxxx",
+        lifecycle_state=lifecycle_state,
+        defined_tags={"Operations": {"Tier": tier}} if tier else {},
+    )
+
+
+def get_response(data):
+    return oci.Response(200, dict(), data, None)
+
+
+def get_module(**additional_properties):
+    params = dict(
+        compartment_id="ocid1.compartment.oc1..xxxxxEXAMPLExxxxx",
+        instance_pool_id=None,
+        instance_pool_ids=None,
+        instance_pool_tag=None,
+        batch_size=None,
+        state="stopped",
+        wait=True,
+        wait_timeout=1200,
+        enable_parallel_requests=True,
+        max_thread_count=None,
+    )
+    params.update(additional_properties)
+    return FakeModule(**params)
@@ -87,6 +87,38 @@ def test_list_internet_gateways_service_error(
         assert error_message in ex.args[0]
 
 
+def test_list_internet_gateways_from_vcn_snapshot(
+    virtual_network_client, list_all_resources_patch, tmpdir
+):
+    module = get_module()
+    module.params.update(
+        use_vcn_snapshot=True, cache_dir=str(tmpdir), cache_max_age=300
+    )
+    internet_gateway = get_internet_gateway()
+
+    def list_all_resources(list_fn, **kwargs):
+        if list_fn == virtual_network_client.list_internet_gateways:
+            return [internet_gateway]
+        return []
+
+    list_all_resources_patch.side_effect = list_all_resources
+    result = oci_internet_gateway_facts.list_internet_gateways(
+        virtual_network_client, module
+    )
+    assert result["internet_gateways"][0]["id"] == internet_gateway.id
+    assert list_all_resources_patch.call_count == 7
+
+    module.params["display_name"] = "another_ig"
+    result = oci_internet_gateway_facts.list_internet_gateways(
+        virtual_network_client, module
+    )
+    assert result["internet_gateways"] == []
+    # The snapshot is cached per VCN, so the next VCN is listed again
+    module.params.update(display_name=None, vcn_id="ocid1.vcn..another")
+    oci_internet_gateway_facts.list_internet_gateways(virtual_network_client, module)
+    assert list_all_resources_patch.call_count == 14
+
+
 def get_internet_gateway():
     internet_gateway = InternetGateway()
     internet_gateway.compartment_id = "ocid1.comp..axsd"
@@ -0,0 +1,158 @@
+# Copyright (c) 2019 Oracle and/or its affiliates.
+# This software is made available to you under the terms of the GPL 3.0 license or the Apache 2.0 license.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0
+# See LICENSE.TXT for details.
+
+import pytest
+from nose.plugins.skip import SkipTest
+from ansible.modules.cloud.oracle import oci_ip_sec_connection_device_status_facts
+
+try:
+    import oci
+    from oci.core.models import IPSecConnectionDeviceStatus, TunnelStatus
+    from oci.exceptions import ServiceError
+except ImportError:
+    raise SkipTest(
+        "test_oci_ip_sec_connection_device_status_facts.py requires `oci` module"
+    )
+
+
+class FakeModule(object):
+    def __init__(self, **kwargs):
+        self.params = kwargs
+
+    def fail_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+        raise Exception(kwargs["msg"])
+
+    def exit_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+
+
+@pytest.fixture()
+def virtual_network_client(mocker):
+    mock_virtual_network_client = mocker.patch(
+        "oci.core.virtual_network_client.VirtualNetworkClient"
+    )
+    return mock_virtual_network_client.return_value
+
+
+@pytest.fixture()
+def time_patch(mocker):
+    clock = dict(now=1549879200.0)
+
+    def sleep(seconds):
+        clock["now"] += seconds
+
+    mocker.patch.object(
+        oci_ip_sec_connection_device_status_facts.time,
+        "time",
+        side_effect=lambda: clock["now"],
+    )
+    return mocker.patch.object(
+        oci_ip_sec_connection_device_status_facts.time, "sleep", side_effect=sleep
+    )
+
+
+def test_record_tunnel_samples_transitions_and_time_in_state():
+    tunnels = dict()
+    for sample_time, state in [(0, "UP"), (30, "UP"), (60, "DOWN"), (90, "UP")]:
+        oci_ip_sec_connection_device_status_facts.record_tunnel_samples(
+            tunnels, get_device_status("ipsc", [state]), sample_time, 2
+        )
+
+    tunnel = tunnels[("ipsc", "129.213.7.0")]
+    assert tunnel["sample_count"] == 4
+    assert list(tunnel["samples"]) == [(60, "DOWN"), (90, "UP")]
+    assert tunnel["transitions"] == [(60, "UP", "DOWN"), (90, "DOWN", "UP")]
+    assert tunnel["time_in_state"] == dict(UP=60, DOWN=30)
+
+
+def test_monitor_device_statuses_samples_each_connection_every_interval(
+    virtual_network_client, time_patch
+):
+    module = get_module(
+        dict(ipsc_ids=["ipsc-1", "ipsc-2"], monitoring_duration=60, max_samples=2)
+    )
+    states = dict(
+        [
+            ("ipsc-1", iter([["UP", "UP"], ["DOWN", "UP"], ["UP", "UP"]])),
+            ("ipsc-2", iter([["UP", "DOWN"], None, ["UP", "UP"]])),
+        ]
+    )
+
+    def get_ip_sec_connection_device_status(ipsc_id, **kwargs):
+        tunnel_states = next(states[ipsc_id])
+        if tunnel_states is None:
+            raise ServiceError(503, "ServiceUnavailable", dict(), "Service unavailable")
+        return oci.Response(
+            200, dict(), get_device_status(ipsc_id, tunnel_states), None
+        )
+
+    virtual_network_client.get_ip_sec_connection_device_status.side_effect = (
+        get_ip_sec_connection_device_status
+    )
+
+    result = oci_ip_sec_connection_device_status_facts.monitor_device_statuses(
+        virtual_network_client, module, ["ipsc-1", "ipsc-2"]
+    )
+
+    assert virtual_network_client.get_ip_sec_connection_device_status.call_count == 6
+    assert time_patch.call_count == 2
+    tunnels = dict(
+        ((tunnel["ipsc_id"], tunnel["ip_address"]), tunnel)
+        for tunnel in result["ip_sec_tunnels_monitoring"]
+    )
+    assert len(tunnels) == 4
+    tunnel = tunnels[("ipsc-1", "129.213.7.0")]
+    assert tunnel["sample_count"] == 3
+    assert [sample["lifecycle_state"] for sample in tunnel["samples"]] == [
+        "DOWN",
+        "UP",
+    ]
+    assert [
+        (transition["from_state"], transition["to_state"])
+        for transition in tunnel["transitions"]
+    ] == [("UP", "DOWN"), ("DOWN", "UP")]
+    assert tunnel["time_in_state"] == dict(UP=30.0, DOWN=30.0)
+    tunnel = tunnels[("ipsc-2", "129.213.7.1")]
+    assert tunnel["sample_count"] == 2
+    assert tunnel["time_in_state"] == dict(DOWN=60.0)
+    assert tunnel["lifecycle_state"] == "UP"
+    assert result["ip_sec_connection_monitoring_errors"] == {
+        "ipsc-2": ["Service unavailable"]
+    }
+    assert [
+        device_status["id"]
+        for device_status in result["ip_sec_connection_device_statuses"]
+    ] == ["ipsc-1", "ipsc-2"]
+
+
+def get_device_status(ipsc_id, tunnel_states):
+    return IPSecConnectionDeviceStatus(
+        id=ipsc_id,
+        compartment_id="ocid1.compartment.oc1..xxxxxEXAMPLExxxxx",
+        tunnels=[
+            TunnelStatus(
+                ip_address="129.213.7.{0}".format(index), lifecycle_state=state
+            )
+            for index, state in enumerate(tunnel_states)
+        ],
+    )
+
+
+def get_module(additional_properties):
+    params = dict(
+        ipsc_id=None,
+        ipsc_ids=None,
+        monitoring_duration=None,
+        monitoring_interval=30,
+        max_samples=20,
+        enable_parallel_requests=True,
+        max_thread_count=None,
+    )
+    params.update(additional_properties)
+    return FakeModule(**params)
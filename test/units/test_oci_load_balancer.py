@@ -13,7 +13,18 @@ from ansible.module_utils.oracle import oci_utils, oci_lb_utils
 try:
     import oci
     from oci.util import to_dict
-    from oci.load_balancer.models import LoadBalancer, WorkRequest
+    from oci.load_balancer.models import (
+        LoadBalancer,
+        WorkRequest,
+        CertificateDetails,
+        CreateLoadBalancerDetails,
+        Backend,
+        BackendSet,
+        Certificate,
+        HealthChecker,
+        Listener,
+        SessionPersistenceConfigurationDetails,
+    )
     from oci.exceptions import ServiceError
 except ImportError:
     raise SkipTest("test_oci_load_balancer.py requires `oci` module")
@@ -155,6 +166,265 @@ def test_delete_load_balancer(
     assert result["changed"] is True
 
 
+def test_create_or_update_lb_create_matches_normalized_certificates(
+    lb_client, check_and_create_resource_patch, mocker
+):
+    module = get_module(dict(certificates=dict(cert1=dict(certificate_name="cert1"))))
+    mocker.patch.object(
+        oci_lb_utils,
+        "create_certificates",
+        return_value=dict(
+            cert1=CertificateDetails(
+                certificate_name="cert1", public_certificate="public-certificate"
+            )
+        ),
+    )
+    check_and_create_resource_patch.return_value = {
+        "load_balancer": to_dict(get_load_balancer()),
+        "changed": False,
+    }
+    oci_load_balancer.create_or_update_lb(lb_client, module)
+    kwargs_check = check_and_create_resource_patch.call_args[1]
+    assert kwargs_check["module"] is not module
+    assert (
+        kwargs_check["module"].params["certificates"]["cert1"]["public_certificate"]
+        == "public-certificate"
+    )
+    assert kwargs_check["module"].params["display_name"] == "ansible_lb"
+    assert module.params["certificates"] == dict(cert1=dict(certificate_name="cert1"))
+    assert kwargs_check["kwargs_create"]["module"] is module
+
+
+def test_check_and_create_resource_deep_compares_candidates_only(lb_client, mocker):
+    module = get_module(dict(shape_name="100Mbps", certificates=None))
+    module.aliases = dict()
+    matching_load_balancer = get_load_balancer()
+    matching_load_balancer.compartment_id = "ocid1.compartment.oc1..aaaaaaaa"
+    matching_load_balancer.shape_name = "100Mbps"
+    other_load_balancer = get_load_balancer()
+    other_load_balancer.compartment_id = "ocid1.compartment.oc1..aaaaaaaa"
+    other_load_balancer.shape_name = "400Mbps"
+    lb_client.list_load_balancers.return_value = get_response(
+        200, None, [other_load_balancer, matching_load_balancer], None
+    )
+    does_existing_resource_match_user_inputs_patch = mocker.patch.object(
+        oci_utils, "does_existing_resource_match_user_inputs", return_value=True
+    )
+    result = oci_utils.check_and_create_resource(
+        resource_type="load_balancer",
+        create_fn=mocker.Mock(),
+        kwargs_create=dict(),
+        list_fn=lb_client.list_load_balancers,
+        kwargs_list={"compartment_id": "ocid1.compartment.oc1..aaaaaaaa"},
+        module=module,
+        model=CreateLoadBalancerDetails(),
+        exclude_attributes={"display_name": True},
+    )
+    assert result["changed"] is False
+    does_existing_resource_match_user_inputs_patch.assert_called_once()
+    assert (
+        does_existing_resource_match_user_inputs_patch.call_args[0][0]["shape_name"]
+        == "100Mbps"
+    )
+
+
+def test_create_or_update_lb_reconcile_sub_resources_no_changes(lb_client):
+    module = get_reconcile_module(dict())
+    lb_client.get_load_balancer.return_value = get_response(
+        200, None, get_reconciled_load_balancer(), None
+    )
+    result = oci_load_balancer.create_or_update_lb(lb_client, module)
+    assert result["changed"] is False
+    assert result["sub_resource_changes"] == []
+    assert [call[0] for call in lb_client.method_calls] == ["get_load_balancer"]
+
+
+def test_reconcile_lb_sub_resources_applies_changes_by_dependency_level(
+    lb_client, mocker
+):
+    module = get_reconcile_module(
+        dict(
+            purge_sub_resources=True,
+            hostnames=dict(app=dict(name="app", hostname="app.example.com")),
+        )
+    )
+    module.params["backend_sets"]["backend1"]["backends"].append(
+        dict(ip_address="10.0.0.3", port="8080")
+    )
+    module.params["listeners"]["listener1"]["hostname_names"] = ["app"]
+    load_balancer = get_reconciled_load_balancer()
+    load_balancer.listeners["listener2"] = Listener(
+        name="listener2", default_backend_set_name="backend1", port=81, protocol="HTTP"
+    )
+    for fn in [
+        "create_hostname",
+        "update_backend_set",
+        "update_listener",
+        "delete_listener",
+    ]:
+        getattr(lb_client, fn).return_value = get_response(
+            200, {"opc-work-request-id": fn}, None, None
+        )
+    wait_for_work_requests_patch = mocker.patch.object(
+        oci_lb_utils,
+        "wait_for_work_requests",
+        side_effect=lambda lb_client, module, load_balancer_id, work_request_ids: dict(
+            (work_request_id, dict(id=work_request_id, lifecycle_state="SUCCEEDED"))
+            for work_request_id in work_request_ids
+        ),
+    )
+    result = oci_load_balancer.reconcile_lb_sub_resources(
+        lb_client, module, load_balancer, dict(changed=False)
+    )
+    assert result["changed"] is True
+    assert [
+        (change["resource_type"], change["name"], change["action"])
+        for change in result["sub_resource_changes"]
+    ] == [
+        ("hostname", "app", "create"),
+        ("backend_set", "backend1", "update"),
+        ("listener", "listener1", "update"),
+        ("listener", "listener2", "delete"),
+    ]
+    assert [call[0][3] for call in wait_for_work_requests_patch.call_args_list] == [
+        ["create_hostname"],
+        ["update_backend_set"],
+        ["update_listener"],
+        ["delete_listener"],
+    ]
+    update_backend_set_details = lb_client.update_backend_set.call_args[1][
+        "update_backend_set_details"
+    ]
+    assert len(update_backend_set_details.backends) == 3
+    assert (
+        update_backend_set_details.session_persistence_configuration.cookie_name
+        == "session"
+    )
+    assert lb_client.delete_listener.call_args[1]["listener_name"] == "listener2"
+    lb_client.delete_backend_set.assert_not_called()
+
+
+def test_get_lb_sub_resource_changes_compares_certificates_by_fingerprint():
+    public_certificate = "-----BEGIN CERTIFICATE-----\nMIIBszCCAV2gAwIBAgIJAO\n-----END CERTIFICATE-----\n"
+    load_balancer = get_load_balancer()
+    # The service does not return the private key and the passphrase of a certificate bundle
+    load_balancer.certificates = dict(
+        cert1=Certificate(
+            certificate_name="cert1",
+            public_certificate=public_certificate,
+            ca_certificate=None,
+        ),
+        cert2=Certificate(
+            certificate_name="cert2",
+            public_certificate=public_certificate,
+            ca_certificate=None,
+        ),
+    )
+    desired_sub_resources = dict(
+        certificates=dict(
+            (
+                name,
+                CertificateDetails(
+                    certificate_name=name,
+                    public_certificate=certificate,
+                    private_key="private-key",
+                    passphrase="passphrase",
+                ),
+            )
+            for name, certificate in [
+                ("cert1", public_certificate.replace("\n", "\r\n")),
+                (
+                    "cert2",
+                    "-----BEGIN CERTIFICATE-----\nMIIBszCCAV2gAwIBAgIJAP\n-----END CERTIFICATE-----\n",
+                ),
+            ]
+        )
+    )
+    changes = oci_load_balancer.get_lb_sub_resource_changes(
+        load_balancer, desired_sub_resources, False
+    )
+    assert [(change["name"], change["action"]) for change in changes] == [
+        ("cert2", "update")
+    ]
+
+
+def get_reconciled_load_balancer():
+    load_balancer = get_load_balancer()
+    load_balancer.backend_sets = dict(
+        backend1=BackendSet(
+            name="backend1",
+            policy="ROUND_ROBIN",
+            backends=[
+                Backend(
+                    name="10.0.0.%d:8080" % index,
+                    ip_address="10.0.0.%d" % index,
+                    port=8080,
+                    weight=1,
+                    backup=False,
+                    drain=False,
+                    offline=False,
+                )
+                for index in [2, 1]
+            ],
+            health_checker=HealthChecker(
+                protocol="HTTP",
+                url_path="/healthcheck",
+                port=0,
+                return_code=200,
+                retries=3,
+                timeout_in_millis=3000,
+                interval_in_millis=10000,
+                response_body_regex=".*",
+            ),
+            session_persistence_configuration=SessionPersistenceConfigurationDetails(
+                cookie_name="session", disable_fallback=False
+            ),
+        )
+    )
+    load_balancer.listeners = dict(
+        listener1=Listener(
+            name="listener1",
+            default_backend_set_name="backend1",
+            port=80,
+            protocol="HTTP",
+            hostname_names=[],
+        )
+    )
+    load_balancer.hostnames = dict()
+    return load_balancer
+
+
+def get_reconcile_module(additional_properties):
+    params = dict(
+        load_balancer_id="ocid.loadbalancer.cvghs",
+        display_name="ansible_lb",
+        reconcile_sub_resources=True,
+        purge_sub_resources=False,
+        certificates=None,
+        hostnames=None,
+        path_route_sets=None,
+        backend_sets=dict(
+            backend1=dict(
+                policy="ROUND_ROBIN",
+                backends=[
+                    dict(ip_address="10.0.0.1", port="8080"),
+                    dict(ip_address="10.0.0.2", port="8080"),
+                ],
+                health_checker=dict(protocol="HTTP", url_path="/healthcheck"),
+            )
+        ),
+        listeners=dict(
+            listener1=dict(
+                default_backend_set_name="backend1", port="80", protocol="HTTP"
+            )
+        ),
+        wait=True,
+        wait_timeout=1200,
+    )
+    params.update(additional_properties)
+    return FakeModule(**params)
+
+
 def get_load_balancer():
     load_balancer = LoadBalancer()
     load_balancer.id = "ocid.loadbalancer.cvghs"
@@ -13,7 +13,13 @@ from ansible.module_utils.oracle import oci_utils, oci_lb_utils
 try:
     import oci
     from oci.util import to_dict
-    from oci.load_balancer.models import Backend, WorkRequest
+    from oci.load_balancer.models import (
+        Backend,
+        BackendSet,
+        BackendSetHealth,
+        HealthChecker,
+        WorkRequest,
+    )
     from oci.exceptions import ServiceError, ClientError
 except ImportError:
     raise SkipTest("test_oci_load_balancer_backend.py requires `oci` module")
@@ -191,6 +197,102 @@ def test_delete_backend(lb_client, delete_lb_resources_and_wait_patch):
     assert result["changed"] is True
 
 
+def test_roll_backends_drains_backends_in_batches(lb_client, mocker):
+    module = get_rolling_module()
+    backend_set = BackendSet(
+        name="backend1",
+        policy="ROUND_ROBIN",
+        health_checker=HealthChecker(protocol="HTTP", port=8181),
+        backends=[
+            get_rolling_backend("10.159.34.21", drain=False),
+            get_rolling_backend("10.159.34.22", drain=True),
+            get_rolling_backend("10.159.34.23", drain=False),
+            get_rolling_backend("10.159.34.24", drain=False),
+            get_rolling_backend("10.159.34.25", drain=False),
+        ],
+    )
+    lb_client.get_backend_set.return_value = get_response(200, None, backend_set, None)
+    lb_client.update_backend_set.return_value = get_response(
+        204,
+        {"opc-work-request-id": "ocid1.loadbalancerworkrequest.oc1..aaaa"},
+        None,
+        None,
+    )
+    lb_client.get_backend_set_health.side_effect = [
+        get_response(
+            200,
+            None,
+            BackendSetHealth(
+                status="WARNING", warning_state_backend_names=["10.159.34.25:8181"]
+            ),
+            None,
+        ),
+        get_response(200, None, BackendSetHealth(status="OK"), None),
+        get_response(200, None, BackendSetHealth(status="OK"), None),
+    ]
+    mocker.patch.object(
+        oci_lb_utils,
+        "wait_for_work_requests",
+        return_value={
+            "ocid1.loadbalancerworkrequest.oc1..aaaa": dict(lifecycle_state="SUCCEEDED")
+        },
+    )
+    sleep_patch = mocker.patch.object(oci_load_balancer_backend.time, "sleep")
+
+    result = oci_load_balancer_backend.roll_backends(lb_client, module)
+
+    assert result["changed"] is True
+    assert [batch["backends"] for batch in result["rolling_batches"]] == [
+        ["10.159.34.21:8181", "10.159.34.23:8181"],
+        ["10.159.34.24:8181"],
+    ]
+    assert lb_client.update_backend_set.call_count == 2
+    update_backend_set_details = lb_client.update_backend_set.call_args[1][
+        "update_backend_set_details"
+    ]
+    assert update_backend_set_details.policy == "ROUND_ROBIN"
+    assert update_backend_set_details.health_checker.port == 8181
+    assert [backend.drain for backend in update_backend_set_details.backends] == [
+        True,
+        True,
+        True,
+        True,
+        False,
+    ]
+    assert lb_client.get_backend_set_health.call_count == 3
+    sleep_patch.assert_any_call(60)
+
+
+def get_rolling_backend(ip_address, drain):
+    return Backend(
+        name="{0}:8181".format(ip_address),
+        ip_address=ip_address,
+        port=8181,
+        weight=1,
+        backup=False,
+        drain=drain,
+        offline=False,
+    )
+
+
+def get_rolling_module():
+    return FakeModule(
+        load_balancer_id="ocid1.loadbalancer.oc1.iad.aaaaa",
+        backend_set_name="backend1",
+        backends=[
+            dict(ip_address="10.159.34.21", port=8181),
+            dict(ip_address="10.159.34.22", port=8181),
+            dict(ip_address="10.159.34.23", port=8181),
+            dict(ip_address="10.159.34.24", port=8181),
+        ],
+        batch_size=2,
+        drain=True,
+        offline=None,
+        drain_wait_seconds=60,
+        wait_timeout=1200,
+    )
+
+
 def get_backend():
     backend = Backend()
     backend.name = "10.159.34.21:8181"
@@ -12,6 +12,7 @@ from ansible.module_utils.oracle import oci_lb_utils
 import tempfile
 import os
 import six
+import base64
 
 try:
     import oci
@@ -220,6 +221,85 @@ def test_delete_certificate(lb_client, delete_lb_resources_and_wait_patch):
     assert result["changed"] is True
 
 
+def test_get_pem_fingerprint_ignores_line_breaks(mocker):
+    pem = get_pem(b"certificate body of some length")
+    rewrapped_pem = pem.replace("\n", "\r\n").replace("Ym9keS", "Ym9k\neS")
+    assert oci_lb_utils.get_pem_fingerprint(pem) == oci_lb_utils.get_pem_fingerprint(
+        rewrapped_pem
+    )
+    assert oci_lb_utils.get_pem_fingerprint(pem) != oci_lb_utils.get_pem_fingerprint(
+        get_pem(b"another certificate body")
+    )
+    get_file_content_spy = mocker.spy(oci_lb_utils, "get_file_content")
+    certificate_bundle = get_certificate_bundle()
+    for _ in range(3):
+        oci_lb_utils.get_certificate_file_content(
+            certificate_bundle["public_certificate"]
+        )
+    delete_cert_bundle(certificate_bundle)
+    assert get_file_content_spy.call_count == 1
+
+
+def test_create_certificates_creates_missing_certificates_only(lb_client, mocker):
+    certificate_bundle = get_certificate_bundle()
+    module = get_module(
+        dict(
+            name=None,
+            certificates=[
+                dict(name="test_certificate", **certificate_bundle),
+                dict(name="new_certificate", **certificate_bundle),
+            ],
+        )
+    )
+    certificate = get_certificate(
+        dict(
+            (attribute, oci_lb_utils.get_certificate_file_content(path) + "\n")
+            for attribute, path in six.iteritems(certificate_bundle)
+        )
+    )
+    new_certificate = get_certificate(certificate_bundle)
+    new_certificate.certificate_name = "new_certificate"
+    lb_client.list_certificates.side_effect = [
+        get_response(200, None, [certificate], None),
+        get_response(200, None, [certificate, new_certificate], None),
+    ]
+    lb_client.create_certificate.return_value = get_response(
+        204,
+        {"opc-work-request-id": "ocid1.loadbalancerworkrequest.oc1..aaaa"},
+        None,
+        None,
+    )
+    mocker.patch.object(
+        oci_lb_utils,
+        "wait_for_work_requests",
+        return_value={
+            "ocid1.loadbalancerworkrequest.oc1..aaaa": dict(lifecycle_state="SUCCEEDED")
+        },
+    )
+    result = oci_load_balancer_certificate.create_certificates(lb_client, module)
+    delete_cert_bundle(certificate_bundle)
+    assert result["changed"] is True
+    assert [
+        (certificate["certificate_name"], certificate["changed"])
+        for certificate in result["certificates"]
+    ] == [("test_certificate", False), ("new_certificate", True)]
+    lb_client.create_certificate.assert_called_once()
+    assert (
+        lb_client.create_certificate.call_args[1][
+            "create_certificate_details"
+        ].certificate_name
+        == "new_certificate"
+    )
+
+
+def get_pem(body):
+    return (
+        "-----BEGIN CERTIFICATE-----\n"
+        + base64.b64encode(body).decode()
+        + "\n-----END CERTIFICATE-----"
+    )
+
+
 def get_certificate(cert_bundle):
     certificate = Certificate()
     certificate.ca_certificate = cert_bundle.get("ca_certificate")
@@ -12,7 +12,14 @@ from ansible.module_utils.oracle import oci_utils
 
 try:
     import oci
-    from oci.load_balancer.models import LoadBalancerHealthSummary
+    from oci.load_balancer.models import (
+        LoadBalancerHealthSummary,
+        LoadBalancer,
+        LoadBalancerHealth,
+        BackendSet,
+        BackendSetHealth,
+        Backend,
+    )
     from oci.exceptions import ServiceError
 except ImportError:
     raise SkipTest(
@@ -78,6 +85,95 @@ def test_list_load_balancer_healths_service_error(lb_client, list_all_resources_
         assert error_message in ex.args[0]
 
 
+def test_get_load_balancer_health_matrix_fetches_unhealthy_load_balancers_only(
+    lb_client,
+):
+    module = get_module()
+    module.params.update(enable_parallel_requests=True, max_thread_count=None)
+    lb_client.list_load_balancer_healths.return_value = get_response(
+        200,
+        None,
+        [
+            LoadBalancerHealthSummary(load_balancer_id="lb-ok", status="OK"),
+            LoadBalancerHealthSummary(load_balancer_id="lb-warning", status="WARNING"),
+        ],
+        None,
+    )
+    lb_client.list_load_balancers.return_value = get_response(
+        200,
+        None,
+        [
+            get_load_balancer("lb-ok", ["bs1"]),
+            get_load_balancer("lb-warning", ["bs1", "bs2"]),
+            get_load_balancer("lb-new", []),
+        ],
+        None,
+    )
+    lb_client.get_load_balancer_health.side_effect = (
+        lambda load_balancer_id, **kwargs: get_response(
+            200,
+            None,
+            LoadBalancerHealth(
+                status="WARNING" if load_balancer_id == "lb-warning" else "OK",
+                warning_state_backend_set_names=(
+                    ["bs2"] if load_balancer_id == "lb-warning" else []
+                ),
+            ),
+            None,
+        )
+    )
+    lb_client.get_backend_set_health.return_value = get_response(
+        200,
+        None,
+        BackendSetHealth(
+            status="WARNING", critical_state_backend_names=["10.0.0.3:80"]
+        ),
+        None,
+    )
+
+    result = oci_load_balancer_health_summary_facts.get_load_balancer_health_matrix(
+        lb_client, module
+    )
+
+    assert sorted(
+        call[1]["load_balancer_id"]
+        for call in lb_client.get_load_balancer_health.call_args_list
+    ) == ["lb-new", "lb-warning"]
+    lb_client.get_backend_set_health.assert_called_once()
+    health_matrix = result["load_balancer_health_matrix"]
+    assert health_matrix["lb-ok"]["backend_sets"]["bs1"]["backends"] == {
+        "10.0.0.2:80": "OK",
+        "10.0.0.3:80": "OK",
+    }
+    assert health_matrix["lb-warning"]["backend_sets"]["bs2"] == dict(
+        status="WARNING", backends={"10.0.0.2:80": "OK", "10.0.0.3:80": "CRITICAL"}
+    )
+    assert health_matrix["lb-new"]["status"] == "OK"
+    assert result["load_balancer_health_rollup"] == dict(
+        load_balancers=dict(OK=2, WARNING=1),
+        backend_sets=dict(OK=2, WARNING=1),
+        backends=dict(OK=5, CRITICAL=1),
+    )
+
+
+def get_load_balancer(load_balancer_id, backend_set_names):
+    return LoadBalancer(
+        id=load_balancer_id,
+        display_name=load_balancer_id,
+        lifecycle_state="ACTIVE",
+        backend_sets=dict(
+            (
+                backend_set_name,
+                BackendSet(
+                    name=backend_set_name,
+                    backends=[Backend(name="10.0.0.%d:80" % index) for index in [2, 3]],
+                ),
+            )
+            for backend_set_name in backend_set_names
+        ),
+    )
+
+
 def get_load_balancer_health_summary():
     load_balancer_health_summary = LoadBalancerHealthSummary()
     load_balancer_health_summary.load_balancer_id = "ocid1.loadbalancer.aaaa"
@@ -37,6 +37,9 @@ class FakeModule(object):
         self.exit_args = args
         self.exit_kwargs = kwargs
 
+    def warn(self, warning):
+        self.warnings = getattr(self, "warnings", []) + [warning]
+
 
 @pytest.fixture()
 def lb_client(mocker):
@@ -262,6 +265,173 @@ def test_delete_path_route_set(lb_client, delete_lb_resources_and_wait_patch):
     assert result["changed"] is True
 
 
+def test_compile_path_routes_detects_conflicts_and_unreachable_path_routes():
+    path_routes = oci_lb_utils.create_path_routes(
+        [
+            get_path_route_dict("/admin", "PREFIX_MATCH", "admin"),
+            get_path_route_dict("/Admin/users", "EXACT_MATCH", "users"),
+            get_path_route_dict(".jpg", "SUFFIX_MATCH", "images"),
+            get_path_route_dict("/thumbs/small.JPG", "SUFFIX_MATCH", "thumbs"),
+            get_path_route_dict("/ADMIN", "EXACT_MATCH", "admin"),
+            get_path_route_dict(".JPG", "SUFFIX_MATCH", "images"),
+            get_path_route_dict("/api", "PREFIX_MATCH", "api"),
+        ]
+    )
+    compiled_path_routes = oci_lb_utils.compile_path_routes(path_routes)
+    assert compiled_path_routes["conflicts"] == []
+    assert compiled_path_routes["duplicates"] == [("SUFFIX_MATCH", ".jpg", "images")]
+    # EXACT_MATCH routes are applied before the PREFIX_MATCH and SUFFIX_MATCH routes, so they are never shadowed
+    assert compiled_path_routes["unreachable"] == [
+        dict(
+            path_route=("SUFFIX_MATCH", "/thumbs/small.jpg", "thumbs"),
+            shadowed_by=("SUFFIX_MATCH", ".jpg", "images"),
+        )
+    ]
+    path_routes = oci_lb_utils.create_path_routes(
+        [
+            get_path_route_dict("/", "PREFIX_MATCH", "default"),
+            get_path_route_dict("/api/v1", "FORCE_LONGEST_PREFIX_MATCH", "api_v1"),
+            get_path_route_dict("/api", "PREFIX_MATCH", "api"),
+            get_path_route_dict(".jpg", "SUFFIX_MATCH", "images"),
+            get_path_route_dict("/api/users", "EXACT_MATCH", "users"),
+        ]
+    )
+    compiled_path_routes = oci_lb_utils.compile_path_routes(path_routes)
+    assert compiled_path_routes["unreachable"] == [
+        dict(
+            path_route=("PREFIX_MATCH", "/api", "api"),
+            shadowed_by=("PREFIX_MATCH", "/", "default"),
+        ),
+        dict(
+            path_route=("SUFFIX_MATCH", ".jpg", "images"),
+            shadowed_by=("PREFIX_MATCH", "/", "default"),
+        ),
+    ]
+    with pytest.raises(ClientError) as exc_info:
+        oci_lb_utils.create_path_routes(
+            [
+                get_path_route_dict("/api", "PREFIX_MATCH", "api"),
+                get_path_route_dict("/API", "PREFIX_MATCH", "api_v2"),
+            ]
+        )
+    assert "PREFIX_MATCH /API routes to both api and api_v2" in str(exc_info.value)
+
+
+def test_update_path_route_set_compares_path_routes_by_canonical_tuple(
+    lb_client, create_or_update_lb_resources_and_wait_patch
+):
+    path_route_dicts = [
+        get_path_route_dict("/app{0}".format(i), "EXACT_MATCH", "backend_set1")
+        for i in range(2000)
+    ]
+    module = get_module(
+        dict(
+            path_routes=[
+                get_path_route_dict("/APP{0}".format(i), "EXACT_MATCH", "backend_set1")
+                for i in range(2000)
+            ],
+            name="path_route_set1",
+            purge_path_routes=True,
+            delete_path_routes=False,
+        )
+    )
+    path_route_set = get_path_route_set("path_route_set1", path_route_dicts)
+    result = oci_load_balancer_path_route_set.update_path_route_set(
+        lb_client, module, "ocid1.loadbalancer.aaa", path_route_set, "path_route_set1"
+    )
+    assert result["changed"] is False
+    assert result["unreachable_path_routes"] == []
+    create_or_update_lb_resources_and_wait_patch.assert_not_called()
+
+    module.params["path_routes"] = [
+        get_path_route_dict("/App0", "EXACT_MATCH", "backend_set1"),
+        get_path_route_dict("/", "PREFIX_MATCH", "backend_set2"),
+    ]
+    module.params["purge_path_routes"] = False
+    create_or_update_lb_resources_and_wait_patch.return_value = dict(
+        path_route_set=to_dict(path_route_set), changed=True
+    )
+    result = oci_load_balancer_path_route_set.update_path_route_set(
+        lb_client, module, "ocid1.loadbalancer.aaa", path_route_set, "path_route_set1"
+    )
+    assert result["changed"] is True
+    update_path_route_set_details = (
+        create_or_update_lb_resources_and_wait_patch.call_args[1]["kwargs_function"][
+            "update_path_route_set_details"
+        ]
+    )
+    assert len(update_path_route_set_details.path_routes) == 2001
+    assert update_path_route_set_details.path_routes[-1].path == "/"
+    assert result["unreachable_path_routes"] == []
+
+
+def test_update_path_route_set_purge_keeps_path_routes_in_input_order(
+    lb_client, create_or_update_lb_resources_and_wait_patch
+):
+    path_route_set = get_path_route_set(
+        "path_route_set1",
+        [
+            get_path_route_dict("/api/admin", "PREFIX_MATCH", "admin"),
+            get_path_route_dict("/", "PREFIX_MATCH", "web"),
+        ],
+    )
+    module = get_module(
+        dict(
+            path_routes=[
+                get_path_route_dict("/api/admin", "PREFIX_MATCH", "admin"),
+                get_path_route_dict("/api", "PREFIX_MATCH", "api"),
+                get_path_route_dict("/", "PREFIX_MATCH", "web"),
+            ],
+            name="path_route_set1",
+            purge_path_routes=True,
+            delete_path_routes=False,
+        )
+    )
+    create_or_update_lb_resources_and_wait_patch.return_value = dict(
+        path_route_set=to_dict(path_route_set), changed=True
+    )
+    result = oci_load_balancer_path_route_set.update_path_route_set(
+        lb_client, module, "ocid1.loadbalancer.aaa", path_route_set, "path_route_set1"
+    )
+    assert result["changed"] is True
+    update_path_route_set_details = (
+        create_or_update_lb_resources_and_wait_patch.call_args[1]["kwargs_function"][
+            "update_path_route_set_details"
+        ]
+    )
+    # The new path route is inserted before the catch-all path route, not appended after it
+    assert [
+        path_route.path for path_route in update_path_route_set_details.path_routes
+    ] == ["/api/admin", "/api", "/"]
+    assert result["unreachable_path_routes"] == []
+
+    # Changing the order of the path routes changes which path route matches first
+    module.params["path_routes"] = list(reversed(module.params["path_routes"]))
+    path_route_set = get_path_route_set(
+        "path_route_set1", list(reversed(module.params["path_routes"]))
+    )
+    oci_load_balancer_path_route_set.update_path_route_set(
+        lb_client, module, "ocid1.loadbalancer.aaa", path_route_set, "path_route_set1"
+    )
+    assert create_or_update_lb_resources_and_wait_patch.call_count == 2
+    update_path_route_set_details = (
+        create_or_update_lb_resources_and_wait_patch.call_args[1]["kwargs_function"][
+            "update_path_route_set_details"
+        ]
+    )
+    assert [
+        path_route.path for path_route in update_path_route_set_details.path_routes
+    ] == ["/", "/api", "/api/admin"]
+
+
+def get_path_route_dict(path, match_type, backend_set_name):
+    return dict(
+        backend_set_name=backend_set_name,
+        path=path,
+        path_match_type=dict(match_type=match_type),
+    )
+
+
 def create_default_path_route_set():
     path_routes = [
         {
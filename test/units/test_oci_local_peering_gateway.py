@@ -0,0 +1,150 @@
+# Copyright (c) 2019 Oracle and/or its affiliates.
+# This software is made available to you under the terms of the GPL 3.0 license or the Apache 2.0 license.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0
+# See LICENSE.TXT for details.
+
+import pytest
+from nose.plugins.skip import SkipTest
+from ansible.modules.cloud.oracle import oci_local_peering_gateway
+from ansible.module_utils.oracle import oci_utils
+
+try:
+    import oci
+    from oci.core.models import LocalPeeringGateway, Vcn
+except ImportError:
+    raise SkipTest("test_oci_local_peering_gateway.py requires `oci` module")
+
+
+class FakeModule(object):
+    def __init__(self, **kwargs):
+        self.params = kwargs
+
+    def fail_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+        raise Exception(kwargs["msg"])
+
+    def exit_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+
+
+@pytest.fixture()
+def virtual_network_client(mocker):
+    mock_virtual_network_client = mocker.patch(
+        "oci.core.virtual_network_client.VirtualNetworkClient"
+    )
+    return mock_virtual_network_client.return_value
+
+
+@pytest.fixture()
+def wait_for_resources_lifecycle_state_patch(mocker):
+    return mocker.patch.object(oci_utils, "wait_for_resources_lifecycle_state")
+
+
+def test_connect_lpg_peerings_connects_unpeered_pairs_only(
+    virtual_network_client, wait_for_resources_lifecycle_state_patch
+):
+    module = get_module(
+        [
+            dict(local_peering_gateway_id="hub-lpg-1", peer_id="spoke-lpg-1"),
+            dict(local_peering_gateway_id="hub-lpg-2", peer_id="spoke-lpg-2"),
+        ]
+    )
+    lpgs = dict(
+        (lpg.id, lpg)
+        for lpg in [
+            get_lpg("hub-lpg-1", "hub-vcn", "PEERED", "10.1.0.0/16"),
+            get_lpg("spoke-lpg-1", "spoke-vcn-1", "PEERED", "10.0.0.0/16"),
+            get_lpg("hub-lpg-2", "hub-vcn", "NEW"),
+            get_lpg("spoke-lpg-2", "spoke-vcn-2", "NEW"),
+        ]
+    )
+    vcns = dict(
+        [
+            ("hub-vcn", "10.0.0.0/16"),
+            ("spoke-vcn-1", "10.1.0.0/16"),
+            ("spoke-vcn-2", "10.2.0.0/16"),
+        ]
+    )
+    virtual_network_client.get_local_peering_gateway.side_effect = (
+        lambda local_peering_gateway_id, **kwargs: get_response(
+            lpgs[local_peering_gateway_id]
+        )
+    )
+    virtual_network_client.get_vcn.side_effect = lambda vcn_id, **kwargs: get_response(
+        Vcn(id=vcn_id, cidr_block=vcns[vcn_id])
+    )
+    wait_for_resources_lifecycle_state_patch.return_value = (
+        dict(
+            (lpg_id, dict(id=lpg_id, peering_status="PEERED"))
+            for lpg_id in ["hub-lpg-2", "spoke-lpg-2"]
+        ),
+        [],
+    )
+
+    result = oci_local_peering_gateway.connect_lpg_peerings(
+        virtual_network_client, module
+    )
+
+    assert result["changed"] is True
+    assert [peering["changed"] for peering in result["peerings"]] == [False, True]
+    virtual_network_client.connect_local_peering_gateways.assert_called_once()
+    kwargs_connect = virtual_network_client.connect_local_peering_gateways.call_args[1]
+    assert kwargs_connect["local_peering_gateway_id"] == "hub-lpg-2"
+    assert (
+        kwargs_connect["connect_local_peering_gateways_details"].peer_id
+        == "spoke-lpg-2"
+    )
+    wait_args = wait_for_resources_lifecycle_state_patch.call_args
+    assert wait_args[0][2] == [
+        dict(compartment_id="ocid1.compartment.oc1..xxxxxEXAMPLExxxxx", vcn_id=vcn_id)
+        for vcn_id in ["hub-vcn", "spoke-vcn-2"]
+    ]
+    assert wait_args[0][3] == ["hub-lpg-2", "spoke-lpg-2"]
+    assert wait_args[1]["state_attribute"] == "peering_status"
+    assert (
+        result["peerings"][1]["peer_local_peering_gateway"]["peering_status"]
+        == "PEERED"
+    )
+
+
+def test_connect_lpg_peerings_lpg_in_more_than_one_peering(virtual_network_client):
+    module = get_module(
+        [
+            dict(local_peering_gateway_id="hub-lpg", peer_id="spoke-lpg-1"),
+            dict(local_peering_gateway_id="hub-lpg", peer_id="spoke-lpg-2"),
+        ]
+    )
+    with pytest.raises(Exception) as exc_info:
+        oci_local_peering_gateway.connect_lpg_peerings(virtual_network_client, module)
+    assert "hub-lpg is part of more than one peering" in str(exc_info.value)
+    virtual_network_client.connect_local_peering_gateways.assert_not_called()
+
+
+def get_lpg(lpg_id, vcn_id, peering_status, peer_advertised_cidr=None):
+    return LocalPeeringGateway(
+        id=lpg_id,
+        compartment_id="ocid1.compartment.oc1..xxxxxEXAMPLExxxxx",
+        vcn_id=vcn_id,
+        peering_status=peering_status,
+        peer_advertised_cidr=peer_advertised_cidr,
+        lifecycle_state="AVAILABLE",
+    )
+
+
+def get_response(data):
+    return oci.Response(200, dict(), data, None)
+
+
+def get_module(peerings):
+    return FakeModule(
+        peerings=peerings,
+        skip_exhaustive_search_for_lpg_peerings=True,
+        wait=True,
+        wait_until=None,
+        wait_timeout=1200,
+        enable_parallel_requests=True,
+        max_thread_count=None,
+    )
@@ -0,0 +1,167 @@
+# Copyright (c) 2019 Oracle and/or its affiliates.
+# This software is made available to you under the terms of the GPL 3.0 license or the Apache 2.0 license.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0
+# See LICENSE.TXT for details.
+
+import pytest
+from nose.plugins.skip import SkipTest
+from ansible.modules.cloud.oracle import oci_private_ip
+from ansible.module_utils.oracle import oci_network_utils
+
+try:
+    import oci
+    from oci.core.models import PrivateIp, Subnet, Vnic
+    from oci.exceptions import ServiceError
+except ImportError:
+    raise SkipTest("test_oci_private_ip.py requires `oci` module")
+
+
+class FakeModule(object):
+    def __init__(self, **kwargs):
+        self.params = kwargs
+
+    def fail_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+        raise Exception(kwargs["msg"])
+
+    def exit_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+
+
+@pytest.fixture()
+def virtual_network_client(mocker):
+    mock_virtual_network_client = mocker.patch(
+        "oci.core.virtual_network_client.VirtualNetworkClient"
+    )
+    return mock_virtual_network_client.return_value
+
+
+def test_get_free_ip_addresses_skips_reserved_and_used_addresses():
+    assert oci_network_utils.get_free_ip_addresses(
+        "10.0.0.0/29", ["10.0.0.3", "10.0.1.3"], 10
+    ) == ["10.0.0.2", "10.0.0.4", "10.0.0.5", "10.0.0.6"]
+    assert oci_network_utils.get_free_ip_addresses("10.0.0.0/16", [], 2) == [
+        "10.0.0.2",
+        "10.0.0.3",
+    ]
+    assert not oci_network_utils.is_assignable_ip_address("10.0.0.0/24", "10.0.0.1")
+    assert not oci_network_utils.is_assignable_ip_address("10.0.0.0/24", "10.0.0.255")
+    assert oci_network_utils.is_assignable_ip_address("10.0.0.0/24", "10.0.0.254")
+
+
+def test_create_private_ips_count_creates_missing_private_ips(virtual_network_client):
+    module = get_module(dict(count=3))
+    set_subnet_private_ips(
+        virtual_network_client,
+        [
+            get_private_ip("ocid1.privateip.oc1..primary", "10.0.0.2", is_primary=True),
+            get_private_ip("ocid1.privateip.oc1..existing", "10.0.0.4"),
+            get_private_ip(
+                "ocid1.privateip.oc1..other",
+                "10.0.0.3",
+                vnic_id="ocid1.vnic.oc1..other",
+            ),
+        ],
+    )
+    virtual_network_client.create_private_ip.side_effect = (
+        lambda create_private_ip_details: get_response(
+            get_private_ip(
+                "ocid1.privateip.oc1.." + create_private_ip_details.ip_address,
+                create_private_ip_details.ip_address,
+            )
+        )
+    )
+
+    result = oci_private_ip.create_private_ips(virtual_network_client, module)
+
+    assert result["changed"] is True
+    assert [private_ip["ip_address"] for private_ip in result["private_ips"]] == [
+        "10.0.0.4",
+        "10.0.0.5",
+        "10.0.0.6",
+    ]
+    virtual_network_client.list_private_ips.assert_called_once()
+
+
+def test_create_private_ips_ip_addresses_assigned_to_another_vnic(
+    virtual_network_client
+):
+    module = get_module(dict(ip_addresses=["10.0.0.4", "10.0.0.3"]))
+    set_subnet_private_ips(
+        virtual_network_client,
+        [
+            get_private_ip("ocid1.privateip.oc1..existing", "10.0.0.4"),
+            get_private_ip(
+                "ocid1.privateip.oc1..other",
+                "10.0.0.3",
+                vnic_id="ocid1.vnic.oc1..other",
+            ),
+        ],
+    )
+    with pytest.raises(Exception) as exc_info:
+        oci_private_ip.create_private_ips(virtual_network_client, module)
+    assert "10.0.0.3 is already assigned to another VNIC" in str(exc_info.value)
+    virtual_network_client.create_private_ip.assert_not_called()
+
+
+def test_create_private_ips_reports_failed_creations(virtual_network_client):
+    module = get_module(dict(ip_addresses=["10.0.0.5", "10.0.0.6"]))
+    set_subnet_private_ips(virtual_network_client, [])
+
+    def create_private_ip(create_private_ip_details):
+        if create_private_ip_details.ip_address == "10.0.0.6":
+            raise ServiceError(409, "Conflict", dict(), "IP address already in use")
+        return get_response(get_private_ip("ocid1.privateip.oc1..created", "10.0.0.5"))
+
+    virtual_network_client.create_private_ip.side_effect = create_private_ip
+    with pytest.raises(Exception) as exc_info:
+        oci_private_ip.create_private_ips(virtual_network_client, module)
+    assert "Failed to create 1 private IPs: 10.0.0.6" in str(exc_info.value)
+    assert module.exit_kwargs["changed"] is True
+    assert [
+        private_ip["ip_address"] for private_ip in module.exit_kwargs["private_ips"]
+    ] == ["10.0.0.5"]
+
+
+def get_private_ip(
+    private_ip_id, ip_address, is_primary=False, vnic_id="ocid1.vnic.oc1..vnic"
+):
+    return PrivateIp(
+        id=private_ip_id,
+        ip_address=ip_address,
+        is_primary=is_primary,
+        vnic_id=vnic_id,
+        subnet_id="ocid1.subnet.oc1..subnet",
+    )
+
+
+def set_subnet_private_ips(virtual_network_client, private_ips):
+    virtual_network_client.get_vnic.return_value = get_response(
+        Vnic(id="ocid1.vnic.oc1..vnic", subnet_id="ocid1.subnet.oc1..subnet")
+    )
+    virtual_network_client.get_subnet.return_value = get_response(
+        Subnet(id="ocid1.subnet.oc1..subnet", cidr_block="10.0.0.0/24")
+    )
+    virtual_network_client.list_private_ips.return_value = get_response(private_ips)
+
+
+def get_response(data):
+    return oci.Response(200, dict(), data, None)
+
+
+def get_module(additional_properties):
+    params = dict(
+        vnic_id="ocid1.vnic.oc1..vnic",
+        count=None,
+        ip_addresses=None,
+        display_name=None,
+        freeform_tags=None,
+        defined_tags=None,
+        enable_parallel_requests=True,
+        max_thread_count=None,
+    )
+    params.update(additional_properties)
+    return FakeModule(**params)
@@ -0,0 +1,310 @@
+# Copyright (c) 2019 Oracle and/or its affiliates.
+# This software is made available to you under the terms of the GPL 3.0 license or the Apache 2.0 license.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0
+# See LICENSE.TXT for details.
+
+import pytest
+from nose.plugins.skip import SkipTest
+from ansible.modules.cloud.oracle import oci_public_ip
+from ansible.module_utils.oracle import oci_utils
+
+try:
+    import oci
+    from oci.core.models import PublicIp
+    from oci.exceptions import ServiceError
+    from oci.util import to_dict
+except ImportError:
+    raise SkipTest("test_oci_public_ip.py requires `oci` module")
+
+
+class FakeModule(object):
+    def __init__(self, **kwargs):
+        self.params = kwargs
+
+    def fail_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+        raise Exception(kwargs["msg"])
+
+    def exit_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+
+
+@pytest.fixture()
+def virtual_network_client(mocker):
+    mock_virtual_network_client = mocker.patch(
+        "oci.core.virtual_network_client.VirtualNetworkClient"
+    )
+    return mock_virtual_network_client.return_value
+
+
+@pytest.fixture()
+def wait_for_resources_lifecycle_state_patch(mocker):
+    return mocker.patch.object(oci_utils, "wait_for_resources_lifecycle_state")
+
+
+def test_create_public_ips_creates_missing_public_ips(
+    virtual_network_client, wait_for_resources_lifecycle_state_patch
+):
+    module = get_module(
+        dict(
+            private_ip_ids=["ocid1.privateip.oc1..first", "ocid1.privateip.oc1..second"]
+        )
+    )
+    set_existing_public_ips(virtual_network_client, [])
+    virtual_network_client.create_public_ip.side_effect = create_public_ip
+    wait_for_resources_lifecycle_state_patch.return_value = (dict(), [])
+
+    result = oci_public_ip.create_public_ips(virtual_network_client, module)
+
+    assert result["changed"] is True
+    assert [public_ip["private_ip_id"] for public_ip in result["public_ips"]] == [
+        "ocid1.privateip.oc1..first",
+        "ocid1.privateip.oc1..second",
+    ]
+    create_public_ip_details = [
+        call_args[1]["create_public_ip_details"]
+        for call_args in virtual_network_client.create_public_ip.call_args_list
+    ]
+    assert sorted(details.private_ip_id for details in create_public_ip_details) == [
+        "ocid1.privateip.oc1..first",
+        "ocid1.privateip.oc1..second",
+    ]
+    assert all(
+        details.compartment_id == "ocid1.compartment.oc1..compartment"
+        and details.lifetime == "EPHEMERAL"
+        for details in create_public_ip_details
+    )
+
+
+def test_create_public_ips_skips_private_ips_with_a_public_ip(
+    virtual_network_client, wait_for_resources_lifecycle_state_patch
+):
+    module = get_module(
+        dict(
+            private_ip_ids=[
+                "ocid1.privateip.oc1..assigned",
+                "ocid1.privateip.oc1..new",
+            ],
+            wait=True,
+        )
+    )
+    set_existing_public_ips(
+        virtual_network_client, [get_public_ip("ocid1.privateip.oc1..assigned")]
+    )
+    virtual_network_client.create_public_ip.side_effect = create_public_ip
+    wait_for_resources_lifecycle_state_patch.return_value = (dict(), [])
+
+    result = oci_public_ip.create_public_ips(virtual_network_client, module)
+
+    assert result["changed"] is True
+    assert [public_ip["id"] for public_ip in result["public_ips"]] == [
+        "ocid1.publicip.oc1..assigned",
+        "ocid1.publicip.oc1..new",
+    ]
+    virtual_network_client.create_public_ip.assert_called_once()
+    assert (
+        virtual_network_client.create_public_ip.call_args[1][
+            "create_public_ip_details"
+        ].private_ip_id
+        == "ocid1.privateip.oc1..new"
+    )
+    assert wait_for_resources_lifecycle_state_patch.call_args[0][3] == [
+        "ocid1.publicip.oc1..new"
+    ]
+
+
+def test_create_public_ips_all_private_ips_with_a_public_ip(
+    virtual_network_client, wait_for_resources_lifecycle_state_patch
+):
+    module = get_module(dict(private_ip_ids=["ocid1.privateip.oc1..assigned"]))
+    set_existing_public_ips(
+        virtual_network_client, [get_public_ip("ocid1.privateip.oc1..assigned")]
+    )
+
+    result = oci_public_ip.create_public_ips(virtual_network_client, module)
+
+    assert result["changed"] is False
+    virtual_network_client.create_public_ip.assert_not_called()
+    wait_for_resources_lifecycle_state_patch.assert_not_called()
+
+
+def test_create_public_ips_reports_failed_creations(
+    virtual_network_client, wait_for_resources_lifecycle_state_patch
+):
+    module = get_module(
+        dict(
+            private_ip_ids=[
+                "ocid1.privateip.oc1..created",
+                "ocid1.privateip.oc1..failed",
+            ]
+        )
+    )
+    set_existing_public_ips(virtual_network_client, [])
+
+    def create_failing_public_ip(create_public_ip_details, **kwargs):
+        if create_public_ip_details.private_ip_id == "ocid1.privateip.oc1..failed":
+            raise ServiceError(400, "LimitExceeded", dict(), "Public IP limit reached")
+        return create_public_ip(create_public_ip_details)
+
+    virtual_network_client.create_public_ip.side_effect = create_failing_public_ip
+    with pytest.raises(Exception) as exc_info:
+        oci_public_ip.create_public_ips(virtual_network_client, module)
+    assert (
+        "Failed to create 1 public IPs: ocid1.privateip.oc1..failed: Public IP limit reached"
+        in str(exc_info.value)
+    )
+    assert module.exit_kwargs["changed"] is True
+    assert [public_ip["id"] for public_ip in module.exit_kwargs["public_ips"]] == [
+        "ocid1.publicip.oc1..created"
+    ]
+    wait_for_resources_lifecycle_state_patch.assert_not_called()
+
+
+def test_create_public_ips_waits_on_created_public_ips_per_availability_domain(
+    virtual_network_client, wait_for_resources_lifecycle_state_patch
+):
+    module = get_module(
+        dict(
+            private_ip_ids=[
+                "ocid1.privateip.oc1..ad2",
+                "ocid1.privateip.oc1..ad1",
+                "ocid1.privateip.oc1..other_ad1",
+            ],
+            wait=True,
+        )
+    )
+    set_existing_public_ips(virtual_network_client, [])
+    availability_domains = {
+        "ocid1.privateip.oc1..ad2": "AD-2",
+        "ocid1.privateip.oc1..ad1": "AD-1",
+        "ocid1.privateip.oc1..other_ad1": "AD-1",
+    }
+    virtual_network_client.create_public_ip.side_effect = (
+        lambda create_public_ip_details, **kwargs: create_public_ip(
+            create_public_ip_details,
+            availability_domains[create_public_ip_details.private_ip_id],
+        )
+    )
+    assigned_public_ip = to_dict(
+        get_public_ip("ocid1.privateip.oc1..ad1", lifecycle_state="ASSIGNED")
+    )
+    wait_for_resources_lifecycle_state_patch.return_value = (
+        {assigned_public_ip["id"]: assigned_public_ip},
+        [],
+    )
+
+    result = oci_public_ip.create_public_ips(virtual_network_client, module)
+
+    assert result["changed"] is True
+    assert [public_ip["lifecycle_state"] for public_ip in result["public_ips"]] == [
+        "PROVISIONING",
+        "ASSIGNED",
+        "PROVISIONING",
+    ]
+    wait_for_resources_lifecycle_state_patch.assert_called_once()
+    call_args = wait_for_resources_lifecycle_state_patch.call_args[0]
+    assert call_args[1] == virtual_network_client.list_public_ips
+    assert call_args[2] == [
+        dict(
+            scope="AVAILABILITY_DOMAIN",
+            compartment_id="ocid1.compartment.oc1..compartment",
+            availability_domain="AD-1",
+        ),
+        dict(
+            scope="AVAILABILITY_DOMAIN",
+            compartment_id="ocid1.compartment.oc1..compartment",
+            availability_domain="AD-2",
+        ),
+    ]
+    assert sorted(call_args[3]) == [
+        "ocid1.publicip.oc1..ad1",
+        "ocid1.publicip.oc1..ad2",
+        "ocid1.publicip.oc1..other_ad1",
+    ]
+    assert call_args[4] == ["ASSIGNED", "AVAILABLE"]
+
+
+def test_create_public_ips_reserved_waits_on_region_and_reports_timeouts(
+    virtual_network_client, wait_for_resources_lifecycle_state_patch
+):
+    module = get_module(
+        dict(
+            private_ip_ids=["ocid1.privateip.oc1..first"],
+            lifetime="RESERVED",
+            wait=True,
+        )
+    )
+    set_existing_public_ips(virtual_network_client, [])
+    virtual_network_client.create_public_ip.side_effect = create_public_ip
+    wait_for_resources_lifecycle_state_patch.return_value = (
+        dict(),
+        ["ocid1.publicip.oc1..first"],
+    )
+
+    with pytest.raises(Exception) as exc_info:
+        oci_public_ip.create_public_ips(virtual_network_client, module)
+    assert "Timed out waiting for public IPs ocid1.publicip.oc1..first." in str(
+        exc_info.value
+    )
+    assert wait_for_resources_lifecycle_state_patch.call_args[0][2] == [
+        dict(scope="REGION", compartment_id="ocid1.compartment.oc1..compartment")
+    ]
+
+
+def get_public_ip(
+    private_ip_id, availability_domain="AD-1", lifecycle_state="PROVISIONING"
+):
+    return PublicIp(
+        id=private_ip_id.replace("privateip", "publicip"),
+        private_ip_id=private_ip_id,
+        availability_domain=availability_domain,
+        lifecycle_state=lifecycle_state,
+    )
+
+
+def create_public_ip(create_public_ip_details, availability_domain="AD-1", **kwargs):
+    return get_response(
+        get_public_ip(create_public_ip_details.private_ip_id, availability_domain)
+    )
+
+
+def set_existing_public_ips(virtual_network_client, public_ips):
+    public_ips_by_private_ip_id = dict(
+        (public_ip.private_ip_id, public_ip) for public_ip in public_ips
+    )
+
+    def get_public_ip_by_private_ip_id(
+        get_public_ip_by_private_ip_id_details, **kwargs
+    ):
+        private_ip_id = get_public_ip_by_private_ip_id_details.private_ip_id
+        if private_ip_id not in public_ips_by_private_ip_id:
+            raise ServiceError(404, "NotAuthorizedOrNotFound", dict(), "Not found")
+        return get_response(public_ips_by_private_ip_id[private_ip_id])
+
+    virtual_network_client.get_public_ip_by_private_ip_id.side_effect = (
+        get_public_ip_by_private_ip_id
+    )
+
+
+def get_response(data):
+    return oci.Response(200, dict(), data, None)
+
+
+def get_module(additional_properties):
+    params = dict(
+        compartment_id="ocid1.compartment.oc1..compartment",
+        lifetime="EPHEMERAL",
+        display_name=None,
+        private_ip_ids=None,
+        freeform_tags=None,
+        defined_tags=None,
+        wait=False,
+        wait_until=None,
+        enable_parallel_requests=True,
+        max_thread_count=None,
+    )
+    params.update(additional_properties)
+    return FakeModule(**params)
@@ -0,0 +1,233 @@
+# Copyright (c) 2019 Oracle and/or its affiliates.
+# This software is made available to you under the terms of the GPL 3.0 license or the Apache 2.0 license.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0
+# See LICENSE.TXT for details.
+
+import pytest
+from nose.plugins.skip import SkipTest
+from ansible.modules.cloud.oracle import oci_remote_peering_connection
+from ansible.module_utils.oracle import oci_utils
+
+try:
+    import oci
+    from oci.core.models import RemotePeeringConnection
+    from oci.exceptions import ServiceError
+except ImportError:
+    raise SkipTest("test_oci_remote_peering_connection.py requires `oci` module")
+
+
+class FakeModule(object):
+    def __init__(self, **kwargs):
+        self.params = kwargs
+
+    def fail_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+        raise Exception(kwargs["msg"])
+
+    def exit_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+
+
+@pytest.fixture()
+def virtual_network_client(mocker):
+    mock_virtual_network_client = mocker.patch(
+        "oci.core.virtual_network_client.VirtualNetworkClient"
+    )
+    return mock_virtual_network_client.return_value
+
+
+@pytest.fixture()
+def wait_for_resources_lifecycle_state_patch(mocker):
+    return mocker.patch.object(oci_utils, "wait_for_resources_lifecycle_state")
+
+
+def test_connect_rpc_peerings_connects_unpeered_rpcs_only(
+    virtual_network_client, wait_for_resources_lifecycle_state_patch
+):
+    module = get_module(
+        [
+            dict(
+                remote_peering_connection_id="hub-rpc-1",
+                peer_id="spoke-rpc-1",
+                peer_region_name="us-phoenix-1",
+            ),
+            dict(
+                remote_peering_connection_id="hub-rpc-2",
+                peer_id="spoke-rpc-2",
+                peer_region_name="uk-london-1",
+            ),
+            dict(
+                remote_peering_connection_id="hub-rpc-3",
+                peer_id="spoke-rpc-3",
+                peer_region_name="uk-london-1",
+            ),
+        ]
+    )
+    rpcs = dict(
+        (rpc.id, rpc)
+        for rpc in [
+            get_rpc("hub-rpc-1", "drg-1", "PEERED", "spoke-rpc-1"),
+            get_rpc("hub-rpc-2", "drg-1", "NEW"),
+            get_rpc("hub-rpc-3", "drg-2", "NEW"),
+        ]
+    )
+    virtual_network_client.get_remote_peering_connection.side_effect = (
+        lambda remote_peering_connection_id, **kwargs: get_response(
+            rpcs[remote_peering_connection_id]
+        )
+    )
+    wait_for_resources_lifecycle_state_patch.return_value = (
+        dict(
+            (rpc_id, dict(id=rpc_id, peering_status="PEERED"))
+            for rpc_id in ["hub-rpc-2", "hub-rpc-3"]
+        ),
+        [],
+    )
+
+    result = oci_remote_peering_connection.connect_rpc_peerings(
+        virtual_network_client, module
+    )
+
+    assert result["changed"] is True
+    assert [rpc["peering_status"] for rpc in result["remote_peering_connections"]] == [
+        "PEERED"
+    ] * 3
+    assert sorted(
+        (
+            call[1]["remote_peering_connection_id"],
+            call[1]["connect_remote_peering_connections_details"].peer_id,
+            call[1]["connect_remote_peering_connections_details"].peer_region_name,
+        )
+        for call in virtual_network_client.connect_remote_peering_connections.call_args_list
+    ) == [
+        ("hub-rpc-2", "spoke-rpc-2", "uk-london-1"),
+        ("hub-rpc-3", "spoke-rpc-3", "uk-london-1"),
+    ]
+    # One grouped wait for the new peerings, listing the RPCs once per DRG
+    wait_for_resources_lifecycle_state_patch.assert_called_once()
+    wait_args = wait_for_resources_lifecycle_state_patch.call_args
+    assert wait_args[0][1] == virtual_network_client.list_remote_peering_connections
+    assert wait_args[0][2] == [
+        dict(compartment_id="ocid1.compartment.oc1..xxxxxEXAMPLExxxxx", drg_id=drg_id)
+        for drg_id in ["drg-1", "drg-2"]
+    ]
+    assert wait_args[0][3] == ["hub-rpc-2", "hub-rpc-3"]
+    assert wait_args[0][4] == ["PEERED"]
+    assert wait_args[1]["state_attribute"] == "peering_status"
+
+
+def test_connect_rpc_peerings_all_peered(
+    virtual_network_client, wait_for_resources_lifecycle_state_patch
+):
+    module = get_module(
+        [
+            dict(
+                remote_peering_connection_id="hub-rpc-1",
+                peer_id="spoke-rpc-1",
+                peer_region_name="us-phoenix-1",
+            )
+        ]
+    )
+    virtual_network_client.get_remote_peering_connection.return_value = get_response(
+        get_rpc("hub-rpc-1", "drg-1", "PEERED", "spoke-rpc-1")
+    )
+
+    result = oci_remote_peering_connection.connect_rpc_peerings(
+        virtual_network_client, module
+    )
+
+    assert result["changed"] is False
+    virtual_network_client.connect_remote_peering_connections.assert_not_called()
+    wait_for_resources_lifecycle_state_patch.assert_not_called()
+
+
+def test_connect_rpc_peerings_reports_failed_connections(
+    virtual_network_client, wait_for_resources_lifecycle_state_patch
+):
+    module = get_module(
+        [
+            dict(
+                remote_peering_connection_id="hub-rpc-1",
+                peer_id="spoke-rpc-1",
+                peer_region_name="us-phoenix-1",
+            ),
+            dict(
+                remote_peering_connection_id="hub-rpc-2",
+                peer_id="spoke-rpc-2",
+                peer_region_name="uk-london-1",
+            ),
+        ]
+    )
+    virtual_network_client.get_remote_peering_connection.side_effect = (
+        lambda remote_peering_connection_id, **kwargs: get_response(
+            get_rpc(remote_peering_connection_id, "drg-1", "NEW")
+        )
+    )
+
+    def connect_remote_peering_connections(remote_peering_connection_id, **kwargs):
+        if remote_peering_connection_id == "hub-rpc-2":
+            raise ServiceError(409, "Conflict", dict(), "The peer is already connected")
+
+    virtual_network_client.connect_remote_peering_connections.side_effect = (
+        connect_remote_peering_connections
+    )
+
+    with pytest.raises(Exception) as exc_info:
+        oci_remote_peering_connection.connect_rpc_peerings(
+            virtual_network_client, module
+        )
+    assert "Failed to connect hub-rpc-2 to spoke-rpc-2" in str(exc_info.value)
+    assert module.exit_kwargs["changed"] is True
+    wait_for_resources_lifecycle_state_patch.assert_not_called()
+
+
+def test_connect_rpc_peerings_rpc_in_more_than_one_peering(virtual_network_client):
+    module = get_module(
+        [
+            dict(
+                remote_peering_connection_id="hub-rpc",
+                peer_id="spoke-rpc-1",
+                peer_region_name="us-phoenix-1",
+            ),
+            dict(
+                remote_peering_connection_id="hub-rpc",
+                peer_id="spoke-rpc-2",
+                peer_region_name="uk-london-1",
+            ),
+        ]
+    )
+    with pytest.raises(Exception) as exc_info:
+        oci_remote_peering_connection.connect_rpc_peerings(
+            virtual_network_client, module
+        )
+    assert "A RPC can only be part of one peering" in str(exc_info.value)
+    virtual_network_client.connect_remote_peering_connections.assert_not_called()
+
+
+def get_rpc(rpc_id, drg_id, peering_status, peer_id=None):
+    return RemotePeeringConnection(
+        id=rpc_id,
+        compartment_id="ocid1.compartment.oc1..xxxxxEXAMPLExxxxx",
+        drg_id=drg_id,
+        peering_status=peering_status,
+        peer_id=peer_id,
+        lifecycle_state="AVAILABLE",
+    )
+
+
+def get_response(data):
+    return oci.Response(200, dict(), data, None)
+
+
+def get_module(peerings):
+    return FakeModule(
+        peerings=peerings,
+        wait=True,
+        wait_until=None,
+        wait_timeout=1200,
+        enable_parallel_requests=True,
+        max_thread_count=None,
+    )
@@ -255,6 +255,75 @@ def test_update_route_table_input_no_route_rules_different(
     assert result["changed"] is False
 
 
+def test_update_route_table_incremental_update_retries_on_conflict(
+    virtual_network_client,
+):
+    route_table = get_route_table()
+    # A route rule added by a concurrent play after the route table was read
+    concurrently_updated_route_table = get_route_table()
+    concurrently_updated_route_table.route_rules = [
+        get_common_route_rule(),
+        get_service_cidr_route_rule(),
+    ]
+    route_rules = [
+        {"cidr_block": "0.0.0.0/0", "network_entity_id": "oci1.internetgateway.abcd"},
+        {"cidr_block": "10.0.0.0/16", "network_entity_id": "oci1.internetgateway.efgh"},
+    ]
+    module = get_module(dict(route_rules=route_rules, incremental_update=True))
+    virtual_network_client.get_route_table.side_effect = [
+        get_response(200, {"etag": "etag-1"}, route_table, None),
+        get_response(200, {"etag": "etag-2"}, concurrently_updated_route_table, None),
+    ]
+    virtual_network_client.update_route_table.side_effect = [
+        ServiceError(412, "NoEtagMatch", dict(), "The resource has been modified."),
+        get_response(200, {"etag": "etag-3"}, route_table, None),
+    ]
+    result = oci_route_table.update_route_table(
+        virtual_network_client, route_table, module
+    )
+    assert result["changed"] is True
+    assert virtual_network_client.update_route_table.call_count == 2
+    kwargs_update = virtual_network_client.update_route_table.call_args[1]
+    assert kwargs_update["if_match"] == "etag-2"
+    destinations = [
+        route_rule.destination
+        for route_rule in kwargs_update["update_route_table_details"].route_rules
+    ]
+    assert destinations == ["0.0.0.0/0", "oci-phx-objectstorage", "10.0.0.0/16"]
+
+
+def test_update_route_table_incremental_update_removes_rules(virtual_network_client):
+    route_table = get_route_table()
+    route_table.route_rules = [get_common_route_rule(), get_service_cidr_route_rule()]
+    module = get_module(
+        dict(
+            route_rules=[
+                {
+                    "destination": "oci-phx-objectstorage",
+                    "destination_type": RouteRule.DESTINATION_TYPE_SERVICE_CIDR_BLOCK,
+                    "network_entity_id": "oci1.servicegateway.abcd",
+                }
+            ],
+            delete_route_rules=True,
+            incremental_update=True,
+        )
+    )
+    virtual_network_client.get_route_table.return_value = get_response(
+        200, {"etag": "etag-1"}, route_table, None
+    )
+    virtual_network_client.update_route_table.return_value = get_response(
+        200, {"etag": "etag-2"}, route_table, None
+    )
+    result = oci_route_table.update_route_table(
+        virtual_network_client, route_table, module
+    )
+    assert result["changed"] is True
+    kwargs_update = virtual_network_client.update_route_table.call_args[1]
+    assert kwargs_update["if_match"] == "etag-1"
+    route_rules = kwargs_update["update_route_table_details"].route_rules
+    assert [route_rule.destination for route_rule in route_rules] == ["0.0.0.0/0"]
+
+
 def test_delete_route_table(virtual_network_client, delete_and_wait_patch):
     route_table = get_route_table()
     module = get_module(dict(rt_id="ocid.routetable..xvdz"))
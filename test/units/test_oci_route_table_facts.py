@@ -75,6 +75,36 @@ def test_list_route_tables_service_error(
         assert error_message in ex.args[0]
 
 
+def test_list_route_tables_from_vcn_snapshot(
+    virtual_network_client, list_all_resources_patch, tmpdir
+):
+    module = get_module()
+    module.params.update(
+        use_vcn_snapshot=True, cache_dir=str(tmpdir), cache_max_age=300
+    )
+    route_table = get_route_table()
+
+    def list_all_resources(list_fn, **kwargs):
+        if list_fn == virtual_network_client.list_route_tables:
+            return [route_table]
+        return []
+
+    list_all_resources_patch.side_effect = list_all_resources
+    result = oci_route_table_facts.list_route_tables(virtual_network_client, module)
+    assert result["route_tables"][0]["display_name"] == route_table.display_name
+    # All the resource types of the VCN are listed in a single pass
+    assert list_all_resources_patch.call_count == 7
+
+    module.params["display_name"] = "another_route_table"
+    result = oci_route_table_facts.list_route_tables(virtual_network_client, module)
+    assert result["route_tables"] == []
+    module.params["display_name"] = route_table.display_name
+    result = oci_route_table_facts.list_route_tables(virtual_network_client, module)
+    assert result["route_tables"][0]["id"] == route_table.id
+    # The next facts tasks on the VCN are served from the cached snapshot
+    assert list_all_resources_patch.call_count == 7
+
+
 def get_route_table():
     route_table = RouteTable()
     route_table.display_name = "ansible_route_table"
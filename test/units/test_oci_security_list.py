@@ -4,10 +4,12 @@
 # Apache License v2.0
 # See LICENSE.TXT for details.
 
+import random
+
 import pytest
 from nose.plugins.skip import SkipTest
 from ansible.modules.cloud.oracle import oci_security_list
-from ansible.module_utils.oracle import oci_utils
+from ansible.module_utils.oracle import oci_utils, oci_network_utils
 
 try:
     import oci
@@ -1000,3 +1002,298 @@ def get_module(additional_properties):
         params.update(additional_properties)
     module = FakeModule(**params)
     return module
+
+
+def get_tcp_ingress_rule(source, min_port, max_port, is_stateless=False):
+    return dict(
+        source=source,
+        protocol="6",
+        is_stateless=is_stateless,
+        tcp_options=dict(destination_port_range=dict(min=min_port, max=max_port)),
+    )
+
+
+def test_get_minimized_security_rules_merges_and_removes_covered_rules():
+    input_ingress_rules = oci_security_list.get_security_rules(
+        "ingress_security_rules",
+        [
+            get_tcp_ingress_rule("10.0.0.0/25", "80", "80"),
+            get_tcp_ingress_rule("10.0.0.128/25", "80", "80"),
+            get_tcp_ingress_rule("10.0.0.0/24", "81", "90"),
+            dict(source="10.1.0.0/16", protocol="all"),
+            dict(source="10.1.2.0/24", protocol="17"),
+            dict(source="10.1.0.0/16", protocol="all"),
+            # a stateless rule is not covered by a stateful rule
+            get_tcp_ingress_rule("10.1.3.0/24", 22, 22, is_stateless=True),
+        ],
+    )
+
+    minimized_rules = oci_security_list.get_minimized_security_rules(
+        input_ingress_rules, None, True, get_module(dict())
+    )
+
+    assert [(rule.source, rule.protocol) for rule in minimized_rules] == [
+        ("10.1.0.0/16", "all"),
+        ("10.1.3.0/24", "6"),
+        ("10.0.0.0/24", "6"),
+    ]
+    merged_port_range = minimized_rules[2].tcp_options.destination_port_range
+    assert (merged_port_range.min, merged_port_range.max) == (80, 90)
+
+
+def test_update_security_list_minimize_rules_skips_covered_rules(
+    virtual_network_client, update_and_wait_patch
+):
+    module = get_module(
+        dict(
+            ingress_security_rules=[get_tcp_ingress_rule("10.0.5.0/24", "22", "22")],
+            egress_security_rules=None,
+            purge_security_rules=False,
+            delete_security_rules=False,
+            minimize_rules=True,
+        )
+    )
+    existing_ingress_rule = IngressSecurityRule(
+        source="10.0.0.0/16", source_type="CIDR_BLOCK", protocol="6", is_stateless=False
+    )
+    security_list = get_security_list(
+        None, [existing_ingress_rule], "ansible_security_list"
+    )
+
+    result = oci_security_list.update_security_list(
+        virtual_network_client, security_list, module
+    )
+
+    assert result["changed"] is False
+    update_and_wait_patch.assert_not_called()
+
+
+def test_is_security_rule_covered_by_enclosing_rules():
+    index = oci_network_utils.build_security_rule_index(
+        oci_network_utils.compile_security_rule(rule)
+        for rule in oci_security_list.get_security_rules(
+            "ingress_security_rules",
+            [
+                get_tcp_ingress_rule("10.0.0.0/8", 1000, 2000),
+                dict(source="192.168.0.0/16", protocol="1", icmp_options=dict(type=3)),
+            ],
+        )
+    )
+
+    def is_covered(rule):
+        return oci_network_utils.is_security_rule_covered(
+            index,
+            oci_network_utils.compile_security_rule(
+                oci_security_list.get_security_rules("ingress_security_rules", [rule])[
+                    0
+                ]
+            ),
+        )
+
+    assert is_covered(get_tcp_ingress_rule("10.20.0.0/16", 1500, 1600))
+    assert is_covered(get_tcp_ingress_rule("10.20.30.40/32", 1000, 2000))
+    assert not is_covered(get_tcp_ingress_rule("10.20.0.0/16", 1500, 2001))
+    assert not is_covered(get_tcp_ingress_rule("11.0.0.0/16", 1500, 1600))
+    assert is_covered(
+        dict(source="192.168.1.0/24", protocol="1", icmp_options=dict(type=3, code=4))
+    )
+    assert not is_covered(
+        dict(source="192.168.1.0/24", protocol="1", icmp_options=dict(type=4))
+    )
+
+
+def test_security_rule_index_matches_pairwise_comparison_on_large_rule_lists():
+    existing_rules = [
+        oci_network_utils.compile_security_rule(rule)
+        for rule in get_random_ingress_rules(2000, seed=1)
+    ]
+    input_rules = [
+        oci_network_utils.compile_security_rule(rule)
+        for rule in get_random_ingress_rules(200, seed=2)
+    ]
+    index = oci_network_utils.build_security_rule_index(existing_rules)
+
+    def is_covered_by(rule, other):
+        mask = (0xFFFFFFFF << (32 - other.prefixlen)) & 0xFFFFFFFF
+        return (
+            rule.protocol == other.protocol
+            and other.prefixlen <= rule.prefixlen
+            and rule.network & mask == other.network
+            and other.dst_ports[0] <= rule.dst_ports[0]
+            and rule.dst_ports[1] <= other.dst_ports[1]
+        )
+
+    covered_rules = [
+        rule
+        for rule in input_rules
+        if any(is_covered_by(rule, other) for other in existing_rules)
+    ]
+    assert 0 < len(covered_rules) < len(input_rules)
+    assert covered_rules == [
+        rule
+        for rule in input_rules
+        if oci_network_utils.is_security_rule_covered(index, rule)
+    ]
+
+
+def test_minimize_security_rules_on_large_rule_lists():
+    security_rules = get_random_ingress_rules(2000, seed=1) + get_random_ingress_rules(
+        2000, seed=2
+    )
+    minimized_rules = [
+        oci_network_utils.compile_security_rule(rule)
+        for rule in oci_network_utils.minimize_security_rules(security_rules)
+    ]
+    assert len(minimized_rules) < len(security_rules)
+    index = oci_network_utils.build_security_rule_index(minimized_rules)
+    assert all(
+        oci_network_utils.is_security_rule_covered(
+            index, oci_network_utils.compile_security_rule(rule)
+        )
+        for rule in security_rules
+    )
+    assert not any(
+        oci_network_utils.is_security_rule_covered(index, rule, exclude_self=True)
+        for rule in minimized_rules
+    )
+
+
+def get_random_ingress_rules(rule_count, seed):
+    rng = random.Random(seed)
+    rules = []
+    for _ in range(rule_count):
+        min_port = rng.choice([22, 80, 443, 1000, 8000])
+        rule = get_tcp_ingress_rule(
+            "10.{0}.{1}.{2}/{3}".format(
+                rng.randint(0, 15),
+                rng.randint(0, 255),
+                rng.randint(0, 255),
+                rng.choice([16, 20, 24, 28, 32]),
+            ),
+            min_port,
+            min_port + rng.choice([0, 100, 1000]),
+        )
+        if rng.random() < 0.5:
+            rule["protocol"] = "17"
+            rule["udp_options"] = rule.pop("tcp_options")
+        rules.append(rule)
+    return oci_security_list.get_security_rules("ingress_security_rules", rules)
+
+
+def test_update_security_list_incremental_update_keeps_concurrent_rules(
+    virtual_network_client,
+):
+    module = get_module(
+        dict(
+            ingress_security_rules=[get_tcp_ingress_rule("10.0.5.0/24", 22, 22)],
+            egress_security_rules=None,
+            purge_security_rules=True,
+            delete_security_rules=False,
+            incremental_update=True,
+        )
+    )
+    existing_ingress_rule = IngressSecurityRule(
+        source="10.0.0.0/16", source_type="CIDR_BLOCK", protocol="6", is_stateless=False
+    )
+    security_list = get_security_list(
+        None, [existing_ingress_rule], "ansible_security_list"
+    )
+    # An ingress rule added by a concurrent play after the security list was read
+    concurrent_ingress_rule = IngressSecurityRule(
+        source="10.9.0.0/16",
+        source_type="CIDR_BLOCK",
+        protocol="17",
+        is_stateless=False,
+    )
+    latest_security_list = get_security_list(
+        None,
+        [existing_ingress_rule, concurrent_ingress_rule],
+        "ansible_security_list",
+    )
+    virtual_network_client.get_security_list.return_value = get_response(
+        200, {"etag": "etag-2"}, latest_security_list, None
+    )
+    virtual_network_client.update_security_list.return_value = get_response(
+        200, {"etag": "etag-3"}, latest_security_list, None
+    )
+
+    result = oci_security_list.update_security_list(
+        virtual_network_client, security_list, module
+    )
+
+    assert result["changed"] is True
+    kwargs_update = virtual_network_client.update_security_list.call_args[1]
+    assert kwargs_update["if_match"] == "etag-2"
+    update_security_list_details = kwargs_update["update_security_list_details"]
+    assert [
+        rule.source for rule in update_security_list_details.ingress_security_rules
+    ] == [
+        "10.9.0.0/16",
+        "10.0.5.0/24",
+    ]
+    assert update_security_list_details.egress_security_rules == []
+
+
+def test_update_security_list_incremental_update_compares_compiled_rules(
+    virtual_network_client,
+):
+    module = get_module(
+        dict(
+            ingress_security_rules=[get_tcp_ingress_rule("10.0.5.0/24", 22, 22)],
+            egress_security_rules=None,
+            purge_security_rules=True,
+            delete_security_rules=False,
+            incremental_update=True,
+        )
+    )
+    existing_ingress_rule = IngressSecurityRule(
+        source="10.0.0.0/16", source_type="CIDR_BLOCK", protocol="6", is_stateless=False
+    )
+    security_list = get_security_list(
+        None, [existing_ingress_rule], "ansible_security_list"
+    )
+    # A concurrent play added the same rule as the input rule, and the rule to remove is now returned with an
+    # explicit full port range. Both only differ from the rules of the delta in their representation.
+    latest_security_list = get_security_list(
+        None,
+        [
+            IngressSecurityRule(
+                source="10.0.0.0/16",
+                source_type="CIDR_BLOCK",
+                protocol="6",
+                is_stateless=False,
+                tcp_options=TcpOptions(
+                    destination_port_range=PortRange(min=1, max=65535)
+                ),
+            ),
+            IngressSecurityRule(
+                source="10.0.5.0/24",
+                protocol="6",
+                is_stateless=False,
+                tcp_options=TcpOptions(
+                    source_port_range=PortRange(min=1, max=65535),
+                    destination_port_range=PortRange(min=22, max=22),
+                ),
+            ),
+        ],
+        "ansible_security_list",
+    )
+    virtual_network_client.get_security_list.return_value = get_response(
+        200, {"etag": "etag-2"}, latest_security_list, None
+    )
+    virtual_network_client.update_security_list.return_value = get_response(
+        200, {"etag": "etag-3"}, latest_security_list, None
+    )
+
+    oci_security_list.update_security_list(
+        virtual_network_client, security_list, module
+    )
+
+    update_security_list_details = (
+        virtual_network_client.update_security_list.call_args[1][
+            "update_security_list_details"
+        ]
+    )
+    assert [
+        rule.source for rule in update_security_list_details.ingress_security_rules
+    ] == ["10.0.5.0/24"]
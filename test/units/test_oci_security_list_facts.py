@@ -104,6 +104,41 @@ def test_list_security_lists_service_error(
         assert error_message in ex.args[0]
 
 
+def test_list_security_lists_from_vcn_snapshot(
+    virtual_network_client, list_all_resources_patch, tmpdir
+):
+    module = get_module(
+        dict(
+            compartment_id="ocid1.compartment.aa",
+            vcn_id="ocid1.vcn.aa",
+            security_list_id="",
+            use_vcn_snapshot=True,
+            cache_dir=str(tmpdir),
+            cache_max_age=300,
+        )
+    )
+    security_lists = get_security_lists(
+        "ansible_security_list", "ansible_security_list_two"
+    )
+
+    def list_all_resources(list_fn, **kwargs):
+        if list_fn == virtual_network_client.list_security_lists:
+            return security_lists
+        return []
+
+    list_all_resources_patch.side_effect = list_all_resources
+    result = oci_security_list_facts.list_security_lists(virtual_network_client, module)
+    assert [security_list["id"] for security_list in result["security_lists"]] == [
+        "ocid1.securitylist.oc1.aaa"
+    ]
+    assert list_all_resources_patch.call_count == 7
+
+    module.params["display_name"] = None
+    result = oci_security_list_facts.list_security_lists(virtual_network_client, module)
+    assert len(result["security_lists"]) == 2
+    assert list_all_resources_patch.call_count == 7
+
+
 def get_response(status, header, data, request):
     return oci.Response(status, header, data, request)
 
@@ -0,0 +1,180 @@
+# Copyright (c) 2019 Oracle and/or its affiliates.
+# This software is made available to you under the terms of the GPL 3.0 license or the Apache 2.0 license.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0
+# See LICENSE.TXT for details.
+
+import pytest
+from nose.plugins.skip import SkipTest
+from ansible.modules.cloud.oracle import oci_subnet
+from ansible.module_utils.oracle import oci_utils
+
+try:
+    import oci
+    from oci.core.models import Subnet, Vcn
+    from oci.exceptions import ServiceError
+except ImportError:
+    raise SkipTest("test_oci_subnet.py requires `oci` module")
+
+
+class FakeModule(object):
+    def __init__(self, **kwargs):
+        self.params = kwargs
+
+    def fail_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+        raise Exception(kwargs["msg"])
+
+    def exit_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+
+
+@pytest.fixture()
+def virtual_network_client(mocker):
+    mock_virtual_network_client = mocker.patch(
+        "oci.core.virtual_network_client.VirtualNetworkClient"
+    )
+    return mock_virtual_network_client.return_value
+
+
+@pytest.fixture()
+def check_and_create_resource_patch(mocker):
+    return mocker.patch.object(oci_utils, "check_and_create_resource")
+
+
+def test_check_and_create_subnet_allocates_cidr_block(
+    virtual_network_client, check_and_create_resource_patch
+):
+    module = get_module(display_name="app", cidr_prefix_length=24)
+    virtual_network_client.get_vcn.return_value = get_response(get_vcn())
+    set_subnets(
+        virtual_network_client,
+        [
+            get_subnet("web", "10.0.0.0/24"),
+            get_subnet("old", "10.0.1.0/24", "TERMINATED"),
+            get_subnet("db", "10.0.2.0/23"),
+        ],
+    )
+    check_and_create_resource_patch.return_value = dict(changed=True)
+
+    oci_subnet.check_and_create_subnet(virtual_network_client, module)
+
+    create_module = check_and_create_resource_patch.call_args[1]["module"]
+    # The CIDR block of the terminated subnet is free again
+    assert create_module.params["cidr_block"] == "10.0.1.0/24"
+    assert (
+        check_and_create_resource_patch.call_args[1]["kwargs_create"]["module"]
+        is create_module
+    )
+    # The options of the module are left as specified
+    assert module.params["cidr_block"] is None
+
+
+def test_get_subnet_cidr_block_reuses_cidr_block_of_existing_subnet(
+    virtual_network_client,
+):
+    module = get_module(display_name="db", cidr_prefix_length=23)
+    set_subnets(
+        virtual_network_client,
+        [get_subnet("web", "10.0.0.0/24"), get_subnet("db", "10.0.2.0/23")],
+    )
+
+    assert (
+        oci_subnet.get_subnet_cidr_block(virtual_network_client, module, get_vcn())
+        == "10.0.2.0/23"
+    )
+
+
+def test_get_subnet_cidr_block_rejects_overlapping_cidr_block(
+    virtual_network_client,
+):
+    module = get_module(cidr_block="10.0.3.0/24")
+    set_subnets(virtual_network_client, [get_subnet("db", "10.0.2.0/23")])
+
+    with pytest.raises(Exception) as exc_info:
+        oci_subnet.get_subnet_cidr_block(virtual_network_client, module, get_vcn())
+    assert "CIDR block 10.0.3.0/24 overlaps with an allocated CIDR block" in str(
+        exc_info.value
+    )
+
+
+def test_get_subnet_cidr_block_in_vcn_with_several_cidr_blocks(
+    virtual_network_client,
+):
+    vcn = get_vcn(["10.0.0.0/23", "172.16.0.0/16"])
+    set_subnets(
+        virtual_network_client,
+        [get_subnet("web", "10.0.0.0/23"), get_subnet("db", "172.16.0.0/24")],
+    )
+
+    module = get_module(cidr_block="172.16.1.0/24")
+    assert (
+        oci_subnet.get_subnet_cidr_block(virtual_network_client, module, vcn)
+        == "172.16.1.0/24"
+    )
+    # The first CIDR block of the VCN is full, so the next one is used
+    module = get_module(display_name="app", cidr_prefix_length=24)
+    assert (
+        oci_subnet.get_subnet_cidr_block(virtual_network_client, module, vcn)
+        == "172.16.1.0/24"
+    )
+    module = get_module(cidr_block="192.168.0.0/24")
+    with pytest.raises(Exception) as exc_info:
+        oci_subnet.get_subnet_cidr_block(virtual_network_client, module, vcn)
+    assert "not within 10.0.0.0/23, 172.16.0.0/16" in str(exc_info.value)
+
+
+def test_get_subnet_cidr_block_service_error(virtual_network_client):
+    module = get_module(cidr_block="10.0.3.0/24")
+    virtual_network_client.list_subnets.side_effect = ServiceError(
+        500, "InternalServerError", dict(), "Internal Server Error"
+    )
+
+    with pytest.raises(Exception) as exc_info:
+        oci_subnet.get_subnet_cidr_block(virtual_network_client, module, get_vcn())
+    assert "Internal Server Error" in str(exc_info.value)
+
+
+def set_subnets(virtual_network_client, subnets):
+    virtual_network_client.list_subnets.return_value = get_response(subnets)
+
+
+def get_subnet(display_name, cidr_block, lifecycle_state="AVAILABLE"):
+    return Subnet(
+        id="ocid1.subnet.oc1.." + display_name,
+        display_name=display_name,
+        cidr_block=cidr_block,
+        compartment_id="ocid1.compartment.oc1..xxxxxEXAMPLExxxxx",
+        vcn_id="ocid1.vcn.oc1..xxxxxEXAMPLExxxxx",
+        lifecycle_state=lifecycle_state,
+    )
+
+
+def get_vcn(cidr_blocks=None):
+    cidr_blocks = cidr_blocks or ["10.0.0.0/16"]
+    return Vcn(
+        id="ocid1.vcn.oc1..xxxxxEXAMPLExxxxx",
+        cidr_block=cidr_blocks[0],
+        cidr_blocks=cidr_blocks,
+        default_dhcp_options_id="ocid1.dhcpoptions.oc1..xxxxxEXAMPLExxxxx",
+        default_route_table_id="ocid1.routetable.oc1..xxxxxEXAMPLExxxxx",
+        default_security_list_id="ocid1.securitylist.oc1..xxxxxEXAMPLExxxxx",
+    )
+
+
+def get_response(data):
+    return oci.Response(200, dict(), data, None)
+
+
+def get_module(**additional_properties):
+    params = dict(
+        compartment_id="ocid1.compartment.oc1..xxxxxEXAMPLExxxxx",
+        vcn_id="ocid1.vcn.oc1..xxxxxEXAMPLExxxxx",
+        display_name=None,
+        cidr_block=None,
+        cidr_prefix_length=None,
+    )
+    params.update(additional_properties)
+    return FakeModule(**params)
@@ -0,0 +1,136 @@
+# Copyright (c) 2019 Oracle and/or its affiliates.
+# This software is made available to you under the terms of the GPL 3.0 license or the Apache 2.0 license.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0
+# See LICENSE.TXT for details.
+
+import pytest
+from nose.plugins.skip import SkipTest
+from ansible.module_utils.oracle import oci_utils, oci_network_utils
+
+try:
+    from oci.core.models import NatGateway, ServiceGateway, Subnet
+except ImportError:
+    raise SkipTest("test_oci_subnet_facts.py requires `oci` module")
+
+
+class FakeModule(object):
+    def __init__(self, **kwargs):
+        self.params = kwargs
+
+    def fail_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+        raise Exception(kwargs["msg"])
+
+    def exit_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+
+
+@pytest.fixture()
+def virtual_network_client(mocker):
+    mock_virtual_network_client = mocker.patch("oci.core.VirtualNetworkClient")
+    return mock_virtual_network_client.return_value
+
+
+@pytest.fixture()
+def list_all_resources_patch(mocker):
+    return mocker.patch.object(oci_utils, "list_all_resources")
+
+
+def test_list_vcn_resources_lists_subnets_with_filters(
+    virtual_network_client, list_all_resources_patch
+):
+    module = get_module(use_vcn_snapshot=False)
+    list_all_resources_patch.return_value = [get_subnet("ocid1.subnet.oc1..s1")]
+
+    result = oci_network_utils.list_vcn_resources(
+        virtual_network_client,
+        module,
+        "subnet",
+        "ocid1.compartment.oc1..aa",
+        "ocid1.vcn.oc1..aa",
+        display_name=None,
+        lifecycle_state="AVAILABLE",
+    )
+
+    assert [subnet["id"] for subnet in result] == ["ocid1.subnet.oc1..s1"]
+    list_all_resources_patch.assert_called_once_with(
+        virtual_network_client.list_subnets,
+        compartment_id="ocid1.compartment.oc1..aa",
+        vcn_id="ocid1.vcn.oc1..aa",
+        lifecycle_state="AVAILABLE",
+    )
+
+
+def test_list_vcn_resources_filters_snapshot_by_lifecycle_state(
+    virtual_network_client, list_all_resources_patch, tmpdir
+):
+    module = get_module(cache_dir=str(tmpdir))
+    resources = {
+        virtual_network_client.list_subnets: [
+            get_subnet("ocid1.subnet.oc1..s1"),
+            get_subnet("ocid1.subnet.oc1..s2", "TERMINATED"),
+        ],
+        virtual_network_client.list_nat_gateways: [
+            NatGateway(id="ocid1.natgateway.oc1..n1", lifecycle_state="TERMINATED")
+        ],
+        virtual_network_client.list_service_gateways: [
+            ServiceGateway(
+                id="ocid1.servicegateway.oc1..sg1", lifecycle_state="AVAILABLE"
+            )
+        ],
+    }
+    list_all_resources_patch.side_effect = lambda list_fn, **kwargs: resources.get(
+        list_fn, []
+    )
+
+    def list_vcn_resources(resource_type, **filters):
+        return [
+            resource["id"]
+            for resource in oci_network_utils.list_vcn_resources(
+                virtual_network_client,
+                module,
+                resource_type,
+                "ocid1.compartment.oc1..aa",
+                "ocid1.vcn.oc1..aa",
+                **filters
+            )
+        ]
+
+    # The snapshot keeps the terminated resources, so that they can still be looked up by lifecycle_state
+    assert list_vcn_resources("subnet") == [
+        "ocid1.subnet.oc1..s1",
+        "ocid1.subnet.oc1..s2",
+    ]
+    assert list_vcn_resources("subnet", lifecycle_state="TERMINATED") == [
+        "ocid1.subnet.oc1..s2"
+    ]
+    assert list_vcn_resources("nat_gateway", lifecycle_state="AVAILABLE") == []
+    assert list_vcn_resources("service_gateway", display_name=None) == [
+        "ocid1.servicegateway.oc1..sg1"
+    ]
+    # Listing resources of the other types of the VCN is served from the same snapshot
+    assert list_all_resources_patch.call_count == 7
+    # The terminated resources are not filtered out of the listings of the snapshot
+    assert all(
+        "lifecycle_state" not in call[1]
+        for call in list_all_resources_patch.call_args_list
+    )
+
+
+def get_subnet(subnet_id, lifecycle_state="AVAILABLE"):
+    return Subnet(
+        id=subnet_id,
+        display_name=subnet_id.split("..")[-1],
+        compartment_id="ocid1.compartment.oc1..aa",
+        vcn_id="ocid1.vcn.oc1..aa",
+        lifecycle_state=lifecycle_state,
+    )
+
+
+def get_module(**additional_properties):
+    params = dict(use_vcn_snapshot=True, cache_dir=None, cache_max_age=300)
+    params.update(additional_properties)
+    return FakeModule(**params)
@@ -0,0 +1,130 @@
+# Copyright (c) 2019 Oracle and/or its affiliates.
+# This software is made available to you under the terms of the GPL 3.0 license or the Apache 2.0 license.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0
+# See LICENSE.TXT for details.
+
+import pytest
+from nose.plugins.skip import SkipTest
+from ansible.module_utils.oracle import oci_utils, oci_lb_utils
+
+try:
+    import oci
+    from oci.load_balancer.models import WorkRequest, WorkRequestError
+    from oci.container_engine.models import WorkRequest as ContainerEngineWorkRequest
+    from oci.container_engine.models import WorkRequestError as ContainerEngineError
+except ImportError:
+    raise SkipTest("test_oci_utils_work_requests.py requires `oci` module")
+
+
+class FakeModule(object):
+    def __init__(self, **kwargs):
+        self.params = kwargs
+
+    def fail_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+        raise Exception(kwargs["msg"])
+
+    def exit_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+
+
+@pytest.fixture()
+def lb_client(mocker):
+    mock_lb_client = mocker.patch(
+        "oci.load_balancer.load_balancer_client.LoadBalancerClient"
+    )
+    return mock_lb_client.return_value
+
+
+def test_wait_for_work_requests_polls_all_work_requests_with_one_listing(
+    lb_client, mocker
+):
+    module = get_module(dict(wait_timeout=1200))
+    failed_work_request = get_work_request("ocid1.loadbalancerworkrequest..fail")
+    failed_work_request.lifecycle_state = "FAILED"
+    failed_work_request.error_details = [
+        WorkRequestError(error_code="BAD_INPUT", message="Invalid backend set")
+    ]
+    in_progress_work_request = get_work_request("ocid1.loadbalancerworkrequest..fail")
+    in_progress_work_request.lifecycle_state = "IN_PROGRESS"
+    lb_client.list_work_requests.side_effect = [
+        get_response(200, dict(), [in_progress_work_request, get_work_request()], None),
+        get_response(200, dict(), [failed_work_request, get_work_request()], None),
+    ]
+    sleep_patch = mocker.patch.object(oci_utils.time, "sleep")
+
+    work_requests = oci_lb_utils.wait_for_work_requests(
+        lb_client,
+        module,
+        "ocid1.loadbalancer.oc1..xxxxxEXAMPLExxxxx",
+        ["ocid1.loadbalancerworkrequest..xvzf", "ocid1.loadbalancerworkrequest..fail"],
+    )
+
+    assert lb_client.list_work_requests.call_count == 2
+    lb_client.get_work_request.assert_not_called()
+    sleep_patch.assert_called_once()
+    assert (
+        work_requests["ocid1.loadbalancerworkrequest..xvzf"]["percent_complete"]
+        == 100.0
+    )
+    failed = work_requests["ocid1.loadbalancerworkrequest..fail"]
+    assert failed["errors"][0]["message"] == "Invalid backend set"
+    assert oci_utils.get_work_request_error_message(failed).endswith(
+        "failed: Invalid backend set"
+    )
+
+
+def test_wait_on_work_request_fails_with_the_errors_of_the_work_request(mocker):
+    module = get_module(dict(wait=True, wait_timeout=1200))
+    client = mocker.MagicMock()
+    work_request = ContainerEngineWorkRequest(
+        id="ocid1.clustersworkrequest..xvzf",
+        compartment_id="ocid1.compartment.oc1..xxxxxEXAMPLExxxxx",
+        status="FAILED",
+    )
+    client.get_work_request.return_value = get_response(200, dict(), work_request, None)
+    client.list_work_request_errors.return_value = get_response(
+        200,
+        dict(),
+        [ContainerEngineError(code="LimitExceeded", message="No quota")],
+        None,
+    )
+    client.list_work_request_logs.return_value = get_response(200, dict(), [], None)
+    mocker.patch.object(
+        oci_utils,
+        "get_work_request_adapter",
+        return_value=oci_utils.WORK_REQUEST_ADAPTERS["ContainerEngineClient"],
+    )
+
+    with pytest.raises(Exception) as exc_info:
+        oci_utils.wait_on_work_request(
+            client, get_response(200, dict(), work_request, None), module
+        )
+
+    assert "No quota" in str(exc_info.value)
+    assert module.exit_kwargs["work_request"]["status"] == "FAILED"
+    assert (
+        client.list_work_request_errors.call_args[1]["compartment_id"]
+        == "ocid1.compartment.oc1..xxxxxEXAMPLExxxxx"
+    )
+
+
+def get_work_request(work_request_id="ocid1.loadbalancerworkrequest..xvzf"):
+    work_request = WorkRequest()
+    work_request.id = work_request_id
+    work_request.lifecycle_state = "SUCCEEDED"
+    return work_request
+
+
+def get_response(status, header, data, request):
+    return oci.Response(status, header, data, request)
+
+
+def get_module(additional_properties):
+    params = dict()
+    params.update(additional_properties)
+    module = FakeModule(**params)
+    return module
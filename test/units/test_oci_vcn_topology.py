@@ -0,0 +1,386 @@
+# Copyright (c) 2019 Oracle and/or its affiliates.
+# This software is made available to you under the terms of the GPL 3.0 license or the Apache 2.0 license.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0
+# See LICENSE.TXT for details.
+
+import pytest
+from nose.plugins.skip import SkipTest
+from ansible.modules.cloud.oracle import oci_vcn_topology
+from ansible.module_utils.oracle import oci_utils, oci_network_utils
+
+try:
+    import oci
+    from oci.core.models import (
+        Vcn,
+        InternetGateway,
+        RouteTable,
+        RouteRule,
+        SecurityList,
+        IngressSecurityRule,
+        EgressSecurityRule,
+        TcpOptions,
+        PortRange,
+        Subnet,
+    )
+except ImportError:
+    raise SkipTest("test_oci_vcn_topology.py requires `oci` module")
+
+
+class FakeModule(object):
+    def __init__(self, **kwargs):
+        self.params = kwargs
+
+    def fail_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+        raise Exception(kwargs["msg"])
+
+    def exit_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+
+
+@pytest.fixture()
+def virtual_network_client(mocker):
+    mock_virtual_network_client = mocker.patch(
+        "oci.core.virtual_network_client.VirtualNetworkClient"
+    )
+    return mock_virtual_network_client.return_value
+
+
+@pytest.fixture()
+def wait_for_resources_lifecycle_state_patch(mocker):
+    return mocker.patch.object(oci_utils, "wait_for_resources_lifecycle_state")
+
+
+def test_reconcile_vcn_topology_creates_resources_in_dependency_order(
+    virtual_network_client, wait_for_resources_lifecycle_state_patch
+):
+    module = get_module(
+        dict(
+            internet_gateways=[dict(display_name="igw")],
+            security_lists=[
+                dict(
+                    display_name="public_sl",
+                    ingress_security_rules=[dict(source="0.0.0.0/0", protocol="6")],
+                    egress_security_rules=[
+                        dict(destination="0.0.0.0/0", protocol="all")
+                    ],
+                )
+            ],
+            route_tables=[
+                dict(
+                    display_name="public_rt",
+                    route_rules=[dict(destination="0.0.0.0/0", network_entity="igw")],
+                )
+            ],
+            subnets=[
+                dict(
+                    display_name="public_subnet",
+                    cidr_block="10.0.0.0/24",
+                    route_table="public_rt",
+                    security_lists=["public_sl"],
+                )
+            ],
+        )
+    )
+    set_vcn_snapshot(virtual_network_client)
+    virtual_network_client.create_internet_gateway.return_value = get_response(
+        get_resource(InternetGateway, "ocid1.internetgateway.oc1..igw", "igw")
+    )
+    virtual_network_client.create_security_list.return_value = get_response(
+        get_resource(SecurityList, "ocid1.securitylist.oc1..sl", "public_sl")
+    )
+    virtual_network_client.create_route_table.return_value = get_response(
+        get_resource(RouteTable, "ocid1.routetable.oc1..rt", "public_rt")
+    )
+    virtual_network_client.create_subnet.return_value = get_response(
+        get_resource(Subnet, "ocid1.subnet.oc1..subnet", "public_subnet")
+    )
+    wait_for_resources_lifecycle_state_patch.return_value = (dict(), [])
+
+    result = oci_vcn_topology.reconcile_vcn_topology(virtual_network_client, module)
+
+    assert result["changed"] is True
+    assert [
+        (change["resource_type"], change["level"])
+        for change in result["topology_changes"]
+    ] == [
+        ("internet_gateway", 0),
+        ("security_list", 0),
+        ("route_table", 1),
+        ("subnet", 2),
+    ]
+    create_route_table_details = virtual_network_client.create_route_table.call_args[1][
+        "create_route_table_details"
+    ]
+    assert (
+        create_route_table_details.route_rules[0].network_entity_id
+        == "ocid1.internetgateway.oc1..igw"
+    )
+    create_subnet_details = virtual_network_client.create_subnet.call_args[1][
+        "create_subnet_details"
+    ]
+    assert create_subnet_details.route_table_id == "ocid1.routetable.oc1..rt"
+    assert create_subnet_details.security_list_ids == ["ocid1.securitylist.oc1..sl"]
+    assert create_subnet_details.vcn_id == "ocid1.vcn.oc1..vcn"
+    assert [subnet["id"] for subnet in result["vcn_topology"]["subnets"]] == [
+        "ocid1.subnet.oc1..subnet"
+    ]
+
+
+def test_reconcile_vcn_topology_only_updates_changed_resources(
+    virtual_network_client, wait_for_resources_lifecycle_state_patch
+):
+    module = get_module(
+        dict(
+            internet_gateways=[dict(display_name="igw")],
+            route_tables=[
+                dict(
+                    display_name="public_rt",
+                    route_rules=[
+                        dict(destination="0.0.0.0/0", network_entity="igw"),
+                        dict(destination="10.1.0.0/16", network_entity="igw"),
+                    ],
+                )
+            ],
+        )
+    )
+    internet_gateway = get_resource(
+        InternetGateway, "ocid1.internetgateway.oc1..igw", "igw"
+    )
+    internet_gateway.is_enabled = True
+    route_table = get_resource(RouteTable, "ocid1.routetable.oc1..rt", "public_rt")
+    route_table.route_rules = [
+        RouteRule(
+            cidr_block="0.0.0.0/0",
+            destination="0.0.0.0/0",
+            destination_type="CIDR_BLOCK",
+            network_entity_id="ocid1.internetgateway.oc1..igw",
+        )
+    ]
+    set_vcn_snapshot(
+        virtual_network_client,
+        internet_gateways=[internet_gateway],
+        route_tables=[route_table],
+    )
+    virtual_network_client.update_route_table.return_value = get_response(route_table)
+    wait_for_resources_lifecycle_state_patch.return_value = (dict(), [])
+
+    result = oci_vcn_topology.reconcile_vcn_topology(virtual_network_client, module)
+
+    assert result["changed"] is True
+    assert result["topology_changes"] == [
+        dict(
+            resource_type="route_table",
+            display_name="public_rt",
+            action="update",
+            level=1,
+        )
+    ]
+    virtual_network_client.update_internet_gateway.assert_not_called()
+    kwargs_update = virtual_network_client.update_route_table.call_args[1]
+    assert kwargs_update["rt_id"] == "ocid1.routetable.oc1..rt"
+    assert [
+        route_rule.destination
+        for route_rule in kwargs_update["update_route_table_details"].route_rules
+    ] == ["0.0.0.0/0", "10.1.0.0/16"]
+
+
+def test_reconcile_vcn_topology_matches_ports_given_as_strings(
+    virtual_network_client, wait_for_resources_lifecycle_state_patch
+):
+    module = get_module(
+        dict(
+            security_lists=[
+                dict(
+                    display_name="public_sl",
+                    ingress_security_rules=[
+                        dict(
+                            source="0.0.0.0/0",
+                            protocol="6",
+                            tcp_options=dict(
+                                destination_port_range=dict(min="443", max="443")
+                            ),
+                        )
+                    ],
+                    egress_security_rules=[
+                        dict(destination="0.0.0.0/0", protocol="all")
+                    ],
+                )
+            ]
+        )
+    )
+    security_list = get_resource(
+        SecurityList, "ocid1.securitylist.oc1..sl", "public_sl"
+    )
+    security_list.ingress_security_rules = [
+        IngressSecurityRule(
+            source="0.0.0.0/0",
+            source_type="CIDR_BLOCK",
+            protocol="6",
+            is_stateless=False,
+            tcp_options=TcpOptions(destination_port_range=PortRange(min=443, max=443)),
+        )
+    ]
+    security_list.egress_security_rules = [
+        EgressSecurityRule(
+            destination="0.0.0.0/0",
+            destination_type="CIDR_BLOCK",
+            protocol="all",
+            is_stateless=False,
+        )
+    ]
+    set_vcn_snapshot(virtual_network_client, security_lists=[security_list])
+
+    result = oci_vcn_topology.reconcile_vcn_topology(virtual_network_client, module)
+
+    assert result["changed"] is False
+    assert result["topology_changes"] == []
+    virtual_network_client.update_security_list.assert_not_called()
+
+
+def test_reconcile_vcn_topology_unknown_reference(virtual_network_client):
+    module = get_module(
+        dict(
+            subnets=[
+                dict(
+                    display_name="public_subnet",
+                    cidr_block="10.0.0.0/24",
+                    route_table="missing_rt",
+                )
+            ]
+        )
+    )
+    set_vcn_snapshot(virtual_network_client)
+    with pytest.raises(Exception) as exc_info:
+        oci_vcn_topology.reconcile_vcn_topology(virtual_network_client, module)
+    assert "No route_table named missing_rt" in str(exc_info.value)
+    virtual_network_client.create_subnet.assert_not_called()
+
+
+def test_get_dependency_levels_cyclic_dependencies():
+    assert oci_utils.get_dependency_levels(dict(a=[], b=["a"], c=["a", "b"])) == [
+        ["a"],
+        ["b"],
+        ["c"],
+    ]
+    with pytest.raises(ValueError):
+        oci_utils.get_dependency_levels(dict(a=["b"], b=["a"]))
+
+
+def test_reconcile_vcn_topology_allocates_subnet_cidr_blocks(
+    virtual_network_client, wait_for_resources_lifecycle_state_patch
+):
+    module = get_module(
+        dict(
+            subnets=[
+                dict(display_name="subnet_a", cidr_prefix_length=24),
+                dict(display_name="subnet_b", cidr_block="10.0.1.0/24"),
+                dict(display_name="subnet_c", cidr_prefix_length=23),
+            ]
+        )
+    )
+    existing_subnet = get_resource(Subnet, "ocid1.subnet.oc1..existing", "existing")
+    existing_subnet.cidr_block = "10.0.0.0/24"
+    set_vcn_snapshot(virtual_network_client, subnets=[existing_subnet])
+    virtual_network_client.create_subnet.side_effect = (
+        lambda create_subnet_details, **kwargs: get_response(
+            get_resource(
+                Subnet,
+                "ocid1.subnet.oc1.." + create_subnet_details.display_name,
+                create_subnet_details.display_name,
+            )
+        )
+    )
+    wait_for_resources_lifecycle_state_patch.return_value = (dict(), [])
+
+    oci_vcn_topology.reconcile_vcn_topology(virtual_network_client, module)
+
+    assert sorted(
+        (
+            call[1]["create_subnet_details"].display_name,
+            call[1]["create_subnet_details"].cidr_block,
+        )
+        for call in virtual_network_client.create_subnet.call_args_list
+    ) == [
+        ("subnet_a", "10.0.2.0/24"),
+        ("subnet_b", "10.0.1.0/24"),
+        ("subnet_c", "10.0.4.0/23"),
+    ]
+
+
+def test_reserve_cidr_block_overlapping_subnet():
+    allocator = oci_network_utils.get_cidr_allocator(
+        "10.0.0.0/16", ["10.0.0.0/24", "10.0.2.0/23"]
+    )
+    assert oci_network_utils.allocate_cidr_block(allocator, 24) == "10.0.1.0/24"
+    assert oci_network_utils.allocate_cidr_block(allocator, 22) == "10.0.4.0/22"
+    with pytest.raises(ValueError):
+        oci_network_utils.reserve_cidr_block(allocator, "10.0.3.128/25")
+    with pytest.raises(ValueError):
+        oci_network_utils.reserve_cidr_block(allocator, "10.1.0.0/24")
+    oci_network_utils.reserve_cidr_block(allocator, "10.0.8.0/24")
+    assert oci_network_utils.allocate_cidr_block(allocator, 24) == "10.0.9.0/24"
+
+
+def test_allocate_cidr_block_skips_reserved_lowest_block():
+    allocator = oci_network_utils.get_cidr_allocator("10.0.0.0/16", ["10.0.0.0/24"])
+    # The lowest free /24 is reserved, so it must not be allocated again
+    oci_network_utils.reserve_cidr_block(allocator, "10.0.1.0/24")
+    assert oci_network_utils.allocate_cidr_block(allocator, 24) == "10.0.2.0/24"
+    assert oci_network_utils.allocate_cidr_block(allocator, 25) == "10.0.3.0/25"
+    oci_network_utils.reserve_cidr_block(allocator, "10.0.3.128/25")
+    assert oci_network_utils.allocate_cidr_block(allocator, 24) == "10.0.4.0/24"
+    with pytest.raises(ValueError):
+        oci_network_utils.reserve_cidr_block(allocator, "10.0.2.0/26")
+
+
+def get_resource(resource_class, resource_id, display_name):
+    resource = resource_class()
+    resource.id = resource_id
+    resource.display_name = display_name
+    resource.compartment_id = "ocid1.compartment.oc1..xxxxxEXAMPLExxxxx"
+    resource.vcn_id = "ocid1.vcn.oc1..vcn"
+    resource.lifecycle_state = "AVAILABLE"
+    return resource
+
+
+def set_vcn_snapshot(virtual_network_client, **resources):
+    vcn = Vcn(
+        id="ocid1.vcn.oc1..vcn",
+        display_name="vcn",
+        cidr_block="10.0.0.0/16",
+        lifecycle_state="AVAILABLE",
+    )
+    virtual_network_client.get_vcn.return_value = get_response(vcn)
+    for resource_type, list_fn in [
+        ("dhcp_options", "list_dhcp_options"),
+        ("internet_gateways", "list_internet_gateways"),
+        ("nat_gateways", "list_nat_gateways"),
+        ("route_tables", "list_route_tables"),
+        ("security_lists", "list_security_lists"),
+        ("service_gateways", "list_service_gateways"),
+        ("subnets", "list_subnets"),
+    ]:
+        getattr(virtual_network_client, list_fn).return_value = get_response(
+            resources.get(resource_type, [])
+        )
+
+
+def get_response(data):
+    return oci.Response(200, dict(), data, None)
+
+
+def get_module(additional_properties):
+    params = dict(
+        compartment_id="ocid1.compartment.oc1..xxxxxEXAMPLExxxxx",
+        vcn_id="ocid1.vcn.oc1..vcn",
+        wait=True,
+        wait_timeout=1200,
+        enable_parallel_requests=True,
+        max_thread_count=None,
+    )
+    params.update(additional_properties)
+    return FakeModule(**params)
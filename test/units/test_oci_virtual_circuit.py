@@ -12,7 +12,11 @@ from ansible.module_utils.oracle import oci_utils
 try:
     import oci
     from oci.util import to_dict
-    from oci.core.models import VirtualCircuit, CrossConnectMapping
+    from oci.core.models import (
+        VirtualCircuit,
+        CrossConnectMapping,
+        VirtualCircuitPublicPrefix,
+    )
     from oci.exceptions import ServiceError, MaximumWaitTimeExceeded
 except ImportError:
     raise SkipTest("test_oci_virtual_circuit.py requires `oci` module")
@@ -73,6 +77,11 @@ def update_and_wait_patch(mocker):
     return mocker.patch.object(oci_utils, "update_and_wait")
 
 
+@pytest.fixture()
+def wait_for_resource_lifecycle_state_patch(mocker):
+    return mocker.patch.object(oci_utils, "wait_for_resource_lifecycle_state")
+
+
 @pytest.fixture()
 def delete_and_wait_patch(mocker):
     return mocker.patch.object(oci_utils, "delete_and_wait")
@@ -231,42 +240,100 @@ def test_update_virtual_circuit_success_cross_connect_mappings_changed(
 
 
 def test_update_virtual_circuit_success_bulk_add_public_prefixes(
-    virtual_network_client, update_and_wait_patch
+    virtual_network_client, wait_for_resource_lifecycle_state_patch
 ):
     module = get_module(
         dict(
             virtual_circuit_id="ocid1.virtualcircuit..xvzf",
-            public_prefixes=["0.0.0.18/31"],
+            public_prefixes=["0.0.0.18/31", "0.0.0.20/31"],
         )
     )
     virtual_circuit = get_virtual_circuit()
-    update_and_wait_patch.return_value = dict(
-        {"virtual_circuit": virtual_circuit, "changed": True}
-    )
-    oci_virtual_circuit.update_virtual_circuit(
+    set_public_prefixes(virtual_network_client, ["0.0.0.20/31"])
+    wait_for_resource_lifecycle_state_patch.return_value = to_dict(virtual_circuit)
+    result = oci_virtual_circuit.update_virtual_circuit(
         virtual_network_client, virtual_circuit, module
     )
-    assert update_and_wait_patch.called
+    assert result["changed"] is True
+    assert get_bulk_public_prefixes(
+        virtual_network_client.bulk_add_virtual_circuit_public_prefixes
+    ) == [["0.0.0.18/31"]]
+    virtual_network_client.bulk_delete_virtual_circuit_public_prefixes.assert_not_called()
+    assert wait_for_resource_lifecycle_state_patch.called
 
 
 def test_update_virtual_circuit_success_bulk_delete_public_prefixes(
-    virtual_network_client, update_and_wait_patch
+    virtual_network_client, wait_for_resource_lifecycle_state_patch
 ):
     module = get_module(
         dict(
             virtual_circuit_id="ocid1.virtualcircuit..xvzf",
-            public_prefixes=["0.0.0.18/31"],
+            public_prefixes=["0.0.0.18/31", "0.0.0.22/31"],
             delete_public_prefixes=True,
         )
     )
     virtual_circuit = get_virtual_circuit()
-    update_and_wait_patch.return_value = dict(
-        {"virtual_circuit": virtual_circuit, "changed": True}
+    set_public_prefixes(virtual_network_client, ["0.0.0.18/31", "0.0.0.20/31"])
+    wait_for_resource_lifecycle_state_patch.return_value = to_dict(virtual_circuit)
+    result = oci_virtual_circuit.update_virtual_circuit(
+        virtual_network_client, virtual_circuit, module
     )
-    oci_virtual_circuit.update_virtual_circuit(
+    assert result["changed"] is True
+    assert get_bulk_public_prefixes(
+        virtual_network_client.bulk_delete_virtual_circuit_public_prefixes
+    ) == [["0.0.0.18/31"]]
+    virtual_network_client.bulk_add_virtual_circuit_public_prefixes.assert_not_called()
+
+
+def test_update_virtual_circuit_public_prefixes_unchanged(
+    virtual_network_client, wait_for_resource_lifecycle_state_patch
+):
+    module = get_module(
+        dict(
+            virtual_circuit_id="ocid1.virtualcircuit..xvzf",
+            public_prefixes=["206.209.218.5/24", "206.209.218.128/25"],
+        )
+    )
+    virtual_circuit = get_virtual_circuit()
+    set_public_prefixes(virtual_network_client, ["206.209.218.0/24"])
+    result = oci_virtual_circuit.update_virtual_circuit(
         virtual_network_client, virtual_circuit, module
     )
-    assert update_and_wait_patch.called
+    assert result["changed"] is False
+    assert result["public_prefix_changes"] == dict(added=[], deleted=[])
+    virtual_network_client.bulk_add_virtual_circuit_public_prefixes.assert_not_called()
+    assert not wait_for_resource_lifecycle_state_patch.called
+
+
+def test_update_virtual_circuit_purge_aggregated_public_prefixes_in_chunks(
+    virtual_network_client, wait_for_resource_lifecycle_state_patch
+):
+    public_prefixes = ["198.51.{0}.0/24".format(index) for index in range(0, 256, 2)]
+    module = get_module(
+        dict(
+            virtual_circuit_id="ocid1.virtualcircuit..xvzf",
+            public_prefixes=public_prefixes
+            + ["206.209.218.0/25", "206.209.218.128/25"],
+            purge_public_prefixes=True,
+            aggregate_public_prefixes=True,
+        )
+    )
+    virtual_circuit = get_virtual_circuit()
+    set_public_prefixes(virtual_network_client, ["206.209.218.0/25", "203.0.113.0/24"])
+    wait_for_resource_lifecycle_state_patch.return_value = to_dict(virtual_circuit)
+    result = oci_virtual_circuit.update_virtual_circuit(
+        virtual_network_client, virtual_circuit, module
+    )
+    assert result["public_prefix_changes"]["deleted"] == [
+        "203.0.113.0/24",
+        "206.209.218.0/25",
+    ]
+    added_batches = get_bulk_public_prefixes(
+        virtual_network_client.bulk_add_virtual_circuit_public_prefixes
+    )
+    assert [len(batch) for batch in added_batches] == [100, 29]
+    assert added_batches[-1][-1] == "206.209.218.0/24"
+    assert wait_for_resource_lifecycle_state_patch.call_count == 1
 
 
 def test_delete_virtual_circuit(virtual_network_client, delete_and_wait_patch):
@@ -277,6 +344,34 @@ def test_delete_virtual_circuit(virtual_network_client, delete_and_wait_patch):
     assert delete_and_wait_patch.called
 
 
+def set_public_prefixes(virtual_network_client, cidr_blocks):
+    virtual_network_client.list_virtual_circuit_public_prefixes.return_value = (
+        get_response(
+            200,
+            None,
+            [
+                VirtualCircuitPublicPrefix(
+                    cidr_block=cidr_block, verification_state="COMPLETED"
+                )
+                for cidr_block in cidr_blocks
+            ],
+            None,
+        )
+    )
+
+
+def get_bulk_public_prefixes(bulk_fn):
+    batches = []
+    for call in bulk_fn.call_args_list:
+        details = [value for key, value in call[1].items() if key.endswith("_details")][
+            0
+        ]
+        batches.append(
+            [public_prefix.cidr_block for public_prefix in details.public_prefixes]
+        )
+    return batches
+
+
 def get_virtual_circuit():
     virtual_circuit = VirtualCircuit()
     virtual_circuit.compartment_id = "ocid1.compartment..axsd"
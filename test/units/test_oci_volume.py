@@ -0,0 +1,166 @@
+# Copyright (c) 2019 Oracle and/or its affiliates.
+# This software is made available to you under the terms of the GPL 3.0 license or the Apache 2.0 license.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0
+# See LICENSE.TXT for details.
+
+import pytest
+from nose.plugins.skip import SkipTest
+from ansible.modules.cloud.oracle import oci_volume
+from ansible.module_utils.oracle import oci_utils
+
+try:
+    import oci
+    from oci.core.models import Volume
+    from oci.exceptions import ServiceError
+except ImportError:
+    raise SkipTest("test_oci_volume.py requires `oci` module")
+
+
+class FakeModule(object):
+    def __init__(self, **kwargs):
+        self.params = kwargs
+
+    def fail_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+        raise Exception(kwargs["msg"])
+
+    def exit_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+
+
+@pytest.fixture()
+def block_storage_client(mocker):
+    mock_block_storage_client = mocker.patch(
+        "oci.core.blockstorage_client.BlockstorageClient"
+    )
+    return mock_block_storage_client.return_value
+
+
+@pytest.fixture()
+def wait_for_resources_lifecycle_state_patch(mocker):
+    return mocker.patch.object(oci_utils, "wait_for_resources_lifecycle_state")
+
+
+def test_create_volumes_count_creates_missing_volumes_in_order(
+    block_storage_client, wait_for_resources_lifecycle_state_patch
+):
+    module = get_module(dict(display_name="data", count=3))
+    block_storage_client.list_volumes.return_value = get_response(
+        [
+            get_volume("ocid1.volume.oc1..data_1", "data_1"),
+            get_volume("ocid1.volume.oc1..terminated", "data_2", "TERMINATED"),
+        ]
+    )
+    block_storage_client.create_volume.side_effect = (
+        lambda create_volume_details, **kwargs: get_response(
+            get_volume(
+                "ocid1.volume.oc1.." + create_volume_details.display_name,
+                create_volume_details.display_name,
+                "PROVISIONING",
+            )
+        )
+    )
+    wait_for_resources_lifecycle_state_patch.return_value = (
+        dict(
+            (volume_id, dict(id=volume_id, lifecycle_state="AVAILABLE"))
+            for volume_id in ["ocid1.volume.oc1..data_0", "ocid1.volume.oc1..data_2"]
+        ),
+        [],
+    )
+
+    result = oci_volume.create_volumes(block_storage_client, module)
+
+    assert result["changed"] is True
+    assert [volume["id"] for volume in result["volumes"]] == [
+        "ocid1.volume.oc1..data_0",
+        "ocid1.volume.oc1..data_1",
+        "ocid1.volume.oc1..data_2",
+    ]
+    assert [volume["lifecycle_state"] for volume in result["volumes"]] == [
+        "AVAILABLE"
+    ] * 3
+    block_storage_client.list_volumes.assert_called_once()
+    assert sorted(
+        call[1]["create_volume_details"].display_name
+        for call in block_storage_client.create_volume.call_args_list
+    ) == ["data_0", "data_2"]
+    wait_args = wait_for_resources_lifecycle_state_patch.call_args
+    assert sorted(wait_args[0][3]) == [
+        "ocid1.volume.oc1..data_0",
+        "ocid1.volume.oc1..data_2",
+    ]
+
+
+def test_create_volumes_reports_failed_creations(block_storage_client):
+    module = get_module(
+        dict(
+            volumes=[
+                dict(display_name="db_data", size_in_gbs=1024),
+                dict(display_name="db_logs"),
+            ],
+            wait=False,
+        )
+    )
+    block_storage_client.list_volumes.return_value = get_response([])
+
+    def create_volume(create_volume_details, **kwargs):
+        if create_volume_details.display_name == "db_logs":
+            raise ServiceError(400, "LimitExceeded", dict(), "Volume limit exceeded")
+        return get_response(
+            get_volume("ocid1.volume.oc1..db_data", "db_data", "PROVISIONING")
+        )
+
+    block_storage_client.create_volume.side_effect = create_volume
+    with pytest.raises(Exception) as exc_info:
+        oci_volume.create_volumes(block_storage_client, module)
+    assert "Failed to create 1 volumes: db_logs" in str(exc_info.value)
+    assert module.exit_kwargs["changed"] is True
+    assert [volume["id"] for volume in module.exit_kwargs["volumes"]] == [
+        "ocid1.volume.oc1..db_data"
+    ]
+    assert sorted(
+        (
+            call[1]["create_volume_details"].display_name,
+            call[1]["create_volume_details"].size_in_gbs,
+        )
+        for call in block_storage_client.create_volume.call_args_list
+    ) == [("db_data", 1024), ("db_logs", 50)]
+
+
+def get_volume(volume_id, display_name, lifecycle_state="AVAILABLE"):
+    return Volume(
+        id=volume_id,
+        display_name=display_name,
+        availability_domain="IwGV:US-ASHBURN-AD-2",
+        compartment_id="ocid1.compartment.oc1..xxxxxEXAMPLExxxxx",
+        lifecycle_state=lifecycle_state,
+    )
+
+
+def get_response(data):
+    return oci.Response(200, dict(), data, None)
+
+
+def get_module(additional_properties):
+    params = dict(
+        availability_domain="IwGV:US-ASHBURN-AD-2",
+        compartment_id="ocid1.compartment.oc1..xxxxxEXAMPLExxxxx",
+        display_name=None,
+        size_in_gbs=50,
+        backup_policy_id=None,
+        source_details=None,
+        count=None,
+        volumes=None,
+        freeform_tags=None,
+        defined_tags=None,
+        wait=True,
+        wait_until=None,
+        wait_timeout=1200,
+        enable_parallel_requests=True,
+        max_thread_count=None,
+    )
+    params.update(additional_properties)
+    return FakeModule(**params)
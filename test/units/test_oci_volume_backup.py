@@ -0,0 +1,292 @@
+# Copyright (c) 2019 Oracle and/or its affiliates.
+# This software is made available to you under the terms of the GPL 3.0 license or the Apache 2.0 license.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0
+# See LICENSE.TXT for details.
+
+import pytest
+from datetime import datetime
+from nose.plugins.skip import SkipTest
+from ansible.module_utils.oracle import oci_utils, oci_blockstorage_utils
+
+try:
+    import oci
+    from oci.core.models import VolumeBackup
+    from oci.exceptions import ServiceError
+except ImportError:
+    raise SkipTest("test_oci_volume_backup.py requires `oci` module")
+
+
+class FakeModule(object):
+    def __init__(self, **kwargs):
+        self.params = kwargs
+
+    def fail_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+        raise Exception(kwargs["msg"])
+
+    def exit_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+
+
+@pytest.fixture()
+def block_storage_client(mocker):
+    mock_block_storage_client = mocker.patch(
+        "oci.core.blockstorage_client.BlockstorageClient"
+    )
+    return mock_block_storage_client.return_value
+
+
+@pytest.fixture()
+def region_clients(mocker):
+    region_clients = dict(
+        (region, mocker.MagicMock()) for region in ["us-phoenix-1", "uk-london-1"]
+    )
+    mocker.patch.object(
+        oci_utils,
+        "create_service_client",
+        side_effect=lambda module, client_class, region=None: region_clients[region],
+    )
+    return region_clients
+
+
+@pytest.fixture()
+def wait_for_resources_lifecycle_state_patch(mocker):
+    return mocker.patch.object(oci_utils, "wait_for_resources_lifecycle_state")
+
+
+def test_copy_backups_to_regions_skips_backups_copied_before(
+    block_storage_client, region_clients, wait_for_resources_lifecycle_state_patch
+):
+    module = get_module()
+    set_source_backups(block_storage_client)
+    region_clients["us-phoenix-1"].list_volume_backups.return_value = get_response(
+        [get_backup("ocid1.volumebackup.oc1.phx..b1", "ocid1.volumebackup.oc1.iad..b1")]
+    )
+    region_clients["uk-london-1"].list_volume_backups.return_value = get_response([])
+    block_storage_client.copy_volume_backup.side_effect = (
+        lambda volume_backup_id, copy_volume_backup_details, **kwargs: get_response(
+            get_backup(
+                volume_backup_id + "." + copy_volume_backup_details.destination_region,
+                volume_backup_id,
+                "CREATING",
+            )
+        )
+    )
+    wait_for_resources_lifecycle_state_patch.side_effect = (
+        lambda module, list_fn, kwargs_lists, resource_ids, states: (
+            dict(
+                (backup_id, dict(id=backup_id, lifecycle_state="AVAILABLE"))
+                for backup_id in resource_ids
+            ),
+            [],
+        )
+    )
+
+    result = oci_blockstorage_utils.copy_backups_to_regions(
+        block_storage_client,
+        module,
+        "volume_backup",
+        ["ocid1.volumebackup.oc1.iad..b1", "ocid1.volumebackup.oc1.iad..b2"],
+    )
+
+    assert result["changed"] is True
+    assert [
+        (copy["region"], copy["source_volume_backup_id"], copy["changed"])
+        for copy in result["volume_backup_copies"]
+    ] == [
+        ("us-phoenix-1", "ocid1.volumebackup.oc1.iad..b1", False),
+        ("us-phoenix-1", "ocid1.volumebackup.oc1.iad..b2", True),
+        ("uk-london-1", "ocid1.volumebackup.oc1.iad..b1", True),
+        ("uk-london-1", "ocid1.volumebackup.oc1.iad..b2", True),
+    ]
+    assert all(
+        copy["volume_backup"]["lifecycle_state"] == "AVAILABLE"
+        for copy in result["volume_backup_copies"]
+    )
+    assert block_storage_client.copy_volume_backup.call_count == 3
+    # One waiter per batch of max_copies_per_region copies
+    assert sorted(
+        call[0][3] for call in wait_for_resources_lifecycle_state_patch.call_args_list
+    ) == [
+        ["ocid1.volumebackup.oc1.iad..b1.uk-london-1"],
+        ["ocid1.volumebackup.oc1.iad..b2.uk-london-1"],
+        ["ocid1.volumebackup.oc1.iad..b2.us-phoenix-1"],
+    ]
+
+
+def test_copy_backups_to_regions_stops_region_after_timed_out_batch(
+    block_storage_client, region_clients, wait_for_resources_lifecycle_state_patch
+):
+    module = get_module(destination_regions=["uk-london-1"])
+    set_source_backups(block_storage_client)
+    region_clients["uk-london-1"].list_volume_backups.return_value = get_response([])
+    block_storage_client.copy_volume_backup.return_value = get_response(
+        get_backup(
+            "ocid1.volumebackup.oc1.lhr..b1",
+            "ocid1.volumebackup.oc1.iad..b1",
+            "CREATING",
+        )
+    )
+    wait_for_resources_lifecycle_state_patch.return_value = (
+        dict(),
+        ["ocid1.volumebackup.oc1.lhr..b1"],
+    )
+
+    with pytest.raises(Exception) as exc_info:
+        oci_blockstorage_utils.copy_backups_to_regions(
+            block_storage_client,
+            module,
+            "volume_backup",
+            ["ocid1.volumebackup.oc1.iad..b1", "ocid1.volumebackup.oc1.iad..b2"],
+        )
+    assert "Failed 2 of 2 copies" in str(exc_info.value)
+    assert [
+        copy.get("error") for copy in module.exit_kwargs["volume_backup_copies"]
+    ] == [
+        "Timed out waiting for the copy to be AVAILABLE",
+        "Not copied, as earlier copies to uk-london-1 are not complete",
+    ]
+    assert module.exit_kwargs["changed"] is True
+    block_storage_client.copy_volume_backup.assert_called_once()
+
+
+def test_get_retained_resources_combines_rules():
+    backups = [
+        get_backup("ocid1.volumebackup.oc1.iad.." + name, time_created=time_created)
+        for name, time_created in [
+            ("jan31", datetime(2019, 1, 31, 23)),
+            ("feb27", datetime(2019, 2, 27, 8)),
+            ("feb28_am", datetime(2019, 2, 28, 8)),
+            ("feb28_pm", datetime(2019, 2, 28, 20)),
+            ("mar01", datetime(2019, 3, 1, 8)),
+        ]
+    ]
+    kept, removed = oci_utils.get_retained_resources(
+        backups, dict(keep_last=1, keep_daily=2, keep_monthly=3)
+    )
+    assert [backup.id[len("ocid1.volumebackup.oc1.iad..") :] for backup in kept] == [
+        "mar01",
+        "feb28_pm",
+        "jan31",
+    ]
+    assert [backup.id[len("ocid1.volumebackup.oc1.iad..") :] for backup in removed] == [
+        "feb28_am",
+        "feb27",
+    ]
+
+
+def test_apply_retention_policy_reports_failed_deletions(block_storage_client):
+    module = get_module(retention_policy=dict(keep_last=1), wait=False)
+    block_storage_client.list_volume_backups.side_effect = (
+        lambda compartment_id, **kwargs: get_response(
+            [
+                get_backup(
+                    compartment_id + ".b" + str(day),
+                    time_created=datetime(2019, 3, day),
+                    volume_id=compartment_id + ".volume",
+                )
+                for day in [1, 2]
+            ]
+        )
+    )
+
+    def delete_volume_backup(volume_backup_id, **kwargs):
+        if volume_backup_id.startswith("ocid1.compartment.oc1..one"):
+            raise ServiceError(409, "Conflict", dict(), "Backup is in use")
+
+    block_storage_client.delete_volume_backup.side_effect = delete_volume_backup
+    with pytest.raises(Exception) as exc_info:
+        oci_utils.apply_retention_policy(
+            module,
+            "volume_backup",
+            block_storage_client.list_volume_backups,
+            [
+                dict(compartment_id="ocid1.compartment.oc1..one"),
+                dict(compartment_id="ocid1.compartment.oc1..two"),
+            ],
+            block_storage_client.delete_volume_backup,
+            "volume_backup_id",
+            "volume_id",
+            ["AVAILABLE"],
+        )
+    assert "Failed to delete 1 volume_backups: ocid1.compartment.oc1..one.b1" in str(
+        exc_info.value
+    )
+    assert module.exit_kwargs["changed"] is True
+    assert [backup["id"] for backup in module.exit_kwargs["kept_volume_backups"]] == [
+        "ocid1.compartment.oc1..one.b2",
+        "ocid1.compartment.oc1..two.b2",
+    ]
+    assert [
+        backup["id"] for backup in module.exit_kwargs["removed_volume_backups"]
+    ] == ["ocid1.compartment.oc1..two.b1"]
+
+
+def test_apply_retention_policy_rejects_negative_rules(block_storage_client):
+    retention_policy_options = oci_utils.get_retention_policy_arg_spec()[
+        "retention_policy"
+    ]["options"]
+    assert dict(
+        (rule, option["type"]) for rule, option in retention_policy_options.items()
+    ) == dict(keep_last="int", keep_daily="int", keep_weekly="int", keep_monthly="int")
+    module = get_module(
+        retention_policy=dict(
+            keep_last=2, keep_daily=-1, keep_weekly=None, keep_monthly=None
+        )
+    )
+    with pytest.raises(Exception) as exc_info:
+        oci_utils.apply_retention_policy(
+            module,
+            "volume_backup",
+            block_storage_client.list_volume_backups,
+            [dict(compartment_id="ocid1.compartment.oc1..one")],
+            block_storage_client.delete_volume_backup,
+            "volume_backup_id",
+            "volume_id",
+            ["AVAILABLE"],
+        )
+    assert "must not be negative: keep_daily" in str(exc_info.value)
+    block_storage_client.list_volume_backups.assert_not_called()
+
+
+def set_source_backups(block_storage_client):
+    block_storage_client.get_volume_backup.side_effect = (
+        lambda volume_backup_id, **kwargs: get_response(get_backup(volume_backup_id))
+    )
+
+
+def get_backup(
+    backup_id,
+    source_backup_id=None,
+    lifecycle_state="AVAILABLE",
+    time_created=None,
+    volume_id=None,
+):
+    return VolumeBackup(
+        id=backup_id,
+        compartment_id="ocid1.compartment.oc1..xxxxxEXAMPLExxxxx",
+        source_volume_backup_id=source_backup_id,
+        lifecycle_state=lifecycle_state,
+        time_created=time_created,
+        volume_id=volume_id,
+    )
+
+
+def get_response(data):
+    return oci.Response(200, dict(), data, None)
+
+
+def get_module(**additional_properties):
+    params = dict(
+        destination_regions=["us-phoenix-1", "uk-london-1"],
+        max_copies_per_region=1,
+        wait=True,
+        wait_timeout=1200,
+        enable_parallel_requests=True,
+        max_thread_count=None,
+    )
+    params.update(additional_properties)
+    return FakeModule(**params)
@@ -0,0 +1,229 @@
+# Copyright (c) 2019 Oracle and/or its affiliates.
+# This software is made available to you under the terms of the GPL 3.0 license or the Apache 2.0 license.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0
+# See LICENSE.TXT for details.
+
+import pytest
+from nose.plugins.skip import SkipTest
+from ansible.modules.cloud.oracle import oci_volume_group_backup
+from ansible.module_utils.oracle import oci_utils, oci_blockstorage_utils
+
+try:
+    import oci
+    from oci.core.models import VolumeGroupBackup
+except ImportError:
+    raise SkipTest("test_oci_volume_group_backup.py requires `oci` module")
+
+
+class FakeModule(object):
+    def __init__(self, **kwargs):
+        self.params = kwargs
+
+    def fail_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+        raise Exception(kwargs["msg"])
+
+    def exit_json(self, *args, **kwargs):
+        self.exit_args = args
+        self.exit_kwargs = kwargs
+
+
+@pytest.fixture()
+def block_storage_client(mocker):
+    mock_block_storage_client = mocker.patch(
+        "oci.core.blockstorage_client.BlockstorageClient"
+    )
+    return mock_block_storage_client.return_value
+
+
+@pytest.fixture()
+def region_clients(mocker):
+    region_clients = dict(
+        (region, mocker.MagicMock()) for region in ["us-phoenix-1", "uk-london-1"]
+    )
+    mocker.patch.object(
+        oci_utils,
+        "create_service_client",
+        side_effect=lambda module, client_class, region=None: region_clients[region],
+    )
+    return region_clients
+
+
+@pytest.fixture()
+def copy_backups_to_regions_patch(mocker):
+    return mocker.patch.object(oci_blockstorage_utils, "copy_backups_to_regions")
+
+
+@pytest.fixture()
+def wait_for_resources_lifecycle_state_patch(mocker):
+    return mocker.patch.object(oci_utils, "wait_for_resources_lifecycle_state")
+
+
+def test_copy_volume_group_backups_volume_group_backup_id(
+    block_storage_client, copy_backups_to_regions_patch
+):
+    module = get_module(volume_group_backup_id="ocid1.volumegroupbackup.oc1.iad..g1")
+    copy_backups_to_regions_patch.return_value = dict(
+        changed=True, volume_group_backup_copies=[]
+    )
+
+    result = oci_volume_group_backup.copy_volume_group_backups(
+        block_storage_client, module
+    )
+
+    assert result["changed"] is True
+    copy_backups_to_regions_patch.assert_called_once_with(
+        block_storage_client,
+        module,
+        "volume_group_backup",
+        ["ocid1.volumegroupbackup.oc1.iad..g1"],
+    )
+
+
+def test_copy_volume_group_backups_volume_group_backup_ids(
+    block_storage_client, copy_backups_to_regions_patch
+):
+    volume_group_backup_ids = [
+        "ocid1.volumegroupbackup.oc1.iad..g1",
+        "ocid1.volumegroupbackup.oc1.iad..g2",
+    ]
+    module = get_module(volume_group_backup_ids=volume_group_backup_ids)
+
+    oci_volume_group_backup.copy_volume_group_backups(block_storage_client, module)
+
+    copy_backups_to_regions_patch.assert_called_once_with(
+        block_storage_client, module, "volume_group_backup", volume_group_backup_ids
+    )
+
+
+def test_copy_volume_group_backups_no_volume_group_backup_ids(
+    block_storage_client, copy_backups_to_regions_patch
+):
+    module = get_module()
+    with pytest.raises(Exception) as exc_info:
+        oci_volume_group_backup.copy_volume_group_backups(block_storage_client, module)
+    assert (
+        "volume_group_backup_id or volume_group_backup_ids is required with destination_regions."
+        in str(exc_info.value)
+    )
+    copy_backups_to_regions_patch.assert_not_called()
+
+
+def test_copy_volume_group_backups_skips_volume_group_backups_copied_before(
+    block_storage_client, region_clients, wait_for_resources_lifecycle_state_patch
+):
+    module = get_module(
+        volume_group_backup_ids=[
+            "ocid1.volumegroupbackup.oc1.iad..g1",
+            "ocid1.volumegroupbackup.oc1.iad..g2",
+        ]
+    )
+    block_storage_client.get_volume_group_backup.side_effect = (
+        lambda volume_group_backup_id, **kwargs: get_response(
+            get_volume_group_backup(volume_group_backup_id)
+        )
+    )
+    region_clients["us-phoenix-1"].list_volume_group_backups.return_value = (
+        get_response(
+            [
+                get_volume_group_backup(
+                    "ocid1.volumegroupbackup.oc1.phx..g1",
+                    "ocid1.volumegroupbackup.oc1.iad..g1",
+                ),
+                # A terminated copy does not count as a copy of the volume group backup
+                get_volume_group_backup(
+                    "ocid1.volumegroupbackup.oc1.phx..g2",
+                    "ocid1.volumegroupbackup.oc1.iad..g2",
+                    "TERMINATED",
+                ),
+            ]
+        )
+    )
+    region_clients["uk-london-1"].list_volume_group_backups.return_value = get_response(
+        []
+    )
+
+    def copy_volume_group_backup(
+        volume_group_backup_id, copy_volume_group_backup_details, **kwargs
+    ):
+        return get_response(
+            get_volume_group_backup(
+                "{0}.{1}".format(
+                    volume_group_backup_id,
+                    copy_volume_group_backup_details.destination_region,
+                ),
+                volume_group_backup_id,
+                "CREATING",
+            )
+        )
+
+    block_storage_client.copy_volume_group_backup.side_effect = copy_volume_group_backup
+    wait_for_resources_lifecycle_state_patch.side_effect = (
+        lambda module, list_fn, kwargs_lists, resource_ids, states: (
+            dict(
+                (backup_id, dict(id=backup_id, lifecycle_state="AVAILABLE"))
+                for backup_id in resource_ids
+            ),
+            [],
+        )
+    )
+
+    result = oci_volume_group_backup.copy_volume_group_backups(
+        block_storage_client, module
+    )
+
+    assert result["changed"] is True
+    assert [
+        (copy["region"], copy["source_volume_group_backup_id"], copy["changed"])
+        for copy in result["volume_group_backup_copies"]
+    ] == [
+        ("us-phoenix-1", "ocid1.volumegroupbackup.oc1.iad..g1", False),
+        ("us-phoenix-1", "ocid1.volumegroupbackup.oc1.iad..g2", True),
+        ("uk-london-1", "ocid1.volumegroupbackup.oc1.iad..g1", True),
+        ("uk-london-1", "ocid1.volumegroupbackup.oc1.iad..g2", True),
+    ]
+    assert (
+        result["volume_group_backup_copies"][0]["volume_group_backup"]["id"]
+        == "ocid1.volumegroupbackup.oc1.phx..g1"
+    )
+    assert block_storage_client.copy_volume_group_backup.call_count == 3
+    list_volume_group_backups = region_clients["us-phoenix-1"].list_volume_group_backups
+    list_volume_group_backups.assert_called_once()
+    assert (
+        list_volume_group_backups.call_args[1]["compartment_id"]
+        == "ocid1.compartment.oc1..xxxxxEXAMPLExxxxx"
+    )
+
+
+def get_volume_group_backup(
+    volume_group_backup_id,
+    source_volume_group_backup_id=None,
+    lifecycle_state="AVAILABLE",
+):
+    return VolumeGroupBackup(
+        id=volume_group_backup_id,
+        compartment_id="ocid1.compartment.oc1..xxxxxEXAMPLExxxxx",
+        source_volume_group_backup_id=source_volume_group_backup_id,
+        lifecycle_state=lifecycle_state,
+    )
+
+
+def get_response(data):
+    return oci.Response(200, dict(), data, None)
+
+
+def get_module(**additional_properties):
+    params = dict(
+        volume_group_backup_id=None,
+        volume_group_backup_ids=None,
+        destination_regions=["us-phoenix-1", "uk-london-1"],
+        max_copies_per_region=2,
+        wait=True,
+        wait_timeout=1200,
+        enable_parallel_requests=True,
+        max_thread_count=None,
+    )
+    params.update(additional_properties)
+    return FakeModule(**params)